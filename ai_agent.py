@@ -1,13 +1,33 @@
+import hashlib
+import json
 import os
+import re
+import tempfile
+import threading
 import pandas as pd
 from dotenv import load_dotenv
 from langchain_community.vectorstores import Chroma
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
+from langchain_openai import ChatOpenAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.runnables import RunnablePassthrough
 from utils.config import *
-from utils.data_loader import load_data, analyze_data_structure, process_landsoft_data, process_google_sheets_data
+from utils.agent_cache import AGENT_CACHE, make_fingerprint, time_bucket
+from utils.answer_cache import CachedAnswer, get_answer_cache
+from utils.dedup import deduplicate_listings
+from utils.data_loader import load_data, load_landsoft_file, analyze_data_structure, process_landsoft_data, process_google_sheets_data, get_sheet_revision
+from utils.embedding_cache import CachedEmbeddings
+from utils.embedding_provider import embedding_model_name, make_embedding_backend, requires_api_key
+from utils.hashing import file_digest
+from utils.ingestion import iter_source_chunks
+from utils.lexical_index import LexicalIndex
+from utils.llm_context import format_context
+from utils.metrics import MetricsCallbackHandler, span
+from utils.numpy_vector_store import NumpyVectorStore
+from utils.retrieval import ListingRetriever
+from utils.schema import compact_listings
+from utils.text_builder import DISPLAY_FIELDS, build_listing_metadata, build_listing_texts
+from utils.vector_sync import DocumentIdAllocator, make_document_ids, sync_vector_store, sync_vector_store_batches
 
 # Load env
 load_dotenv()
@@ -25,50 +45,79 @@ def load_and_process_data(source_type='sample', sheet_url=None, credentials_path
         file_path: Optional custom file path for csv/excel
     """
     try:
-        # Load data from source
-        if source_type == 'gsheet':
-            if not sheet_url:
-                raise ValueError("Sheet URL is required for Google Sheets source")
-            # Only pass credentials_path if explicitly provided (for local development)
-            # In deployment, let load_data use environment variable
-            if credentials_path:
-                df = load_data(source_type='gsheet', sheet_url=sheet_url, credentials_path=credentials_path)
+        with span('load_data', source_type=source_type) as stage:
+            # Load data from source
+            if source_type == 'gsheet':
+                if not sheet_url:
+                    raise ValueError("Sheet URL is required for Google Sheets source")
+                # Only pass credentials_path if explicitly provided (for local development)
+                # In deployment, let load_data use environment variable
+                if credentials_path:
+                    df = load_data(source_type='gsheet', sheet_url=sheet_url, credentials_path=credentials_path)
+                else:
+                    df = load_data(source_type='gsheet', sheet_url=sheet_url)
+            elif source_type == 'excel':
+                # LandSoft export, processed (snapshot reused while the file is unchanged)
+                df = load_landsoft_file(file_path or EXCEL_DATA_PATH)
             else:
-                df = load_data(source_type='gsheet', sheet_url=sheet_url)
-        else:
-            df = load_data(source_type=source_type, file_path=file_path)
-        
-        # For Excel files, process LandSoft data
-        if source_type == 'excel':
-            df = process_landsoft_data(df)
-        # For Google Sheets, process data to ensure required columns
-        elif source_type == 'gsheet':
-            df = process_google_sheets_data(df)
-        
-        # Analyze data structure
-        missing_columns = analyze_data_structure(df, source_type)
-        
-        # If missing required columns, try to map them (for non-Excel, non-GSheet sources)
-        if missing_columns and source_type not in ['excel', 'gsheet']:
-            df = map_excel_columns(df)
-        
-        # Validate required columns after processing
-        required_columns = ['id', 'type', 'district', 'ward', 'address', 'price', 'area', 'bedrooms', 'direction', 'legal_status', 'amenities', 'description']
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            raise ValueError(f"Missing required columns after processing: {missing_columns}")
+                df = load_data(source_type=source_type, file_path=file_path)
+            
+            # For Google Sheets, process data to ensure required columns
+            if source_type == 'gsheet':
+                df = process_google_sheets_data(df)
+            stage.set(rows=len(df))
         
-        # Tạo text embedding cho mỗi sản phẩm với thông tin chi tiết hơn
-        df['text'] = df.apply(create_detailed_text_embedding, axis=1)
+        if DEDUP_ENABLED and source_type in ('excel', 'gsheet'):
+            # Re-posted listings are embedded (and shown) once
+            with span('dedup', rows=len(df)) as stage:
+                df, dedup_stats = deduplicate_listings(df)
+                stage.set(**{key: value for key, value in dedup_stats.items() if key != 'seconds'})
+            print(f"🧹 Dedup: {dedup_stats['rows']} rows -> {dedup_stats['clusters']} listings "
+                  f"({dedup_stats['duplicates']} duplicates in {dedup_stats['duplicate_clusters']} clusters, "
+                  f"largest {dedup_stats['largest_cluster']}, {dedup_stats['seconds']:.2f}s)")
         
-        return df
+        with span('text_build', rows=len(df)):
+            return process_data(df, source_type)
         
     except Exception as e:
         raise Exception(f"Error loading data from {source_type}: {str(e)}")
 
+REQUIRED_COLUMNS = ['id', 'type', 'district', 'ward', 'address', 'price', 'area', 'bedrooms', 'direction', 'legal_status', 'amenities', 'description']
+
+def process_data(df, source_type, verbose=True):
+    """
+    Map columns if needed, validate them and add the listing text
+    
+    Args:
+        df: Loaded (and for excel/gsheet, source-processed) DataFrame or chunk
+        source_type: 'sample', 'csv', 'excel', or 'gsheet'
+        verbose: Print the data structure analysis (off for streamed chunks)
+    """
+    # Analyze data structure
+    if verbose:
+        missing_columns = analyze_data_structure(df, source_type)
+    else:
+        missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    
+    # If missing required columns, try to map them (for non-Excel, non-GSheet sources)
+    if missing_columns and source_type not in ['excel', 'gsheet']:
+        df = map_excel_columns(df)
+    
+    # Validate required columns after processing
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing_columns:
+        raise ValueError(f"Missing required columns after processing: {missing_columns}")
+    
+    # Tạo text embedding cho mỗi sản phẩm với thông tin chi tiết hơn
+    df['text'] = build_listing_texts(df)
+    
+    return df
+
 def create_detailed_text_embedding(row):
     """
     Create detailed text embedding for LandSoft data
+    
+    Row-wise reference; load_and_process_data uses the column-wise build_listing_texts.
     """
     # Format price
     price_display = "Thương lượng" if row['price'] == 0 else f"{row['price']:,.0f} VND"
@@ -88,29 +137,30 @@ def create_detailed_text_embedding(row):
     # Format phone
     phone_info = f"ĐT: {row.get('phone', 'N/A')}" if pd.notna(row.get('phone')) else ""
     
-    # Create comprehensive text
     # Show both Gallery ID and Product ID if available
     id_display = f"Mã SP: {row['id']}"
     if 'product_id' in row and pd.notna(row['product_id']):
         id_display += f" (Mã sản phẩm: {row['product_id']})"
     
-    text = f"""
-    {id_display}
-    Loại giao dịch: {transaction_type}
-    Loại hình: {row['type']}
-    Vị trí: {row['district']}, {row['ward']}
-    Địa chỉ: {row['address']}
-    Giá: {price_display}
-    Diện tích: {area_info}
-    Phòng ngủ: {row['bedrooms']}
-    Hướng: {row['direction']}
-    Pháp lý: {row['legal_status']}
-    Tiện ích: {row['amenities']}
-    {owner_info}
-    {agent_info}
-    {phone_info}
-    Mô tả: {row['description']}
-    """
+    # One line per field; missing owner/agent/phone lines are left out
+    lines = [
+        id_display,
+        f"Loại giao dịch: {transaction_type}",
+        f"Loại hình: {row['type']}",
+        f"Vị trí: {row['district']}, {row['ward']}",
+        f"Địa chỉ: {row['address']}",
+        f"Giá: {price_display}",
+        f"Diện tích: {area_info}",
+        f"Phòng ngủ: {row['bedrooms']}",
+        f"Hướng: {row['direction']}",
+        f"Pháp lý: {row['legal_status']}",
+        f"Tiện ích: {row['amenities']}",
+        owner_info,
+        agent_info,
+        phone_info,
+        f"Mô tả: {row['description']}",
+    ]
+    text = '\n'.join(line for line in lines if line)
     
     return text.strip()
 
@@ -183,57 +233,207 @@ def map_excel_columns(df):
     
     return mapped_df
 
+def is_deployment_environment():
+    """Read-only filesystem deployments (Streamlit Cloud) keep the vector store in memory"""
+    return os.getenv('STREAMLIT_SERVER_PORT') is not None or os.getenv('GOOGLE_CREDENTIALS_JSON') is not None
+
+def make_embeddings():
+    """
+    Embeddings of EMBEDDING_PROVIDER behind the vector cache
+    
+    For OpenAI only cache misses reach the executor, which sends them as
+    concurrent batches within EMBEDDING_TPM_LIMIT and retries 429s itself.
+    """
+    return CachedEmbeddings(make_embedding_backend(), model_name=embedding_model_name())
+
+# Tên bộ sưu tập vector: real_estate_{source_type}_{hash nguồn}, bản fork thêm _fork_{fingerprint}
+COLLECTION_PREFIX = 'real_estate_'
+SOURCE_COLLECTION_PATTERN = re.compile(r'real_estate_[a-z]+_[0-9a-f]{12}')
+FORK_MARKER = '_fork_'
+
+def source_identity(source_type, sheet_url=None, file_path=None):
+    """What a vector collection belongs to: the sheet or the file's location (all uploads share one)"""
+    if source_type == 'gsheet':
+        return sheet_url or ''
+    if source_type == 'sample':
+        return os.path.abspath(SAMPLE_DATA_PATH)
+    if source_type in ('csv', 'excel'):
+        path = os.path.abspath(file_path or (PRODUCTION_DATA_PATH if source_type == 'csv' else EXCEL_DATA_PATH))
+        # Uploads land in a new temp file every time
+        if os.path.dirname(path) == os.path.abspath(tempfile.gettempdir()):
+            return 'upload'
+        return path
+    raise ValueError(f"Invalid source type: {source_type}")
+
+def source_collection_name(source_type, sheet_url=None, file_path=None):
+    """
+    The collection a data source is incrementally synced into, stable across
+    refreshes of its contents; vectors of another provider have another size,
+    so the provider is part of the name
+    """
+    identity = json.dumps([source_identity(source_type, sheet_url, file_path), EMBEDDING_PROVIDER])
+    return f"{COLLECTION_PREFIX}{source_type}_{hashlib.sha256(identity.encode('utf-8')).hexdigest()[:12]}"
+
+def open_vector_store(source_type, embeddings, collection_name=None):
+    """
+    A vector collection, by default the source type's own (see source_collection_name)
+    
+    Args:
+        collection_name: Name of the collection to open instead
+    """
+    collection_name = collection_name or source_collection_name(source_type)
+    if VECTOR_BACKEND == 'numpy':
+        # Memory-mapped float32 matrix + sidecar; in memory on read-only deployments
+        persist_directory = None if is_deployment_environment() else NUMPY_VECTOR_DIR
+        return NumpyVectorStore(collection_name, embeddings, persist_directory=persist_directory)
+    if is_deployment_environment():
+        # In-memory collection, still reused by later inits in the same process
+        return Chroma(collection_name=collection_name, embedding_function=embeddings)
+    VECTOR_DB_DIR.mkdir(exist_ok=True)
+    return Chroma(
+        collection_name=collection_name,
+        embedding_function=embeddings,
+        persist_directory=str(VECTOR_DB_DIR)
+    )
+
+def _chroma_client():
+    """The chromadb client open_vector_store's Chroma stores use (same settings, so the same system)"""
+    import chromadb
+    import chromadb.config
+    if is_deployment_environment():
+        return chromadb.Client(chromadb.config.Settings())
+    return chromadb.Client(chromadb.config.Settings(is_persistent=True, persist_directory=str(VECTOR_DB_DIR)))
+
+def list_vector_collections():
+    """Names of the real_estate_* collections of VECTOR_BACKEND (on disk and in this process)"""
+    if VECTOR_BACKEND == 'numpy':
+        names = set(NumpyVectorStore._memory_collections)
+        if not is_deployment_environment() and NUMPY_VECTOR_DIR.exists():
+            names.update(path.name for path in NUMPY_VECTOR_DIR.iterdir() if path.is_dir())
+    else:
+        if not is_deployment_environment() and not VECTOR_DB_DIR.exists():
+            return []
+        names = {getattr(collection, 'name', collection) for collection in _chroma_client().list_collections()}
+    return sorted(name for name in names if name.startswith(COLLECTION_PREFIX))
+
+def drop_vector_collection(collection_name):
+    """Delete one collection of VECTOR_BACKEND, on disk too"""
+    if VECTOR_BACKEND == 'numpy':
+        open_vector_store(None, None, collection_name).delete_collection()
+    else:
+        _chroma_client().delete_collection(collection_name)
+
+# Bộ sưu tập -> fingerprint của agent (trong AGENT_CACHE) đang tìm kiếm trên nó
+_COLLECTION_OWNERS = {}
+_COLLECTION_LOCK = threading.RLock()
+
+def claim_collection(base_name, fingerprint, cache=AGENT_CACHE):
+    """
+    Collection a cached agent builds into (copy-on-write)
+    
+    The source's own collection is synced in place, so only changed listings
+    are written, unless another cached agent still holds it: then the new
+    agent gets a fork named after its fingerprint, filled from the embedding
+    cache, and the shared index of the older agent is left untouched. An
+    idle older agent is dropped from the cache instead of being forked around.
+    
+    Returns:
+        Collection name, released with release_collection
+    """
+    with _COLLECTION_LOCK:
+        owner = _COLLECTION_OWNERS.get(base_name)
+        if owner in (None, fingerprint) or cache.discard(owner):
+            _COLLECTION_OWNERS[base_name] = fingerprint
+            return base_name
+        fork_name = f"{base_name}{FORK_MARKER}{fingerprint[:12]}"
+        _COLLECTION_OWNERS[fork_name] = fingerprint
+        return fork_name
+
+def release_collection(collection_name, fingerprint):
+    """Give up a claim_collection claim; forks are deleted, source collections kept for the next refresh"""
+    with _COLLECTION_LOCK:
+        if _COLLECTION_OWNERS.get(collection_name) != fingerprint:
+            return
+        del _COLLECTION_OWNERS[collection_name]
+        if FORK_MARKER in collection_name:
+            drop_vector_collection(collection_name)
+
+def collect_orphan_collections():
+    """
+    Delete the collections no live agent owns: forks left by earlier runs or
+    agents and collections of older naming schemes; source collections stay
+    
+    Returns:
+        Names of the deleted collections
+    """
+    with _COLLECTION_LOCK:
+        orphans = [name for name in list_vector_collections()
+                   if name not in _COLLECTION_OWNERS and not SOURCE_COLLECTION_PATTERN.fullmatch(name)]
+        for name in orphans:
+            try:
+                drop_vector_collection(name)
+            except Exception as e:
+                print(f"Warning: Could not delete vector collection {name}: {e}")
+    if orphans:
+        print(f"🧹 Deleted {len(orphans)} unused vector collections")
+    return orphans
+
 # Khởi tạo vector store
-def init_vector_store(df, source_type='sample'):
+def init_vector_store(df, source_type='sample', sync_mode=None, collection_name=None):
     """
     Initialize vector store with data
     
     Args:
         df: Processed DataFrame
         source_type: Source type for cache management
+        sync_mode: 'incremental' (diff against the persisted collection) or
+                   'rebuild' (drop everything and re-index); defaults to VECTOR_SYNC_MODE
+        collection_name: Collection to sync into; defaults to the source type's (see open_vector_store)
     """
     try:
         # Check if API key is set
         current_api_key = os.getenv('OPENAI_API_KEY')
-        if not current_api_key or current_api_key == 'your_openai_api_key_here':
+        if requires_api_key() and (not current_api_key or current_api_key == 'your_openai_api_key_here'):
             raise ValueError("OpenAI API key is not set. Please enter your API key in the sidebar.")
         
+        sync_mode = sync_mode or VECTOR_SYNC_MODE
+        if sync_mode not in ('incremental', 'rebuild'):
+            raise ValueError(f"Invalid sync mode: {sync_mode}")
+        
         texts = df['text'].tolist()
-        embeddings = OpenAIEmbeddings(model=EMBEDDING_MODEL)
-        
-        # Create unique collection name based on source type and timestamp
-        import time
-        timestamp = int(time.time())
-        collection_name = f"real_estate_{source_type}_{timestamp}"
-        
-        # Check if we're in a deployment environment (read-only filesystem)
-        is_deployment = os.getenv('STREAMLIT_SERVER_PORT') is not None or os.getenv('GOOGLE_CREDENTIALS_JSON') is not None
-        
-        if is_deployment:
-            # Use in-memory vector store for deployment (no persistence)
-            vector_store = Chroma.from_texts(
-                texts=texts,
-                embedding=embeddings,
-                collection_name=collection_name
-            )
-        else:
-            # Use persistent vector store for local development
-            try:
-                import shutil
-                if VECTOR_DB_DIR.exists():
-                    shutil.rmtree(VECTOR_DB_DIR)
-                VECTOR_DB_DIR.mkdir(exist_ok=True)
-            except Exception as e:
-                print(f"Warning: Could not clear vector DB cache: {e}")
-            
-            vector_store = Chroma.from_texts(
-                texts=texts,
-                embedding=embeddings,
-                persist_directory=str(VECTOR_DB_DIR),
-                collection_name=collection_name
-            )
+        ids = make_document_ids(df)
+        # Filterable fields (district, price, bedrooms, ...) for query-time pre-filtering
+        metadatas = build_listing_metadata(df)
+        
+        # Only listings that changed since the last build are sent to OpenAI
+        # (falls back to an in-memory cache on read-only filesystems)
+        embeddings = make_embeddings()
+        
+        # 'rebuild' drops only this collection (others may be searched by cached agents) and re-syncs it
+        vector_store = open_vector_store(source_type, embeddings, collection_name)
+        if sync_mode == 'rebuild':
+            vector_store.delete_collection()
+            vector_store = open_vector_store(source_type, embeddings, collection_name)
+        
+        with span('vector_index', rows=len(ids), backend=VECTOR_BACKEND, mode=sync_mode) as stage:
+            sync_stats = sync_vector_store(vector_store, ids, texts, metadatas, model_name=embedding_model_name())
+            stage.set(**sync_stats)
+        print(f"🔁 Vector store sync: {sync_stats['added']} added, {sync_stats['updated']} updated, "
+              f"{sync_stats['deleted']} deleted, {sync_stats['unchanged']} unchanged")
         
-        return vector_store.as_retriever(search_kwargs={"k": TOP_K_RESULTS})
+        stats = embeddings.stats()
+        print(f"🧠 Embedding cache: {stats['hits']} hits, {stats['misses']} misses ({stats['entries']} cached vectors)")
+        
+        lexical_index = None
+        if HYBRID_SEARCH_ENABLED:
+            # Keyword search for listing codes, street names and ward numbers
+            with span('lexical_index', rows=len(ids)):
+                lexical_index = LexicalIndex(df['text'], ids=ids, metadatas=metadatas)
+            index_stats = lexical_index.stats()
+            print(f"🔎 Lexical index: {index_stats['documents']} listings, {index_stats['terms']} terms "
+                  f"({index_stats['build_seconds']:.2f}s)")
+        
+        return ListingRetriever(vector_store=vector_store, lexical_index=lexical_index, k=TOP_K_RESULTS)
         
     except Exception as e:
         if "api_key" in str(e).lower():
@@ -241,8 +441,145 @@ def init_vector_store(df, source_type='sample'):
         else:
             raise Exception(f"Error initializing vector store: {str(e)}")
 
+def iter_listing_batches(source_type, file_path=None, chunk_size=INGEST_CHUNK_SIZE, allocator=None):
+    """
+    Read, process and describe a file source one chunk at a time
+    
+    Yields:
+        (ids, texts, metadatas) per chunk; ids are the same as make_document_ids
+        would give for the whole file
+    """
+    allocator = allocator or DocumentIdAllocator()
+    for chunk in iter_source_chunks(source_type, file_path, chunk_size):
+        if source_type == 'excel':
+            chunk = process_landsoft_data(chunk)
+        chunk = process_data(chunk, source_type, verbose=False)
+        yield allocator.allocate(chunk['id'].tolist()), chunk['text'].tolist(), build_listing_metadata(chunk)
+
+def ingest_source(source_type='sample', file_path=None, sync_mode=None, chunk_size=INGEST_CHUNK_SIZE,
+                  collection_name=None):
+    """
+    Streaming counterpart of load_and_process_data + init_vector_store
+    
+    Chunks are read, processed, embedded and upserted one after another, so
+    peak memory does not grow with the file. Only the listing ids and filter
+    fields are kept; without the texts there is no lexical index, so the
+    retriever is vector-only.
+    
+    Returns:
+        (listings, retriever): listings is a DataFrame of ids and metadata fields
+    """
+    try:
+        current_api_key = os.getenv('OPENAI_API_KEY')
+        if requires_api_key() and (not current_api_key or current_api_key == 'your_openai_api_key_here'):
+            raise ValueError("OpenAI API key is not set. Please enter your API key in the sidebar.")
+        
+        sync_mode = sync_mode or VECTOR_SYNC_MODE
+        if sync_mode not in ('incremental', 'rebuild'):
+            raise ValueError(f"Invalid sync mode: {sync_mode}")
+        
+        embeddings = make_embeddings()
+        vector_store = open_vector_store(source_type, embeddings, collection_name)
+        if sync_mode == 'rebuild':
+            vector_store.delete_collection()
+            vector_store = open_vector_store(source_type, embeddings, collection_name)
+        
+        listing_parts = []
+        def batches():
+            for chunk_number, (ids, texts, metadatas) in enumerate(
+                    iter_listing_batches(source_type, file_path, chunk_size), start=1):
+                listing_parts.append(pd.DataFrame(metadatas).drop(columns=list(DISPLAY_FIELDS)).assign(id=ids))
+                print(f"📦 Chunk {chunk_number}: {len(ids)} listings")
+                yield ids, texts, metadatas
+        
+        with span('vector_index', backend=VECTOR_BACKEND, mode=sync_mode, chunk_size=chunk_size) as stage:
+            sync_stats = sync_vector_store_batches(vector_store, batches(), model_name=embedding_model_name())
+            stage.set(rows=sum(len(part) for part in listing_parts), **sync_stats)
+        print(f"🔁 Vector store sync: {sync_stats['added']} added, {sync_stats['updated']} updated, "
+              f"{sync_stats['deleted']} deleted, {sync_stats['unchanged']} unchanged")
+        stats = embeddings.stats()
+        print(f"🧠 Embedding cache: {stats['hits']} hits, {stats['misses']} misses ({stats['entries']} cached vectors)")
+        
+        listings = pd.concat(listing_parts, ignore_index=True) if listing_parts else pd.DataFrame({'id': []})
+        return listings, ListingRetriever(vector_store=vector_store, k=TOP_K_RESULTS)
+        
+    except Exception as e:
+        if "api_key" in str(e).lower():
+            raise ValueError("OpenAI API key is not set or invalid. Please check your API key in the sidebar.")
+        else:
+            raise Exception(f"Error ingesting {source_type} data: {str(e)}")
+
+def build_chain(retriever, llm=None, answer_cache=None):
+    """
+    Retrieval + prompt + LLM chain over a retriever
+    
+    Args:
+        retriever: Listing retriever (see init_vector_store)
+        llm: Chat model; defaults to ChatOpenAI(LLM_MODEL)
+        answer_cache: Optional AnswerCache in front of the LLM
+    
+    Every run is traced as a 'query' span (retrieval and LLM time, tokens),
+    see utils.metrics.
+    """
+    prompt = ChatPromptTemplate.from_template(PROMPT_TEMPLATE)
+    if llm is None:
+        # stream_usage: token counts are reported for streamed answers too
+        llm = ChatOpenAI(model=LLM_MODEL, temperature=LLM_TEMPERATURE, stream_usage=True)
+    
+    # Create chain: retrieve first, so repeated questions over the same
+    # listings are answered from the cache without calling the LLM.
+    # The retrieved listings reach the prompt in the compact, token-budgeted format.
+    generate = (
+        RunnablePassthrough.assign(context=lambda inputs: format_context(inputs['context']))
+        | prompt | llm | StrOutputParser()
+    )
+    if answer_cache is not None:
+        generate = CachedAnswer(generate, answer_cache)
+    chain = {"context": retriever, "question": RunnablePassthrough()} | generate
+    return chain.with_config(callbacks=[MetricsCallbackHandler()])
+
 # Tạo AI chain
-def create_agent(source_type='sample', sheet_url=None, credentials_path=None, file_path=None):
+def build_agent(source_type='sample', sheet_url=None, credentials_path=None, file_path=None, llm=None,
+                collection_name=None):
+    """
+    Load data, index it and assemble the chain
+    
+    Args:
+        llm: Optional chat model replacing ChatOpenAI (e.g. a local fake for benchmarks)
+        collection_name: Vector collection to sync into; defaults to the data source's
+            (see source_collection_name)
+    
+    Returns:
+        (chain, df, retriever)
+    """
+    # Check if API key is set (not needed with an injected LLM and local embeddings)
+    current_api_key = os.getenv('OPENAI_API_KEY')
+    if (llm is None or requires_api_key()) and (not current_api_key or current_api_key == 'your_openai_api_key_here'):
+        raise ValueError("OpenAI API key is not set. Please enter your API key in the sidebar.")
+    
+    # Timed stage by stage (utils.metrics); the trace is the 'build' one shown in the sidebar
+    with span('build', source_type=source_type, ingest_mode=INGEST_MODE) as trace:
+        if INGEST_MODE == 'streaming' and source_type != 'gsheet':
+            # Bounded memory: read, embed and index the file chunk by chunk
+            df, retriever = ingest_source(source_type, file_path, collection_name=collection_name)
+        else:
+            # Load and process data
+            df = load_and_process_data(source_type, sheet_url, credentials_path, file_path)
+            
+            # Initialize vector store
+            retriever = init_vector_store(df, source_type, collection_name=collection_name)
+        
+        if COMPACT_LISTINGS:
+            # The table kept with the agent: categoricals, small ints, float32, datetime64
+            with span('compact_listings', rows=len(df)):
+                df = compact_listings(df)
+        trace.set(rows=len(df))
+    
+    # Answers are cached under LLM_MODEL, so an injected LLM gets no answer cache
+    chain = build_chain(retriever, llm=llm, answer_cache=get_answer_cache() if llm is None else None)
+    return chain, df, retriever
+
+def create_agent(source_type='sample', sheet_url=None, credentials_path=None, file_path=None, llm=None):
     """
     Create AI agent with specified data source
     
@@ -251,32 +588,93 @@ def create_agent(source_type='sample', sheet_url=None, credentials_path=None, fi
         sheet_url: Google Sheet URL (required for 'gsheet')
         credentials_path: Path to Google credentials (optional)
         file_path: Optional custom file path for csv/excel
+        llm: Optional chat model replacing ChatOpenAI
     """
     try:
-        # Check if API key is set
-        current_api_key = os.getenv('OPENAI_API_KEY')
-        if not current_api_key or current_api_key == 'your_openai_api_key_here':
-            raise ValueError("OpenAI API key is not set. Please enter your API key in the sidebar.")
+        chain, df, _ = build_agent(source_type, sheet_url, credentials_path, file_path, llm=llm)
+        return chain, df
         
-        # Load and process data
-        df = load_and_process_data(source_type, sheet_url, credentials_path, file_path)
+    except Exception as e:
+        raise Exception(f"Error creating agent: {str(e)}")
+
+def agent_fingerprint(source_type='sample', sheet_url=None, credentials_path=None, file_path=None):
+    """
+    Identity of the agent a data source would build: file contents (or sheet
+    URL + revision) plus every setting that changes the index or the answers
+    """
+    if source_type == 'gsheet':
+        revision = get_sheet_revision(sheet_url, credentials_path or 'credentials.json')
+        # Without a readable revision, rebuild at most every GSHEET_REVISION_TTL seconds
+        source = [sheet_url, revision or f"ttl-{time_bucket(GSHEET_REVISION_TTL)}"]
+    elif source_type == 'sample':
+        source = [file_digest(SAMPLE_DATA_PATH)]
+    elif source_type in ('csv', 'excel'):
+        source = [file_digest(file_path or (PRODUCTION_DATA_PATH if source_type == 'csv' else EXCEL_DATA_PATH))]
+    else:
+        raise ValueError(f"Invalid source type: {source_type}")
+    
+    # An agent built with one API key is never handed to a session using another
+    api_key = os.getenv('OPENAI_API_KEY') or ''
+    return make_fingerprint(
+        source_type, *source,
+        api_key=hashlib.sha256(api_key.encode('utf-8')).hexdigest(),
+        embedding_model=embedding_model_name(), llm_model=LLM_MODEL, temperature=LLM_TEMPERATURE,
+        top_k=TOP_K_RESULTS, prompt=PROMPT_TEMPLATE,
+        query_filters=QUERY_FILTERS_ENABLED, hybrid=HYBRID_SEARCH_ENABLED, ingest_mode=INGEST_MODE,
+        compact_listings=COMPACT_LISTINGS, vector_backend=VECTOR_BACKEND,
+        dedup=[DEDUP_ENABLED, DEDUP_THRESHOLD, DEDUP_NUM_PERM, DEDUP_BANDS, DEDUP_SHINGLE_SIZE],
+        rerank=[RERANK_ENABLED, RERANK_FETCH_K], context_token_budget=CONTEXT_TOKEN_BUDGET,
+    )
+
+def estimate_agent_memory(df, retriever):
+    """Rough bytes held by a built agent: DataFrame, lexical index and in-memory vectors"""
+    size = int(df.memory_usage(deep=True).sum())
+    if getattr(retriever, 'lexical_index', None) is not None:
+        size += retriever.lexical_index.nbytes
+    return size + len(df) * EMBEDDING_DIMENSIONS * 4
+
+def get_shared_agent(source_type='sample', sheet_url=None, credentials_path=None, file_path=None):
+    """
+    Lease the process-wide agent for a data source, building it only if no
+    other session already has
+    
+    The chain and DataFrame in lease.value are shared between sessions and
+    must be treated as read-only. Call lease.release() when switching agents;
+    a lease that is garbage collected releases itself. A cached agent's
+    vector collection is never changed while it is cached (see
+    claim_collection); unused collections are deleted on every build.
+    
+    Returns:
+        AgentLease with .value = (chain, df, retriever)
+    """
+    try:
+        fingerprint = agent_fingerprint(source_type, sheet_url, credentials_path, file_path)
         
-        # Initialize vector store
-        retriever = init_vector_store(df, source_type)
+        collection_name = None
         
-        # Create prompt and LLM
-        prompt = ChatPromptTemplate.from_template(PROMPT_TEMPLATE)
-        llm = ChatOpenAI(model=LLM_MODEL, temperature=LLM_TEMPERATURE)
+        def build():
+            nonlocal collection_name
+            collection_name = claim_collection(source_collection_name(source_type, sheet_url, file_path),
+                                               fingerprint)
+            collect_orphan_collections()
+            try:
+                return build_agent(source_type, sheet_url, credentials_path, file_path,
+                                   collection_name=collection_name)
+            except BaseException:
+                release_collection(collection_name, fingerprint)
+                raise
         
-        # Create chain
-        chain = (
-            {"context": retriever, "question": RunnablePassthrough()} 
-            | prompt 
-            | llm 
-            | StrOutputParser()
+        lease = AGENT_CACHE.acquire(
+            fingerprint,
+            build,
+            size_of=lambda agent: estimate_agent_memory(agent[1], agent[2]),
+            dispose=lambda agent: release_collection(collection_name, fingerprint)
         )
         
-        return chain, df
+        stats = AGENT_CACHE.stats()
+        print(f"🗂️ Agent cache: {stats['entries']} agents, {stats['leases']} sessions, "
+              f"{stats['bytes'] / 1e6:.0f} MB, {stats['hits']} hits / {stats['misses']} builds")
+        return lease
         
     except Exception as e:
         raise Exception(f"Error creating agent: {str(e)}")
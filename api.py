@@ -0,0 +1,224 @@
+"""
+Async HTTP service for the real estate agent
+
+One agent is built at startup and shared by every request: the listings
+index is loaded once, questions go through chain.ainvoke / chain.astream,
+and all LLM calls share one pooled (keep-alive) HTTP client. At most
+SERVICE_MAX_CONCURRENCY questions are answered at the same time; the rest
+wait for a slot.
+
+Endpoints:
+    GET  /health       {"status", "source_type", "listings"}
+    POST /ask          {"question": "..."} -> {"answer", "seconds"}
+    POST /ask/batch    {"questions": [...]} -> {"results": [{"question", "answer" | "error"}], "seconds"}
+    POST /ask/stream   {"question": "..."} -> answer as text/plain chunks while the LLM writes it
+
+Run:
+    uvicorn api:app --host 0.0.0.0 --port 8000
+    SERVICE_SOURCE=excel SERVICE_FILE_PATH=data/export.xlsx python api.py --port 8000
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import time
+
+import httpx
+from langchain_openai import ChatOpenAI
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from ai_agent import build_agent, build_chain
+from utils.answer_cache import get_answer_cache
+from utils.config import (
+    DEFAULT_SHEET_URL, LLM_MODEL, LLM_TEMPERATURE, MAX_INPUT_LENGTH,
+    SERVICE_SOURCE, SERVICE_FILE_PATH, SERVICE_MAX_CONCURRENCY, SERVICE_MAX_BATCH,
+    SERVICE_HTTP_MAX_CONNECTIONS, SERVICE_HTTP_MAX_KEEPALIVE, SERVICE_HTTP_TIMEOUT,
+)
+
+
+def make_http_clients():
+    """(sync, async) httpx clients with one connection pool each, shared by all LLM calls"""
+    limits = httpx.Limits(max_connections=SERVICE_HTTP_MAX_CONNECTIONS,
+                          max_keepalive_connections=SERVICE_HTTP_MAX_KEEPALIVE)
+    timeout = httpx.Timeout(SERVICE_HTTP_TIMEOUT)
+    return httpx.Client(limits=limits, timeout=timeout), httpx.AsyncClient(limits=limits, timeout=timeout)
+
+
+def make_pooled_llm(http_client, http_async_client, **kwargs):
+    """ChatOpenAI(LLM_MODEL) on the shared clients; kwargs override (e.g. base_url for a stub)"""
+    options = dict(model=LLM_MODEL, temperature=LLM_TEMPERATURE, stream_usage=True, max_retries=2)
+    options.update(kwargs)
+    return ChatOpenAI(http_client=http_client, http_async_client=http_async_client, **options)
+
+
+class AgentService:
+    """The shared chain behind the endpoints, with a cap on questions in flight"""
+
+    def __init__(self, chain, source_type=None, listings=0, max_concurrency=SERVICE_MAX_CONCURRENCY):
+        self.chain = chain
+        self.source_type = source_type
+        self.listings = listings
+        self.max_concurrency = max_concurrency
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+    async def ask(self, question):
+        async with self._slots:
+            return await self.chain.ainvoke(question)
+
+    async def ask_batch(self, questions):
+        """Answers in order; a failed question gives its exception instead of failing the batch"""
+        return await asyncio.gather(*(self.ask(question) for question in questions), return_exceptions=True)
+
+    async def stream(self, question):
+        async with self._slots:
+            async for chunk in self.chain.astream(question):
+                if chunk:
+                    yield chunk
+
+
+def load_service(source_type=SERVICE_SOURCE, file_path=SERVICE_FILE_PATH, sheet_url=DEFAULT_SHEET_URL,
+                 http_clients=None, llm=None):
+    """
+    Build the agent (blocking) and wrap its chain for the service
+
+    Args:
+        http_clients: (sync, async) httpx clients for ChatOpenAI; see make_http_clients
+        llm: Optional chat model replacing ChatOpenAI (tests, load tests)
+    """
+    chain, df, retriever = build_agent(source_type, sheet_url=sheet_url if source_type == 'gsheet' else None,
+                                       file_path=file_path, llm=llm)
+    if llm is None and http_clients is not None:
+        # Same chain as create_agent, with the LLM on the pooled clients
+        chain = build_chain(retriever, llm=make_pooled_llm(*http_clients), answer_cache=get_answer_cache())
+    return AgentService(chain, source_type=source_type, listings=len(df))
+
+
+def _question(value):
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError("question must be a non-empty string")
+    if len(value) > MAX_INPUT_LENGTH:
+        raise ValueError(f"question is longer than {MAX_INPUT_LENGTH} characters")
+    return value.strip()
+
+
+async def _read_json(request):
+    try:
+        body = await request.json()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        raise ValueError("body must be JSON")
+    if not isinstance(body, dict):
+        raise ValueError("body must be a JSON object")
+    return body
+
+
+def _error(status, message):
+    return JSONResponse({'error': message}, status_code=status)
+
+
+async def health(request):
+    service = request.app.state.service
+    return JSONResponse({'status': 'ok', 'source_type': service.source_type, 'listings': service.listings})
+
+
+async def ask(request):
+    try:
+        question = _question((await _read_json(request)).get('question'))
+    except ValueError as e:
+        return _error(400, str(e))
+    start = time.perf_counter()
+    try:
+        answer = await request.app.state.service.ask(question)
+    except Exception as e:
+        return _error(502, f"Error answering question: {e}")
+    return JSONResponse({'answer': answer, 'seconds': round(time.perf_counter() - start, 3)})
+
+
+async def ask_batch(request):
+    try:
+        questions = (await _read_json(request)).get('questions')
+        if not isinstance(questions, list) or not questions:
+            raise ValueError("questions must be a non-empty list")
+        if len(questions) > SERVICE_MAX_BATCH:
+            raise ValueError(f"at most {SERVICE_MAX_BATCH} questions per batch")
+        questions = [_question(question) for question in questions]
+    except ValueError as e:
+        return _error(400, str(e))
+    start = time.perf_counter()
+    answers = await request.app.state.service.ask_batch(questions)
+    results = [
+        {'question': question, 'error': str(answer)} if isinstance(answer, Exception)
+        else {'question': question, 'answer': answer}
+        for question, answer in zip(questions, answers)
+    ]
+    return JSONResponse({'results': results, 'seconds': round(time.perf_counter() - start, 3)})
+
+
+async def ask_stream(request):
+    try:
+        question = _question((await _read_json(request)).get('question'))
+    except ValueError as e:
+        return _error(400, str(e))
+    return StreamingResponse(request.app.state.service.stream(question), media_type='text/plain; charset=utf-8')
+
+
+def create_app(service=None, source_type=SERVICE_SOURCE, file_path=SERVICE_FILE_PATH, sheet_url=DEFAULT_SHEET_URL,
+               llm=None):
+    """
+    Starlette app; the agent is built on startup unless a ready service is given
+
+    Args:
+        service: Prebuilt AgentService (tests, load tests)
+        source_type, file_path, sheet_url: Data source of the agent built on startup
+        llm: Optional chat model replacing ChatOpenAI
+    """
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        if service is not None:
+            yield
+            return
+        http_client, http_async_client = make_http_clients()
+        try:
+            print(f"🚀 Building the {source_type} agent for the API...")
+            app.state.service = await run_in_threadpool(
+                load_service, source_type, file_path, sheet_url, (http_client, http_async_client), llm
+            )
+            print(f"✅ API ready: {app.state.service.listings} listings")
+            yield
+        finally:
+            await http_async_client.aclose()
+            http_client.close()
+
+    app = Starlette(routes=[
+        Route('/health', health, methods=['GET']),
+        Route('/ask', ask, methods=['POST']),
+        Route('/ask/batch', ask_batch, methods=['POST']),
+        Route('/ask/stream', ask_stream, methods=['POST']),
+    ], lifespan=lifespan)
+    if service is not None:
+        app.state.service = service
+    return app
+
+
+# uvicorn api:app
+app = create_app()
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Real estate agent HTTP API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--source', default=SERVICE_SOURCE, choices=['sample', 'csv', 'excel', 'gsheet'])
+    parser.add_argument('--file', default=SERVICE_FILE_PATH, help='csv/excel file of the source')
+    args = parser.parse_args()
+    uvicorn.run(create_app(source_type=args.source, file_path=args.file), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
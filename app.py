@@ -1,17 +1,33 @@
 import os
+import pandas as pd
 import streamlit as st
-from ai_agent import create_agent
-from utils.config import DATABASE_SOURCES, DEFAULT_SHEET_URL
-import time
+from ai_agent import get_shared_agent
+from utils.answer_cache import get_answer_cache
+from utils.config import DATABASE_SOURCES, DEFAULT_SHEET_URL, VECTOR_BACKEND
+from utils.metrics import METRICS, breakdown, start_metrics_server
+from utils.streaming import format_timings, stream_answer
+
+# Fix SQLite version issue for ChromaDB (only for deployment; the numpy backend does not need it)
+if VECTOR_BACKEND == 'chroma':
+    try:
+        import pysqlite3
+        import sys
+        sys.modules['sqlite3'] = pysqlite3
+    except ImportError:
+        # pysqlite3 not available, use system sqlite3 (local development)
+        pass
+
+# /metrics endpoint on 127.0.0.1 (started once per process, METRICS_PORT=0 disables it)
+start_metrics_server()
+
+
+def show_trace(title, trace):
+    """One trace from utils.metrics as a stage table (children indented)"""
+    st.markdown(f"**{title}** · {trace.seconds:.2f}s")
+    table = pd.DataFrame(breakdown(trace))
+    table['stage'] = ['\u2003' * depth + stage for depth, stage in zip(table['depth'], table['stage'])]
+    st.dataframe(table.drop(columns=['depth']), hide_index=True, use_container_width=True)
 
-# Fix SQLite version issue for ChromaDB (only for deployment)
-try:
-    import pysqlite3
-    import sys
-    sys.modules['sqlite3'] = pysqlite3
-except ImportError:
-    # pysqlite3 not available, use system sqlite3 (local development)
-    pass
 
 # Cấu hình trang
 st.set_page_config(page_title="RealEstate AI Agent", layout="wide")
@@ -114,14 +130,21 @@ with st.sidebar:
         else:
             with st.spinner("Đang khởi tạo AI Agent..."):
                 try:
-                    # Create new agent
-                    agent, df = create_agent(
+                    # Reuse the agent another session already built for the same data
+                    lease = get_shared_agent(
                         source_type=selected_source,
                         sheet_url=sheet_url,
                         file_path=file_path
                     )
+                    agent, df, _ = lease.value
+                    
+                    # Give back the previous agent so it can be evicted when unused
+                    previous_lease = st.session_state.get('agent_lease')
+                    if previous_lease is not None:
+                        previous_lease.release()
                     
                     # Store in session state
+                    st.session_state.agent_lease = lease
                     st.session_state.agent = agent
                     st.session_state.data_source = selected_source
                     st.session_state.dataframe = df
@@ -134,6 +157,23 @@ with st.sidebar:
                     if "api_key" in str(e).lower():
                         st.info("💡 Hãy kiểm tra lại OpenAI API Key của bạn")
     
+    # Answer cache hit rate (shared by all sessions)
+    answer_cache = get_answer_cache()
+    if answer_cache is not None and 'agent' in st.session_state:
+        cache_stats = answer_cache.stats()
+        total_questions = cache_stats['hits'] + cache_stats['misses']
+        st.caption(f"💾 Cache câu trả lời: {cache_stats['hits']}/{total_questions} câu hỏi "
+                   f"({cache_stats['hit_rate']:.0%}), {cache_stats['entries']} câu trả lời đã lưu")
+    
+    # Per-stage timings of the last agent build and the last question (all sessions)
+    last_build, last_query = METRICS.last_trace('build'), METRICS.last_trace('query')
+    if last_build is not None or last_query is not None:
+        with st.expander("⏱️ Hiệu năng", expanded=False):
+            if last_build is not None:
+                show_trace("Khởi tạo Agent gần nhất", last_build)
+            if last_query is not None:
+                show_trace("Câu hỏi gần nhất", last_query)
+    
     st.divider()
     
     # Usage Instructions
@@ -174,6 +214,8 @@ else:
     for message in st.session_state.messages:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
+            if message.get("timings"):
+                st.caption(format_timings(message["timings"]))
     
     # Chat input
     if prompt := st.chat_input("Nhập câu hỏi của bạn..."):
@@ -188,25 +230,25 @@ else:
         with st.chat_message("assistant"):
             message_placeholder = st.empty()
             full_response = ""
+            timings = None
             
             try:
-                # Get response from agent
-                response = st.session_state.agent.invoke(prompt)
-                
-                # Simulate streaming response
-                for chunk in response.split():
-                    full_response += chunk + " "
-                    time.sleep(0.05)
-                    message_placeholder.markdown(full_response + "▌")
+                # Stream tokens from the chain as the LLM produces them
+                full_response, timings = stream_answer(
+                    st.session_state.agent,
+                    prompt,
+                    on_update=lambda text: message_placeholder.markdown(text + "▌")
+                )
                 
                 message_placeholder.markdown(full_response)
+                st.caption(format_timings(timings))
                 
             except Exception as e:
                 message_placeholder.error(f"❌ Lỗi: {str(e)}")
                 full_response = f"Xin lỗi, có lỗi xảy ra: {str(e)}"
         
         # Add assistant response to chat history
-        st.session_state.messages.append({"role": "assistant", "content": full_response})
+        st.session_state.messages.append({"role": "assistant", "content": full_response, "timings": timings})
 
 # Footer
 st.divider()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Benchmark: near-duplicate detection (utils.dedup) on synthetic LandSoft exports
+
+Each size is generated with scripts/generate_sample_data.py (copies and
+re-posts at --duplicate-rate) and processed untimed; then
+deduplicate_listings is timed. Seconds per row should stay flat as the
+size grows.
+
+Usage:
+    python benchmarks/bench_dedup.py --rows 10000 100000 1000000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import time_call
+from scripts.generate_sample_data import generate_landsoft_data
+from utils.data_loader import process_landsoft_data
+from utils.dedup import deduplicate_listings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--duplicate-rate', type=float, default=0.03)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'seconds':>8} {'µs/row':>7} {'clusters':>10} {'duplicates':>10} {'largest':>7}")
+    for num_rows in args.rows:
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = process_landsoft_data(generate_landsoft_data(num_rows, seed=args.seed,
+                                                              duplicate_rate=args.duplicate_rate))
+        seconds, (_, stats) = time_call(deduplicate_listings, df)
+        print(f"{num_rows:>10,} {seconds:>8.2f} {seconds / num_rows * 1e6:>7.2f} {stats['clusters']:>10,} "
+              f"{stats['duplicates']:>10,} {stats['largest_cluster']:>7}")
+
+
+if __name__ == "__main__":
+    main()
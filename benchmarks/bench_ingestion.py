@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: peak memory of loading + processing an Excel export in one piece vs in chunks
+
+Peak memory is the tracemalloc peak (Python and NumPy allocations). Embedding
+and the vector store are left out; both modes hand the same (ids, texts,
+metadatas) to them.
+
+Usage:
+    python benchmarks/bench_ingestion.py --rows 10000 40000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from ai_agent import iter_listing_batches, process_data
+from scripts.generate_sample_data import generate_landsoft_data
+from utils.data_loader import process_landsoft_data
+from utils.text_builder import build_listing_metadata
+from utils.vector_sync import make_document_ids
+
+
+def load_in_memory(path):
+    with open(path, 'rb') as f:
+        df = process_data(process_landsoft_data(pd.read_excel(f)), 'excel', verbose=False)
+    return make_document_ids(df), df['text'].tolist(), build_listing_metadata(df)
+
+
+def load_streaming(path, chunk_size):
+    return sum(len(ids) for ids, _, _ in iter_listing_batches('excel', path, chunk_size=chunk_size))
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 40_000])
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'memory (s)':>11} {'peak (MB)':>10} {'streaming (s)':>14} {'peak (MB)':>10}")
+    for num_rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'export.xlsx')
+            generate_landsoft_data(num_rows).to_excel(path, index=False)
+            full_time, full_peak = measure(load_in_memory, path)
+            stream_time, stream_peak = measure(load_streaming, path, args.chunk_size)
+            print(f"{num_rows:>10,} {full_time:>11.2f} {full_peak:>10.0f} {stream_time:>14.2f} {stream_peak:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vectorized process_landsoft_data vs the original row-wise version
+
+Usage:
+    python benchmarks/bench_landsoft_processing.py --rows 10000 100000 1000000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import time_call
+from legacy_reference import legacy_process_landsoft_data
+from scripts.generate_sample_data import generate_landsoft_data
+from utils.data_loader import process_landsoft_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--legacy-max-rows', type=int, default=100_000,
+                        help='Skip the row-wise baseline above this size (it takes minutes at 1M rows)')
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'vectorized (s)':>15} {'row-wise (s)':>13} {'speedup':>8}")
+    for num_rows in args.rows:
+        raw_df = generate_landsoft_data(num_rows)
+        with contextlib.redirect_stdout(io.StringIO()):
+            fast, _ = time_call(process_landsoft_data, raw_df)
+            if num_rows <= args.legacy_max_rows:
+                slow, _ = time_call(legacy_process_landsoft_data, raw_df)
+            else:
+                slow = None
+        if slow is None:
+            print(f"{num_rows:>10,} {fast:>15.2f} {'skipped':>13} {'-':>8}")
+        else:
+            print(f"{num_rows:>10,} {fast:>15.2f} {slow:>13.2f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
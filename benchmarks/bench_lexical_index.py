@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Benchmark: BM25 lexical index build time and query latency
+
+Usage:
+    python benchmarks/bench_lexical_index.py --rows 100000 1000000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.generate_sample_data import generate_landsoft_data
+from utils.data_loader import process_landsoft_data
+from utils.lexical_index import LexicalIndex
+from utils.text_builder import build_listing_texts
+
+QUERIES = [
+    'căn hộ 2pn Quận 7 dưới 5 tỷ',
+    'Võ Văn Tần',
+    'nhà phường 15 Bình Thạnh',
+    'biệt thự hồ bơi',
+    'Quận 1',
+    'nhà hẻm xe hơi 3 phòng ngủ Gò Vấp',
+    'văn phòng cho thuê điều hòa',
+    'đất nền sổ hồng riêng',
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--k', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=20, help='Runs of every query')
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'build (s)':>10} {'terms':>10} {'p50 (ms)':>9} {'p95 (ms)':>9} {'max (ms)':>9}")
+    for num_rows in args.rows:
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = process_landsoft_data(generate_landsoft_data(num_rows))
+        texts = build_listing_texts(df)
+        del df
+
+        index = LexicalIndex(texts)
+        queries = QUERIES + [str(1000 + num_rows // 2)]  # a listing code
+        latencies = []
+        for _ in range(args.repeat):
+            for query in queries:
+                start = time.perf_counter()
+                index.search(query, k=args.k)
+                latencies.append((time.perf_counter() - start) * 1000)
+        p50, p95, worst = np.percentile(latencies, [50, 95, 100])
+        print(f"{num_rows:>10,} {index.build_seconds:>10.2f} {len(index.vocabulary):>10,} "
+              f"{p50:>9.2f} {p95:>9.2f} {worst:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
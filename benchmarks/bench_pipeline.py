@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Benchmark: the whole pipeline, stage by stage, on synthetic LandSoft exports
+
+For each size a LandSoft-shaped export is generated and written to disk
+(untimed), then every stage is timed in order:
+
+    load_data              read the export (CSV or Excel)
+    process_landsoft_data  map LandSoft columns, parse prices, derive fields
+    text_build             process_data: validation and listing texts
+    embedding              embed every listing text
+    vector_index           sync_vector_store into an empty store
+    lexical_index          build the BM25 index
+    retrieval              ListingRetriever.invoke, per query
+    chain_invoke           full chain.invoke (retrieval + prompt + LLM), per query
+
+Embeddings are the deterministic local hashed n-gram embeddings and the LLM
+is a fake chat model with canned answers, so runs need no network and are
+comparable between commits. The vector index is built from the vectors of
+the embedding stage (not re-embedded). Nothing is written outside a temp dir.
+
+Results are printed and, with --output, saved as JSON; --compare prints the
+ratio to an earlier JSON file and exits with status 1 if a stage got slower
+than --tolerance allows.
+
+Usage:
+    python benchmarks/bench_pipeline.py --rows 1000 10000 100000 --output bench.json
+    python benchmarks/bench_pipeline.py --rows 1000 10000 100000 --compare bench.json
+    python benchmarks/bench_pipeline.py --rows 1000000 --dimensions 128 --format csv
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+
+# Parse the export on every run instead of reusing a columnar snapshot
+os.environ.setdefault('SNAPSHOT_CACHE', '0')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+import numpy as np
+import pandas as pd
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from ai_agent import build_chain, process_data
+from benchmarks.common import LookupEmbeddings, make_queries, time_call
+from scripts.generate_sample_data import generate_landsoft_data
+from utils.config import TOP_K_RESULTS
+from utils.data_loader import load_data, process_landsoft_data
+from utils.lexical_index import LexicalIndex
+from utils.local_embeddings import HashedNgramEmbeddings
+from utils.numpy_vector_store import NumpyVectorStore
+from utils.retrieval import ListingRetriever
+from utils.text_builder import build_listing_metadata
+from utils.vector_sync import make_document_ids, sync_vector_store
+
+FAKE_ANSWERS = [
+    "Dựa trên dữ liệu, căn hộ phù hợp nhất nằm ở Quận 7, giá 3 tỷ, 2 phòng ngủ.",
+    "Có 3 sản phẩm phù hợp với yêu cầu của anh/chị, chi tiết như sau.",
+]
+
+
+def write_export(raw, tmp, file_format):
+    if file_format == 'csv':
+        path = os.path.join(tmp, 'export.csv')
+        raw.to_csv(path, index=False)
+    else:
+        path = os.path.join(tmp, 'export.xlsx')
+        raw.to_excel(path, index=False)
+    return path
+
+
+def open_store(backend, embeddings, directory):
+    if backend == 'numpy':
+        return NumpyVectorStore('bench', embeddings, persist_directory=directory)
+    from langchain_community.vectorstores import Chroma
+    return Chroma(collection_name=f"bench_{uuid.uuid4().hex}", embedding_function=embeddings,
+                  persist_directory=directory)
+
+
+def per_query(func, queries):
+    """Time func(query) for every query"""
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        func(query)
+        timings.append(time.perf_counter() - start)
+    timings = np.array(timings)
+    return {
+        'seconds': float(timings.sum()),
+        'queries': len(queries),
+        'mean_ms': float(timings.mean() * 1000),
+        'p50_ms': float(np.percentile(timings, 50) * 1000),
+        'p95_ms': float(np.percentile(timings, 95) * 1000),
+    }
+
+
+def run_pipeline(num_rows, args, tmp):
+    """Timings of every stage for one export size"""
+    directory = os.path.join(tmp, f"rows_{num_rows}")
+    os.makedirs(directory)
+    path = write_export(generate_landsoft_data(num_rows, seed=args.seed), directory, args.format)
+    results = {}
+
+    def row_stage(stage, seconds):
+        results[stage] = {'seconds': seconds, 'rows_per_second': num_rows / seconds if seconds else None}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        seconds, raw = time_call(load_data, args.format, file_path=path)
+        row_stage('load_data', seconds)
+        seconds, processed = time_call(process_landsoft_data, raw)
+        row_stage('process_landsoft_data', seconds)
+        seconds, df = time_call(process_data, processed, 'excel', verbose=False)
+        row_stage('text_build', seconds)
+
+    ids = make_document_ids(df)
+    texts = df['text'].tolist()
+    metadatas = build_listing_metadata(df)
+
+    embedder = HashedNgramEmbeddings(dimensions=args.dimensions)
+    seconds, vectors = time_call(embedder.embed_array, texts)
+    row_stage('embedding', seconds)
+
+    embeddings = LookupEmbeddings(dict(zip(texts, vectors)), embedder)
+    store = open_store(args.vector_backend, embeddings, os.path.join(directory, 'vectors'))
+    with contextlib.redirect_stdout(io.StringIO()):
+        seconds, _ = time_call(sync_vector_store, store, ids, texts, metadatas, model_name=embedder.model_name)
+    row_stage('vector_index', seconds)
+    seconds, lexical_index = time_call(LexicalIndex, df['text'], ids=ids, metadatas=metadatas)
+    row_stage('lexical_index', seconds)
+
+    queries = make_queries(args.queries, seed=args.seed + 1)
+    retriever = ListingRetriever(vector_store=store, lexical_index=lexical_index, k=TOP_K_RESULTS)
+    results['retrieval'] = per_query(retriever.invoke, queries)
+    chain = build_chain(retriever, llm=FakeListChatModel(responses=FAKE_ANSWERS))
+    results['chain_invoke'] = per_query(chain.invoke, queries)
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def headline(metrics):
+    """The number compared between runs: per-query median for query stages, total seconds otherwise"""
+    return ('p50_ms', metrics['p50_ms']) if 'p50_ms' in metrics else ('seconds', metrics['seconds'])
+
+
+def print_results(results):
+    print(f"{'rows':>10} {'stage':<22} {'seconds':>9} {'rows/s':>12} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+    for entry in results:
+        rate = f"{entry['rows_per_second']:,.0f}" if entry.get('rows_per_second') else ''
+        p50 = f"{entry['p50_ms']:.2f}" if 'p50_ms' in entry else ''
+        p95 = f"{entry['p95_ms']:.2f}" if 'p95_ms' in entry else ''
+        print(f"{entry['rows']:>10,} {entry['stage']:<22} {entry['seconds']:>9.3f} {rate:>12} {p50:>9} {p95:>9}")
+
+
+def compare(results, baseline_path, tolerance):
+    """Print current/baseline ratios; returns the (rows, stage) pairs slower than tolerance"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous = {(entry['rows'], entry['stage']): entry for entry in baseline['results']}
+    print(f"\nCompared with {baseline_path} (commit {baseline['meta'].get('commit')}):")
+    print(f"{'rows':>10} {'stage':<22} {'metric':>8} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    regressions = []
+    for entry in results:
+        before = previous.get((entry['rows'], entry['stage']))
+        if before is None:
+            continue
+        metric, current = headline(entry)
+        old = before.get(metric)
+        if not old:
+            continue
+        ratio = current / old
+        flag = '  ⚠️ slower' if ratio > tolerance else ''
+        if ratio > tolerance:
+            regressions.append((entry['rows'], entry['stage']))
+        print(f"{entry['rows']:>10,} {entry['stage']:<22} {metric:>8} {old:>10.3f} {current:>10.3f} {ratio:>7.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 10_000, 100_000])
+    parser.add_argument('--format', choices=['csv', 'excel'], default='csv', help='Export format read by load_data')
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--dimensions', type=int, default=512, help='Embedding size (memory: rows x dimensions x 4 bytes)')
+    parser.add_argument('--vector-backend', choices=['numpy', 'chroma'], default='numpy')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Write results to this JSON file')
+    parser.add_argument('--compare', help='Baseline JSON file from an earlier run')
+    parser.add_argument('--tolerance', type=float, default=1.25, help='Slowdown ratio reported as a regression')
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_rows in args.rows:
+            for stage, metrics in run_pipeline(num_rows, args, tmp).items():
+                results.append({'rows': num_rows, 'stage': stage, **metrics})
+    print_results(results)
+
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'args': vars(args),
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\nSaved results to {args.output}")
+    if args.compare and compare(results, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
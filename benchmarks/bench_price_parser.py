@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Benchmark: shared vectorized price parser vs the previous per-row parsers
+
+Usage:
+    python benchmarks/bench_price_parser.py --rows 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import time_call
+from legacy_reference import legacy_extract_price, legacy_parse_price_text
+from scripts.generate_sample_data import generate_landsoft_data
+from utils.price_parser import parse_prices
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--unique', action='store_true',
+                        help='Make price texts much less repetitive (harder case for the de-duplicating parser)')
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'parser':>24} {'seconds':>8} {'rows/s':>12}")
+    for num_rows in args.rows:
+        price_text = generate_landsoft_data(num_rows)['Tổng giá text']
+        if args.unique:
+            price_text = price_text + ' ' + (price_text.index % 997).astype(str) + ' nghìn'
+
+        runs = [
+            ('parse_prices', lambda: parse_prices(price_text)),
+            ('legacy LandSoft (apply)', lambda: price_text.apply(legacy_parse_price_text)),
+            ('legacy GSheets (apply)', lambda: price_text.apply(legacy_extract_price)),
+        ]
+        for name, run in runs:
+            seconds, _ = time_call(run)
+            print(f"{num_rows:>10,} {name:>24} {seconds:>8.2f} {num_rows / seconds:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Load test: throughput of the async HTTP service (api.py) against concurrency
+
+Two local servers run in background threads:
+
+    stub LLM   an OpenAI-compatible /v1/chat/completions endpoint that answers
+               after --latency seconds (asyncio.sleep), plain or streamed
+    service    api.create_app around a chain over synthetic listings, with
+               ChatOpenAI pointed at the stub through the pooled HTTP clients
+
+The listings are indexed once with the local hashed n-gram embeddings, the
+numpy vector store and BM25, so only the network round trips are measured.
+For every --concurrency level, that many clients send /ask requests
+back to back until --requests have been answered; /ask/batch and
+/ask/stream are timed once at the end.
+
+Usage:
+    python benchmarks/bench_service.py
+    python benchmarks/bench_service.py --latency 0.5 --concurrency 1 8 32 128 --requests 256
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import socket
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'scripts'))
+
+import httpx
+import numpy as np
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from ai_agent import build_chain, process_data
+from api import AgentService, create_app, make_http_clients, make_pooled_llm
+from benchmarks.common import make_queries
+from generate_sample_data import generate_real_estate_data
+from utils.config import TOP_K_RESULTS
+from utils.lexical_index import LexicalIndex
+from utils.local_embeddings import HashedNgramEmbeddings
+from utils.numpy_vector_store import NumpyVectorStore
+from utils.retrieval import ListingRetriever
+from utils.text_builder import build_listing_metadata
+from utils.vector_sync import make_document_ids, sync_vector_store
+
+STUB_ANSWER = "Dựa trên dữ liệu, căn hộ phù hợp nhất nằm ở Quận 7, giá 3 tỷ, 2 phòng ngủ, gần trường học."
+
+
+def make_stub_llm(latency):
+    """OpenAI chat-completions stand-in: fixed answer after `latency` seconds"""
+
+    def completion(model, **fields):
+        return {'id': 'chatcmpl-stub', 'object': 'chat.completion', 'created': int(time.time()), 'model': model,
+                **fields}
+
+    async def chat_completions(request):
+        body = await request.json()
+        prompt_tokens = sum(len(message.get('content') or '') for message in body['messages']) // 4
+        usage = {'prompt_tokens': prompt_tokens, 'completion_tokens': 24, 'total_tokens': prompt_tokens + 24}
+        await asyncio.sleep(latency)
+        if not body.get('stream'):
+            return JSONResponse(completion(body['model'], choices=[{
+                'index': 0, 'finish_reason': 'stop',
+                'message': {'role': 'assistant', 'content': STUB_ANSWER},
+            }], usage=usage))
+
+        async def events():
+            for word in STUB_ANSWER.split(' '):
+                delta = {'content': word + ' '}
+                yield f"data: {json.dumps(completion(body['model'], choices=[{'index': 0, 'delta': delta}]))}\n\n"
+            yield f"data: {json.dumps(completion(body['model'], choices=[], usage=usage))}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type='text/event-stream')
+
+    return Starlette(routes=[Route('/v1/chat/completions', chat_completions, methods=['POST'])])
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def serve_in_thread(app):
+    """Run app on uvicorn in a daemon thread; returns (server, base_url) once it accepts connections"""
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host='127.0.0.1', port=port, log_level='warning',
+                                           backlog=4096, timeout_keep_alive=30))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server, f"http://127.0.0.1:{port}"
+
+
+def build_service(args, llm_url):
+    """AgentService over --rows synthetic listings, with the LLM on the stub"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = process_data(generate_real_estate_data(args.rows, seed=args.seed), 'csv', verbose=False)
+        ids = make_document_ids(df)
+        texts = df['text'].tolist()
+        metadatas = build_listing_metadata(df)
+        embeddings = HashedNgramEmbeddings()
+        store = NumpyVectorStore('bench_service', embeddings)
+        sync_vector_store(store, ids, texts, metadatas, model_name=embeddings.model_name)
+    retriever = ListingRetriever(vector_store=store, lexical_index=LexicalIndex(df['text'], ids=ids, metadatas=metadatas),
+                                 k=TOP_K_RESULTS)
+    http_clients = make_http_clients()
+    llm = make_pooled_llm(*http_clients, base_url=f"{llm_url}/v1", api_key='stub', model='stub')
+    return AgentService(build_chain(retriever, llm=llm), source_type='sample', listings=len(df),
+                        max_concurrency=args.max_concurrency), http_clients
+
+
+async def load_test(url, queries, concurrency, num_requests):
+    """num_requests /ask calls from `concurrency` clients; returns throughput and latency percentiles"""
+    latencies = []
+    errors = 0
+    remaining = iter(range(num_requests))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=120) as client:
+        async def worker():
+            nonlocal errors
+            for i in remaining:
+                start = time.perf_counter()
+                response = await client.post('/ask', json={'question': queries[i % len(queries)]})
+                latencies.append(time.perf_counter() - start)
+                errors += response.status_code != 200
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        seconds = time.perf_counter() - start
+
+    latencies = np.array(latencies)
+    return {
+        'concurrency': concurrency,
+        'requests': num_requests,
+        'errors': errors,
+        'seconds': seconds,
+        'requests_per_second': num_requests / seconds,
+        'p50_ms': float(np.percentile(latencies, 50) * 1000),
+        'p95_ms': float(np.percentile(latencies, 95) * 1000),
+    }
+
+
+async def time_batch_and_stream(url, queries, batch_size):
+    async with httpx.AsyncClient(base_url=url, timeout=120) as client:
+        start = time.perf_counter()
+        response = await client.post('/ask/batch', json={'questions': queries[:batch_size]})
+        batch_seconds = time.perf_counter() - start
+        failed = sum('error' in result for result in response.json()['results'])
+
+        start = time.perf_counter()
+        first_chunk = None
+        async with client.stream('POST', '/ask/stream', json={'question': queries[0]}) as stream:
+            async for _ in stream.aiter_text():
+                if first_chunk is None:
+                    first_chunk = time.perf_counter() - start
+        stream_seconds = time.perf_counter() - start
+    return batch_seconds, failed, first_chunk, stream_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=2_000, help='Synthetic listings indexed by the service')
+    parser.add_argument('--latency', type=float, default=0.2, help='Seconds the stub LLM takes per answer')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 64])
+    parser.add_argument('--requests', type=int, default=128, help='Requests per concurrency level')
+    parser.add_argument('--max-concurrency', type=int, default=64, help='Questions the service answers at once')
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Write results to this JSON file')
+    args = parser.parse_args()
+
+    stub, llm_url = serve_in_thread(make_stub_llm(args.latency))
+    service, (http_client, http_async_client) = build_service(args, llm_url)
+    api_server, url = serve_in_thread(create_app(service=service))
+    queries = make_queries(max(args.requests, args.batch_size), seed=args.seed + 1)
+
+    print(f"Stub LLM latency {args.latency * 1000:.0f} ms, {service.listings:,} listings, "
+          f"service cap {args.max_concurrency} questions\n")
+    print(f"{'concurrency':>11} {'requests':>8} {'errors':>6} {'req/s':>8} {'p50 (ms)':>9} {'p95 (ms)':>9}")
+    results = []
+    try:
+        for concurrency in args.concurrency:
+            result = asyncio.run(load_test(url, queries, concurrency, args.requests))
+            results.append(result)
+            print(f"{concurrency:>11} {result['requests']:>8} {result['errors']:>6} "
+                  f"{result['requests_per_second']:>8.1f} {result['p50_ms']:>9.1f} {result['p95_ms']:>9.1f}")
+
+        batch_seconds, failed, first_chunk, stream_seconds = asyncio.run(
+            time_batch_and_stream(url, queries, args.batch_size))
+        print(f"\n/ask/batch  {args.batch_size} questions in {batch_seconds:.2f}s ({failed} failed)")
+        print(f"/ask/stream first chunk after {first_chunk * 1000:.0f} ms, done after {stream_seconds * 1000:.0f} ms")
+    finally:
+        api_server.should_exit = stub.should_exit = True
+        http_client.close()
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'args': vars(args), 'results': results,
+                       'batch_seconds': batch_seconds, 'stream_first_chunk_seconds': first_chunk},
+                      f, ensure_ascii=False, indent=2)
+        print(f"\nSaved results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
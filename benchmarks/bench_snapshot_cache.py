@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold (parse + process) vs warm (memory-mapped snapshot) LandSoft Excel load
+
+Usage:
+    python benchmarks/bench_snapshot_cache.py --rows 10000 100000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import time_call
+from scripts.generate_sample_data import generate_landsoft_data
+from utils.data_loader import load_landsoft_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'file (MB)':>10} {'cold (s)':>9} {'warm (s)':>9} {'speedup':>8}")
+    for num_rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'export.xlsx')
+            generate_landsoft_data(num_rows).to_excel(path, index=False)
+            snapshot_dir = os.path.join(tmp, 'snapshots')
+            with contextlib.redirect_stdout(io.StringIO()):
+                cold, _ = time_call(load_landsoft_file, path, snapshot_dir=snapshot_dir)
+                warm, _ = time_call(load_landsoft_file, path, snapshot_dir=snapshot_dir, repeat=3)
+            size = os.path.getsize(path) / 1e6
+            print(f"{num_rows:>10,} {size:>10.1f} {cold:>9.2f} {warm:>9.3f} {cold / warm:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
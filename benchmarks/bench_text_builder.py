@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: build_listing_texts vs df.apply(create_detailed_text_embedding, axis=1)
+
+Usage:
+    python benchmarks/bench_text_builder.py --rows 100000 1000000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import time_call
+from legacy_reference import legacy_listing_texts
+from scripts.generate_sample_data import generate_landsoft_data
+from utils.data_loader import process_landsoft_data
+from utils.text_builder import build_listing_texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'column-wise (s)':>16} {'row-wise (s)':>13} {'speedup':>8}")
+    for num_rows in args.rows:
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = process_landsoft_data(generate_landsoft_data(num_rows))
+        fast, texts = time_call(build_listing_texts, df, repeat=args.repeat)
+        slow, expected = time_call(legacy_listing_texts, df)
+        assert texts.tolist() == expected.tolist(), "column-wise texts differ from the row-wise builder"
+        print(f"{num_rows:>10,} {fast:>16.3f} {slow:>13.2f} {slow / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark: NumPy brute-force vector store vs Chroma (SQLite + HNSW)
+
+Both stores index the same vectors: synthetic listings embedded once with the
+local hashed n-gram embeddings and served from a lookup table, so embedding
+time is left out. Reported per store: build time, p50/p95 latency of single
+queries (unfiltered and with a district filter), time per query in batches,
+and recall@k against the exact top-k.
+
+Usage:
+    python benchmarks/bench_vector_store.py --rows 10000 50000 --queries 200
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from ai_agent import process_data
+from benchmarks.common import LookupEmbeddings, make_queries
+from scripts.generate_sample_data import generate_landsoft_data
+from utils.data_loader import process_landsoft_data
+from utils.local_embeddings import HashedNgramEmbeddings
+from utils.numpy_vector_store import NumpyVectorStore
+from utils.text_builder import build_listing_metadata
+from utils.vector_sync import make_document_ids
+
+
+def add_in_batches(store, ids, texts, metadatas, batch_size=1000):
+    for start in range(0, len(ids), batch_size):
+        end = start + batch_size
+        store.add_texts(texts[start:end], metadatas=metadatas[start:end], ids=ids[start:end])
+
+
+def latencies(search, queries):
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        search(query)
+        timings.append(time.perf_counter() - start)
+    return np.percentile(timings, 50) * 1000, np.percentile(timings, 95) * 1000
+
+
+def recall(results, exact):
+    return np.mean([len(set(found) & set(truth)) / len(truth) for found, truth in zip(results, exact)])
+
+
+def run(num_rows, num_queries, k, tmp):
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = process_data(process_landsoft_data(generate_landsoft_data(num_rows)), 'excel', verbose=False)
+    ids = make_document_ids(df)
+    texts = df['text'].tolist()
+    metadatas = [{**metadata, 'id': doc_id} for doc_id, metadata in zip(ids, build_listing_metadata(df))]
+    queries = make_queries(num_queries)
+    where = {'district_key': {'$in': [metadatas[0]['district_key']]}}
+
+    local = HashedNgramEmbeddings()
+    table = dict(zip(texts, local.embed_array(texts).tolist()))
+    table.update(zip(queries, local.embed_array(queries).tolist()))
+    embeddings = LookupEmbeddings(table, local)
+
+    # Exact top-k by cosine similarity
+    matrix = np.array([table[text] for text in texts], dtype=np.float32)
+    query_matrix = np.array([table[query] for query in queries], dtype=np.float32)
+    exact = [[ids[i] for i in np.argsort(-scores, kind='stable')[:k]] for scores in query_matrix @ matrix.T]
+
+    from langchain_community.vectorstores import Chroma
+
+    rows = []
+    for name in ('numpy', 'chroma'):
+        start = time.perf_counter()
+        if name == 'numpy':
+            store = NumpyVectorStore('bench', embeddings, persist_directory=os.path.join(tmp, f'numpy_{num_rows}'))
+            add_in_batches(store, ids, texts, metadatas)
+            store.flush()
+        else:
+            store = Chroma(collection_name=f"bench_{uuid.uuid4().hex}", embedding_function=embeddings,
+                           persist_directory=os.path.join(tmp, f'chroma_{num_rows}'))
+            add_in_batches(store, ids, texts, metadatas)
+        build = time.perf_counter() - start
+
+        p50, p95 = latencies(lambda query: store.similarity_search(query, k=k), queries)
+        f50, f95 = latencies(lambda query: store.similarity_search(query, k=k, filter=where), queries)
+
+        start = time.perf_counter()
+        if name == 'numpy':
+            results = store.similarity_search_batch(queries, k=k)
+        else:
+            response = store._collection.query(query_embeddings=query_matrix.tolist(), n_results=k)
+            results = response['ids']
+        batch_ms = (time.perf_counter() - start) / len(queries) * 1000
+        found = [[document.id for document in documents] for documents in results] if name == 'numpy' else results
+
+        rows.append((name, build, p50, p95, f50, f95, batch_ms, recall(found, exact)))
+        if name == 'chroma':
+            store.delete_collection()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 50_000])
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--k', type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'store':>7} {'build (s)':>10} {'p50 (ms)':>9} {'p95 (ms)':>9} "
+          f"{'filtered p50':>13} {'p95':>7} {'batched (ms/q)':>15} {f'recall@{args.k}':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for num_rows in args.rows:
+            for name, build, p50, p95, f50, f95, batch_ms, hit_rate in run(num_rows, args.queries, args.k, tmp):
+                print(f"{num_rows:>8,} {name:>7} {build:>10.2f} {p50:>9.2f} {p95:>9.2f} "
+                      f"{f50:>13.2f} {f95:>7.2f} {batch_ms:>15.3f} {hit_rate:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
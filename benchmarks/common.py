@@ -0,0 +1,52 @@
+"""
+Shared helpers for the benchmarks: timing, lookup embeddings and queries
+
+Synthetic exports come from scripts/generate_sample_data.py, the row-wise
+baselines from legacy_reference.py (shared with the equivalence tests).
+"""
+
+import os
+import sys
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.generate_sample_data import DESCRIPTIONS, DISTRICTS
+
+
+def time_call(func, *args, repeat=1, **kwargs):
+    """Best wall-clock time in seconds over `repeat` runs, plus the last result"""
+    import time
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+class LookupEmbeddings(Embeddings):
+    """Precomputed vectors by text (computed with `fallback` on a miss), so stores are timed without embedding"""
+
+    def __init__(self, table, fallback):
+        self.table = table
+        self.fallback = fallback
+
+    def embed_documents(self, texts):
+        missing = [text for text in texts if text not in self.table]
+        if missing:
+            self.table.update(zip(missing, self.fallback.embed_documents(missing)))
+        return [self.table[text] for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def make_queries(num_queries, seed=1):
+    """Listing-style questions: a description plus a district"""
+    rng = np.random.default_rng(seed)
+    return [f"{DESCRIPTIONS[rng.integers(len(DESCRIPTIONS))]} {DISTRICTS[rng.integers(len(DISTRICTS))]}"
+            for _ in range(num_queries)]
@@ -0,0 +1,8 @@
+"""
+pytest setup shared by the test scripts
+"""
+
+import os
+
+# Tests parse their inputs every time instead of writing columnar snapshots into snapshot_cache/
+os.environ.setdefault('SNAPSHOT_CACHE', '0')
@@ -0,0 +1,95 @@
+"""
+Row-wise reference implementations, as they were before vectorization
+
+The equivalence tests compare the vectorized code against these, and the
+benchmarks time them as baselines. Nothing in the application imports them.
+"""
+
+import re
+from datetime import datetime
+
+import pandas as pd
+
+from utils.data_loader import determine_property_type, extract_amenities, extract_bedrooms
+
+
+def legacy_parse_price_text(price_text):
+    """LandSoft price parser before the shared vectorized engine (three re.search per row)"""
+    if pd.isna(price_text) or price_text == 'Thương lượng':
+        return 0
+    price_text = str(price_text).strip()
+    if 'thương lượng' in price_text.lower() or price_text == '':
+        return 0
+    total_price = 0
+    billion_match = re.search(r'(\d+(?:\.\d+)?)\s*tỷ', price_text, re.IGNORECASE)
+    if billion_match:
+        total_price += float(billion_match.group(1)) * 1000000000
+    million_match = re.search(r'(\d+(?:\.\d+)?)\s*triệu', price_text, re.IGNORECASE)
+    if million_match:
+        total_price += float(million_match.group(1)) * 1000000
+    thousand_match = re.search(r'(\d+(?:\.\d+)?)\s*nghìn', price_text, re.IGNORECASE)
+    if thousand_match:
+        total_price += float(thousand_match.group(1)) * 1000
+    return int(total_price) if total_price > 0 else 0
+
+
+def legacy_extract_price(price_text):
+    """Google Sheets price parser before the shared engine (first digit group only)"""
+    if pd.isna(price_text):
+        return 0
+    numbers = re.findall(r'[\d,]+', str(price_text))
+    if numbers:
+        return int(numbers[0].replace(',', ''))
+    return 0
+
+
+def legacy_process_landsoft_data(df):
+    """process_landsoft_data as it was before vectorization (row-wise apply)"""
+    processed_df = df.copy()
+    column_mapping = {
+        'Gallery': 'id', 'Mã sản phẩm': 'product_id', 'Nhu cầu': 'transaction_type', 'Số nhà': 'house_number',
+        'Loại đường': 'street_type', 'Tên đường': 'street_name', 'Xã/Phường': 'ward', 'Quận/huyện': 'district',
+        'Ngang XD': 'width', 'Dài XD': 'length', 'Diện tích': 'area', 'Tổng giá text': 'price_text',
+        'Hướng': 'direction', 'Chủ nhà': 'owner', 'Điện thoại': 'phone', 'Diễn giải': 'description',
+        'Ngày ĐK': 'registration_date', 'Ngày cập nhật': 'update_date', 'Tỷ lệ MG': 'commission_rate',
+        'CV môi giới': 'agent_name', 'CV đăng tin': 'posted_by'
+    }
+    processed_df = processed_df.rename(columns=column_mapping)
+    if 'id' not in processed_df.columns:
+        if 'product_id' in processed_df.columns:
+            processed_df['id'] = processed_df['product_id'].fillna('SP') + '_' + processed_df.index.astype(str)
+        else:
+            processed_df['id'] = 'SP_' + processed_df.index.astype(str)
+    processed_df['address'] = processed_df.apply(
+        lambda row: f"{row.get('house_number', '')} {row.get('street_name', '')}, {row.get('ward', '')}, {row.get('district', '')}".strip(),
+        axis=1
+    )
+    processed_df['address'] = processed_df['address'].apply(
+        lambda x: 'N/A' if not x or x.strip() in [',', ''] else x
+    )
+    if 'price_text' in processed_df.columns:
+        processed_df['price'] = processed_df['price_text'].apply(legacy_parse_price_text)
+    elif 'price' not in processed_df.columns:
+        processed_df['price'] = 0
+    processed_df['type'] = processed_df.apply(determine_property_type, axis=1)
+    processed_df['bedrooms'] = processed_df['description'].apply(extract_bedrooms)
+    processed_df['legal_status'] = 'Sổ hồng'
+    processed_df['amenities'] = processed_df['description'].apply(extract_amenities)
+    if 'transaction_type' in processed_df.columns:
+        processed_df['status'] = processed_df['transaction_type'].apply(
+            lambda x: 'available' if x == 'Cần bán' else 'for_rent' if x == 'Cho thuê' else 'available'
+        )
+    else:
+        processed_df['status'] = 'available'
+    processed_df['posted_date'] = processed_df['registration_date'].apply(
+        lambda x: x.strftime('%Y-%m-%d') if pd.notna(x) and hasattr(x, 'strftime') else
+                 (x if pd.notna(x) and isinstance(x, str) else datetime.now().strftime('%Y-%m-%d'))
+    )
+    return processed_df
+
+
+def legacy_listing_texts(df):
+    """Listing texts as load_and_process_data built them before build_listing_texts (row-wise apply)"""
+    from ai_agent import create_detailed_text_embedding
+
+    return df.apply(create_detailed_text_embedding, axis=1)
@@ -0,0 +1,177 @@
+# scripts/batch_questions.py
+"""
+Answer a JSONL file of questions with one agent, several at a time
+
+Each input line is {"id": ..., "question": ...} (other fields are copied to
+the output) or a bare JSON string; lines without an id are numbered from 1.
+The agent is built once with create_agent and the questions go through
+chain.batch_as_completed with max_concurrency, so at most that many LLM
+calls are in flight. Every answer is appended to the output as soon as it is
+ready:
+
+    {"id", "question", "answer", "listing_ids", "latency_seconds"}
+    {"id", "question", "error", "listing_ids", "latency_seconds"}
+
+Re-running with the same output resumes: questions already answered there are
+skipped, failed ones are asked again (the last line of an id wins).
+
+Usage:
+    python scripts/batch_questions.py profiles.jsonl
+    python scripts/batch_questions.py profiles.jsonl --output shortlists.jsonl --source excel \\
+        --file data/export.xlsx --max-concurrency 16
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.config import BATCH_MAX_CONCURRENCY, DEFAULT_SHEET_URL
+
+
+def read_questions(path):
+    """Input items as dicts with 'id' and 'question'; raises ValueError on a bad line"""
+    items, seen = [], set()
+    with open(path, encoding='utf-8') as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{number}: invalid JSON ({e})")
+            if isinstance(item, str):
+                item = {'question': item}
+            if not isinstance(item, dict) or not isinstance(item.get('question'), str) or not item['question'].strip():
+                raise ValueError(f"{path}:{number}: expected a question string or an object with 'question'")
+            item.setdefault('id', number)
+            if item['id'] in seen:
+                raise ValueError(f"{path}:{number}: duplicate id {item['id']!r}")
+            seen.add(item['id'])
+            items.append(item)
+    return items
+
+
+def answered_ids(path):
+    """
+    Ids with an answer in an earlier output file
+
+    A line cut short by a crash is removed, so new results start on a line
+    of their own.
+    """
+    if not os.path.exists(path):
+        return set()
+    with open(path, 'rb+') as f:
+        data = f.read()
+        complete = data.rfind(b'\n') + 1
+        if complete < len(data):
+            f.truncate(complete)
+    status = {}
+    for line in data[:complete].decode('utf-8').splitlines():
+        if line.strip():
+            record = json.loads(line)
+            status[record['id']] = 'answer' in record
+    return {item_id for item_id, answered in status.items() if answered}
+
+
+class ItemRecorder(BaseCallbackHandler):
+    """Listing ids retrieved and wall-clock latency of one chain run"""
+
+    run_inline = True
+
+    def __init__(self):
+        self.listing_ids = []
+        self.latency_seconds = None
+        self._root = None
+        self._start = None
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, **kwargs):
+        if parent_run_id is None and self._root is None:
+            self._root, self._start = run_id, time.perf_counter()
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        if run_id == self._root:
+            self.latency_seconds = round(time.perf_counter() - self._start, 4)
+
+    on_chain_error = on_chain_end
+
+    def on_retriever_end(self, documents, **kwargs):
+        self.listing_ids.extend(document.metadata.get('id', document.id) for document in documents)
+
+
+def run_questions(chain, items, output_path, max_concurrency=BATCH_MAX_CONCURRENCY, progress_every=50):
+    """
+    Ask every item not yet answered in output_path, appending results as they finish
+
+    Args:
+        chain: Agent chain (see create_agent)
+        items: From read_questions
+        output_path: JSONL file appended to (resumed if it exists)
+        max_concurrency: Questions answered at the same time
+
+    Returns:
+        {'skipped', 'answered', 'failed', 'seconds'}
+    """
+    done = answered_ids(output_path)
+    pending = [item for item in items if item['id'] not in done]
+    summary = {'skipped': len(items) - len(pending), 'answered': 0, 'failed': 0, 'seconds': 0.0}
+    if not pending:
+        return summary
+
+    recorders = [ItemRecorder() for _ in pending]
+    configs = [{'callbacks': [recorder], 'max_concurrency': max_concurrency} for recorder in recorders]
+    start = time.perf_counter()
+    with open(output_path, 'a', encoding='utf-8') as out:
+        results = chain.batch_as_completed([item['question'] for item in pending], configs, return_exceptions=True)
+        for count, (index, result) in enumerate(results, start=1):
+            item, recorder = pending[index], recorders[index]
+            record = dict(item)
+            if isinstance(result, Exception):
+                record['error'] = f"{type(result).__name__}: {result}"
+                summary['failed'] += 1
+            else:
+                record['answer'] = result
+                summary['answered'] += 1
+            record['listing_ids'] = recorder.listing_ids
+            record['latency_seconds'] = recorder.latency_seconds
+            out.write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+            out.flush()
+            if progress_every and count % progress_every == 0:
+                print(f"⏳ {count}/{len(pending)} questions ({time.perf_counter() - start:.1f}s)")
+    summary['seconds'] = time.perf_counter() - start
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Answer a JSONL file of questions with the agent")
+    parser.add_argument('input', help='JSONL file of questions')
+    parser.add_argument('--output', help='JSONL answers (default: <input>.answers.jsonl)')
+    parser.add_argument('--source', default='sample', choices=['sample', 'csv', 'excel', 'gsheet'])
+    parser.add_argument('--file', help='csv/excel file of the source')
+    parser.add_argument('--sheet-url', default=DEFAULT_SHEET_URL)
+    parser.add_argument('--max-concurrency', type=int, default=BATCH_MAX_CONCURRENCY)
+    args = parser.parse_args()
+    output = args.output or os.path.splitext(args.input)[0] + '.answers.jsonl'
+
+    from ai_agent import create_agent
+
+    items = read_questions(args.input)
+    print(f"📋 {len(items)} questions from {args.input}")
+    chain, df = create_agent(args.source, sheet_url=args.sheet_url if args.source == 'gsheet' else None,
+                             file_path=args.file)
+    print(f"✅ Agent ready with {len(df)} listings")
+
+    summary = run_questions(chain, items, output, max_concurrency=args.max_concurrency)
+    print(f"✅ {summary['answered']} answered, {summary['failed']} failed, {summary['skipped']} already done "
+          f"in {summary['seconds']:.1f}s -> {output}")
+    if summary['failed']:
+        print("⚠️ Run the same command again to retry the failed questions")
+
+
+if __name__ == "__main__":
+    main()
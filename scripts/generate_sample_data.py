@@ -1,139 +1,469 @@
 # scripts/generate_sample_data.py
-import pandas as pd
-import random
-from faker import Faker
+"""
+Synthetic real estate data, vectorized with NumPy (millions of rows in seconds)
+
+Two layouts:
+- cleaned: the schema of data/sample_real_estate.csv (id, type, district, ...)
+- landsoft: the raw LandSoft export columns ('Gallery', 'Tổng giá text',
+  'Diễn giải', 'Quận/huyện', ...) with the price text formats seen in real
+  exports and a share of duplicated / re-posted listings
+
+Usage:
+    python scripts/generate_sample_data.py                                  # 30 cleaned rows -> data/
+    python scripts/generate_sample_data.py --rows 1000000 --layout landsoft --output-dir /tmp/load
+    python scripts/generate_sample_data.py --rows 50000 --layout both --format xlsx --seed 7
+"""
+
+import argparse
 import os
+import time
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+# Real Ho Chi Minh City districts and wards
+DISTRICT_WARDS = {
+    'Quận 1': ['Phường Bến Nghé', 'Phường Bến Thành', 'Phường Cầu Kho', 'Phường Cầu Ông Lãnh',
+               'Phường Đa Kao', 'Phường Nguyễn Cư Trinh', 'Phường Nguyễn Thái Bình', 'Phường Phạm Ngũ Lão',
+               'Phường Tân Định'],
+    'Quận 3': ['Phường 1', 'Phường 2', 'Phường 3', 'Phường 4', 'Phường 5', 'Phường 6', 'Phường 7', 'Phường 8', 'Phường 9', 'Phường 10', 'Phường 11', 'Phường 12', 'Phường 13', 'Phường 14'],
+    'Quận 7': ['Phường Bình Thuận', 'Phường Phú Mỹ', 'Phường Phú Thuận', 'Phường Tân Hưng',
+               'Phường Tân Kiểng', 'Phường Tân Phong', 'Phường Tân Phú', 'Phường Tân Quy', 'Phường Tân Thuận Đông', 'Phường Tân Thuận Tây'],
+    'Quận Bình Thạnh': ['Phường 1', 'Phường 2', 'Phường 3', 'Phường 5', 'Phường 6', 'Phường 7', 'Phường 11', 'Phường 12', 'Phường 13', 'Phường 14', 'Phường 15', 'Phường 17', 'Phường 19', 'Phường 21', 'Phường 22', 'Phường 24', 'Phường 25', 'Phường 26', 'Phường 27', 'Phường 28'],
+    'Quận Gò Vấp': ['Phường 1', 'Phường 3', 'Phường 4', 'Phường 5', 'Phường 6', 'Phường 7', 'Phường 8', 'Phường 9', 'Phường 10', 'Phường 11', 'Phường 12', 'Phường 13', 'Phường 14', 'Phường 15', 'Phường 16', 'Phường 17'],
+    'Quận Thủ Đức': ['Phường An Khánh', 'Phường An Lạc', 'Phường An Lạc A', 'Phường An Phú', 'Phường Bình Chiểu', 'Phường Bình Thọ', 'Phường Hiệp Bình Chánh', 'Phường Hiệp Bình Phước', 'Phường Linh Chiểu', 'Phường Linh Đông', 'Phường Linh Tây', 'Phường Linh Trung', 'Phường Linh Xuân', 'Phường Long Bình', 'Phường Long Phước', 'Phường Long Thạnh Mỹ', 'Phường Long Trường', 'Phường Phú Hữu', 'Phường Phước Bình', 'Phường Phước Long A', 'Phường Phước Long B', 'Phường Tam Bình', 'Phường Tam Phú', 'Phường Tăng Nhơn Phú A', 'Phường Tăng Nhơn Phú B', 'Phường Tân Phú', 'Phường Trường Thạnh', 'Phường Trường Thọ']
+}
+DISTRICTS = list(DISTRICT_WARDS)
+CENTRAL_DISTRICTS = ['Quận 1', 'Quận 3']
+INNER_DISTRICTS = ['Quận 7', 'Quận Bình Thạnh']
+
+PROPERTY_TYPES = ['Căn hộ', 'Nhà phố', 'Biệt thự', 'Shophouse', 'Văn phòng']
+
+# (giá tỷ min, max, diện tích min, max, phòng ngủ min, max) theo loại hình và khu vực (trung tâm, nội thành, còn lại)
+PRICE_AREA_BEDROOMS = {
+    'Căn hộ': [(8, 25, 60, 120, 1, 3), (5, 15, 70, 130, 1, 3), (3, 10, 65, 110, 1, 3)],
+    'Nhà phố': [(30, 80, 100, 200, 3, 5), (20, 50, 120, 250, 3, 5), (15, 35, 100, 200, 3, 5)],
+    'Biệt thự': [(50, 150, 200, 400, 4, 6)] * 3,
+    'Shophouse': [(25, 60, 150, 300, 2, 4)] * 3,
+    'Văn phòng': [(10, 30, 80, 200, 0, 0)] * 3,
+}
+
+# Realistic property descriptions
+DESCRIPTIONS = [
+    "Căn hộ cao cấp với thiết kế hiện đại, view đẹp, tiện ích đầy đủ. Vị trí thuận lợi, giao thông thuận tiện.",
+    "Nhà phố mặt tiền đường lớn, kinh doanh tốt, phù hợp mở shop hoặc văn phòng. Diện tích sử dụng rộng rãi.",
+    "Biệt thự sang trọng với thiết kế độc đáo, sân vườn rộng, không gian sống thoáng đãng. An ninh 24/7.",
+    "Shophouse mới xây, thiết kế đẹp, vị trí đắc địa. Phù hợp kinh doanh hoặc cho thuê văn phòng.",
+    "Căn hộ trung cấp giá tốt, tiện ích cơ bản đầy đủ. Phù hợp gia đình trẻ, sinh viên.",
+    "Nhà phố hẻm xe hơi, yên tĩnh, an ninh tốt. Gần trường học, bệnh viện, siêu thị.",
+    "Căn hộ view sông, không khí trong lành. Thiết kế tối ưu, tiết kiệm năng lượng.",
+    "Biệt thự mini với sân thượng rộng, view thành phố. Phù hợp gia đình nhỏ.",
+    "Văn phòng cho thuê tại tòa nhà văn phòng cao cấp. Vị trí trung tâm, giao thông thuận tiện.",
+    "Căn hộ studio giá rẻ, phù hợp người độc thân hoặc sinh viên. Gần trường đại học."
+]
+
+# Realistic amenities
+AMENITIES = [
+    "Hồ bơi, Gym, An ninh 24/7",
+    "Thang máy, Chỗ đậu xe, Sân chơi trẻ em",
+    "Gần trường học, Siêu thị, Bệnh viện",
+    "Công viên gần đó, Nhà hàng, Cafe",
+    "Trung tâm thương mại, Bến xe buýt, Metro",
+    "Sân tennis, BBQ area, Garden",
+    "Gym, Spa, Restaurant",
+    "Playground, Library, Business center",
+    "Swimming pool, Sauna, Conference room",
+    "Parking, Security, Maintenance"
+]
+
+STREETS = ['Nguyễn Huệ', 'Lê Lợi', 'Đồng Khởi', 'Pasteur', 'Võ Văn Tần',
+           'Nguyễn Thị Minh Khai', 'Cách Mạng Tháng 8', '3 Tháng 2',
+           'Lý Tự Trọng', 'Nam Kỳ Khởi Nghĩa', 'Điện Biên Phủ', 'Võ Thị Sáu']
+DIRECTIONS = ['Đông', 'Tây', 'Nam', 'Bắc', 'Đông Nam', 'Tây Nam', 'Đông Bắc', 'Tây Bắc']
+LEGAL_STATUSES = ['Sổ hồng', 'Sổ đỏ', 'Hợp đồng mua bán', 'Đang hoàn thiện pháp lý']
+STATUSES = ['available', 'pending', 'sold']
+
+# LandSoft-only values
+OWNER_TITLES = ['Anh', 'Chị', 'Cô', 'Chú', 'Ông', 'Bà']
+OWNER_NAMES = ['Trung', 'Lan', 'Hùng', 'Mai', 'Tuấn', 'Hoa', 'Dũng', 'Thảo', 'Minh', 'Ngọc']
+AGENTS = ['Mạch Hồng Ngọc', 'Trần Văn Thiện', 'Nguyễn Thị Hạnh', 'Lê Quốc Bảo', 'Phạm Minh Tâm']
+PHONE_PREFIXES = ['090', '091', '093', '097', '098', '032', '070', '077', '083']
+LISTING_FEATURES = ['hồ bơi', 'gym', 'thang máy', 'sân thượng', 'ban công', 'bãi xe', 'an ninh 24/7',
+                    'nhà bếp', 'phòng khách rộng', 'sổ hồng riêng', 'hẻm xe hơi', 'điều hòa']
+LANDSOFT_COLUMNS = ['Gallery', 'Nhu cầu', 'Số nhà', 'Mã sản phẩm', 'Loại đường', 'Tên đường', 'Xã/Phường',
+                    'Quận/huyện', 'Ngang XD', 'Dài XD', 'Diện tích', 'Tổng giá text', 'Hướng', 'Chủ nhà',
+                    'Điện thoại', 'Diễn giải', 'Ngày ĐK', 'Ngày cập nhật', 'Tỷ lệ MG', 'CV môi giới',
+                    'CV đăng tin']
+
+# Tỷ lệ các kiểu ghi giá trong Tổng giá text (giá bán)
+SALE_PRICE_FORMATS = {
+    'ty_trieu': 0.35,     # '6 tỷ  500 triệu' (LandSoft puts two spaces before triệu)
+    'ty': 0.2,            # '12 tỷ'
+    'ty_decimal': 0.2,    # '4.2 tỷ' / '4,5 tỷ'
+    'trieu': 0.1,         # '6500 triệu'
+    'digits': 0.05,       # '6.500.000.000'
+    'negotiable': 0.1,    # 'Thương lượng' / 'Thỏa thuận' / 'TL'
+}
+NEGOTIABLE_TEXTS = ['Thương lượng', 'Thương lượng', 'Thỏa thuận', 'TL']
+
+# Excel giới hạn 1.048.576 dòng mỗi sheet (kể cả dòng tiêu đề)
+XLSX_MAX_ROWS = 1_048_575
+FIRST_PRODUCT_CODE = 19194
+LANDSOFT_END_DATE = '2025-09-30'
+
+TEXT = np.dtypes.StringDType()
+
+
+def _pick(rng, options, size, p=None):
+    return np.asarray(options, dtype=object)[rng.choice(len(options), size=size, p=p)]
+
+
+def _text(values):
+    """Array (numbers, strings) as NumPy variable-width strings; str scalars pass through"""
+    return values if isinstance(values, str) else np.asarray(values).astype(TEXT)
+
+
+def _join(*parts):
+    """Element-wise string concatenation of arrays / scalars (np.strings, no Python loop)"""
+    return reduce(np.strings.add, map(_text, parts))
+
+
+def _format_codes(codes, format_unique):
+    """
+    Texts for integer codes, formatting each distinct code once
+
+    Most generated columns have few distinct values (a price, a district, a
+    street), so formatting the unique codes and indexing back is much cheaper
+    than building a million strings.
+    """
+    unique, inverse = np.unique(codes, return_inverse=True)
+    return np.asarray(format_unique(unique)).astype(object)[inverse]
+
+
+def _with_missing(rng, values, rate):
+    """Object array with about rate of the values replaced by None"""
+    values = np.asarray(values).astype(object)
+    values[rng.random(len(values)) < rate] = None
+    return values
+
+
+def _locations(rng, size):
+    """District and ward indices; wards are drawn from each district's own list"""
+    district_index = rng.integers(0, len(DISTRICTS), size)
+    ward_index = (rng.random(size) * WARD_COUNTS[district_index]).astype(np.int64) + WARD_OFFSETS[district_index]
+    return district_index, ward_index
+
+
+def _prices_areas_bedrooms(rng, type_index, district_index):
+    """Price (VND), area (m²) and bedrooms by property type and district tier"""
+    bounds = BOUNDS[type_index, DISTRICT_TIERS[district_index]]
+    price = rng.integers(bounds[:, 0], bounds[:, 1] + 1) * 1_000_000_000
+    area = rng.integers(bounds[:, 2], bounds[:, 3] + 1)
+    bedrooms = rng.integers(bounds[:, 4], bounds[:, 5] + 1)
+    return price, area, bedrooms
+
+
+def _dates(rng, size, days_back, end=None):
+    """datetime64[D] dates up to days_back days before end (default: today)"""
+    end = np.datetime64(end or pd.Timestamp.today().date(), 'D')
+    return end - rng.integers(0, days_back + 1, size).astype('timedelta64[D]')
+
+
+def _addresses(codes):
+    """'77 Pasteur, Phường Bến Nghé, Quận 1, TP.HCM' from (number, street, ward) codes"""
+    codes, ward = np.divmod(codes, len(WARD_NAMES))
+    number, street = np.divmod(codes, len(STREETS))
+    return _join(number, ' ', STREET_NAMES[street], ', ', WARD_NAMES[ward], ', ', WARD_DISTRICTS[ward], ', TP.HCM')
+
+
+def generate_real_estate_data(num_records=30, seed=None):
+    """
+    Listings in the cleaned schema of data/sample_real_estate.csv
+
+    Args:
+        num_records: Number of rows
+        seed: Random seed (None = different data every run)
+    """
+    rng = np.random.default_rng(seed)
+    type_index = rng.integers(0, len(PROPERTY_TYPES), num_records)
+    district_index, ward_index = _locations(rng, num_records)
+    price, area, bedrooms = _prices_areas_bedrooms(rng, type_index, district_index)
+    number = rng.integers(1, 201, num_records)
+    street = rng.integers(0, len(STREETS), num_records)
+    posted = _dates(rng, num_records, days_back=183)
+
+    return pd.DataFrame({
+        'id': _join('SP', np.strings.zfill(_text(np.arange(1, num_records + 1)), 3)).astype(object),
+        'type': TYPE_NAMES[type_index],
+        'district': DISTRICT_NAMES[district_index],
+        'ward': WARD_NAMES[ward_index],
+        'address': _format_codes((number * len(STREETS) + street) * len(WARD_NAMES) + ward_index, _addresses),
+        'price': price,
+        'area': area,
+        'bedrooms': bedrooms,
+        'direction': _pick(rng, DIRECTIONS, num_records),
+        'legal_status': _pick(rng, LEGAL_STATUSES, num_records),
+        'amenities': _pick(rng, AMENITIES, num_records),
+        'description': _pick(rng, DESCRIPTIONS, num_records),
+        'posted_date': _format_codes(posted.astype(np.int64), lambda days: np.datetime_as_string(days.astype('datetime64[D]'))),
+        'status': _pick(rng, STATUSES, num_records),
+    })
 
-def generate_real_estate_data(num_records=30):
-    fake = Faker('vi_VN')
-    
-    # Real Ho Chi Minh City districts and wards
-    district_wards = {
-        'Quận 1': ['Phường Bến Nghé', 'Phường Bến Thành', 'Phường Cầu Kho', 'Phường Cầu Ông Lãnh', 
-                   'Phường Đa Kao', 'Phường Nguyễn Cư Trinh', 'Phường Nguyễn Thái Bình', 'Phường Phạm Ngũ Lão', 
-                   'Phường Tân Định'],
-        'Quận 3': ['Phường 1', 'Phường 2', 'Phường 3', 'Phường 4', 'Phường 5', 'Phường 6', 'Phường 7', 'Phường 8', 'Phường 9', 'Phường 10', 'Phường 11', 'Phường 12', 'Phường 13', 'Phường 14'],
-        'Quận 7': ['Phường Bình Thuận', 'Phường Phú Mỹ', 'Phường Phú Thuận', 'Phường Tân Hưng', 
-                   'Phường Tân Kiểng', 'Phường Tân Phong', 'Phường Tân Phú', 'Phường Tân Quy', 'Phường Tân Thuận Đông', 'Phường Tân Thuận Tây'],
-        'Quận Bình Thạnh': ['Phường 1', 'Phường 2', 'Phường 3', 'Phường 5', 'Phường 6', 'Phường 7', 'Phường 11', 'Phường 12', 'Phường 13', 'Phường 14', 'Phường 15', 'Phường 17', 'Phường 19', 'Phường 21', 'Phường 22', 'Phường 24', 'Phường 25', 'Phường 26', 'Phường 27', 'Phường 28'],
-        'Quận Gò Vấp': ['Phường 1', 'Phường 3', 'Phường 4', 'Phường 5', 'Phường 6', 'Phường 7', 'Phường 8', 'Phường 9', 'Phường 10', 'Phường 11', 'Phường 12', 'Phường 13', 'Phường 14', 'Phường 15', 'Phường 16', 'Phường 17'],
-        'Quận Thủ Đức': ['Phường An Khánh', 'Phường An Lạc', 'Phường An Lạc A', 'Phường An Phú', 'Phường Bình Chiểu', 'Phường Bình Thọ', 'Phường Hiệp Bình Chánh', 'Phường Hiệp Bình Phước', 'Phường Linh Chiểu', 'Phường Linh Đông', 'Phường Linh Tây', 'Phường Linh Trung', 'Phường Linh Xuân', 'Phường Long Bình', 'Phường Long Phước', 'Phường Long Thạnh Mỹ', 'Phường Long Trường', 'Phường Phú Hữu', 'Phường Phước Bình', 'Phường Phước Long A', 'Phường Phước Long B', 'Phường Tam Bình', 'Phường Tam Phú', 'Phường Tăng Nhơn Phú A', 'Phường Tăng Nhơn Phú B', 'Phường Tân Phú', 'Phường Trường Thạnh', 'Phường Trường Thọ']
+
+def _price_texts(codes):
+    """Sale price texts for (millions, comma separator, format) codes"""
+    codes, format_index = np.divmod(codes, len(SALE_PRICE_FORMATS))
+    millions, comma = np.divmod(codes, 2)
+    billions, remainder = np.divmod(millions, 1000)
+    format_names = np.asarray(list(SALE_PRICE_FORMATS))[format_index]
+
+    whole = _join(billions, ' tỷ')
+    # '6 tỷ' cannot show a remainder, '6.5 tỷ' only whole hundreds: fall back to 'x tỷ  y triệu'
+    mixed = np.where(remainder > 0, _join(whole, '  ', remainder, ' triệu'), whole)
+    separator = np.where(comma == 1, ',', '.')
+    decimal = np.where(remainder % 100 == 0, _join(billions, separator, remainder // 100, ' tỷ'), mixed)
+    digits = _join(billions, '.', np.strings.zfill(_text(remainder), 3), '.000.000')
+    return np.select(
+        [format_names == 'ty_trieu', format_names == 'ty', format_names == 'ty_decimal',
+         format_names == 'trieu', format_names == 'digits'],
+        [mixed, np.where(remainder == 0, whole, mixed), decimal, _join(millions, ' triệu'), digits],
+        default='',
+    )
+
+
+def _sale_price_texts(rng, price):
+    """
+    LandSoft-style texts for sale prices in VND (multiples of 100 triệu)
+
+    Returns:
+        (texts, negotiable) - object array of texts and the mask of rows without a price
+    """
+    size = len(price)
+    formats = rng.choice(len(SALE_PRICE_FORMATS), size=size, p=list(SALE_PRICE_FORMATS.values()))
+    comma = rng.random(size) < 0.5
+    texts = _format_codes(((price // 1_000_000) * 2 + comma) * len(SALE_PRICE_FORMATS) + formats, _price_texts)
+    negotiable = formats == list(SALE_PRICE_FORMATS).index('negotiable')
+    texts[negotiable] = _pick(rng, NEGOTIABLE_TEXTS, size)[negotiable]
+    return texts, negotiable
+
+
+def _rent_price_texts(rng, size):
+    """
+    Monthly rents: '15 triệu/tháng', '15 tr/th', '800 nghìn/tháng'
+
+    Returns:
+        (texts, prices) - object array of texts and the rents in VND
+    """
+    millions = rng.integers(5, 200, size)
+    short = rng.random(size) >= 0.7
+    texts = _format_codes(millions * 2 + short, lambda codes: np.where(
+        codes % 2 == 1, _join(codes // 2, ' tr/th'), _join(codes // 2, ' triệu/tháng')))
+    cheap = rng.random(size) < 0.05
+    thousands = rng.integers(5, 10, size) * 100
+    texts[cheap] = _format_codes(thousands, lambda codes: _join(codes, ' nghìn/tháng'))[cheap]
+    return texts, np.where(cheap, thousands * 1000, millions * 1_000_000)
+
+
+def _house_numbers(rng, size):
+    """'160', '27/71/18' (hẻm), '12A' and missing"""
+    first = _text(rng.integers(1, 400, size))
+    second = _join(first, '/', rng.integers(1, 120, size))
+    third = _join(second, '/', rng.integers(1, 40, size))
+    lettered = _join(first, _pick(rng, ['A', 'B', 'C'], size))
+    kind = rng.random(size)
+    numbers = np.select([kind < 0.3, kind < 0.4, kind < 0.45], [second, third, lettered], default=first)
+    numbers = numbers.astype(object)
+    numbers[kind >= 0.92] = None
+    return numbers
+
+
+def _descriptions(codes):
+    """'Bán nhà phố 3PN 2WC, hồ bơi, sân thượng' from (type, bedrooms, rent, feature, feature) codes"""
+    features = len(LISTING_FEATURES)
+    codes, second = np.divmod(codes, features)
+    codes, first = np.divmod(codes, features)
+    codes, is_rent = np.divmod(codes, 2)
+    type_index, bedrooms = np.divmod(codes, 10)
+    verb = np.where(is_rent == 1, 'Cho thuê ', 'Bán ')
+    rooms = np.where(bedrooms > 0, _join(' ', bedrooms, 'PN ', np.maximum(bedrooms - 1, 1), 'WC'), '')
+    return _join(verb, np.strings.lower(_text(TYPE_NAMES[type_index])), rooms,
+                 ', ', FEATURE_NAMES[first], ', ', FEATURE_NAMES[second])
+
+
+def _landsoft_descriptions(rng, type_index, bedrooms, is_rent):
+    """Listing descriptions; some are missing"""
+    size = len(type_index)
+    features = len(LISTING_FEATURES)
+    first = rng.integers(0, features, size)
+    second = (first + rng.integers(1, features, size)) % features
+    codes = ((type_index * 10 + bedrooms) * 2 + is_rent) * features ** 2 + first * features + second
+    descriptions = _format_codes(codes, _descriptions)
+    descriptions[rng.random(size) < 0.05] = None
+    return descriptions
+
+
+def _phones(rng, size):
+    digits = np.strings.zfill(_text(rng.integers(0, 10_000_000, size)), 7)
+    return _with_missing(rng, _join(_pick(rng, PHONE_PREFIXES, size), digits), 0.15)
+
+
+def _landsoft_ward(ward):
+    """'Phường 1' -> 'P.01', 'Phường Bến Thành' -> 'P.Bến Thành' (LandSoft spelling)"""
+    name = ward.removeprefix('Phường ')
+    return f"P.{int(name):02d}" if name.isdigit() else f"P.{name}"
+
+
+# Lookup tables: a ward index points into the flattened per-district ward lists
+DISTRICT_NAMES = np.asarray(DISTRICTS, dtype=object)
+WARD_NAMES = np.asarray([ward for district in DISTRICTS for ward in DISTRICT_WARDS[district]], dtype=object)
+LANDSOFT_WARD_NAMES = np.asarray([_landsoft_ward(ward) for ward in WARD_NAMES], dtype=object)
+WARD_COUNTS = np.asarray([len(DISTRICT_WARDS[district]) for district in DISTRICTS])
+WARD_OFFSETS = np.concatenate([[0], np.cumsum(WARD_COUNTS)[:-1]])
+WARD_DISTRICTS = np.repeat(DISTRICT_NAMES, WARD_COUNTS)
+DISTRICT_TIERS = np.asarray([0 if district in CENTRAL_DISTRICTS else 1 if district in INNER_DISTRICTS else 2
+                             for district in DISTRICTS])
+BOUNDS = np.asarray([PRICE_AREA_BEDROOMS[property_type] for property_type in PROPERTY_TYPES], dtype=np.int64)
+TYPE_NAMES = np.asarray(PROPERTY_TYPES, dtype=object)
+STREET_NAMES = np.asarray(STREETS, dtype=object)
+FEATURE_NAMES = np.asarray(LISTING_FEATURES, dtype=object)
+OWNER_TITLE_NAMES = np.asarray(OWNER_TITLES, dtype=object)
+OWNER_FIRST_NAMES = np.asarray(OWNER_NAMES, dtype=object)
+
+
+def generate_landsoft_data(num_records=1000, seed=0, duplicate_rate=0.03, rent_rate=0.15):
+    """
+    Listings in the raw LandSoft export layout
+
+    Prices are written in the formats seen in real exports ('6 tỷ  500 triệu',
+    '4,5 tỷ', '6.500.000.000', '15 triệu/tháng', 'Thương lượng', ...). About
+    duplicate_rate of the rows repeat an earlier listing: half of them are
+    exact copies, the other half re-posts with a later update date and a new
+    price. 'Gallery' stays the row number, as in the export.
+
+    Args:
+        num_records: Number of rows
+        seed: Random seed
+        duplicate_rate: Share of rows that repeat an earlier row
+        rent_rate: Share of 'Cho thuê' listings
+    """
+    rng = np.random.default_rng(seed)
+    size = num_records
+    type_index = rng.choice(len(PROPERTY_TYPES), size=size, p=[0.4, 0.3, 0.08, 0.1, 0.12])
+    district_index, ward_index = _locations(rng, size)
+    price, area, bedrooms = _prices_areas_bedrooms(rng, type_index, district_index)
+    # Giá bán theo bội số 100 triệu
+    price = price + rng.integers(0, 10, size) * 100_000_000
+    is_rent = rng.random(size) < rent_rate
+    transaction = np.where(is_rent, 'Cho thuê', 'Cần bán').astype(object)
+
+    price_text, _ = _sale_price_texts(rng, price)
+    rent_text, _ = _rent_price_texts(rng, size)
+    price_text[is_rent] = rent_text[is_rent]
+
+    house_numbers = _house_numbers(rng, size)
+    in_alley = np.strings.find(_text(np.where(house_numbers == None, '', house_numbers)), '/') >= 0  # noqa: E711
+    width = rng.choice([3.0, 3.5, 4.0, 4.5, 5.0, 6.0, 8.0], size)
+    length = rng.choice([10.0, 12.0, 15.0, 16.0, 18.0, 20.0, 25.0], size)
+    is_apartment = np.isin(type_index, [PROPERTY_TYPES.index('Căn hộ'), PROPERTY_TYPES.index('Văn phòng')])
+    width[is_apartment | (rng.random(size) < 0.1)] = np.nan
+    length[np.isnan(width)] = np.nan
+    area = np.where(np.isnan(width), area, width * length).astype(float)
+
+    # Fixed end date, so a seed always gives the same export
+    registration = _dates(rng, size, days_back=365, end=LANDSOFT_END_DATE).astype('datetime64[ns]')
+    update = registration + rng.integers(0, 90, size).astype('timedelta64[D]')
+    registration[rng.random(size) < 0.03] = np.datetime64('NaT')
+
+    owners = _format_codes(rng.integers(0, len(OWNER_TITLES) * len(OWNER_NAMES), size), lambda codes: _join(
+        OWNER_TITLE_NAMES[codes // len(OWNER_NAMES)], ' ', OWNER_FIRST_NAMES[codes % len(OWNER_NAMES)]))
+    owners[rng.random(size) < 0.2] = None
+    columns = {
+        'Gallery': np.arange(1, size + 1),
+        'Nhu cầu': transaction,
+        'Số nhà': house_numbers,
+        'Mã sản phẩm': np.arange(FIRST_PRODUCT_CODE, FIRST_PRODUCT_CODE + size),
+        'Loại đường': np.where(in_alley, 'Hẻm', 'Mặt tiền').astype(object),
+        'Tên đường': _pick(rng, STREETS, size),
+        'Xã/Phường': LANDSOFT_WARD_NAMES[ward_index],
+        'Quận/huyện': DISTRICT_NAMES[district_index],
+        'Ngang XD': width,
+        'Dài XD': length,
+        'Diện tích': area,
+        'Tổng giá text': price_text,
+        'Hướng': _pick(rng, DIRECTIONS, size),
+        'Chủ nhà': owners,
+        'Điện thoại': _phones(rng, size),
+        'Diễn giải': _landsoft_descriptions(rng, type_index, bedrooms, is_rent),
+        'Ngày ĐK': registration,
+        'Ngày cập nhật': update,
+        'Tỷ lệ MG': _pick(rng, ['1%', '1.5%', '2%', None], size),
+        'CV môi giới': _pick(rng, AGENTS, size),
+        'CV đăng tin': _pick(rng, AGENTS, size),
     }
-    
-    property_types = ['Căn hộ', 'Nhà phố', 'Biệt thự', 'Shophouse', 'Văn phòng']
-    
-    # Realistic property descriptions
-    descriptions = [
-        "Căn hộ cao cấp với thiết kế hiện đại, view đẹp, tiện ích đầy đủ. Vị trí thuận lợi, giao thông thuận tiện.",
-        "Nhà phố mặt tiền đường lớn, kinh doanh tốt, phù hợp mở shop hoặc văn phòng. Diện tích sử dụng rộng rãi.",
-        "Biệt thự sang trọng với thiết kế độc đáo, sân vườn rộng, không gian sống thoáng đãng. An ninh 24/7.",
-        "Shophouse mới xây, thiết kế đẹp, vị trí đắc địa. Phù hợp kinh doanh hoặc cho thuê văn phòng.",
-        "Căn hộ trung cấp giá tốt, tiện ích cơ bản đầy đủ. Phù hợp gia đình trẻ, sinh viên.",
-        "Nhà phố hẻm xe hơi, yên tĩnh, an ninh tốt. Gần trường học, bệnh viện, siêu thị.",
-        "Căn hộ view sông, không khí trong lành. Thiết kế tối ưu, tiết kiệm năng lượng.",
-        "Biệt thự mini với sân thượng rộng, view thành phố. Phù hợp gia đình nhỏ.",
-        "Văn phòng cho thuê tại tòa nhà văn phòng cao cấp. Vị trí trung tâm, giao thông thuận tiện.",
-        "Căn hộ studio giá rẻ, phù hợp người độc thân hoặc sinh viên. Gần trường đại học."
-    ]
-    
-    # Realistic amenities
-    amenities_list = [
-        "Hồ bơi, Gym, An ninh 24/7",
-        "Thang máy, Chỗ đậu xe, Sân chơi trẻ em",
-        "Gần trường học, Siêu thị, Bệnh viện",
-        "Công viên gần đó, Nhà hàng, Cafe",
-        "Trung tâm thương mại, Bến xe buýt, Metro",
-        "Sân tennis, BBQ area, Garden",
-        "Gym, Spa, Restaurant",
-        "Playground, Library, Business center",
-        "Swimming pool, Sauna, Conference room",
-        "Parking, Security, Maintenance"
-    ]
-    
-    data = []
-    for i in range(1, num_records+1):
-        prop_type = random.choice(property_types)
-        district = random.choice(list(district_wards.keys()))
-        ward = random.choice(district_wards[district])
-        
-        # Generate realistic pricing based on property type and location
-        if prop_type == 'Căn hộ':
-            if district in ['Quận 1', 'Quận 3']:
-                price = random.randint(8, 25) * 1000000000  # 8-25 tỷ
-                area = random.randint(60, 120)
-            elif district in ['Quận 7', 'Quận Bình Thạnh']:
-                price = random.randint(5, 15) * 1000000000  # 5-15 tỷ
-                area = random.randint(70, 130)
-            else:
-                price = random.randint(3, 10) * 1000000000  # 3-10 tỷ
-                area = random.randint(65, 110)
-            bedrooms = random.randint(1, 3)
-            
-        elif prop_type == 'Nhà phố':
-            if district in ['Quận 1', 'Quận 3']:
-                price = random.randint(30, 80) * 1000000000  # 30-80 tỷ
-                area = random.randint(100, 200)
-            elif district in ['Quận 7', 'Quận Bình Thạnh']:
-                price = random.randint(20, 50) * 1000000000  # 20-50 tỷ
-                area = random.randint(120, 250)
-            else:
-                price = random.randint(15, 35) * 1000000000  # 15-35 tỷ
-                area = random.randint(100, 200)
-            bedrooms = random.randint(3, 5)
-            
-        elif prop_type == 'Biệt thự':
-            price = random.randint(50, 150) * 1000000000  # 50-150 tỷ
-            area = random.randint(200, 400)
-            bedrooms = random.randint(4, 6)
-            
-        elif prop_type == 'Shophouse':
-            price = random.randint(25, 60) * 1000000000  # 25-60 tỷ
-            area = random.randint(150, 300)
-            bedrooms = random.randint(2, 4)
-            
-        else:  # Văn phòng
-            price = random.randint(10, 30) * 1000000000  # 10-30 tỷ
-            area = random.randint(80, 200)
-            bedrooms = 0
-        
-        # Generate realistic address
-        street_names = ['Nguyễn Huệ', 'Lê Lợi', 'Đồng Khởi', 'Pasteur', 'Võ Văn Tần', 
-                       'Nguyễn Thị Minh Khai', 'Cách Mạng Tháng 8', '3 Tháng 2', 
-                       'Lý Tự Trọng', 'Nam Kỳ Khởi Nghĩa', 'Điện Biên Phủ', 'Võ Thị Sáu']
-        street = random.choice(street_names)
-        number = random.randint(1, 200)
-        address = f"{number} {street}, {ward}, {district}, TP.HCM"
-        
-        data.append({
-            'id': f'SP{i:03d}',
-            'type': prop_type,
-            'district': district,
-            'ward': ward,
-            'address': address,
-            'price': price,
-            'area': area,
-            'bedrooms': bedrooms,
-            'direction': random.choice(['Đông', 'Tây', 'Nam', 'Bắc', 'Đông Nam', 'Tây Nam', 'Đông Bắc', 'Tây Bắc']),
-            'legal_status': random.choice(['Sổ hồng', 'Sổ đỏ', 'Hợp đồng mua bán', 'Đang hoàn thiện pháp lý']),
-            'amenities': random.choice(amenities_list),
-            'description': random.choice(descriptions),
-            'posted_date': fake.date_between(start_date='-6m', end_date='today').strftime('%Y-%m-%d'),
-            'status': random.choice(['available', 'pending', 'sold'])
-        })
-    
-    return pd.DataFrame(data)
 
-if __name__ == "__main__":
+    # Repeated listings: copy earlier rows (everything but Gallery) onto a random share of rows
+    duplicates = np.flatnonzero(rng.random(size) < duplicate_rate)
+    duplicates = duplicates[duplicates > 0]
+    if len(duplicates):
+        sources = (rng.random(len(duplicates)) * duplicates).astype(np.int64)
+        for column in LANDSOFT_COLUMNS[1:]:
+            columns[column][duplicates] = columns[column][sources]
+        # Re-posts: later update date and, for sales, a price up to 200 triệu lower or 300 triệu higher
+        is_repost = rng.random(len(duplicates)) < 0.5
+        reposts, repost_sources = duplicates[is_repost], sources[is_repost]
+        columns['Ngày cập nhật'][reposts] += rng.integers(1, 60, len(reposts)).astype('timedelta64[D]')
+        is_sale = ~is_rent[repost_sources]
+        reposts, repost_sources = reposts[is_sale], repost_sources[is_sale]
+        new_price = price[repost_sources] + 100_000_000 * rng.integers(-2, 4, len(reposts))
+        columns['Tổng giá text'][reposts] = _sale_price_texts(rng, new_price)[0]
+    return pd.DataFrame(columns, columns=LANDSOFT_COLUMNS)
+
+
+def write_frame(df, path):
+    """Write as CSV or .xlsx depending on the suffix"""
+    if path.endswith('.xlsx'):
+        if len(df) > XLSX_MAX_ROWS:
+            raise ValueError(f"{len(df):,} rows do not fit in one Excel sheet (max {XLSX_MAX_ROWS:,}); use CSV")
+        df.to_excel(path, index=False)
+    else:
+        df.to_csv(path, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=30)
+    parser.add_argument('--layout', choices=['cleaned', 'landsoft', 'both'], default='cleaned')
+    parser.add_argument('--format', choices=['csv', 'xlsx'], default='csv')
+    parser.add_argument('--output-dir', default='data')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--duplicate-rate', type=float, default=0.03, help='LandSoft layout only')
+    args = parser.parse_args()
+
     # Tạo thư mục data nếu chưa tồn tại
-    os.makedirs('data', exist_ok=True)
-    
-    # Tạo dataset với 30 mẫu
-    df = generate_real_estate_data(30)
-    
-    # Lưu ra file CSV
-    df.to_csv('data/sample_real_estate.csv', index=False)
-    print("✅ Đã tạo file dữ liệu mẫu: data/sample_real_estate.csv")
-    print(f"📊 Số lượng bản ghi: {len(df)}")
-    print(f"🏠 Các loại hình: {df['type'].value_counts().to_dict()}")
-    print(f"📍 Các quận: {df['district'].value_counts().to_dict()}")
-    print(f"💰 Khoảng giá: {df['price'].min():,.0f} - {df['price'].max():,.0f} VND")
\ No newline at end of file
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    if args.layout in ('cleaned', 'both'):
+        start = time.perf_counter()
+        df = generate_real_estate_data(args.rows, seed=args.seed)
+        path = os.path.join(args.output_dir, f"sample_real_estate.{args.format}")
+        write_frame(df, path)
+        print(f"✅ Đã tạo file dữ liệu mẫu: {path} ({time.perf_counter() - start:.1f}s)")
+        print(f"📊 Số lượng bản ghi: {len(df):,}")
+        print(f"🏠 Các loại hình: {df['type'].value_counts().to_dict()}")
+        print(f"📍 Các quận: {df['district'].value_counts().to_dict()}")
+        print(f"💰 Khoảng giá: {df['price'].min():,.0f} - {df['price'].max():,.0f} VND")
+
+    if args.layout in ('landsoft', 'both'):
+        start = time.perf_counter()
+        df = generate_landsoft_data(args.rows, seed=0 if args.seed is None else args.seed,
+                                    duplicate_rate=args.duplicate_rate)
+        path = os.path.join(args.output_dir, f"landsoft_export.{args.format}")
+        write_frame(df, path)
+        print(f"✅ Đã tạo file LandSoft: {path} ({time.perf_counter() - start:.1f}s)")
+        print(f"📊 Số lượng bản ghi: {len(df):,} ({df['Mã sản phẩm'].duplicated().sum():,} trùng mã sản phẩm)")
+        print(f"💬 Nhu cầu: {df['Nhu cầu'].value_counts().to_dict()}")
+
+
+if __name__ == "__main__":
+    main()
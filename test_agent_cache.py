@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Test script for the process-wide agent cache
+"""
+
+import gc
+import os
+import sys
+import tempfile
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_concurrent_sessions_share_one_build():
+    from utils.agent_cache import AgentCache
+
+    cache = AgentCache(max_bytes=10_000)
+    builds = []
+
+    def build():
+        builds.append(1)
+        time.sleep(0.05)
+        return object()
+
+    leases = []
+    threads = [threading.Thread(target=lambda: leases.append(cache.acquire('key', build))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(builds) == 1
+    assert len({id(lease.value) for lease in leases}) == 1
+    assert cache.stats()['leases'] == 8 and cache.stats()['misses'] == 1 and cache.stats()['hits'] == 7
+
+
+def test_eviction_respects_leases_and_lru():
+    from utils.agent_cache import AgentCache
+
+    cache = AgentCache(max_bytes=100)
+    size = lambda value: 60
+    lease_a = cache.acquire('a', lambda: 'A', size_of=size)
+    lease_b = cache.acquire('b', lambda: 'B', size_of=size)
+    # Over budget, but both agents are in use
+    assert cache.stats()['entries'] == 2
+
+    lease_a.release()
+    lease_a.release()  # idempotent
+    assert cache.stats()['entries'] == 1 and cache.stats()['evictions'] == 1
+
+    # 'b' is now the least recently used idle agent and makes room for 'c'
+    lease_b.release()
+    lease_c = cache.acquire('c', lambda: 'C', size_of=size)
+    assert cache.stats()['entries'] == 1 and lease_c.value == 'C'
+
+
+def test_evicted_and_cleared_entries_are_disposed():
+    from utils.agent_cache import AgentCache
+
+    cache = AgentCache(max_bytes=100)
+    disposed = []
+    size = lambda value: 60
+    cache.acquire('a', lambda: 'A', size_of=size, dispose=disposed.append).release()
+    lease_b = cache.acquire('b', lambda: 'B', size_of=size, dispose=disposed.append)
+    assert disposed == ['A']
+    cache.clear()
+    assert disposed == ['A'] and lease_b.value == 'B'
+    lease_b.release()
+    cache.clear()
+    assert disposed == ['A', 'B'] and cache.stats()['entries'] == 0
+
+
+def test_failed_build_is_not_cached():
+    from utils.agent_cache import AgentCache
+
+    cache = AgentCache()
+
+    def broken():
+        raise ValueError("no data")
+
+    for _ in range(2):
+        try:
+            cache.acquire('key', broken)
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+    assert cache.stats()['entries'] == 0
+    assert cache.acquire('key', lambda: 42).value == 42
+
+
+def test_garbage_collected_lease_releases():
+    from utils.agent_cache import AgentCache
+
+    cache = AgentCache()
+    lease = cache.acquire('key', lambda: 'agent')
+    assert cache.stats()['leases'] == 1
+    del lease
+    gc.collect()
+    assert cache.stats()['leases'] == 0
+
+
+def test_fingerprints():
+    from utils.agent_cache import make_fingerprint
+    from utils.hashing import file_digest
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [os.path.join(tmp, name) for name in ('upload1.xls', 'upload2.xls', 'other.xls')]
+        for path, content in zip(paths, [b'same export', b'same export', b'new export']):
+            with open(path, 'wb') as f:
+                f.write(content)
+        assert file_digest(paths[0]) == file_digest(paths[1]) != file_digest(paths[2])
+
+    assert make_fingerprint('excel', 'abc', model='m1') == make_fingerprint('excel', 'abc', model='m1')
+    assert make_fingerprint('excel', 'abc', model='m1') != make_fingerprint('excel', 'abc', model='m2')
+
+
+def test_agent_fingerprint_depends_on_api_key():
+    from ai_agent import agent_fingerprint
+
+    saved = os.environ.get('OPENAI_API_KEY')
+    try:
+        os.environ['OPENAI_API_KEY'] = 'sk-one'
+        first = agent_fingerprint('sample')
+        assert agent_fingerprint('sample') == first
+        os.environ['OPENAI_API_KEY'] = 'sk-two'
+        assert agent_fingerprint('sample') != first
+    finally:
+        if saved is None:
+            os.environ.pop('OPENAI_API_KEY', None)
+        else:
+            os.environ['OPENAI_API_KEY'] = saved
+
+
+def test_agent_fingerprint_covers_index_and_chain_settings():
+    import ai_agent
+
+    first = ai_agent.agent_fingerprint('sample')
+    for name, value in [('CONTEXT_TOKEN_BUDGET', 123), ('DEDUP_THRESHOLD', 0.9), ('RERANK_FETCH_K', 7)]:
+        saved = getattr(ai_agent, name)
+        setattr(ai_agent, name, value)
+        try:
+            assert ai_agent.agent_fingerprint('sample') != first, name
+        finally:
+            setattr(ai_agent, name, saved)
+    assert ai_agent.agent_fingerprint('sample') == first
+
+
+def test_collections_are_named_by_source():
+    from ai_agent import source_collection_name
+
+    with tempfile.TemporaryDirectory(dir=os.getcwd()) as tmp:
+        path = os.path.join(tmp, 'export.xls')
+        assert source_collection_name('excel', file_path=path) == source_collection_name('excel', file_path=path)
+        assert source_collection_name('excel', file_path=path) != source_collection_name('excel')
+    uploads = [os.path.join(tempfile.gettempdir(), name) for name in ('tmp1.excel', 'tmp2.excel')]
+    assert source_collection_name('excel', file_path=uploads[0]) == source_collection_name('excel', file_path=uploads[1])
+    assert source_collection_name('gsheet', sheet_url='https://a') != source_collection_name('gsheet', sheet_url='https://b')
+
+
+def test_collection_claims_fork_only_while_another_agent_holds_it():
+    import ai_agent
+    from utils.agent_cache import AgentCache
+    from utils.local_embeddings import HashedNgramEmbeddings
+
+    saved = ai_agent.VECTOR_BACKEND, ai_agent.NUMPY_VECTOR_DIR
+    with tempfile.TemporaryDirectory() as tmp:
+        ai_agent.VECTOR_BACKEND, ai_agent.NUMPY_VECTOR_DIR = 'numpy', ai_agent.Path(tmp)
+        try:
+            cache = AgentCache()
+            base = ai_agent.source_collection_name('gsheet', sheet_url='https://sheet')
+
+            def build(fingerprint):
+                def run():
+                    name = ai_agent.claim_collection(base, fingerprint, cache)
+                    store = ai_agent.open_vector_store('gsheet', HashedNgramEmbeddings(dimensions=16), name)
+                    store.add_texts([fingerprint], ids=[fingerprint])
+                    store.flush()
+                    return name
+                return cache.acquire(fingerprint, run,
+                                     dispose=lambda name: ai_agent.release_collection(name, fingerprint))
+
+            first = build('a' * 64)
+            assert first.value == base
+            # The first agent is still held: the refresh gets a fork
+            second = build('b' * 64)
+            assert second.value == f"{base}_fork_{'b' * 12}"
+            # Once idle, the first agent is dropped and its collection synced in place
+            first.release()
+            third = build('c' * 64)
+            assert third.value == base and not cache.is_leased('a' * 64)
+
+            # Forks are deleted with their agent; leftovers and old names by the orphan pass
+            second.release()
+            cache.clear()
+            assert second.value not in ai_agent.list_vector_collections()
+            os.makedirs(os.path.join(tmp, 'real_estate_excel_1700000000'))
+            os.makedirs(os.path.join(tmp, f"{base}_fork_{'d' * 12}"))
+            assert ai_agent.collect_orphan_collections() == ['real_estate_excel_1700000000', f"{base}_fork_{'d' * 12}"]
+            assert ai_agent.list_vector_collections() == [base]
+            third.release()
+        finally:
+            ai_agent.VECTOR_BACKEND, ai_agent.NUMPY_VECTOR_DIR = saved
+            ai_agent._COLLECTION_OWNERS.clear()
+
+
+if __name__ == "__main__":
+    test_concurrent_sessions_share_one_build()
+    test_eviction_respects_leases_and_lru()
+    test_evicted_and_cleared_entries_are_disposed()
+    test_failed_build_is_not_cached()
+    test_garbage_collected_lease_releases()
+    test_fingerprints()
+    test_agent_fingerprint_depends_on_api_key()
+    test_agent_fingerprint_covers_index_and_chain_settings()
+    test_collections_are_named_by_source()
+    test_collection_claims_fork_only_while_another_agent_holds_it()
+    print("✅ Agent cache tests passed")
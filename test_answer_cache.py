@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test script for the answer cache
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from langchain_core.documents import Document
+from langchain_core.runnables import RunnableLambda, RunnablePassthrough
+
+
+class CountingLLM:
+    """Answer step that records how often it was really called"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, input):
+        self.calls += 1
+        ids = ','.join(document.metadata['id'] for document in input['context'])
+        return f"Trả lời cho '{input['question']}' từ {ids}"
+
+
+def make_chain(documents, cache):
+    from utils.answer_cache import CachedAnswer
+
+    llm = CountingLLM()
+    retriever = RunnableLambda(lambda question: documents())
+    chain = {"context": retriever, "question": RunnablePassthrough()} | CachedAnswer(RunnableLambda(llm), cache)
+    return chain, llm
+
+
+def listing(doc_id, text='Căn hộ Quận 7'):
+    return Document(page_content=text, metadata={'id': doc_id})
+
+
+def test_same_question_and_listings_hit():
+    from utils.answer_cache import AnswerCache, MemoryAnswerStore
+
+    cache = AnswerCache(MemoryAnswerStore())
+    chain, llm = make_chain(lambda: [listing('1'), listing('2')], cache)
+
+    first = chain.invoke("Căn hộ 2pn quận 7 dưới 3 tỷ")
+    assert chain.invoke("  căn hộ 2PN   Quận 7 dưới 3 tỷ ") == first
+    assert llm.calls == 1
+    assert cache.stats()['hits'] == 1 and cache.stats()['hit_rate'] == 0.5
+
+
+def test_changed_listings_invalidate():
+    from utils.answer_cache import AnswerCache, MemoryAnswerStore
+
+    current = [[listing('1'), listing('2')]]
+    cache = AnswerCache(MemoryAnswerStore())
+    chain, llm = make_chain(lambda: current[0], cache)
+
+    chain.invoke("căn hộ quận 7")
+    current[0] = [listing('1'), listing('3')]
+    chain.invoke("căn hộ quận 7")
+    current[0] = [listing('1'), listing('3', text='Căn hộ Quận 7 - đã giảm giá')]
+    chain.invoke("căn hộ quận 7")
+    assert llm.calls == 3
+
+
+def test_version_is_part_of_key():
+    from utils.answer_cache import answer_cache_key, answer_version
+
+    documents = [listing('1')]
+    assert answer_version(model='a') != answer_version(model='b')
+    assert answer_cache_key('q', documents, 'v1') != answer_cache_key('q', documents, 'v2')
+
+
+def test_ttl_and_lru():
+    from utils.answer_cache import AnswerCache, MemoryAnswerStore
+
+    cache = AnswerCache(MemoryAnswerStore(max_entries=2), ttl=0.05)
+    cache.set('a', 'A')
+    cache.set('b', 'B')
+    assert cache.get('a') == 'A'
+    cache.set('c', 'C')  # 'b' is the least recently used
+    assert cache.get('b') is None and cache.get('a') == 'A'
+    time.sleep(0.06)
+    assert cache.get('a') is None and cache.get('c') is None
+
+
+def test_sqlite_backend_persists():
+    from utils.answer_cache import make_answer_cache
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'answers.sqlite3')
+        make_answer_cache('sqlite', path=path).set('key', 'Câu trả lời')
+        reopened = make_answer_cache('sqlite', path=path, max_entries=1)
+        assert reopened.get('key') == 'Câu trả lời'
+        reopened.set('other', 'x')
+        assert reopened.stats()['entries'] == 1
+        assert reopened.stats()['backend'] == 'SQLiteAnswerStore'
+    assert make_answer_cache('none') is None
+
+
+def test_streaming_and_async():
+    """Streaming stores the full answer; a cached answer streams as one chunk"""
+    from langchain_core.language_models import GenericFakeChatModel
+    from langchain_core.messages import AIMessage
+    from langchain_core.output_parsers import StrOutputParser
+    from utils.answer_cache import AnswerCache, CachedAnswer, MemoryAnswerStore
+
+    cache = AnswerCache(MemoryAnswerStore())
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content="Có 2 căn hộ phù hợp ở Quận 7")]))
+    generate = RunnableLambda(lambda input: input['question']) | llm | StrOutputParser()
+    chain = ({"context": RunnableLambda(lambda q: [listing('1')]), "question": RunnablePassthrough()}
+             | CachedAnswer(generate, cache))
+
+    chunks = list(chain.stream("căn hộ quận 7"))
+    assert len(chunks) > 1
+    assert list(chain.stream("căn hộ quận 7")) == ["Có 2 căn hộ phù hợp ở Quận 7"]
+    assert asyncio.run(chain.ainvoke("Căn hộ Quận 7")) == "Có 2 căn hộ phù hợp ở Quận 7"
+    assert cache.stats()['hits'] == 2
+
+
+if __name__ == "__main__":
+    test_same_question_and_listings_hit()
+    test_changed_listings_invalidate()
+    test_version_is_part_of_key()
+    test_ttl_and_lru()
+    test_sqlite_backend_persists()
+    test_streaming_and_async()
+    print("✅ Answer cache tests passed")
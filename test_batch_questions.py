@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test script for the batch question CLI (scripts/batch_questions.py)
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from langchain_core.runnables import RunnableLambda
+
+
+class SlowLLM:
+    """Sync stand-in for the LLM: records calls and how many run at once, fails on chosen questions"""
+
+    def __init__(self, fail=(), delay=0.05):
+        self.fail = set(fail)
+        self.delay = delay
+        self.asked = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, prompt):
+        question = prompt.to_messages()[0].content.rsplit('Câu hỏi:', 1)[-1].split('\n')[0].strip()
+        with self._lock:
+            self.asked.append(question)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        if question in self.fail:
+            raise RuntimeError("LLM unavailable")
+        return f"Trả lời: {question}"
+
+
+def make_chain(llm):
+    from ai_agent import build_chain
+    from test_numpy_vector_store import make_store
+    from utils.retrieval import ListingRetriever
+
+    return build_chain(ListingRetriever(vector_store=make_store(), k=2), llm=RunnableLambda(llm))
+
+
+def write_lines(path, lines):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(''.join(json.dumps(line, ensure_ascii=False) + '\n' for line in lines))
+
+
+def read_records(path):
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_read_questions():
+    from scripts.batch_questions import read_questions
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'questions.jsonl')
+        write_lines(path, ["căn hộ quận 7", {'id': 'p2', 'question': 'nhà phố', 'budget': 5}])
+        assert read_questions(path) == [{'question': 'căn hộ quận 7', 'id': 1},
+                                        {'id': 'p2', 'question': 'nhà phố', 'budget': 5}]
+
+        write_lines(path, [{'id': 'a', 'question': 'x'}, {'id': 'a', 'question': 'y'}])
+        try:
+            read_questions(path)
+        except ValueError as e:
+            assert 'duplicate id' in str(e)
+        else:
+            raise AssertionError("duplicate id accepted")
+
+
+def test_answers_ids_and_latency_are_written():
+    from scripts.batch_questions import read_questions, run_questions
+
+    llm = SlowLLM()
+    with tempfile.TemporaryDirectory() as tmp:
+        path, output = os.path.join(tmp, 'questions.jsonl'), os.path.join(tmp, 'answers.jsonl')
+        write_lines(path, [{'id': f"p{i}", 'question': f"căn hộ {i}", 'budget': i} for i in range(12)])
+        summary = run_questions(make_chain(llm), read_questions(path), output, max_concurrency=3, progress_every=0)
+        records = read_records(output)
+
+    assert summary['answered'] == 12 and summary['failed'] == summary['skipped'] == 0
+    assert sorted(record['id'] for record in records) == sorted(f"p{i}" for i in range(12))
+    for record in records:
+        assert record['answer'] == f"Trả lời: {record['question']}"
+        assert record['budget'] == int(record['id'][1:])
+        assert len(record['listing_ids']) == 2
+        assert record['latency_seconds'] >= llm.delay
+    assert llm.max_active == 3
+
+
+def test_resume_skips_answered_and_retries_failed():
+    from scripts.batch_questions import read_questions, run_questions
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path, output = os.path.join(tmp, 'questions.jsonl'), os.path.join(tmp, 'answers.jsonl')
+        write_lines(path, [{'id': i, 'question': f"nhà {i}"} for i in range(6)])
+        items = read_questions(path)
+
+        first = run_questions(make_chain(SlowLLM(fail={'nhà 4'}, delay=0)), items[:5], output, progress_every=0)
+        assert (first['answered'], first['failed']) == (4, 1)
+        # A crash while writing the next line leaves half a record behind
+        with open(output, 'a', encoding='utf-8') as f:
+            f.write('{"id": 5, "question": "nh')
+
+        llm = SlowLLM(delay=0)
+        second = run_questions(make_chain(llm), items, output, progress_every=0)
+        assert second == {**second, 'skipped': 4, 'answered': 2, 'failed': 0}
+        assert sorted(llm.asked) == ['nhà 4', 'nhà 5']
+        records = read_records(output)
+
+    assert len(records) == 7
+    last = {record['id']: record for record in records}
+    assert all('answer' in record for record in last.values()) and len(last) == 6
+    errors = [record for record in records if 'error' in record]
+    assert [record['id'] for record in errors] == [4]
+    assert errors[0]['error'] == 'RuntimeError: LLM unavailable'
+
+
+if __name__ == "__main__":
+    test_read_questions()
+    test_answers_ids_and_latency_are_written()
+    test_resume_skips_answered_and_retries_failed()
+    print("✅ Batch question tests passed")
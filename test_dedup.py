@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script for near-duplicate listing detection (MinHash/LSH)
+"""
+
+import contextlib
+import io
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+DESCRIPTION = ("Bán nhà phố hẻm xe hơi 4x16m, 1 trệt 2 lầu, 3 phòng ngủ, 3 WC, sân thượng rộng, "
+               "gần chợ và trường học, sổ hồng chính chủ, khu dân trí cao an ninh tốt")
+
+
+def listings():
+    """Re-posts of one house next to look-alikes that must stay separate"""
+    same = {'address': '160 Võ Văn Kiệt, P.Cầu Ông Lãnh, Quận 1', 'area': 64.0, 'price': 12_000_000_000,
+            'transaction_type': 'Cần bán'}
+    rows = [
+        {**same, 'id': 'original', 'description': DESCRIPTION, 'update_date': '2025-03-01'},
+        {**same, 'id': 'edited', 'description': DESCRIPTION.replace('gần chợ', 'gần siêu thị') + ', LH ngay',
+         'update_date': '2025-04-01', 'address': '160  võ văn kiệt, P.Cầu Ông Lãnh, Quận 1'},
+        {**same, 'id': 'copy', 'description': DESCRIPTION.upper(), 'update_date': '2025-02-01'},
+        {**same, 'id': 'other_house', 'description': "Căn góc 2 mặt tiền, nội thất cao cấp, thang máy, "
+                                                     "phù hợp làm văn phòng công ty", 'update_date': '2025-05-01'},
+        {**same, 'id': 'new_price', 'price': 11_500_000_000, 'description': DESCRIPTION, 'update_date': '2025-05-01'},
+        {**same, 'id': 'for_rent', 'transaction_type': 'Cho thuê', 'description': DESCRIPTION,
+         'update_date': '2025-05-01'},
+        {**same, 'id': 'no_description_1', 'description': None, 'update_date': '2025-01-01'},
+        {**same, 'id': 'no_description_2', 'description': None, 'update_date': '2025-01-01'},
+    ]
+    return pd.DataFrame(rows)
+
+
+def test_reposts_cluster_on_the_latest_row():
+    from utils.dedup import find_duplicate_clusters
+
+    df = listings()
+    labels = find_duplicate_clusters(df)
+    clusters = {df['id'][position]: df['id'][label] for position, label in enumerate(labels)}
+    assert clusters['original'] == clusters['edited'] == clusters['copy'] == 'edited'
+    for listing_id in ['other_house', 'new_price', 'for_rent', 'no_description_1', 'no_description_2']:
+        assert clusters[listing_id] == listing_id
+
+
+def test_deduplicate_listings_reports_clusters():
+    from utils.dedup import deduplicate_listings
+
+    deduplicated, stats = deduplicate_listings(listings())
+    assert deduplicated['id'].tolist() == ['edited', 'other_house', 'new_price', 'for_rent',
+                                           'no_description_1', 'no_description_2']
+    assert deduplicated['duplicate_count'].tolist() == [2, 0, 0, 0, 0, 0]
+    assert deduplicated.index.equals(pd.RangeIndex(6))
+    assert stats == {**stats, 'rows': 8, 'clusters': 6, 'duplicates': 2, 'duplicate_clusters': 1, 'largest_cluster': 3}
+
+
+def test_minhash_estimates_jaccard():
+    from utils.dedup import minhash_signatures, shingle_hashes
+
+    edited = DESCRIPTION.replace('3 phòng ngủ', '4 phòng ngủ')
+    a, b = set(shingle_hashes(DESCRIPTION).tolist()), set(shingle_hashes(edited).tolist())
+    jaccard = len(a & b) / len(a | b)
+    signatures = minhash_signatures([DESCRIPTION, edited, "căn hộ studio quận 7"], num_perm=256)
+    assert abs((signatures[0] == signatures[1]).mean() - jaccard) < 0.1
+    assert (signatures[0] == signatures[2]).mean() < 0.1
+    assert np.array_equal(signatures, minhash_signatures([DESCRIPTION, edited, "căn hộ studio quận 7"], num_perm=256))
+
+
+def test_connected_components():
+    from utils.dedup import connected_components
+
+    edges = np.array([[5, 4], [4, 3], [1, 2], [3, 0]])
+    assert connected_components(7, edges).tolist() == [0, 1, 1, 0, 0, 0, 6]
+
+
+def test_landsoft_export_copies_are_folded():
+    """The generator's copied rows are found, and every folded row repeats its canonical listing"""
+    from scripts.generate_sample_data import generate_landsoft_data
+    from utils.data_loader import process_landsoft_data
+    from utils.dedup import find_duplicate_clusters
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = process_landsoft_data(generate_landsoft_data(5000, seed=2, duplicate_rate=0.1))
+    labels = find_duplicate_clusters(df)
+    folded = np.flatnonzero(labels != np.arange(len(df)))
+    product_ids = df['product_id'].to_numpy()
+    assert len(folded) > 200
+    assert (product_ids[folded] == product_ids[labels[folded]]).all()
+    # Exact copies (same price and description) all end up with one canonical row
+    copies = df.duplicated(['product_id', 'price', 'description'], keep=False) & df['description'].notna()
+    groups = pd.Series(labels[copies.to_numpy()]).groupby(df.loc[copies, 'product_id'].to_numpy()).nunique()
+    assert (groups == 1).all()
+
+
+if __name__ == "__main__":
+    test_reposts_cluster_on_the_latest_row()
+    test_deduplicate_listings_reports_clusters()
+    test_minhash_estimates_jaccard()
+    test_connected_components()
+    test_landsoft_export_copies_are_folded()
+    print("✅ Dedup tests passed")
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Test script for the persistent embedding cache
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from langchain_core.embeddings import Embeddings
+
+
+class CountingEmbeddings(Embeddings):
+    """Deterministic fake backend that records every text it embeds"""
+
+    def __init__(self):
+        self.calls = []
+
+    def embed_documents(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), float(sum(map(ord, text)) % 97), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        return self.embed_documents([text])[0]
+
+
+def test_only_misses_reach_backend():
+    """Second build with one changed listing embeds only that listing"""
+    from utils.embedding_cache import CachedEmbeddings
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, 'embeddings.sqlite3')
+        backend = CountingEmbeddings()
+        cache = CachedEmbeddings(backend, model_name='fake-model', cache_path=cache_path)
+        first = cache.embed_documents(['căn hộ Q7', 'nhà phố Q1', 'căn hộ Q7'])
+        assert backend.calls == [['căn hộ Q7', 'nhà phố Q1']]
+        cache.close()
+
+        # New instance on the same file = next day's rebuild
+        backend = CountingEmbeddings()
+        cache = CachedEmbeddings(backend, model_name='fake-model', cache_path=cache_path)
+        second = cache.embed_documents(['căn hộ Q7', 'nhà phố Q1 (đã giảm giá)'])
+        assert backend.calls == [['nhà phố Q1 (đã giảm giá)']]
+        assert second[0] == first[0]
+        stats = cache.stats()
+        assert stats['hits'] == 1 and stats['misses'] == 1
+        cache.close()
+
+
+def test_model_is_part_of_key():
+    from utils.embedding_cache import embedding_cache_key
+
+    assert embedding_cache_key('model-a', 'text') != embedding_cache_key('model-b', 'text')
+
+
+def test_lru_eviction():
+    """Entries beyond max_entries are evicted oldest-first"""
+    from utils.embedding_cache import CachedEmbeddings
+
+    backend = CountingEmbeddings()
+    cache = CachedEmbeddings(backend, model_name='fake-model', cache_path=':memory:', max_entries=2)
+    cache.embed_documents(['a'])
+    cache.embed_documents(['b'])
+    cache.embed_documents(['c'])
+    assert cache.stats()['entries'] == 2
+
+    backend.calls.clear()
+    cache.embed_documents(['c', 'a'])
+    assert backend.calls == [['a']]
+
+
+class SlowEmbeddings(CountingEmbeddings):
+    """Backend that takes `delay` seconds per call and records how many calls overlap"""
+
+    def __init__(self, delay=0.2):
+        super().__init__()
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+
+    def embed_documents(self, texts):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        self.active -= 1
+        return [[0.1 * len(text), 1 / 3, 1.0] for text in super().embed_documents(texts)]
+
+
+def test_misses_and_hits_return_the_same_vector():
+    from utils.embedding_cache import CachedEmbeddings
+
+    cache = CachedEmbeddings(SlowEmbeddings(delay=0), model_name='fake-model', cache_path=':memory:')
+    miss = cache.embed_documents(['căn hộ Q7', 'căn hộ Q7'])
+    hit = cache.embed_documents(['căn hộ Q7'])
+    assert miss == [hit[0], hit[0]]
+    assert cache.stats()['misses'] == 1 and cache.stats()['hits'] == 2
+
+
+def test_concurrent_callers_are_not_serialized():
+    """Different texts are embedded in parallel; the same text only once"""
+    from utils.embedding_cache import CachedEmbeddings
+
+    backend = SlowEmbeddings()
+    cache = CachedEmbeddings(backend, model_name='fake-model', cache_path=':memory:')
+    batches = [['nhà phố Q1'], ['căn hộ Q7'], ['căn hộ Q7'], ['đất Thủ Đức']]
+    results = [None] * len(batches)
+
+    def embed(number):
+        results[number] = cache.embed_documents(batches[number])
+
+    threads = [threading.Thread(target=embed, args=(number,)) for number in range(len(batches))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert backend.max_active > 1
+    assert sorted(text for call in backend.calls for text in call) == ['căn hộ Q7', 'nhà phố Q1', 'đất Thủ Đức']
+    assert results[1] == results[2]
+
+
+if __name__ == "__main__":
+    test_only_misses_reach_backend()
+    test_model_is_part_of_key()
+    test_lru_eviction()
+    test_misses_and_hits_return_the_same_vector()
+    test_concurrent_callers_are_not_serialized()
+    print("✅ Embedding cache tests passed")
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Test script for the batched, rate-limited embedding executor
+
+Runs OpenAIEmbeddings against a local stub of the /v1/embeddings endpoint
+that rate limits the first requests and records concurrency.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+
+def vector_for(text):
+    return [float(len(text)), float(sum(map(ord, text)) % 997)]
+
+
+class StubEmbeddingServer:
+    """OpenAI-compatible embeddings endpoint on localhost"""
+
+    def __init__(self, fail_first=0, delay=0.05):
+        self.fail_first = fail_first
+        self.delay = delay
+        self.requests = 0
+        self.batch_sizes = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, payload, headers=None):
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                with stub.lock:
+                    stub.requests += 1
+                    rate_limited = stub.requests <= stub.fail_first
+                    stub.active += 1
+                    stub.max_active = max(stub.max_active, stub.active)
+                try:
+                    time.sleep(stub.delay)
+                    if rate_limited:
+                        self._reply(429, {'error': {'message': 'Rate limit reached', 'type': 'requests'}},
+                                    {'retry-after': '0.01'})
+                        return
+                    texts = request['input']
+                    with stub.lock:
+                        stub.batch_sizes.append(len(texts))
+                    self._reply(200, {
+                        'object': 'list',
+                        'model': request['model'],
+                        'data': [{'object': 'embedding', 'index': i, 'embedding': vector_for(text)}
+                                 for i, text in enumerate(texts)],
+                        'usage': {'prompt_tokens': 0, 'total_tokens': 0},
+                    })
+                finally:
+                    with stub.lock:
+                        stub.active -= 1
+
+        return Handler
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def openai_backend(base_url):
+    from langchain_openai import OpenAIEmbeddings
+
+    # Token-id splitting needs a tiktoken download; the stub takes plain strings
+    return OpenAIEmbeddings(model='text-embedding-3-small', base_url=base_url, api_key='test',
+                            max_retries=0, check_embedding_ctx_length=False)
+
+
+def test_concurrent_batches_keep_order():
+    from utils.embedding_executor import EmbeddingExecutor
+
+    texts = [f"căn hộ {i} quận {i % 12}" for i in range(100)]
+    with StubEmbeddingServer(delay=0.05) as stub:
+        executor = EmbeddingExecutor(openai_backend(stub.base_url), batch_size=10, max_workers=4,
+                                     tokens_per_minute=None)
+        with contextlib.redirect_stdout(io.StringIO()):
+            vectors = executor.embed_documents(texts)
+
+    assert vectors == [vector_for(text) for text in texts]
+    assert sorted(stub.batch_sizes) == [10] * 10
+    assert stub.max_active > 1
+    assert executor.stats()['texts'] == 100
+
+
+def test_rate_limited_requests_are_retried():
+    from utils.embedding_executor import EmbeddingExecutor
+
+    texts = [f"nhà phố {i}" for i in range(30)]
+    with StubEmbeddingServer(fail_first=3, delay=0.0) as stub:
+        executor = EmbeddingExecutor(openai_backend(stub.base_url), batch_size=10, max_workers=2,
+                                     tokens_per_minute=None, max_retries=5, backoff=0.01)
+        with contextlib.redirect_stdout(io.StringIO()):
+            vectors = executor.embed_documents(texts)
+            query = executor.embed_query('biệt thự')
+
+    assert vectors == [vector_for(text) for text in texts]
+    assert query == vector_for('biệt thự')
+    assert executor.stats()['retries'] == 3
+    assert stub.requests == 3 + 3 + 1
+
+
+def test_non_retryable_errors_are_raised():
+    from utils.embedding_executor import EmbeddingExecutor
+
+    class Broken:
+        calls = 0
+
+        def embed_documents(self, texts):
+            Broken.calls += 1
+            raise ValueError('bad input')
+
+    executor = EmbeddingExecutor(Broken(), batch_size=5, max_workers=1, tokens_per_minute=None, backoff=0)
+    try:
+        executor.embed_documents(['a', 'b'])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('expected ValueError')
+    assert Broken.calls == 1
+
+
+def test_token_budget_throttles():
+    from utils.embedding_executor import TokenBucket
+
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    bucket = TokenBucket(600, clock=lambda: now[0], sleep=sleep)  # 10 tokens/s
+    assert bucket.acquire(600) == 0
+    assert abs(bucket.acquire(50) - 5.0) < 1e-9
+    # Bigger than the bucket: waits for a full bucket instead of forever
+    assert abs(bucket.acquire(10_000) - 60.0) < 1e-9
+    assert abs(now[0] - 65.0) < 1e-9
+
+
+def test_executor_spends_budget_per_batch():
+    from utils.embedding_executor import EmbeddingExecutor
+    from test_vector_sync import CountingEmbeddings
+
+    executor = EmbeddingExecutor(CountingEmbeddings(), batch_size=4, max_workers=1,
+                                 tokens_per_minute=60, token_counter=lambda text: 1)
+    waits = []
+    acquire = executor.bucket.acquire
+    executor.bucket.acquire = lambda tokens: waits.append(tokens) or acquire(tokens)
+    with contextlib.redirect_stdout(io.StringIO()):
+        executor.embed_documents(['x'] * 10)
+    assert waits == [4, 4, 2]
+
+
+if __name__ == "__main__":
+    test_concurrent_batches_keep_order()
+    test_rate_limited_requests_are_retried()
+    test_non_retryable_errors_are_raised()
+    test_token_budget_throttles()
+    test_executor_spends_budget_per_batch()
+    print("✅ Embedding executor tests passed")
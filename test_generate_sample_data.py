@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script for the vectorized sample data generator
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+
+def test_cleaned_layout_matches_sample_csv():
+    from scripts.generate_sample_data import generate_real_estate_data
+
+    sample = pd.read_csv(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'sample_real_estate.csv'))
+    df = generate_real_estate_data(500, seed=1)
+    assert df.columns.tolist() == sample.columns.tolist()
+    assert df['id'].is_unique and df['id'].iloc[0] == 'SP001'
+    assert (df['price'] >= 3_000_000_000).all()
+    assert df.apply(lambda row: row['address'].endswith(f"{row['ward']}, {row['district']}, TP.HCM"), axis=1).all()
+    assert generate_real_estate_data(500, seed=1).equals(df)
+
+
+def test_landsoft_layout_is_seeded():
+    from scripts.generate_sample_data import LANDSOFT_COLUMNS, generate_landsoft_data
+
+    df = generate_landsoft_data(2000, seed=4)
+    assert df.columns.tolist() == LANDSOFT_COLUMNS
+    assert df['Gallery'].tolist() == list(range(1, 2001))
+    assert generate_landsoft_data(2000, seed=4).equals(df)
+    assert not generate_landsoft_data(2000, seed=5).equals(df)
+
+
+def test_price_texts_parse_back():
+    from scripts.generate_sample_data import _rent_price_texts, _sale_price_texts
+    from utils.price_parser import parse_prices
+
+    rng = np.random.default_rng(0)
+    price = rng.integers(30, 1600, 20_000) * 100_000_000
+    texts, negotiable = _sale_price_texts(rng, price)
+    assert len(set(texts)) > 100
+    assert (parse_prices(pd.Series(texts)).to_numpy() == np.where(negotiable, 0, price)).all()
+
+    texts, rents = _rent_price_texts(rng, 5000)
+    assert (parse_prices(pd.Series(texts)).to_numpy() == rents).all()
+
+
+def test_duplicates_repeat_earlier_listings():
+    from scripts.generate_sample_data import generate_landsoft_data
+
+    df = generate_landsoft_data(5000, seed=0, duplicate_rate=0.1)
+    repeated = df['Mã sản phẩm'].duplicated()
+    assert 0.07 < repeated.mean() < 0.13
+    # Exact copies keep every column but Gallery; re-posts get a later update date
+    columns = [column for column in df.columns if column not in ('Gallery', 'Ngày cập nhật', 'Tổng giá text')]
+    assert df.loc[repeated, columns].merge(df.loc[~repeated, columns], how='left', indicator=True)['_merge'] \
+        .eq('both').all()
+    assert generate_landsoft_data(5000, seed=0, duplicate_rate=0)['Mã sản phẩm'].is_unique
+
+
+def test_landsoft_export_is_processed():
+    from scripts.generate_sample_data import generate_landsoft_data, write_frame
+    from utils.data_loader import load_data, process_landsoft_data
+
+    df = generate_landsoft_data(300, seed=2)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'landsoft_export.xlsx')
+        write_frame(df, path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            processed = process_landsoft_data(load_data('excel', file_path=path))
+    assert len(processed) == 300
+    assert (processed['price'] > 0).mean() > 0.8
+    assert processed['district'].notna().all()
+
+
+if __name__ == "__main__":
+    test_cleaned_layout_matches_sample_csv()
+    test_landsoft_layout_is_seeded()
+    test_price_texts_parse_back()
+    test_duplicates_repeat_earlier_listings()
+    test_landsoft_export_is_processed()
+    print("✅ Sample data generator tests passed")
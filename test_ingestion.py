@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test script for chunked (streaming) ingestion
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import tracemalloc
+import uuid
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from scripts.generate_sample_data import generate_landsoft_data
+from test_vector_sync import CountingEmbeddings
+
+
+def collect(batches):
+    ids, texts, metadatas = [], [], []
+    for batch_ids, batch_texts, batch_metadatas in batches:
+        ids += batch_ids
+        texts += batch_texts
+        metadatas += batch_metadatas
+    return ids, texts, metadatas
+
+
+def write_upload(tmp, raw):
+    """Save a LandSoft frame the way the app saves uploads (xlsx content, '.excel' suffix)"""
+    path = os.path.join(tmp, 'upload.excel')
+    raw.to_excel(path + '.xlsx', index=False)
+    os.rename(path + '.xlsx', path)
+    return path
+
+
+def full_load(path):
+    from ai_agent import process_data
+    from utils.data_loader import process_landsoft_data
+
+    with open(path, 'rb') as f, contextlib.redirect_stdout(io.StringIO()):
+        return process_data(process_landsoft_data(pd.read_excel(f)), 'excel', verbose=False)
+
+
+def test_xlsx_chunks_match_full_load():
+    from ai_agent import iter_listing_batches
+    from utils.text_builder import build_listing_metadata
+    from utils.vector_sync import make_document_ids
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_upload(tmp, generate_landsoft_data(2500, seed=5))
+        df = full_load(path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            ids, texts, metadatas = collect(iter_listing_batches('excel', path, chunk_size=700))
+
+    assert ids == make_document_ids(df)
+    assert texts == df['text'].tolist()
+    assert metadatas == build_listing_metadata(df)
+
+
+def test_ids_ignore_chunk_dtypes():
+    """Blank rows make the whole-file id column float, but not every chunk's"""
+    from ai_agent import iter_listing_batches
+    from utils.vector_sync import make_document_ids
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raw = generate_landsoft_data(1000, seed=6)
+        raw.loc[[10, 11], :] = None
+        path = write_upload(tmp, raw)
+        df = full_load(path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            ids = collect(iter_listing_batches('excel', path, chunk_size=300))[0]
+
+    assert df['id'].dtype == float
+    assert ids == make_document_ids(df)
+    assert ids[:3] == ['1', '2', '3']
+
+
+def test_csv_ids_are_deterministic_across_chunks():
+    from ai_agent import iter_listing_batches
+    from utils.vector_sync import make_document_ids
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'listings.csv')
+        df = pd.read_csv(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'sample_real_estate.csv'))
+        pd.concat([df, df, df], ignore_index=True).to_csv(path, index=False)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            small = collect(iter_listing_batches('csv', path, chunk_size=7))[0]
+            large = collect(iter_listing_batches('csv', path, chunk_size=1000))[0]
+        assert small == large == make_document_ids(pd.read_csv(path))
+        assert len(set(small)) == len(small)
+
+
+def test_streamed_sync_matches_full_sync():
+    from langchain_community.vectorstores import Chroma
+    from utils.vector_sync import sync_vector_store, sync_vector_store_batches
+
+    ids = [str(i) for i in range(25)]
+    texts = [f"căn hộ {i}" for i in range(25)]
+    backend = CountingEmbeddings()
+    store = Chroma(collection_name=f"test_ingest_{uuid.uuid4().hex}", embedding_function=backend)
+    sync_vector_store(store, ids + ['old'], texts + ['nhà cũ'])
+
+    texts[3] = 'căn hộ 3 - giảm giá'
+    batches = ((ids[i:i + 10], texts[i:i + 10], None) for i in range(0, 25, 10))
+    stats = sync_vector_store_batches(store, batches)
+    assert stats == {'added': 0, 'updated': 1, 'deleted': 1, 'unchanged': 24}
+    assert backend.embedded == 27
+
+
+def _peak_bytes(path, chunk_size):
+    from ai_agent import iter_listing_batches
+
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in iter_listing_batches('csv', path, chunk_size=chunk_size):
+            pass
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def test_peak_memory_does_not_grow_with_file():
+    from utils.data_loader import process_landsoft_data
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for num_rows in (2000, 8000):
+            path = os.path.join(tmp, f'listings_{num_rows}.csv')
+            with contextlib.redirect_stdout(io.StringIO()):
+                process_landsoft_data(generate_landsoft_data(num_rows)).to_csv(path, index=False)
+            paths.append(path)
+        assert _peak_bytes(paths[1], 500) < 1.5 * _peak_bytes(paths[0], 500)
+
+
+if __name__ == "__main__":
+    test_xlsx_chunks_match_full_load()
+    test_ids_ignore_chunk_dtypes()
+    test_csv_ids_are_deterministic_across_chunks()
+    test_streamed_sync_matches_full_sync()
+    test_peak_memory_does_not_grow_with_file()
+    print("✅ Ingestion tests passed")
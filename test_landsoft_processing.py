@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Equivalence test: vectorized process_landsoft_data vs the original row-wise version
+"""
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+
+def assert_same_output(raw_df, check_price=True):
+    from legacy_reference import legacy_process_landsoft_data
+    from utils.data_loader import process_landsoft_data
+
+    expected = legacy_process_landsoft_data(raw_df)
+    actual = process_landsoft_data(raw_df)
+    if not check_price:
+        expected, actual = expected.drop(columns=['price']), actual.drop(columns=['price'])
+    pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_sample_landsoft_file():
+    from utils.data_loader import load_data
+    assert_same_output(load_data(source_type='excel'))
+
+
+def test_synthetic_export_with_missing_values():
+    from scripts.generate_sample_data import generate_landsoft_data
+    # Generated exports use price formats ('4,5 tỷ', '6.500.000.000') the row-wise
+    # parser misread; prices are covered by test_price_parser
+    assert_same_output(generate_landsoft_data(2000, seed=7), check_price=False)
+
+
+def test_edge_cases():
+    """Missing optional columns, mixed date cells, numeric descriptions and empty addresses"""
+    raw_df = pd.DataFrame({
+        'Mã sản phẩm': ['A1', None, 'A3', 'A4', 'A5'],
+        'Diễn giải': ['Căn hộ 2 phòng ngủ, 3PN, WC', np.nan, 1234, 'VILLA 4 bedroom hồ bơi', ''],
+        'Ngày ĐK': ['20/08/2025', pd.Timestamp('2025-08-21 10:00'), None, pd.NaT, 45000],
+        'Nhu cầu': ['Cho thuê', 'Cần bán', None, 'Cho thuê', 'Cần thuê'],
+    })
+    assert_same_output(raw_df)
+
+
+if __name__ == "__main__":
+    test_sample_landsoft_file()
+    test_synthetic_export_with_missing_values()
+    test_edge_cases()
+    print("✅ Vectorized LandSoft processing matches the row-wise version")
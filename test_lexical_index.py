@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test script for the BM25 lexical index and hybrid retrieval
+"""
+
+import math
+import os
+import sys
+import uuid
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+CORPUS = [
+    'Mã SP: LS-00123 Căn hộ Quận 7, P.Tân Phong, 25 Nguyễn Văn Linh, 2PN',
+    'Mã SP: LS-00124 Nhà phố Quận 3, P.06, 12 Võ Văn Tần, 4 phòng ngủ',
+    'Mã SP: LS-00125 Biệt thự Quận 2, P.Thảo Điền, hồ bơi, 5PN',
+    'Mã SP: LS-00126 Căn hộ Quận 1, P.Bến Nghé, 2PN, view sông',
+    'Mã SP: LS-00127 Văn phòng Quận 3, P.6, 80 Võ Văn Tần, cho thuê',
+    'Mã SP: LS-00128 Đất nền Huyện Nhà Bè, sổ hồng riêng',
+]
+
+
+class ConstantEmbeddings(Embeddings):
+    def embed_documents(self, texts):
+        return [[1.0, 0.0, 0.0] for _ in texts]
+
+    def embed_query(self, text):
+        return [1.0, 0.0, 0.0]
+
+
+def brute_force_bm25(texts, query, k1=1.5, b=0.75):
+    from utils.lexical_index import tokenize
+
+    docs = [tokenize(text) for text in texts]
+    avg_length = sum(map(len, docs)) / len(docs)
+    scores = []
+    for doc in docs:
+        score = 0.0
+        for term in dict.fromkeys(tokenize(query)):
+            tf = doc.count(term)
+            if tf:
+                df = sum(term in other for other in docs)
+                idf = math.log1p((len(docs) - df + 0.5) / (df + 0.5))
+                score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(doc) / avg_length))
+        scores.append(score)
+    return scores
+
+
+def test_tokenize():
+    from utils.lexical_index import tokenize
+
+    assert tokenize('Võ Văn Tần, Quận 3') == ['vo', 'van', 'tan', 'quan', '3']
+    assert tokenize('Q7 2PN P.07 LS-00123') == ['q', '7', '2', 'pn', 'p', '7', 'ls', '123']
+    assert tokenize('Đường số 9 — 0 đ') == ['duong', 'so', '9', '0', 'd']
+
+
+def test_search_matches_brute_force():
+    """Scores equal a direct BM25 computation, with and without impact tiers"""
+    from utils.lexical_index import LexicalIndex
+
+    texts = CORPUS * 5
+    for tier_size in (1000, 2):
+        index = LexicalIndex(texts, tier_size=tier_size, chunk_size=7)
+        for query in ['võ văn tần', 'căn hộ 2pn quận 7', 'LS-00126', 'phường 6', 'hồ bơi thảo điền']:
+            expected = brute_force_bm25(texts, query)
+            for position, score in index.search(query, k=5):
+                assert abs(score - expected[position]) < 1e-4
+            best = max(expected)
+            assert abs(index.search(query, k=1)[0][1] - best) < 1e-4
+
+
+def test_search_finds_codes_and_streets():
+    from utils.lexical_index import LexicalIndex
+
+    index = LexicalIndex(CORPUS)
+    assert index.search('LS-00125', k=1)[0][0] == 2
+    assert {position for position, _ in index.search('Vo Van Tan', k=2)} == {1, 4}
+    assert index.search('xyz không có', k=3) == []
+    assert index.search('', k=3) == []
+
+
+def test_fallback_tokenizer_builds_same_index():
+    """The pure pandas path (no pyarrow) gives identical postings and weights"""
+    import utils.lexical_index as lexical_index
+
+    texts = pd.Series(CORPUS + ['—', '', 'İstanbul 0012 m²'])
+    arrow_index = lexical_index.LexicalIndex(texts, chunk_size=3)
+    saved, lexical_index.pa = lexical_index.pa, None
+    try:
+        plain_index = lexical_index.LexicalIndex(texts, chunk_size=3)
+    finally:
+        lexical_index.pa = saved
+
+    assert arrow_index.vocabulary == plain_index.vocabulary
+    assert np.array_equal(arrow_index.postings, plain_index.postings)
+    assert np.allclose(arrow_index.weights, plain_index.weights)
+
+
+def test_reciprocal_rank_fusion():
+    from utils.retrieval import reciprocal_rank_fusion
+
+    def docs(*ids):
+        return [Document(page_content=doc_id, metadata={'id': doc_id}) for doc_id in ids]
+
+    fused = reciprocal_rank_fusion([docs('a', 'b', 'c'), docs('c', 'd', 'a')])
+    assert [doc.metadata['id'] for doc in fused] == ['a', 'c', 'b', 'd']
+
+
+def test_hybrid_retriever():
+    from langchain_community.vectorstores import Chroma
+    from utils.lexical_index import LexicalIndex
+    from utils.retrieval import ListingRetriever
+
+    ids = [f"LS-{123 + position:05d}" for position in range(len(CORPUS))]
+    metadatas = [{'district_key': key} for key in ['7', '3', '2', '1', '3', 'nhabe']]
+    store = Chroma(collection_name=f"test_hybrid_{uuid.uuid4().hex}", embedding_function=ConstantEmbeddings())
+    store.add_texts(texts=CORPUS, metadatas=[{**meta, 'id': doc_id} for doc_id, meta in zip(ids, metadatas)], ids=ids)
+    index = LexicalIndex(CORPUS, ids=ids, metadatas=metadatas)
+
+    # Vector similarity cannot tell listings apart here; BM25 brings in both street matches
+    retriever = ListingRetriever(vector_store=store, lexical_index=index, k=4, fetch_k=2, use_filters=False)
+    assert {'LS-00124', 'LS-00127'} <= {doc.metadata['id'] for doc in retriever.invoke('Võ Văn Tần')}
+
+    # Keyword hits outside the requested district are dropped
+    retriever = ListingRetriever(vector_store=store, lexical_index=index, k=1, fetch_k=3)
+    assert [doc.metadata['id'] for doc in retriever.invoke('Võ Văn Tần ở quận 7')] == ['LS-00123']
+
+
+if __name__ == "__main__":
+    test_tokenize()
+    test_search_matches_brute_force()
+    test_search_finds_codes_and_streets()
+    test_fallback_tokenizer_builds_same_index()
+    test_reciprocal_rank_fusion()
+    test_hybrid_retriever()
+    print("✅ Lexical index tests passed")
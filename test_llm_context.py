@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script for the lean listing text and the token-budgeted LLM context
+"""
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from langchain_core.documents import Document
+
+LONG_DESCRIPTION = ("Nhà phố hẻm xe hơi, yên tĩnh, an ninh tốt. Gần trường học, bệnh viện, siêu thị. "
+                    "Thiết kế hiện đại, nhiều ánh sáng tự nhiên, sân thượng rộng. ") * 12
+
+
+def landsoft_listings(rows=50):
+    from scripts.generate_sample_data import generate_landsoft_data
+    from utils.data_loader import process_landsoft_data
+    from utils.text_builder import build_listing_metadata, build_listing_texts
+
+    df = process_landsoft_data(generate_landsoft_data(rows, seed=5))
+    df['description'] = df['description'].astype(object)
+    df.loc[df.index % 2 == 0, 'description'] = LONG_DESCRIPTION
+    df['text'] = build_listing_texts(df)
+    df['metadata'] = build_listing_metadata(df)
+    return df
+
+
+def test_lean_text_has_no_indentation_or_empty_lines():
+    df = landsoft_listings()
+    for text, owner in zip(df['text'], df['owner']):
+        lines = text.split('\n')
+        assert all(line and not line[0].isspace() for line in lines)
+        assert any(line.startswith('Chủ nhà: ') for line in lines) == isinstance(owner, str)
+
+
+def test_context_is_rendered_from_metadata():
+    from utils.llm_context import format_context
+
+    df = landsoft_listings()
+    row = df.iloc[1]
+    # The embedded text plays no part: only the metadata is shown
+    context = format_context([Document(page_content='không liên quan', metadata=row['metadata'])],
+                             token_budget=100_000)
+    assert 'không liên quan' not in context
+    assert context.startswith(f"[1] Mã SP: {row['id']}")
+    assert row['metadata']['area_text'] in context and row['metadata']['address'] in context
+    assert context.endswith(' '.join(str(row['description']).split()))
+    # Documents without listing metadata fall back to their text
+    assert format_context([Document(page_content='Nhà  đẹp')]) == '[1]\nMô tả: Nhà đẹp'
+
+
+def test_compact_price():
+    from utils.llm_context import compact_price
+
+    assert compact_price('21,000,000,000 VND') == '21 tỷ'
+    assert compact_price('6,850,000,000 VND') == '6.85 tỷ'
+    assert compact_price('50,000,000 VND') == '50 triệu'
+    assert compact_price('800,000 VND') == '800,000 VND'
+    assert compact_price('Thương lượng') == 'Thương lượng'
+
+
+def test_context_fits_budget_and_keeps_rank_order():
+    from utils.embedding_executor import estimate_tokens
+    from utils.llm_context import format_context
+
+    df = landsoft_listings()
+    documents = [Document(page_content=text, metadata=metadata)
+                 for text, metadata in zip(df['text'][:3], df['metadata'][:3])]
+    unlimited = format_context(documents, token_budget=100_000)
+    assert LONG_DESCRIPTION.strip() in unlimited
+
+    context = format_context(documents, token_budget=400)
+    assert estimate_tokens(context) <= 400
+    blocks = context.split('\n\n')
+    assert [block.split(' ', 1)[0] for block in blocks] == ['[1]', '[2]', '[3]']
+    assert all(f"Mã SP: {listing_id}" in block for listing_id, block in zip(df['id'], blocks))
+    # The long descriptions are cut at a word, the short one is kept whole
+    assert blocks[0].endswith('…') and blocks[2].endswith('…')
+    assert blocks[1].endswith(' '.join(str(df['description'].iloc[1]).split()))
+
+    # Too small for every listing's fields: the lowest ranked ones go first
+    tight = format_context(documents, token_budget=60)
+    assert tight.startswith('[1] ') and '[2]' not in tight
+    assert format_context([]) == "Không có sản phẩm nào khớp với câu hỏi."
+
+
+def test_chain_prompt_uses_compact_context():
+    from langchain_core.runnables import RunnableLambda
+    from ai_agent import build_chain
+    from test_numpy_vector_store import make_store
+    from utils.retrieval import ListingRetriever
+
+    prompts = []
+
+    def llm(prompt):
+        prompts.append(prompt.to_messages()[0].content)
+        return "ok"
+
+    chain = build_chain(ListingRetriever(vector_store=make_store(), k=2), llm=RunnableLambda(llm))
+    assert chain.invoke("căn hộ quận 7") == "ok"
+    assert '[1]' in prompts[0] and '[2]' in prompts[0]
+    assert 'page_content' not in prompts[0] and 'metadata' not in prompts[0]
+
+
+if __name__ == "__main__":
+    test_lean_text_has_no_indentation_or_empty_lines()
+    test_context_is_rendered_from_metadata()
+    test_compact_price()
+    test_context_fits_budget_and_keeps_rank_order()
+    test_chain_prompt_uses_compact_context()
+    print("✅ LLM context tests passed")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test script for the local (hashed character n-gram) embedding provider
+"""
+
+import os
+import sys
+import uuid
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+
+def test_vectors_are_normalized_and_deterministic():
+    from utils.local_embeddings import HashedNgramEmbeddings
+
+    texts = ['Căn hộ 2PN Quận 7', 'Nhà phố Bình Thạnh, sổ hồng', '']
+    vectors = HashedNgramEmbeddings(dimensions=256).embed_array(texts)
+    again = HashedNgramEmbeddings(dimensions=256).embed_array(texts)
+
+    assert vectors.shape == (3, 256) and vectors.dtype == np.float32
+    assert np.array_equal(vectors, again)
+    assert np.allclose(np.linalg.norm(vectors[:2], axis=1), 1.0)
+    assert not vectors[2].any()
+
+
+def test_batching_does_not_mix_texts():
+    from utils.local_embeddings import HashedNgramEmbeddings
+
+    texts = [f"căn hộ {i} phòng ngủ quận {i % 12}" for i in range(50)] + ['a', 'bc']
+    embeddings = HashedNgramEmbeddings(batch_size=7)
+    batched = embeddings.embed_array(texts)
+    single = np.array([embeddings.embed_query(text) for text in texts], dtype=np.float32)
+    assert np.allclose(batched, single)
+
+
+def test_diacritics_and_case_are_ignored():
+    from utils.local_embeddings import HashedNgramEmbeddings
+
+    embeddings = HashedNgramEmbeddings()
+    assert embeddings.embed_query('Quận Bình Thạnh') == embeddings.embed_query('quan binh thanh')
+
+
+def test_similar_listings_rank_first():
+    from langchain_community.vectorstores import Chroma
+    from utils.local_embeddings import HashedNgramEmbeddings
+    from utils.vector_sync import sync_vector_store
+
+    texts = [
+        'Căn hộ chung cư Quận 7, 2 phòng ngủ, giá 3 tỷ',
+        'Nhà phố Gò Vấp, 4 tầng, sổ hồng riêng',
+        'Đất nền Thủ Đức, mặt tiền đường lớn',
+        'Biệt thự Quận 2 có hồ bơi',
+    ]
+    store = Chroma(collection_name=f"test_local_{uuid.uuid4().hex}", embedding_function=HashedNgramEmbeddings())
+    sync_vector_store(store, [str(i) for i in range(len(texts))], texts)
+
+    assert store.similarity_search('can ho quan 7 hai phong ngu', k=1)[0].page_content == texts[0]
+    assert store.similarity_search('đất thủ đức', k=1)[0].page_content == texts[2]
+    assert store.similarity_search('biet thu ho boi', k=1)[0].page_content == texts[3]
+
+
+def test_provider_selection():
+    from utils.embedding_provider import embedding_model_name, make_embedding_backend, requires_api_key
+    from utils.local_embeddings import HashedNgramEmbeddings
+
+    assert not requires_api_key('local')
+    assert requires_api_key('openai')
+    assert isinstance(make_embedding_backend('local'), HashedNgramEmbeddings)
+    assert embedding_model_name('local').startswith('local-hashed-char-')
+    assert embedding_model_name('local') != embedding_model_name('openai')
+    try:
+        make_embedding_backend('word2vec')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('expected ValueError')
+
+
+if __name__ == "__main__":
+    test_vectors_are_normalized_and_deterministic()
+    test_batching_does_not_mix_texts()
+    test_diacritics_and_case_are_ignored()
+    test_similar_listings_rank_first()
+    test_provider_selection()
+    print("✅ Local embedding tests passed")
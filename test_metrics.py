@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test script for span-based build and query metrics
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import urllib.request
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from test_vector_sync import CountingEmbeddings
+
+
+def test_nested_spans_form_one_trace():
+    from utils.metrics import MetricsRegistry, breakdown, span
+
+    with tempfile.TemporaryDirectory() as tmp:
+        registry = MetricsRegistry(log_path=os.path.join(tmp, 'logs', 'metrics.jsonl'))
+        with span('build', registry=registry, source_type='excel') as trace:
+            with span('load_data') as stage:
+                stage.set(rows=100)
+            for _ in range(3):
+                with span('embedding', texts=10, tokens=40):
+                    pass
+        assert registry.last_trace('build') is trace
+        assert [child.name for child in trace.children] == ['load_data', 'embedding', 'embedding', 'embedding']
+
+        rows = {row['stage']: row for row in breakdown(trace)}
+        assert rows['build']['depth'] == 0 and rows['build']['source_type'] == 'excel'
+        assert rows['load_data']['rows'] == 100
+        assert rows['embedding']['count'] == 3 and rows['embedding']['tokens'] == 120
+        assert trace.seconds >= rows['embedding']['seconds']
+
+        with open(registry.log_path, encoding='utf-8') as f:
+            logged = [json.loads(line) for line in f]
+        assert logged[0]['event'] == 'trace' and logged[0]['name'] == 'build'
+        assert logged[0]['children'][0]['attrs'] == {'rows': 100}
+
+
+def test_errors_are_recorded_and_raised():
+    from utils.metrics import MetricsRegistry, span
+
+    registry = MetricsRegistry(log_path=None)
+    try:
+        with span('build', registry=registry):
+            with span('vector_index'):
+                raise ValueError("boom")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("error was swallowed")
+    trace = registry.last_trace('build')
+    assert trace.attrs['error'] == trace.children[0].attrs['error'] == 'ValueError'
+    assert registry.totals()['build/vector_index']['errors'] == 1
+
+
+def test_embedding_cache_misses_are_timed():
+    from utils.embedding_cache import CachedEmbeddings
+    from utils.metrics import MetricsRegistry, span
+
+    registry = MetricsRegistry(log_path=None)
+    with tempfile.TemporaryDirectory() as tmp:
+        cached = CachedEmbeddings(CountingEmbeddings(), model_name='test',
+                                  cache_path=os.path.join(tmp, 'embeddings.sqlite3'))
+        with span('build', registry=registry) as trace:
+            cached.embed_documents(['căn hộ 1', 'căn hộ 2'])
+            cached.embed_documents(['căn hộ 1', 'căn hộ 3'])
+            cached.embed_documents(['căn hộ 3'])
+        cached.close()
+    embedding = [child for child in trace.children if child.name == 'embedding']
+    assert [child.attrs['texts'] for child in embedding] == [2, 1]
+    assert all(child.attrs['tokens'] > 0 for child in embedding)
+
+
+def test_data_stages_of_sample_build():
+    from ai_agent import load_and_process_data
+    from utils.metrics import MetricsRegistry, breakdown, span
+
+    registry = MetricsRegistry(log_path=None)
+    with contextlib.redirect_stdout(io.StringIO()):
+        with span('build', registry=registry) as trace:
+            df = load_and_process_data('sample')
+    rows = {row['stage']: row for row in breakdown(trace)}
+    assert rows['load_data']['rows'] == rows['text_build']['rows'] == len(df)
+
+
+def test_chain_runs_are_traced_as_queries():
+    from ai_agent import build_chain
+    from test_numpy_vector_store import make_store
+    from utils.metrics import METRICS, breakdown
+    from utils.retrieval import ListingRetriever
+    from utils.streaming import stream_answer
+
+    answer = "Căn hộ Quận 7, 2 phòng ngủ, giá 4,5 tỷ."
+    retriever = ListingRetriever(vector_store=make_store(), k=2)
+    chain = build_chain(retriever, llm=GenericFakeChatModel(messages=iter([AIMessage(content=answer)] * 3)))
+
+    text, _ = stream_answer(chain, "căn hộ Q7")
+    trace = METRICS.last_trace('query')
+    rows = {row['stage']: row for row in breakdown(trace)}
+    assert rows['query']['answer_chars'] == len(text) == len(answer)
+    assert rows['retrieval']['documents'] == 2
+    assert 0 <= rows['llm']['ttft_seconds'] <= rows['llm']['seconds'] <= trace.seconds
+
+    # Concurrent runs get one trace each
+    before = len(METRICS.traces('query'))
+    chain.batch(["q1", "q2"])
+    traces = METRICS.traces('query')[before:]
+    assert len(traces) == 2
+    assert all([child.name for child in trace.children] == ['retrieval', 'llm'] for trace in traces)
+
+
+def test_metrics_endpoint():
+    from utils.metrics import MetricsRegistry, span, start_metrics_server
+
+    registry = MetricsRegistry(log_path=None)
+    with span('build', registry=registry):
+        with span('load_data', rows=5):
+            pass
+    server = start_metrics_server(port=0, registry=registry)
+    assert server is None
+
+    import utils.metrics as metrics
+    server = start_metrics_server(port=_free_port(), registry=registry)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        text = urllib.request.urlopen(f"{url}/metrics", timeout=5).read().decode('utf-8')
+        assert 'real_estate_span_rows_total{span="build/load_data"} 5' in text
+        payload = json.loads(urllib.request.urlopen(f"{url}/metrics.json", timeout=5).read())
+        assert payload['last']['build']['children'][0]['name'] == 'load_data'
+        # Started once per process
+        assert start_metrics_server(port=_free_port(), registry=registry) is server
+    finally:
+        server.shutdown()
+        server.server_close()
+        metrics._server = None
+
+
+def _free_port():
+    import socket
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+if __name__ == "__main__":
+    test_nested_spans_form_one_trace()
+    test_errors_are_recorded_and_raised()
+    test_embedding_cache_misses_are_timed()
+    test_data_stages_of_sample_build()
+    test_chain_runs_are_traced_as_queries()
+    test_metrics_endpoint()
+    print("✅ Metrics tests passed")
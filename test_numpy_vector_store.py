@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test script for the NumPy brute-force vector store
+"""
+
+import os
+import sys
+import tempfile
+import uuid
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from test_vector_sync import CountingEmbeddings
+
+LISTINGS = [
+    ('1', 'Căn hộ chung cư Quận 7, 2 phòng ngủ', {'district_key': '7', 'price': 3_000_000_000, 'bedrooms': 2, 'type': 'Căn hộ'}),
+    ('2', 'Nhà phố Gò Vấp, 4 tầng, sổ hồng', {'district_key': 'govap', 'price': 8_000_000_000, 'bedrooms': 4, 'type': 'Nhà phố'}),
+    ('3', 'Căn hộ Quận 7 view sông, 3 phòng ngủ', {'district_key': '7', 'price': 5_500_000_000, 'bedrooms': 3, 'type': 'Căn hộ'}),
+    ('4', 'Đất nền Thủ Đức mặt tiền', {'district_key': 'thuduc', 'price': 0, 'bedrooms': 0, 'type': 'Đất'}),
+]
+
+
+def local_embeddings():
+    from utils.local_embeddings import HashedNgramEmbeddings
+    return HashedNgramEmbeddings(dimensions=256)
+
+
+def make_store(directory=None, embeddings=None):
+    from utils.numpy_vector_store import NumpyVectorStore
+
+    store = NumpyVectorStore(f"test_{uuid.uuid4().hex}", embeddings or local_embeddings(), persist_directory=directory)
+    ids, texts, metadatas = zip(*LISTINGS)
+    store.add_texts(texts, metadatas=metadatas, ids=ids)
+    return store
+
+
+def test_search_matches_exact_cosine_ranking():
+    embeddings = local_embeddings()
+    store = make_store(embeddings=embeddings)
+    query = 'căn hộ quận 7 ba phòng ngủ'
+
+    vectors = np.array(embeddings.embed_documents([text for _, text, _ in LISTINGS]))
+    q = np.array(embeddings.embed_query(query))
+    expected = [LISTINGS[i][0] for i in np.argsort(-(vectors @ q))]
+
+    hits = store.similarity_search_with_score(query, k=4)
+    assert [document.metadata.get('district_key') for document, _ in hits][:2] == ['7', '7']
+    assert [document.id for document, _ in hits] == expected
+    assert all(a >= b for (_, a), (_, b) in zip(hits, hits[1:]))
+
+
+def test_filters_follow_matches_filter():
+    from utils.query_parser import matches_filter
+
+    store = make_store()
+    filters = [
+        {'district_key': {'$in': ['7']}},
+        {'$and': [{'price': {'$gte': 1}}, {'price': {'$lte': 6_000_000_000}}]},
+        {'bedrooms': {'$in': [4, 0]}},
+        {'district_key': 'govap'},
+        {'type': 'Căn hộ'},
+        {'ward_key': {'$in': ['1']}},
+    ]
+    for where in filters:
+        found = sorted(document.id for document in store.similarity_search('nhà', k=10, filter=where))
+        expected = sorted(doc_id for doc_id, _, metadata in LISTINGS if matches_filter(metadata, where))
+        assert found == expected, where
+
+
+def test_batched_queries_match_single_queries():
+    store = make_store()
+    queries = ['căn hộ quận 7', 'nhà phố gò vấp', 'đất thủ đức']
+    batched = store.similarity_search_batch(queries, k=2)
+    assert [[d.id for d in docs] for docs in batched] == \
+        [[d.id for d in store.similarity_search(query, k=2)] for query in queries]
+
+
+def test_batched_queries_stay_out_of_the_embedding_cache():
+    from utils.embedding_cache import CachedEmbeddings
+    from utils.local_embeddings import HashedNgramEmbeddings
+    from utils.numpy_vector_store import NumpyVectorStore
+
+    embeddings = CachedEmbeddings(HashedNgramEmbeddings(dimensions=64), 'hashed', cache_path=':memory:')
+    store = NumpyVectorStore(f"test_{uuid.uuid4().hex}", embeddings)
+    store.add_texts(['căn hộ quận 7', 'nhà phố gò vấp'], ids=['a', 'b'])
+    assert embeddings.stats()['entries'] == 2
+    assert [docs[0].id for docs in store.similarity_search_batch(['căn hộ q7', 'nhà gò vấp'], k=1)] == ['a', 'b']
+    assert embeddings.stats()['entries'] == 2
+
+
+def test_persisted_store_is_memory_mapped_and_synced():
+    from utils.numpy_vector_store import NumpyVectorStore
+    from utils.vector_sync import sync_vector_store
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = CountingEmbeddings()
+        store = NumpyVectorStore('listings', backend, persist_directory=tmp)
+        ids = [str(i) for i in range(20)]
+        texts = [f"căn hộ {i}" for i in range(20)]
+        sync_vector_store(store, ids, texts)
+
+        reopened = NumpyVectorStore('listings', backend, persist_directory=tmp)
+        assert isinstance(reopened._data.vectors, np.memmap)
+        assert reopened.get(include=[])['ids'] == ids
+
+        texts[5] = 'căn hộ 5 - giảm giá'
+        stats = sync_vector_store(reopened, ids[:-1], texts[:-1])
+        assert stats == {'added': 0, 'updated': 1, 'deleted': 1, 'unchanged': 18}
+        assert backend.embedded == 21
+
+        final = NumpyVectorStore('listings', backend, persist_directory=tmp)
+        assert len(final) == 19
+        assert final.get(ids=['5'], include=['documents'])['documents'] == ['căn hộ 5 - giảm giá']
+        assert final.similarity_search('căn hộ 5 - giảm giá', k=1)[0].id == '5'
+
+        final.delete_collection()
+        assert len(NumpyVectorStore('listings', backend, persist_directory=tmp)) == 0
+
+
+def test_hits_resolve_against_the_searched_rows():
+    import utils.numpy_vector_store as module
+
+    store = make_store()
+    texts = {doc_id: text for doc_id, text, _ in LISTINGS}
+    top_k = module._top_k
+
+    def delete_while_scoring(scores, k):
+        # A concurrent delete() rebinds the rows after the lock is released
+        store.delete(ids=['1'])
+        return top_k(scores, k)
+
+    module._top_k = delete_while_scoring
+    try:
+        hits = store.similarity_search_with_score('căn hộ quận 7', k=4)
+    finally:
+        module._top_k = top_k
+    assert len(hits) == 4
+    assert all(document.page_content == texts[document.id] for document, _ in hits)
+    assert [document.id for document in store.similarity_search('căn hộ quận 7', k=4)].count('1') == 0
+
+
+def test_retriever_uses_numpy_store():
+    from utils.retrieval import ListingRetriever
+
+    retriever = ListingRetriever(vector_store=make_store(), k=2)
+    documents = retriever.invoke('căn hộ quận 7 giá dưới 4 tỷ')
+    assert documents[0].id == '1'
+    assert len(documents) == 2
+
+
+if __name__ == "__main__":
+    test_search_matches_exact_cosine_ranking()
+    test_filters_follow_matches_filter()
+    test_batched_queries_match_single_queries()
+    test_batched_queries_stay_out_of_the_embedding_cache()
+    test_persisted_store_is_memory_mapped_and_synced()
+    test_hits_resolve_against_the_searched_rows()
+    test_retriever_uses_numpy_store()
+    print("✅ NumPy vector store tests passed")
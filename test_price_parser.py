@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared vectorized price parser
+"""
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+CASES = [
+    ('6 tỷ 900 triệu', 6_900_000_000),
+    ('6 tỷ  500 triệu', 6_500_000_000),
+    ('50 triệu', 50_000_000),
+    ('800 nghìn', 800_000),
+    ('4.2 tỷ', 4_200_000_000),
+    ('4,2 tỷ', 4_200_000_000),
+    ('6.5Tỷ', 6_500_000_000),
+    ('1.500 triệu', 1_500_000_000),
+    ('2 trăm triệu', 200_000_000),
+    ('12,000,000', 12_000_000),
+    ('6900000000', 6_900_000_000),
+    ('12.5', 12_500_000_000),
+    ('12,5', 12_500_000_000),
+    ('7 tỷ 850', 7_850_000_000),
+    ('5 triệu 500', 5_500_000),
+    ('15/tháng', 15_000_000),
+    ('15 triệu/tháng', 15_000_000),
+    ('5 - 7 tỷ', 5_000_000_000),
+    ('từ 5 đến 7 tỷ', 5_000_000_000),
+    ('Thương lượng', 0),
+    ('TL', 0),
+    ('', 0),
+    (None, 0),
+    (np.nan, 0),
+]
+
+
+def test_parse_prices():
+    from utils.price_parser import parse_prices
+
+    values = pd.Series([text for text, _ in CASES], dtype=object)
+    assert parse_prices(values).tolist() == [price for _, price in CASES]
+
+
+def test_price_details():
+    from utils.price_parser import parse_price_details
+
+    details = parse_price_details(pd.Series(['5 tỷ - 7 tỷ', '15 triệu/tháng', 'Thương lượng'], index=[10, 11, 12]))
+    assert details.index.tolist() == [10, 11, 12]
+    assert details['price_max'].tolist() == [7_000_000_000, 15_000_000, 0]
+    assert details['is_monthly'].tolist() == [False, True, False]
+    assert details['is_negotiable'].tolist() == [False, False, True]
+
+
+def test_matches_legacy_landsoft_parser_on_export():
+    """Every price text in the sample LandSoft export parses as before"""
+    from legacy_reference import legacy_parse_price_text
+    from utils.data_loader import load_data
+    from utils.price_parser import parse_prices
+
+    price_text = load_data(source_type='excel')['Tổng giá text']
+    assert parse_prices(price_text).tolist() == price_text.apply(legacy_parse_price_text).tolist()
+
+
+def test_google_sheets_path_uses_full_price():
+    """The Google Sheets path no longer stops at the first digit group"""
+    from utils.data_loader import process_google_sheets_data
+
+    df = process_google_sheets_data(pd.DataFrame({'Tổng giá text': ['6 tỷ 900 triệu', '50 triệu']}))
+    assert df['price'].tolist() == [6_900_000_000, 50_000_000]
+
+
+if __name__ == "__main__":
+    test_parse_prices()
+    test_price_details()
+    test_matches_legacy_landsoft_parser_on_export()
+    test_google_sheets_path_uses_full_price()
+    print("✅ Price parser tests passed")
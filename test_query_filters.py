@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test script for query understanding and metadata-filtered retrieval
+"""
+
+import os
+import sys
+import uuid
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+from langchain_core.embeddings import Embeddings
+
+
+class ConstantEmbeddings(Embeddings):
+    """Every text gets the same vector, so only the metadata filter decides"""
+
+    def embed_documents(self, texts):
+        return [[1.0, 0.0, 0.0] for _ in texts]
+
+    def embed_query(self, text):
+        return [1.0, 0.0, 0.0]
+
+
+def test_location_keys():
+    from utils.text_utils import location_key, ward_key
+
+    assert location_key('Quận 7') == location_key('Q7') == location_key('q.07') == '7'
+    assert location_key('Quận Bình Thạnh') == 'binhthanh'
+    assert location_key('Huyện Nhà Bè') == 'nhabe'
+    assert ward_key('P.02') == ward_key('Phường 2') == '2'
+    assert ward_key('P.Tân Định') == 'tandinh'
+
+
+def test_parse_query():
+    from utils.query_parser import build_where_filter, parse_query
+
+    constraints = parse_query('Căn hộ 2pn Q7 dưới 5 tỷ')
+    assert constraints['districts'] == ['7']
+    assert constraints['price_max'] == 5e9 and constraints['price_min'] is None
+    assert constraints['bedrooms'] == 2
+    assert constraints['property_type'] == 'Căn hộ'
+    assert constraints['transaction_type'] is None
+
+    constraints = parse_query('Có nhà cho thuê nào ở Bình Thạnh từ 10 đến 20 triệu?')
+    assert constraints['districts'] == ['binhthanh']
+    assert (constraints['price_min'], constraints['price_max']) == (10e6, 20e6)
+    assert constraints['transaction_type'] == 'Cho thuê'
+
+    constraints = parse_query('Cần mua biệt thự khu trung tâm trên 20 tỷ')
+    assert constraints['districts'] == [] and constraints['preferred_districts'] == ['1', '3', '4']
+    assert constraints['price_min'] == 20e9 and constraints['price_max'] is None
+    assert constraints['transaction_type'] == 'Cần bán'
+
+    # District numbers are not prices, and aliases only match whole words
+    constraints = parse_query('căn hộ quận 2 - 5 tỷ')
+    assert constraints['districts'] == ['2']
+    assert (constraints['price_min'], constraints['price_max']) == (4e9, 6e9)
+    assert parse_query('căn hộ từ 2 tỷ - 5 tỷ ở Q2')['price_min'] == 2e9
+    assert parse_query('nhà gần Bình Thạnh')['districts'] == ['binhthanh']
+    assert build_where_filter(parse_query('căn hộ gần trung tâm thương mại')) == {'type': 'Căn hộ'}
+
+    # "bạn" folds to "ban" but is not a sale keyword
+    assert parse_query('Bạn có gì ở phường 15?')['transaction_type'] is None
+    assert parse_query('Bạn có gì ở phường 15?')['wards'] == ['15']
+
+    # Area: ranges, bounds and a single size with tolerance; not part of the where filter
+    assert (parse_query('căn hộ 70-90m2')['area_min'], parse_query('căn hộ 70-90m2')['area_max']) == (70, 90)
+    assert parse_query('nhà trên 100 mét vuông dưới 5 tỷ')['area_min'] == 100
+    assert parse_query('nhà trên 100 mét vuông dưới 5 tỷ')['price_max'] == 5e9
+    assert parse_query('căn hộ 80m² Q7')['area_max'] == 96
+    for question in ('nhà từ 100 m2 đến 200 m2', 'nhà từ 100m2 tới 200m2', 'nhà 100 - 200 mét vuông'):
+        assert (parse_query(question)['area_min'], parse_query(question)['area_max']) == (100, 200), question
+    # The "2" of "m2" or of a district is never the lower bound
+    for question, area in [('diện tích từ 60m2 tới 90m2', (60, 90)), ('căn hộ quận 2 - 80m2', (64, 96))]:
+        assert (parse_query(question)['area_min'], parse_query(question)['area_max']) == area, question
+    assert build_where_filter(parse_query('căn hộ 80m²')) == {'type': 'Căn hộ'}
+
+
+def test_build_where_filter():
+    from utils.query_parser import build_where_filter, parse_query
+
+    assert build_where_filter(parse_query('Nhà nào có view đẹp?')) is None
+    assert build_where_filter(parse_query('Tìm nhà ở quận 3')) == {'district_key': {'$in': ['3']}}
+    assert build_where_filter(parse_query('2pn Q7 dưới 5 tỷ')) == {'$and': [
+        {'district_key': {'$in': ['7']}},
+        {'price': {'$lte': 5e9}},
+        {'bedrooms': {'$in': [2, 0]}},
+    ]}
+
+
+def test_build_listing_metadata():
+    from utils.text_builder import DISPLAY_FIELDS, build_listing_metadata
+
+    df = pd.DataFrame({
+        'district': ['Quận 7', None], 'ward': ['P.Tân Phong', 'Phường 2'], 'type': ['Căn hộ', 'Nhà phố'],
+        'price': [4_500_000_000, 0], 'area': [75.5, float('nan')], 'bedrooms': [2, 0],
+    })
+    metadata = build_listing_metadata(df)
+    filters = {key: metadata[0][key] for key in metadata[0] if key not in DISPLAY_FIELDS}
+    assert filters == {
+        'district': 'Quận 7', 'ward': 'P.Tân Phong', 'district_key': '7', 'ward_key': 'tanphong',
+        'type': 'Căn hộ', 'transaction_type': 'Cần bán', 'price': 4_500_000_000, 'area': 75.5, 'bedrooms': 2,
+    }
+    assert metadata[0]['price_text'] == '4,500,000,000 VND' and metadata[0]['area_text'] == '75.5m²'
+    assert metadata[1]['price_text'] == 'Thương lượng' and metadata[1]['area_text'] == ''
+    assert metadata[1]['district'] == '' and metadata[1]['ward_key'] == '2' and metadata[1]['area'] == 0.0
+    assert all(type(value) in (str, int, float) for row in metadata for value in row.values())
+
+
+def test_retriever_applies_filter_and_tops_up():
+    from langchain_community.vectorstores import Chroma
+    from utils.retrieval import ListingRetriever
+    from utils.text_builder import build_listing_metadata
+
+    df = pd.DataFrame({
+        'id': ['A', 'B', 'C', 'D'],
+        'district': ['Quận 7', 'Quận 1', 'Quận 7', 'Quận 3'],
+        'ward': ['P.Tân Phong'] * 4,
+        'type': ['Căn hộ'] * 4,
+        'price': [3_000_000_000, 4_000_000_000, 9_000_000_000, 2_000_000_000],
+        'area': [70, 80, 90, 60],
+        'bedrooms': [2, 2, 3, 1],
+    })
+    metadatas = [{**meta, 'id': doc_id} for doc_id, meta in zip(df['id'], build_listing_metadata(df))]
+    store = Chroma(collection_name=f"test_filters_{uuid.uuid4().hex}", embedding_function=ConstantEmbeddings())
+    store.add_texts(texts=[f"listing {doc_id}" for doc_id in df['id']], metadatas=metadatas, ids=list(df['id']))
+
+    retriever = ListingRetriever(vector_store=store, k=1)
+    assert [doc.metadata['id'] for doc in retriever.invoke('căn hộ Q7 dưới 5 tỷ')] == ['A']
+
+    # Only one listing matches; the other slots come from the unfiltered search
+    retriever = ListingRetriever(vector_store=store, k=3)
+    documents = retriever.invoke('căn hộ Q7 dưới 5 tỷ')
+    assert documents[0].metadata['id'] == 'A'
+    assert len(documents) == 3 and len({doc.metadata['id'] for doc in documents}) == 3
+
+
+def test_google_sheets_rows_match_type_filters():
+    from langchain_community.vectorstores import Chroma
+    from utils.data_loader import process_google_sheets_data
+    from utils.query_parser import build_where_filter, parse_query
+    from utils.text_builder import build_listing_metadata
+
+    # Google Sheets puts 'Nhu cầu' into 'type'; the metadata must still carry the property type
+    df = process_google_sheets_data(pd.DataFrame({
+        'Mã sản phẩm': ['G1', 'G2', 'G3'],
+        'Nhu cầu': ['Cần bán', 'Cho thuê', 'Cần bán'],
+        'Quận/huyện': ['Quận 7', 'Quận 7', 'Quận 3'],
+        'Xã/Phường': ['P.Tân Phong'] * 3,
+        'Tổng giá text': ['4 tỷ', '15 triệu', '3 tỷ'],
+        'Diễn giải': ['Bán căn hộ 2PN view sông', 'Cho thuê nhà phố mặt tiền', 'Bán căn hộ chung cư'],
+    }))
+    metadata = build_listing_metadata(df)
+    assert [(row['type'], row['transaction_type']) for row in metadata] == [
+        ('Căn hộ', 'Cần bán'), ('Nhà phố', 'Cho thuê'), ('Căn hộ', 'Cần bán'),
+    ]
+
+    store = Chroma(collection_name=f"test_filters_{uuid.uuid4().hex}", embedding_function=ConstantEmbeddings())
+    store.add_texts(texts=list(df['description']), metadatas=metadata, ids=list(df['product_id']))
+    documents = store.similarity_search('căn hộ Q7', k=3, filter=build_where_filter(parse_query('căn hộ Q7')))
+    assert [doc.page_content for doc in documents] == ['Bán căn hộ 2PN view sông']
+    documents = store.similarity_search('x', k=3, filter=build_where_filter(parse_query('cho thuê nhà Q7')))
+    assert [doc.page_content for doc in documents] == ['Cho thuê nhà phố mặt tiền']
+
+
+if __name__ == "__main__":
+    test_location_keys()
+    test_parse_query()
+    test_build_where_filter()
+    test_build_listing_metadata()
+    test_retriever_applies_filter_and_tops_up()
+    test_google_sheets_rows_match_type_filters()
+    print("✅ Query filter tests passed")
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test script for the structured re-ranking of retrieved listings
+"""
+
+import os
+import sys
+import uuid
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+from langchain_core.documents import Document
+
+QUESTION = 'Cần mua căn hộ 2pn Q7 dưới 5 tỷ khoảng 70m2'
+
+
+def listing(listing_id, district_key='7', price=4_000_000_000, bedrooms=2, area=70.0, kind='Căn hộ',
+            transaction_type='Cần bán'):
+    return Document(page_content=f"listing {listing_id}", metadata={
+        'id': listing_id, 'district_key': district_key, 'price': price, 'bedrooms': bedrooms, 'area': area,
+        'type': kind, 'transaction_type': transaction_type,
+    })
+
+
+def test_range_score():
+    from utils.reranker import UNKNOWN_SCORE, range_score
+
+    values = np.array([0, 50, 100, 125, 150, 200], dtype=float)
+    assert range_score(values, high=100).tolist() == [UNKNOWN_SCORE, 1.0, 1.0, 0.5, 0.0, 0.0]
+    assert range_score(values, low=100, high=100).tolist()[1:4] == [0.0, 1.0, 0.5]
+    assert range_score(values).tolist() == [UNKNOWN_SCORE, 1, 1, 1, 1, 1]
+
+
+def test_rerank_puts_best_fit_first():
+    from utils.query_parser import parse_query
+    from utils.reranker import rerank
+
+    documents = [
+        listing('wrong_district', district_key='1'),
+        listing('too_expensive', price=9_000_000_000),
+        listing('rental', transaction_type='Cho thuê'),
+        listing('four_bedrooms', bedrooms=4),
+        listing('unknown_bedrooms', bedrooms=0),
+        listing('best'),
+        listing('also_best'),
+    ]
+    ranked = rerank(documents, parse_query(QUESTION), k=4)
+    # Ties keep the retrieval order; an unknown bedroom count beats a wrong one
+    assert [document.metadata['id'] for document in ranked] == ['best', 'also_best', 'unknown_bedrooms', 'four_bedrooms']
+
+    # Nothing stated: the retrieval order is kept
+    no_constraints = rerank(documents, parse_query('nhà nào đẹp?'), k=3)
+    assert no_constraints == documents[:3]
+    assert rerank([], parse_query(QUESTION), k=3) == []
+
+    # A vague area ("khu trung tâm") is no filter, but its districts still rank first
+    central = [listing('district_7'), listing('district_3', district_key='3')]
+    assert rerank(central, parse_query('căn hộ khu trung tâm'), k=1)[0].metadata['id'] == 'district_3'
+
+
+def test_retriever_reranks_overfetched_candidates():
+    from utils.local_embeddings import HashedNgramEmbeddings
+    from utils.numpy_vector_store import NumpyVectorStore
+    from utils.retrieval import ListingRetriever
+
+    # The listing that fits is the one least similar to the question's wording
+    documents = [listing(f"near_{i}", district_key='1', price=9_000_000_000, bedrooms=4) for i in range(8)]
+    texts = ['Căn hộ 2pn Q7 dưới 5 tỷ khoảng 70m2 view đẹp'] * 8 + ['Chung cư khu Nam Sài Gòn, tiện ích đầy đủ']
+    documents.append(listing('fits'))
+    store = NumpyVectorStore(f"test_{uuid.uuid4().hex}", HashedNgramEmbeddings(dimensions=256))
+    store.add_texts(texts, metadatas=[document.metadata for document in documents],
+                    ids=[document.metadata['id'] for document in documents])
+
+    plain = ListingRetriever(vector_store=store, k=2, use_filters=False, rerank=False)
+    assert 'fits' not in [document.metadata['id'] for document in plain.invoke(QUESTION)]
+    reranked = ListingRetriever(vector_store=store, k=2, use_filters=False, rerank_fetch_k=20)
+    assert reranked.invoke(QUESTION)[0].metadata['id'] == 'fits'
+    # Too narrow a candidate set cannot reach it
+    narrow = ListingRetriever(vector_store=store, k=2, use_filters=False, rerank_fetch_k=4)
+    assert 'fits' not in [document.metadata['id'] for document in narrow.invoke(QUESTION)]
+
+
+if __name__ == "__main__":
+    test_range_score()
+    test_rerank_puts_best_fit_first()
+    test_retriever_reranks_overfetched_candidates()
+    print("✅ Re-ranking tests passed")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script for the compact listings table dtypes
+"""
+
+import contextlib
+import io
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+from scripts.generate_sample_data import generate_landsoft_data
+
+EXCEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'sample_landsoft.xls')
+
+
+def processed(raw):
+    from ai_agent import process_data
+    from utils.data_loader import process_landsoft_data
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        return process_data(process_landsoft_data(raw), 'excel', verbose=False)
+
+
+def test_sample_export_keeps_its_values():
+    from utils.data_loader import read_excel_file
+    from utils.schema import compact_listings
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        df = processed(read_excel_file(EXCEL_PATH))
+        compact = compact_listings(df)
+
+    for column in ('district', 'ward', 'type', 'direction', 'transaction_type', 'legal_status', 'status'):
+        assert isinstance(compact[column].dtype, pd.CategoricalDtype), column
+        assert compact[column].astype(object).equals(df[column].astype(object))
+    assert compact['bedrooms'].dtype == np.int8 and (compact['bedrooms'] == df['bedrooms']).all()
+    assert compact['price'].dtype == np.int64 and compact['price'].equals(df['price'])
+    assert compact['area'].dtype == np.float32 and np.allclose(compact['area'], df['area'])
+    assert compact['posted_date'].equals(pd.to_datetime(df['posted_date']))
+    assert compact['text'].equals(df['text'])
+
+
+def test_texts_and_metadata_unchanged_on_compact_frame():
+    from utils.schema import compact_listings
+    from utils.text_builder import build_listing_metadata, build_listing_texts
+
+    df = processed(generate_landsoft_data(3000, seed=4))
+    df['area'] = df['area'] + 0.1  # not exactly representable as float32
+    with contextlib.redirect_stdout(io.StringIO()):
+        compact = compact_listings(df)
+    assert build_listing_texts(compact).tolist() == build_listing_texts(df).tolist()
+    assert build_listing_metadata(compact) == build_listing_metadata(df)
+
+
+def test_lossy_conversions_are_skipped():
+    from utils.schema import compact_listings
+
+    df = pd.DataFrame({
+        'district': [f'Quận {i}' for i in range(10)],  # every value distinct
+        'bedrooms': [1.5, 2, 3, 1, 2, 3, 1, 2, 3, 1],
+        'posted_date': ['2025-01-01'] * 9 + ['không rõ'],
+        'update_date': ['05/02/2024'] * 10,
+    })
+    compact = compact_listings(df, report=False)
+    assert compact['district'].dtype == df['district'].dtype
+    assert compact['bedrooms'].dtype == np.float64
+    assert compact['posted_date'].dtype == df['posted_date'].dtype
+    assert compact['update_date'].iloc[0] == pd.Timestamp('2024-02-05')
+
+
+def test_iso_dates_are_not_read_day_first():
+    from utils.schema import compact_listings
+
+    df = pd.DataFrame({
+        'posted_date': ['2025-01-05', '2025-03-12 08:30:00', None],
+        'update_date': ['2025-01-05', '05/01/2025', '2025-02-11'],
+    })
+    compact = compact_listings(df, report=False)
+    assert compact['posted_date'].tolist()[:2] == [pd.Timestamp('2025-01-05'), pd.Timestamp('2025-03-12 08:30')]
+    assert compact['posted_date'].isna().iloc[2]
+    assert compact['update_date'].tolist() == [pd.Timestamp('2025-01-05'), pd.Timestamp('2025-01-05'),
+                                               pd.Timestamp('2025-02-11')]
+
+
+def test_memory_reduction():
+    from utils.schema import compact_listings, frame_memory
+
+    df = processed(generate_landsoft_data(20000)).drop(columns=['text'])
+    compact = compact_listings(df, report=False)
+    assert frame_memory(compact) < 0.5 * frame_memory(df)
+
+
+if __name__ == "__main__":
+    test_sample_export_keeps_its_values()
+    test_texts_and_metadata_unchanged_on_compact_frame()
+    test_lossy_conversions_are_skipped()
+    test_iso_dates_are_not_read_day_first()
+    test_memory_reduction()
+    print("✅ Schema tests passed")
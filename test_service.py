@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Test script for the async HTTP query service (api.py)
+"""
+
+import asyncio
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+ANSWER = "Căn hộ Quận 7, 2 phòng ngủ, giá 3 tỷ."
+
+
+def make_client(llm, max_concurrency=4):
+    from starlette.testclient import TestClient
+    from api import AgentService, create_app
+    from ai_agent import build_chain
+    from test_numpy_vector_store import make_store
+    from utils.retrieval import ListingRetriever
+
+    chain = build_chain(ListingRetriever(vector_store=make_store(), k=2), llm=llm)
+    service = AgentService(chain, source_type='sample', listings=4, max_concurrency=max_concurrency)
+    return TestClient(create_app(service=service))
+
+
+class SlowLLM:
+    """Async stand-in for the LLM that records how many calls run at once"""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+
+    async def __call__(self, prompt):
+        question = prompt.to_messages()[0].content.rsplit('Câu hỏi:', 1)[-1].split('\n')[0].strip()
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if question == 'lỗi':
+            raise RuntimeError("LLM unavailable")
+        return f"Trả lời: {question}"
+
+    def runnable(self):
+        return RunnableLambda(lambda prompt: "sync", afunc=self)
+
+
+def test_health_and_ask():
+    with make_client(GenericFakeChatModel(messages=iter([AIMessage(content=ANSWER)]))) as client:
+        assert client.get('/health').json() == {'status': 'ok', 'source_type': 'sample', 'listings': 4}
+        response = client.post('/ask', json={'question': 'căn hộ quận 7'})
+        assert response.status_code == 200
+        assert response.json()['answer'] == ANSWER
+
+
+def test_invalid_requests_are_rejected():
+    with make_client(GenericFakeChatModel(messages=iter([]))) as client:
+        assert client.post('/ask', content=b'not json').status_code == 400
+        assert client.post('/ask', json={'question': '  '}).status_code == 400
+        assert client.post('/ask', json={'question': 'x' * 501}).json()['error'].startswith('question is longer')
+        assert client.post('/ask/batch', json={'questions': []}).status_code == 400
+        assert client.post('/ask/batch', json={'questions': ['q'] * 51}).status_code == 400
+        assert client.get('/ask').status_code == 405
+
+
+def test_batch_keeps_order_and_concurrency_cap():
+    llm = SlowLLM()
+    with make_client(llm.runnable(), max_concurrency=3) as client:
+        questions = [f"căn hộ {i}" for i in range(10)] + ['lỗi']
+        results = client.post('/ask/batch', json={'questions': questions}).json()['results']
+    assert [result['question'] for result in results] == questions
+    assert [result['answer'] for result in results[:-1]] == [f"Trả lời: {question}" for question in questions[:-1]]
+    assert results[-1] == {'question': 'lỗi', 'error': 'LLM unavailable'}
+    assert llm.max_active == 3
+
+
+def test_concurrent_requests_overlap():
+    """Requests wait on the LLM concurrently, not one after another"""
+    import httpx
+    from api import AgentService, create_app
+    from ai_agent import build_chain
+    from test_numpy_vector_store import make_store
+    from utils.retrieval import ListingRetriever
+
+    llm = SlowLLM(delay=0.2)
+    chain = build_chain(ListingRetriever(vector_store=make_store(), k=2), llm=llm.runnable())
+    app = create_app(service=AgentService(chain, max_concurrency=8))
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://api') as client:
+            responses = await asyncio.gather(*(client.post('/ask', json={'question': f"nhà {i}"}) for i in range(8)))
+        return [response.json()['answer'] for response in responses]
+
+    answers = asyncio.run(run())
+    assert answers == [f"Trả lời: nhà {i}" for i in range(8)]
+    assert llm.max_active == 8
+
+
+def test_stream_returns_chunks():
+    with make_client(GenericFakeChatModel(messages=iter([AIMessage(content=ANSWER)]))) as client:
+        with client.stream('POST', '/ask/stream', json={'question': 'căn hộ quận 7'}) as response:
+            assert response.headers['content-type'].startswith('text/plain')
+            chunks = list(response.iter_text())
+    assert ''.join(chunks) == ANSWER
+
+
+def test_service_stream_yields_tokens():
+    from api import AgentService
+    from ai_agent import build_chain
+    from test_numpy_vector_store import make_store
+    from utils.retrieval import ListingRetriever
+
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content=ANSWER)]))
+    service = AgentService(build_chain(ListingRetriever(vector_store=make_store(), k=2), llm=llm))
+
+    async def collect():
+        return [chunk async for chunk in service.stream('căn hộ quận 7')]
+
+    chunks = asyncio.run(collect())
+    assert ''.join(chunks) == ANSWER
+    assert len(chunks) > 1
+
+
+def test_pooled_llm_uses_shared_clients():
+    from api import make_http_clients, make_pooled_llm
+
+    http_client, http_async_client = make_http_clients()
+    try:
+        llm = make_pooled_llm(http_client, http_async_client, api_key='test', base_url='http://127.0.0.1:1/v1')
+        other = make_pooled_llm(http_client, http_async_client, api_key='test', base_url='http://127.0.0.1:1/v1')
+        assert llm.http_async_client is other.http_async_client is http_async_client
+        assert llm.stream_usage
+    finally:
+        http_client.close()
+        asyncio.run(http_async_client.aclose())
+
+
+if __name__ == "__main__":
+    test_health_and_ask()
+    test_invalid_requests_are_rejected()
+    test_batch_keeps_order_and_concurrency_cap()
+    test_concurrent_requests_overlap()
+    test_stream_returns_chunks()
+    test_service_stream_yields_tokens()
+    test_pooled_llm_uses_shared_clients()
+    print("✅ Service tests passed")
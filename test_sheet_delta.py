@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Test script for delta loading of Google Sheets, against a local fake gspread client
+"""
+
+import os
+import re
+import sys
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from gspread.utils import a1_to_rowcol, column_letter_to_index, numericise_all
+
+HEADER = ['Mã sản phẩm', 'Nhu cầu', 'Quận/huyện', 'Tổng giá text', 'Ngày cập nhật']
+SHEET_URL = 'https://docs.google.com/spreadsheets/d/fake'
+
+
+def _trim(rows):
+    """Like the Sheets API: no trailing empty cells or rows"""
+    rows = [list(row) for row in rows]
+    for row in rows:
+        while row and row[-1] == '':
+            row.pop()
+    while rows and not rows[-1]:
+        rows.pop()
+    return rows
+
+
+class FakeWorksheet:
+    """Grid of strings serving the read calls the loaders use, counting calls and cells"""
+
+    def __init__(self, values):
+        self.values = values
+        self.calls = 0
+        self.cells = 0
+
+    def _range(self, name):
+        if re.fullmatch(r'\d+:\d+', name):
+            first, last = map(int, name.split(':'))
+            rows = self.values[first - 1:last]
+        else:
+            start, end = name.split(':')
+            row, col = a1_to_rowcol(start)
+            if end.isalpha():
+                last_row, last_col = len(self.values), column_letter_to_index(end)
+            else:
+                last_row, last_col = a1_to_rowcol(end)
+            rows = [values[col - 1:last_col] for values in self.values[row - 1:last_row]]
+        rows = _trim(rows)
+        self.cells += sum(len(row) for row in rows)
+        return rows
+
+    def get_values(self):
+        self.calls += 1
+        rows = _trim(self.values)
+        self.cells += sum(len(row) for row in rows)
+        width = max(len(row) for row in rows)
+        return [row + [''] * (width - len(row)) for row in rows]
+
+    def batch_get(self, ranges):
+        self.calls += 1
+        return [self._range(name) for name in ranges]
+
+    def get_all_records(self):
+        values = self.get_values()
+        return [dict(zip(values[0], numericise_all(row))) for row in values[1:]]
+
+
+class FakeSpreadsheet:
+    def __init__(self, worksheet, revision='2024-01-01T00:00:00Z'):
+        self.worksheet = worksheet
+        self.revision = revision
+
+    def get_lastUpdateTime(self):
+        if self.revision is None:
+            raise PermissionError("Drive API not enabled")
+        return self.revision
+
+    def get_worksheet(self, index):
+        return self.worksheet
+
+
+class FakeClient:
+    def __init__(self, spreadsheet):
+        self.spreadsheet = spreadsheet
+
+    def open_by_url(self, url):
+        return self.spreadsheet
+
+
+def make_sheet(n_rows):
+    return [HEADER] + [
+        [f'SP{i:05d}', 'Cần bán', f'Quận {i % 12 + 1}', f'{i % 9 + 1} tỷ', '01/01/2024']
+        for i in range(n_rows)
+    ]
+
+
+def expected_frame(worksheet):
+    import pandas as pd
+    return pd.DataFrame(worksheet.get_all_records())
+
+
+def load(client, snapshot_dir):
+    from utils.data_loader import load_google_sheet
+    return load_google_sheet(SHEET_URL, client=client, delta=True, snapshot_dir=snapshot_dir)
+
+
+def test_unchanged_sheet_is_not_downloaded():
+    with tempfile.TemporaryDirectory() as tmp:
+        worksheet = FakeWorksheet(make_sheet(1000))
+        client = FakeClient(FakeSpreadsheet(worksheet))
+        first = load(client, tmp)
+
+        worksheet.calls = worksheet.cells = 0
+        second = load(client, tmp)
+        assert worksheet.calls == 0
+        assert second.equals(first) and second.equals(expected_frame(worksheet))
+
+
+def test_only_changed_and_new_rows_are_fetched():
+    with tempfile.TemporaryDirectory() as tmp:
+        worksheet = FakeWorksheet(make_sheet(1000))
+        spreadsheet = FakeSpreadsheet(worksheet)
+        load(FakeClient(spreadsheet), tmp)
+
+        worksheet.values[11][3] = '12 tỷ'
+        worksheet.values[11][4] = '05/02/2024'
+        worksheet.values[500][1] = 'Cho thuê'
+        worksheet.values[500][4] = '06/02/2024'
+        worksheet.values.append(['SP99999', 'Cho thuê', 'Quận 7', '15 triệu', '06/02/2024'])
+        spreadsheet.revision = '2024-02-06T00:00:00Z'
+
+        worksheet.calls = worksheet.cells = 0
+        df = load(FakeClient(spreadsheet), tmp)
+        # Probe (header + 2 columns) and one call for the changed ranges
+        assert worksheet.calls == 2
+        assert worksheet.cells < 2 * 1001 + 5 * 10
+        assert df.equals(expected_frame(worksheet))
+
+
+def test_deleted_rows_and_missing_revision():
+    """Without a revision every load probes; deletions shift rows and are re-read from there"""
+    with tempfile.TemporaryDirectory() as tmp:
+        worksheet = FakeWorksheet(make_sheet(200))
+        spreadsheet = FakeSpreadsheet(worksheet, revision=None)
+        load(FakeClient(spreadsheet), tmp)
+
+        worksheet.calls = 0
+        df = load(FakeClient(spreadsheet), tmp)
+        assert worksheet.calls == 2  # probe + (empty) tail read
+        assert df.equals(expected_frame(worksheet))
+
+        del worksheet.values[150:153]
+        assert load(FakeClient(spreadsheet), tmp).equals(expected_frame(worksheet))
+
+
+def test_header_change_and_corrupt_snapshot_fall_back_to_full_download():
+    from utils.sheet_snapshot import snapshot_path
+
+    with tempfile.TemporaryDirectory() as tmp:
+        worksheet = FakeWorksheet(make_sheet(50))
+        spreadsheet = FakeSpreadsheet(worksheet, revision=None)
+        load(FakeClient(spreadsheet), tmp)
+
+        for row in worksheet.values:
+            row.append('Hướng' if row is worksheet.values[0] else 'Đông')
+        assert load(FakeClient(spreadsheet), tmp).equals(expected_frame(worksheet))
+
+        with open(snapshot_path(SHEET_URL, tmp), 'w') as f:
+            f.write('{not json')
+        assert load(FakeClient(spreadsheet), tmp).equals(expected_frame(worksheet))
+
+
+def test_full_mode_matches_get_all_records():
+    from utils.data_loader import load_google_sheet
+
+    worksheet = FakeWorksheet(make_sheet(20))
+    df = load_google_sheet(SHEET_URL, client=FakeClient(FakeSpreadsheet(worksheet)), delta=False)
+    assert df.equals(expected_frame(worksheet))
+
+
+if __name__ == "__main__":
+    test_unchanged_sheet_is_not_downloaded()
+    test_only_changed_and_new_rows_are_fetched()
+    test_deleted_rows_and_missing_revision()
+    test_header_change_and_corrupt_snapshot_fall_back_to_full_download()
+    test_full_mode_matches_get_all_records()
+    print("✅ Google Sheet delta tests passed")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for the columnar snapshot cache of parsed source files
+"""
+
+import os
+import sys
+import tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+EXCEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'sample_landsoft.xls')
+
+
+def test_warm_load_skips_parsing():
+    from utils.data_loader import cached_frame
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'export.csv')
+        pd.DataFrame({'Mã sản phẩm': [1, 2], 'Quận/huyện': ['Quận 7', None]}).to_csv(source, index=False)
+        builds = []
+
+        def build():
+            builds.append(1)
+            return pd.read_csv(source)
+
+        cold = cached_frame('raw', source, build, snapshot_dir=tmp)
+        warm = cached_frame('raw', source, build, snapshot_dir=tmp)
+        assert len(builds) == 1
+        pd.testing.assert_frame_equal(cold, warm)
+
+        # New content -> new key
+        with open(source, 'a') as f:
+            f.write('3,Quận 1\n')
+        assert len(cached_frame('raw', source, build, snapshot_dir=tmp)) == 3 and len(builds) == 2
+
+
+def test_landsoft_snapshot_matches_fresh_processing():
+    from utils.data_loader import load_landsoft_file, process_landsoft_data, read_excel_file, snapshot_file
+
+    with tempfile.TemporaryDirectory() as tmp:
+        expected = process_landsoft_data(read_excel_file(EXCEL_PATH))
+        cold = load_landsoft_file(EXCEL_PATH, snapshot_dir=tmp)
+        assert os.path.exists(snapshot_file('excel', EXCEL_PATH, tmp))
+        assert os.path.exists(snapshot_file('landsoft', EXCEL_PATH, tmp))
+
+        warm = load_landsoft_file(EXCEL_PATH, snapshot_dir=tmp)
+        pd.testing.assert_frame_equal(cold, expected)
+        pd.testing.assert_frame_equal(warm, expected)
+
+
+def test_unrepresentable_frames_are_not_snapshotted():
+    from utils.data_loader import cached_frame
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'export.xlsx')
+        with open(source, 'wb') as f:
+            f.write(b'export')
+        mixed = pd.DataFrame({'Ngày ĐK': [pd.Timestamp('2025-01-01'), 'không rõ', 3]}, dtype=object)
+
+        assert cached_frame('raw', source, lambda: mixed, snapshot_dir=tmp) is mixed
+        assert not [name for name in os.listdir(tmp) if name.endswith('.feather')]
+
+        # A corrupt snapshot is rebuilt
+        cached_frame('ok', source, lambda: pd.DataFrame({'a': [1]}), snapshot_dir=tmp)
+        for name in os.listdir(tmp):
+            if name.endswith('.feather'):
+                with open(os.path.join(tmp, name), 'wb') as f:
+                    f.write(b'not arrow')
+        assert cached_frame('ok', source, lambda: pd.DataFrame({'a': [2]}), snapshot_dir=tmp)['a'].tolist() == [2]
+
+
+def test_missing_dates_are_filled_after_the_snapshot():
+    from pyarrow import feather
+    from utils.data_loader import load_landsoft_file, read_excel_file, snapshot_file
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raw = read_excel_file(EXCEL_PATH)
+        raw.loc[0, 'Ngày ĐK'] = None
+        source = os.path.join(tmp, 'export.xlsx')
+        raw.to_excel(source, index=False)
+
+        today = pd.Timestamp.now().strftime('%Y-%m-%d')
+        assert load_landsoft_file(source, snapshot_dir=tmp)['posted_date'][0] == today
+        assert feather.read_table(str(snapshot_file('landsoft', source, tmp)))['posted_date'][0].as_py() is None
+        assert load_landsoft_file(source, snapshot_dir=tmp)['posted_date'][0] == today
+
+
+if __name__ == "__main__":
+    test_warm_load_skips_parsing()
+    test_landsoft_snapshot_matches_fresh_processing()
+    test_unrepresentable_frames_are_not_snapshotted()
+    test_missing_dates_are_filled_after_the_snapshot()
+    print("✅ Snapshot cache tests passed")
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test script for streaming answers from the agent chain
+"""
+
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableLambda
+
+
+def make_chain(answer):
+    prompt = ChatPromptTemplate.from_template("{question}")
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content=answer)]))
+    return {"question": lambda question: question} | prompt | llm | StrOutputParser()
+
+
+def test_stream_answer_yields_incrementally():
+    from utils.streaming import stream_answer
+
+    answer = "Căn hộ Quận 7, 2 phòng ngủ, giá 4,5 tỷ."
+    updates = []
+    text, timings = stream_answer(make_chain(answer), "căn hộ Q7", on_update=updates.append)
+
+    assert text == answer
+    assert len(updates) == timings['chunks'] > 1
+    assert updates[0] != answer and updates[-1] == answer
+    assert 0 <= timings['ttft_seconds'] <= timings['total_seconds']
+
+
+def test_time_to_first_token_excludes_generation():
+    """TTFT is taken at the first chunk, not when the whole answer is done"""
+    from utils.streaming import stream_answer
+
+    def slow_tokens(_):
+        for token in ["a", "b", "c"]:
+            yield token
+            time.sleep(0.05)
+
+    _, timings = stream_answer(RunnableLambda(slow_tokens), "q")
+    assert timings['ttft_seconds'] < 0.05 <= timings['total_seconds'] - timings['ttft_seconds']
+
+
+def test_format_timings():
+    from utils.streaming import format_timings
+
+    assert format_timings({'ttft_seconds': 0.8234, 'total_seconds': 4.1}) == "⏱️ Token đầu tiên: 0.82s · Tổng: 4.10s"
+    assert format_timings({'ttft_seconds': None, 'total_seconds': 0.5}) == "⏱️ Token đầu tiên: - · Tổng: 0.50s"
+
+
+def test_build_chain_streams_from_injected_llm():
+    from langchain_core.documents import Document
+    from ai_agent import build_chain
+    from utils.streaming import stream_answer
+
+    answer = "Có 1 căn hộ phù hợp ở Quận 7."
+    prompts = []
+    llm = GenericFakeChatModel(messages=iter([AIMessage(content=answer)]))
+    retriever = RunnableLambda(lambda question: [Document(page_content=f"Căn hộ Quận 7 ({question})")])
+    chain = build_chain(retriever, llm=RunnableLambda(lambda prompt: prompts.append(prompt) or prompt) | llm)
+
+    text, _ = stream_answer(chain, "căn hộ Q7")
+    assert text == answer
+    assert "Căn hộ Quận 7 (căn hộ Q7)" in prompts[0].to_string()
+
+
+if __name__ == "__main__":
+    test_stream_answer_yields_incrementally()
+    test_time_to_first_token_excludes_generation()
+    test_format_timings()
+    test_build_chain_streams_from_injected_llm()
+    print("✅ Streaming tests passed")
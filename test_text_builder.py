@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test script: column-wise listing texts are byte-identical to the row-wise builder
+"""
+
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pandas as pd
+
+
+def assert_same_texts(df):
+    from legacy_reference import legacy_listing_texts
+    from utils.text_builder import build_listing_texts
+
+    expected = legacy_listing_texts(df)
+    actual = build_listing_texts(df)
+    assert actual.index.equals(expected.index)
+    assert actual.tolist() == expected.tolist()
+
+
+def test_sample_csv():
+    from utils.data_loader import load_data
+    assert_same_texts(load_data(source_type='sample'))
+
+
+def test_landsoft_export():
+    from utils.data_loader import load_data, process_landsoft_data
+    assert_same_texts(process_landsoft_data(load_data(source_type='excel')))
+
+
+def test_synthetic_export_with_missing_values():
+    from scripts.generate_sample_data import generate_landsoft_data
+    from utils.data_loader import process_landsoft_data
+
+    df = process_landsoft_data(generate_landsoft_data(3000, seed=3))
+    df.loc[df.index % 7 == 0, 'price'] = 0
+    df['area'] = df['area'].astype(object)
+    df.loc[df.index % 11 == 0, 'area'] = np.nan
+    df.loc[df.index % 13 == 0, 'description'] = '   trailing spaces   '
+    assert_same_texts(df)
+
+
+def test_google_sheets_frame_without_optional_columns():
+    from utils.data_loader import process_google_sheets_data
+
+    df = process_google_sheets_data(pd.DataFrame({
+        'Gallery': [1, 2],
+        'Tổng giá text': ['6 tỷ 900 triệu', 'Thương lượng'],
+        'Quận/huyện': ['Quận 7', None],
+    }))
+    assert_same_texts(df)
+
+
+if __name__ == "__main__":
+    test_sample_csv()
+    test_landsoft_export()
+    test_synthetic_export_with_missing_values()
+    test_google_sheets_frame_without_optional_columns()
+    print("✅ Column-wise listing texts match the row-wise builder")
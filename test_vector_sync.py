@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script for incremental vector store sync
+"""
+
+import os
+import sys
+import uuid
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+from langchain_core.embeddings import Embeddings
+
+
+class CountingEmbeddings(Embeddings):
+    """Deterministic fake backend that counts embedded texts"""
+
+    def __init__(self):
+        self.embedded = 0
+
+    def embed_documents(self, texts):
+        self.embedded += len(texts)
+        return [[float(len(text)), float(sum(map(ord, text)) % 97), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        return [float(len(text)), float(sum(map(ord, text)) % 97), 1.0]
+
+
+def test_make_document_ids_is_unique_and_stable():
+    from utils.vector_sync import make_document_ids
+
+    df = pd.DataFrame({'id': [1, 2, 1, 3, 1]})
+    assert make_document_ids(df) == ['1', '2', '1#2', '3', '1#3']
+    assert make_document_ids(df) == make_document_ids(df.copy())
+
+
+def test_sync_touches_only_changed_rows():
+    """Second sync embeds only the edited and the new listing, and drops the removed one"""
+    from langchain_community.vectorstores import Chroma
+    from utils.vector_sync import sync_vector_store
+
+    backend = CountingEmbeddings()
+    store = Chroma(collection_name=f"test_sync_{uuid.uuid4().hex}", embedding_function=backend)
+
+    stats = sync_vector_store(store, ['1', '2', '3'], ['căn hộ A', 'nhà phố B', 'biệt thự C'])
+    assert stats == {'added': 3, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+    assert backend.embedded == 3
+
+    stats = sync_vector_store(store, ['1', '2', '4'], ['căn hộ A', 'nhà phố B - giảm giá', 'đất nền D'])
+    assert stats == {'added': 1, 'updated': 1, 'deleted': 1, 'unchanged': 1}
+    assert backend.embedded == 5
+
+    current = store.get()
+    assert sorted(current['ids']) == ['1', '2', '4']
+    assert 'nhà phố B - giảm giá' in current['documents']
+
+    stats = sync_vector_store(store, ['1', '2', '4'], ['căn hộ A', 'nhà phố B - giảm giá', 'đất nền D'])
+    assert stats['unchanged'] == 3 and backend.embedded == 5
+
+    # A different embedding model invalidates every stored vector
+    stats = sync_vector_store(store, ['1', '2', '4'], ['căn hộ A', 'nhà phố B - giảm giá', 'đất nền D'],
+                              model_name='other-model')
+    assert stats['updated'] == 3
+
+
+def test_rebuild_drops_only_its_own_collection():
+    import contextlib
+    import io
+    import tempfile
+    from pathlib import Path
+    import ai_agent
+    from utils.embedding_cache import CachedEmbeddings
+
+    saved = ai_agent.VECTOR_DB_DIR, ai_agent.VECTOR_BACKEND, ai_agent.make_embeddings, ai_agent.requires_api_key
+    with tempfile.TemporaryDirectory() as tmp:
+        ai_agent.VECTOR_DB_DIR, ai_agent.VECTOR_BACKEND = Path(tmp), 'chroma'
+        ai_agent.make_embeddings = lambda: CachedEmbeddings(CountingEmbeddings(), 'fake', cache_path=':memory:')
+        ai_agent.requires_api_key = lambda: False
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                df = ai_agent.process_data(ai_agent.load_data('sample'), 'sample', verbose=False)
+                other = ai_agent.open_vector_store('csv', ai_agent.make_embeddings(), 'real_estate_csv_other')
+                other.add_texts(['căn hộ Q7'], ids=['kept'])
+                retriever = ai_agent.init_vector_store(df, 'sample', sync_mode='rebuild')
+                retriever = ai_agent.init_vector_store(df, 'sample', sync_mode='rebuild')
+            assert len(retriever.vector_store.get(include=[])['ids']) == len(df)
+            assert retriever.vector_store._collection.name == ai_agent.source_collection_name('sample')
+            assert other.get(include=[])['ids'] == ['kept']
+        finally:
+            ai_agent.VECTOR_DB_DIR, ai_agent.VECTOR_BACKEND, ai_agent.make_embeddings, ai_agent.requires_api_key = saved
+
+
+if __name__ == "__main__":
+    test_make_document_ids_is_unique_and_stable()
+    test_sync_touches_only_changed_rows()
+    test_rebuild_drops_only_its_own_collection()
+    print("✅ Vector sync tests passed")
@@ -0,0 +1,215 @@
+"""
+Process-wide cache of built agents, shared by all Streamlit sessions
+
+Agents are keyed by a fingerprint of their data source and configuration,
+built once, handed out as reference-counted leases and evicted (least
+recently used first, never while leased) when the memory budget is exceeded.
+"""
+
+import hashlib
+import json
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+from utils.config import AGENT_CACHE_MAX_BYTES
+
+
+def make_fingerprint(*parts, **settings):
+    """Stable hash of the data source parts and the settings a built agent depends on"""
+    payload = json.dumps([parts, settings], sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class AgentLease:
+    """
+    One session's hold on a cached agent
+
+    Released explicitly with release(), or automatically when the lease is
+    garbage collected (e.g. when a Streamlit session ends).
+    """
+
+    def __init__(self, cache, key, value):
+        self.key = key
+        self.value = value
+        self._finalizer = weakref.finalize(self, cache._release, key)
+
+    def release(self):
+        self._finalizer()
+
+    @property
+    def released(self):
+        return not self._finalizer.alive
+
+
+class _Entry:
+    def __init__(self):
+        self.ready = threading.Event()
+        self.value = None
+        self.error = None
+        self.size = 0
+        self.refcount = 0
+        self.dispose = None
+
+
+class AgentCache:
+    """
+    Thread-safe build-once cache with reference counting
+
+    Args:
+        max_bytes: Memory budget; unleased entries are evicted LRU-first above it
+    """
+
+    def __init__(self, max_bytes=AGENT_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def acquire(self, key, build, size_of=None, dispose=None):
+        """
+        Lease the value for `key`, calling build() if no one has built it yet
+
+        Concurrent callers with the same key wait for a single build. A failed
+        build is not cached, so the next caller retries.
+
+        Args:
+            key: Fingerprint, see make_fingerprint
+            build: Zero-argument function returning the value
+            size_of: Optional function value -> estimated bytes held in memory
+            dispose: Optional function value -> None, called once the entry
+                is evicted or cleared (e.g. to drop its vector collection)
+
+        Returns:
+            AgentLease whose .value is the shared (read-only) value
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            is_builder = entry is None
+            if is_builder:
+                entry = self._entries[key] = _Entry()
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            entry.refcount += 1
+
+        if is_builder:
+            try:
+                entry.value = build()
+                entry.size = int(size_of(entry.value)) if size_of is not None else 0
+                entry.dispose = dispose
+            except BaseException as e:
+                entry.error = e
+                with self._lock:
+                    if self._entries.get(key) is entry:
+                        del self._entries[key]
+                raise
+            finally:
+                entry.ready.set()
+            with self._lock:
+                evicted = self._evict()
+            _dispose(evicted)
+        else:
+            entry.ready.wait()
+            if entry.error is not None:
+                with self._lock:
+                    entry.refcount -= 1
+                raise entry.error
+
+        return AgentLease(self, key, entry.value)
+
+    def _release(self, key):
+        evicted = []
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.refcount > 0:
+                entry.refcount -= 1
+                evicted = self._evict()
+        _dispose(evicted)
+
+    def _evict(self):
+        """
+        Drop least recently used, unleased, built entries until within budget (lock held)
+
+        Returns:
+            The dropped entries, to be disposed of once the lock is released
+        """
+        total = sum(entry.size for entry in self._entries.values())
+        evicted = []
+        for key in list(self._entries):
+            if total <= self.max_bytes:
+                break
+            entry = self._entries[key]
+            if entry.refcount == 0 and entry.ready.is_set():
+                del self._entries[key]
+                total -= entry.size
+                self.evictions += 1
+                evicted.append(entry)
+                print(f"♻️ Agent cache: evicted {key[:12]} ({entry.size / 1e6:.1f} MB)")
+        return evicted
+
+    def is_leased(self, key):
+        """Whether a session holds (or is building) the entry for `key`"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry.refcount > 0
+
+    def discard(self, key):
+        """
+        Forget (and dispose of) the entry for `key` if no one holds it
+
+        Returns:
+            False if the entry is still leased, True otherwise
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return True
+            if entry.refcount > 0 or not entry.ready.is_set():
+                return False
+            del self._entries[key]
+        _dispose([entry])
+        return True
+
+    def clear(self):
+        """Forget (and dispose of) every unleased entry"""
+        with self._lock:
+            cleared = [self._entries.pop(key) for key, entry in list(self._entries.items())
+                       if entry.refcount == 0 and entry.ready.is_set()]
+        _dispose(cleared)
+
+    def stats(self):
+        with self._lock:
+            entries = list(self._entries.values())
+            return {
+                'entries': len(entries),
+                'leases': sum(entry.refcount for entry in entries),
+                'bytes': sum(entry.size for entry in entries),
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+
+def _dispose(entries):
+    """Run the dispose callbacks of dropped entries; a failing one only warns"""
+    for entry in entries:
+        if entry.dispose is not None:
+            try:
+                entry.dispose(entry.value)
+            except Exception as e:
+                print(f"Warning: Could not dispose of a cached agent: {e}")
+
+
+# Một cache cho cả process: mọi session Streamlit dùng chung
+AGENT_CACHE = AgentCache()
+
+
+def time_bucket(seconds):
+    """Changes every `seconds`, for sources without a revision id (forces a periodic rebuild)"""
+    return int(time.time() // seconds)
@@ -0,0 +1,265 @@
+"""
+Cache of generated answers, keyed by the question and the listings it was answered from
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from langchain_core.runnables import Runnable
+
+from utils.config import (
+    ANSWER_CACHE_BACKEND, ANSWER_CACHE_MAX_ENTRIES, ANSWER_CACHE_PATH, ANSWER_CACHE_TTL,
+    CONTEXT_TOKEN_BUDGET, LLM_MODEL, LLM_TEMPERATURE, PROMPT_TEMPLATE,
+)
+
+
+def normalize_question(question):
+    """Unicode-, case- and whitespace-insensitive form of a question"""
+    return ' '.join(unicodedata.normalize('NFC', str(question)).lower().split())
+
+
+def answer_version(prompt_template=PROMPT_TEMPLATE, model=LLM_MODEL, temperature=LLM_TEMPERATURE,
+                   context_token_budget=CONTEXT_TOKEN_BUDGET):
+    """Changes whenever the prompt, its context budget or the model settings change"""
+    payload = json.dumps([prompt_template, model, temperature, context_token_budget], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def answer_cache_key(question, documents, version):
+    """
+    Key of one answer: normalized question, the retrieved listings (id and
+    content, in rank order) and the prompt/model version
+    """
+    listings = [
+        [document.metadata.get('id'), hashlib.sha256(document.page_content.encode('utf-8')).hexdigest()]
+        for document in documents
+    ]
+    payload = json.dumps([version, normalize_question(question), listings], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class MemoryAnswerStore:
+    """Process-local LRU store"""
+
+    def __init__(self, max_entries=ANSWER_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, key, min_created):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        answer, created = entry
+        if created < min_created:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return answer
+
+    def set(self, key, answer, created):
+        self._entries[key] = (answer, created)
+        self._entries.move_to_end(key)
+        while self.max_entries is not None and len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SQLiteAnswerStore:
+    """On-disk LRU store that survives restarts (falls back to memory on read-only filesystems)"""
+
+    def __init__(self, path=ANSWER_CACHE_PATH, max_entries=ANSWER_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._conn = self._connect(path)
+
+    @staticmethod
+    def _connect(path):
+        if str(path) != ':memory:':
+            try:
+                Path(path).parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(path), check_same_thread=False)
+                SQLiteAnswerStore._init_schema(conn)
+                return conn
+            except (OSError, sqlite3.OperationalError) as e:
+                print(f"Warning: Could not open answer cache at {path}: {e}")
+        conn = sqlite3.connect(':memory:', check_same_thread=False)
+        SQLiteAnswerStore._init_schema(conn)
+        return conn
+
+    @staticmethod
+    def _init_schema(conn):
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS answers ("
+            "key TEXT PRIMARY KEY, answer TEXT NOT NULL, created REAL NOT NULL, last_used REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_answers_last_used ON answers(last_used)")
+        conn.commit()
+
+    def get(self, key, min_created):
+        row = self._conn.execute("SELECT answer, created FROM answers WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        if row[1] < min_created:
+            self._conn.execute("DELETE FROM answers WHERE key = ?", (key,))
+            self._conn.commit()
+            return None
+        self._conn.execute("UPDATE answers SET last_used = ? WHERE key = ?", (time.time(), key))
+        self._conn.commit()
+        return row[0]
+
+    def set(self, key, answer, created):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO answers (key, answer, created, last_used) VALUES (?, ?, ?, ?)",
+            (key, answer, created, created)
+        )
+        if self.max_entries is not None:
+            overflow = len(self) - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM answers WHERE key IN "
+                    "(SELECT key FROM answers ORDER BY last_used ASC LIMIT ?)", (overflow,)
+                )
+        self._conn.commit()
+
+    def __len__(self):
+        return self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+
+
+class AnswerCache:
+    """
+    TTL + LRU answer cache with hit-rate counters
+
+    Args:
+        store: MemoryAnswerStore or SQLiteAnswerStore
+        ttl: Seconds an answer stays valid (None = until evicted)
+    """
+
+    def __init__(self, store, ttl=ANSWER_CACHE_TTL):
+        self.store = store
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        min_created = time.time() - self.ttl if self.ttl is not None else float('-inf')
+        with self._lock:
+            answer = self.store.get(key, min_created)
+            if answer is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return answer
+
+    def set(self, key, answer):
+        with self._lock:
+            self.store.set(key, answer, time.time())
+
+    def stats(self):
+        with self._lock:
+            entries = len(self.store)
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': entries,
+            'backend': type(self.store).__name__,
+        }
+
+
+def make_answer_cache(backend=ANSWER_CACHE_BACKEND, ttl=ANSWER_CACHE_TTL, max_entries=ANSWER_CACHE_MAX_ENTRIES,
+                      path=ANSWER_CACHE_PATH):
+    """AnswerCache for a backend name ('memory' or 'sqlite'), or None for 'none'"""
+    if backend == 'none':
+        return None
+    if backend == 'memory':
+        return AnswerCache(MemoryAnswerStore(max_entries), ttl=ttl)
+    if backend == 'sqlite':
+        return AnswerCache(SQLiteAnswerStore(path, max_entries), ttl=ttl)
+    raise ValueError(f"Invalid answer cache backend: {backend}")
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_answer_cache():
+    """The process-wide answer cache configured by ANSWER_CACHE_BACKEND (None if disabled)"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None and ANSWER_CACHE_BACKEND != 'none':
+            _shared_cache = make_answer_cache()
+        return _shared_cache
+
+
+class CachedAnswer(Runnable):
+    """
+    Answer step of the chain with a cache in front of it
+
+    Takes {"context": [Document, ...], "question": str} (the retrieval step's
+    output), so the key covers exactly the listings the answer is based on.
+    Cached answers are returned (or streamed as one chunk) without calling
+    the LLM; new answers are stored once fully generated.
+
+    Args:
+        generate: Runnable producing the answer text (prompt | llm | parser)
+        cache: AnswerCache
+        version: See answer_version
+    """
+
+    def __init__(self, generate, cache, version=None):
+        self.generate = generate
+        self.cache = cache
+        self.version = version or answer_version()
+
+    def _key(self, input):
+        return answer_cache_key(input['question'], input['context'], self.version)
+
+    def invoke(self, input: Any, config=None, **kwargs) -> str:
+        key = self._key(input)
+        answer = self.cache.get(key)
+        if answer is None:
+            answer = self.generate.invoke(input, config, **kwargs)
+            self.cache.set(key, answer)
+        return answer
+
+    def stream(self, input: Any, config=None, **kwargs):
+        key = self._key(input)
+        answer = self.cache.get(key)
+        if answer is not None:
+            yield answer
+            return
+        chunks = []
+        for chunk in self.generate.stream(input, config, **kwargs):
+            chunks.append(chunk)
+            yield chunk
+        self.cache.set(key, ''.join(chunks))
+
+    async def ainvoke(self, input: Any, config=None, **kwargs) -> str:
+        key = self._key(input)
+        answer = self.cache.get(key)
+        if answer is None:
+            answer = await self.generate.ainvoke(input, config, **kwargs)
+            self.cache.set(key, answer)
+        return answer
+
+    async def astream(self, input: Any, config=None, **kwargs):
+        key = self._key(input)
+        answer = self.cache.get(key)
+        if answer is not None:
+            yield answer
+            return
+        chunks = []
+        async for chunk in self.generate.astream(input, config, **kwargs):
+            chunks.append(chunk)
+            yield chunk
+        self.cache.set(key, ''.join(chunks))
@@ -14,6 +14,12 @@ EXCEL_DATA_PATH = DATA_DIR / 'sample_landsoft.xls'  # Excel file path
 # ---------- Google Sheets Config ----------
 GOOGLE_CREDENTIALS_PATH = BASE_DIR / 'credentials.json'
 DEFAULT_SHEET_URL = os.getenv('GOOGLE_SHEET_URL', '')  # Set via environment variable
+# Delta: giữ bản sao cục bộ, chỉ tải lại các dòng thay đổi (theo cột 'Ngày cập nhật')
+GSHEET_DELTA_ENABLED = os.getenv('GSHEET_DELTA', '1') != '0'
+GSHEET_SNAPSHOT_DIR = BASE_DIR / 'gsheet_cache'
+GSHEET_UPDATE_COLUMN = 'Ngày cập nhật'
+GSHEET_KEY_COLUMN = 'Mã sản phẩm'
+GSHEET_FULL_REFRESH_SECONDS = 24 * 3600  # Tải lại toàn bộ định kỳ (bắt cả sửa đổi không cập nhật ngày)
 
 # ---------- Database Sources ----------
 DATABASE_SOURCES = {
@@ -41,12 +47,98 @@ DATABASE_SOURCES = {
 }
 
 # ---------- AI Model Config ----------
+# 'openai': OpenAI embeddings (cần API key); 'local': n-gram ký tự băm, chạy bằng CPU, không cần mạng
+EMBEDDING_PROVIDER = os.getenv('EMBEDDING_PROVIDER', 'openai')
 EMBEDDING_MODEL = "text-embedding-3-small"
+LOCAL_EMBEDDING_DIMENSIONS = 512  # Số chiều vector của embedding local
+LOCAL_EMBEDDING_NGRAM_RANGE = (3, 5)  # Độ dài n-gram ký tự
+LOCAL_EMBEDDING_BATCH_SIZE = 2048  # Số text băm mỗi lần (giới hạn bộ nhớ tạm)
 LLM_MODEL = "gpt-4o-mini"
 LLM_TEMPERATURE = 0.1  # Độ sáng tạo của AI
 
+# ---------- Embedding Cache Config ----------
+EMBEDDING_CACHE_PATH = BASE_DIR / 'embedding_cache' / 'embeddings.sqlite3'
+EMBEDDING_CACHE_MAX_ENTRIES = 200000  # Số vector tối đa giữ trong cache (LRU)
+
+# ---------- Embedding Executor Config ----------
+EMBEDDING_BATCH_SIZE = 256  # Số text mỗi request
+EMBEDDING_MAX_WORKERS = 4  # Số request chạy song song
+EMBEDDING_TPM_LIMIT = int(os.getenv('EMBEDDING_TPM_LIMIT', '1000000'))  # Giới hạn tokens/phút của tài khoản OpenAI
+EMBEDDING_MAX_RETRIES = 6  # Thử lại khi bị 429/lỗi tạm thời
+EMBEDDING_BACKOFF_SECONDS = 1.0  # Thời gian chờ lần thử lại đầu tiên (nhân đôi mỗi lần)
+
+# ---------- Snapshot Cache Config ----------
+# Bản sao dạng cột (Arrow/Feather) của file Excel/CSV đã đọc, theo hash nội dung file
+SNAPSHOT_CACHE_ENABLED = os.getenv('SNAPSHOT_CACHE', '1') != '0'
+SNAPSHOT_CACHE_DIR = BASE_DIR / 'snapshot_cache'
+SNAPSHOT_CACHE_MAX_FILES = 20  # Giữ các snapshot mới nhất
+
+# ---------- Ingestion Config ----------
+# 'memory': đọc cả file vào một DataFrame; 'streaming': đọc/xử lý/nhúng từng khối (bộ nhớ không tăng theo kích thước file)
+INGEST_MODE = os.getenv('INGEST_MODE', 'memory')
+INGEST_CHUNK_SIZE = 5000  # Số dòng mỗi khối khi streaming
+
+# ---------- Listings Table Config ----------
+COMPACT_LISTINGS = os.getenv('COMPACT_LISTINGS', '1') != '0'  # Kiểu dữ liệu gọn cho bảng sản phẩm giữ trong bộ nhớ
+CATEGORY_MAX_RATIO = 0.5  # Chỉ chuyển sang category khi số giá trị khác nhau <= 50% số dòng
+
+# ---------- Answer Cache Config ----------
+# 'memory' (theo process), 'sqlite' (giữ qua các lần khởi động lại) hoặc 'none'
+ANSWER_CACHE_BACKEND = os.getenv('ANSWER_CACHE_BACKEND', 'memory')
+ANSWER_CACHE_PATH = BASE_DIR / 'answer_cache' / 'answers.sqlite3'
+ANSWER_CACHE_TTL = 6 * 3600  # Giây một câu trả lời còn hiệu lực
+ANSWER_CACHE_MAX_ENTRIES = 10000
+
+# ---------- Vector Store Config ----------
+# 'incremental': chỉ thêm/cập nhật/xóa các sản phẩm thay đổi; 'rebuild': xóa và tạo lại toàn bộ
+VECTOR_SYNC_MODE = os.getenv('VECTOR_SYNC_MODE', 'incremental')
+# 'chroma' (SQLite + HNSW) hoặc 'numpy' (ma trận float32 memory-mapped, tìm kiếm chính xác bằng một phép nhân ma trận)
+VECTOR_BACKEND = os.getenv('VECTOR_BACKEND', 'chroma')
+NUMPY_VECTOR_DIR = BASE_DIR / 'vector_index'
+
+# ---------- Agent Cache Config ----------
+# Agent dùng chung giữa các session; vượt ngân sách thì bỏ agent ít dùng nhất (không ai đang dùng)
+AGENT_CACHE_MAX_BYTES = int(os.getenv('AGENT_CACHE_MAX_MB', '2048')) * 1024 * 1024
+GSHEET_REVISION_TTL = 300  # Giây; dùng khi không đọc được thời điểm sửa cuối của Google Sheet
+EMBEDDING_DIMENSIONS = LOCAL_EMBEDDING_DIMENSIONS if EMBEDDING_PROVIDER == 'local' else 1536  # Để ước lượng bộ nhớ vector store
+
+# ---------- Metrics Config ----------
+# Thời gian từng bước (span) khi khởi tạo agent và khi trả lời câu hỏi
+METRICS_LOG_PATH = os.getenv('METRICS_LOG_PATH', '')  # Log JSON mỗi dòng (vd. logs/metrics.jsonl); mặc định tắt
+METRICS_PORT = int(os.getenv('METRICS_PORT', '9464'))  # /metrics (Prometheus) trên 127.0.0.1; 0 để tắt
+METRICS_HISTORY = 50  # Số trace gần nhất giữ trong bộ nhớ cho mỗi loại (build/query)
+
+# ---------- Dedup Config ----------
+# Gộp tin đăng trùng (cùng địa chỉ/diện tích/giá, mô tả gần giống) trước khi embed
+DEDUP_ENABLED = os.getenv('DEDUP_ENABLED', '1') != '0'  # Áp dụng cho nguồn excel (LandSoft) và gsheet
+DEDUP_THRESHOLD = 0.6  # Độ tương đồng Jaccard (ước lượng) tối thiểu của hai mô tả
+DEDUP_NUM_PERM = 64  # Số hoán vị MinHash
+DEDUP_BANDS = 16  # Số dải LSH (DEDUP_NUM_PERM chia hết cho DEDUP_BANDS)
+DEDUP_SHINGLE_SIZE = 2  # Số từ mỗi shingle
+
+# ---------- Service Config ----------
+# HTTP API (api.py): một agent dùng chung cho mọi request
+SERVICE_SOURCE = os.getenv('SERVICE_SOURCE', 'sample')  # Nguồn dữ liệu khi khởi động: sample/csv/excel/gsheet
+SERVICE_FILE_PATH = os.getenv('SERVICE_FILE_PATH') or None  # File csv/excel (mặc định theo nguồn)
+SERVICE_MAX_CONCURRENCY = int(os.getenv('SERVICE_MAX_CONCURRENCY', '32'))  # Số câu hỏi xử lý đồng thời
+SERVICE_MAX_BATCH = 50  # Số câu hỏi tối đa mỗi request /ask/batch
+SERVICE_HTTP_MAX_CONNECTIONS = 64  # Kết nối tối đa tới OpenAI (dùng chung, giữ kết nối)
+SERVICE_HTTP_MAX_KEEPALIVE = 32
+SERVICE_HTTP_TIMEOUT = 60.0  # Giây
+
+# ---------- Batch Config ----------
+# scripts/batch_questions.py: trả lời hàng loạt câu hỏi từ file JSONL
+BATCH_MAX_CONCURRENCY = int(os.getenv('BATCH_MAX_CONCURRENCY', '8'))  # Số câu hỏi gọi LLM đồng thời
+
 # ---------- Application Config ----------
 TOP_K_RESULTS = 3  # Số lượng sản phẩm trả về
+CONTEXT_TOKEN_BUDGET = int(os.getenv('CONTEXT_TOKEN_BUDGET', '600'))  # Token (ước lượng) tối đa cho danh sách sản phẩm trong prompt; mô tả bị cắt bớt cho vừa
+QUERY_FILTERS_ENABLED = True  # Lọc theo quận/giá/phòng ngủ/loại giao dịch trích từ câu hỏi
+HYBRID_SEARCH_ENABLED = True  # Kết hợp BM25 (từ khóa) với vector search
+HYBRID_FETCH_K = 20  # Số ứng viên lấy từ mỗi nguồn trước khi hợp nhất
+RRF_K = 60  # Hằng số reciprocal rank fusion
+RERANK_ENABLED = True  # Xếp hạng lại ứng viên theo giá/diện tích/phòng ngủ/quận/loại giao dịch trong câu hỏi
+RERANK_FETCH_K = 50  # Số ứng viên lấy về để xếp hạng lại trước khi giữ TOP_K_RESULTS
 MAX_INPUT_LENGTH = 500  # Độ dài tối đa của câu hỏi
 
 # ---------- Prompt Templates ----------
@@ -76,10 +168,29 @@ PROMPT_TEMPLATE = """
 # ---------- District Mapping ----------
 DISTRICT_ALIASES = {
     "q1": "Quận 1",
+    "q2": "Quận 2",
     "q3": "Quận 3",
+    "q4": "Quận 4",
+    "q5": "Quận 5",
+    "q6": "Quận 6",
+    "q7": "Quận 7",
+    "q8": "Quận 8",
+    "q9": "Quận 9",
+    "q10": "Quận 10",
+    "q11": "Quận 11",
+    "q12": "Quận 12",
     "thuduc": "Quận Thủ Đức",
     "binhthanh": "Quận Bình Thạnh",
     "govap": "Quận Gò Vấp",
+    "phunhuan": "Quận Phú Nhuận",
+    "tanbinh": "Quận Tân Bình",
+    "tanphu": "Quận Tân Phú",
+    "binhtan": "Quận Bình Tân",
+    "nhabe": "Huyện Nhà Bè",
+    "binhchanh": "Huyện Bình Chánh",
+    "hocmon": "Huyện Hóc Môn",
+    "cuchi": "Huyện Củ Chi",
+    "cangio": "Huyện Cần Giờ",
     "trungtam": ["Quận 1", "Quận 3", "Quận 4"]
 }
 
@@ -1,11 +1,18 @@
+import numpy as np
 import pandas as pd
 import gspread
 from google.oauth2.service_account import Credentials
-from utils.config import SAMPLE_DATA_PATH, PRODUCTION_DATA_PATH, EXCEL_DATA_PATH
+from utils.config import SAMPLE_DATA_PATH, PRODUCTION_DATA_PATH, EXCEL_DATA_PATH, GSHEET_DELTA_ENABLED, GSHEET_SNAPSHOT_DIR
+from utils.config import SNAPSHOT_CACHE_ENABLED, SNAPSHOT_CACHE_DIR, SNAPSHOT_CACHE_MAX_FILES
+from utils.hashing import file_digest
+from utils.metrics import span
+from utils.price_parser import parse_prices
+from utils.sheet_snapshot import SheetDeltaLoader, snapshot_path
 import os
 import re
 import json
 from datetime import datetime
+from pathlib import Path
 
 def load_data(source_type='sample', sheet_url=None, credentials_path='credentials.json', file_path=None):
     """
@@ -37,8 +44,107 @@ def load_data(source_type='sample', sheet_url=None, credentials_path='credential
     else:
         raise ValueError(f"Invalid source type: {source_type}")
 
-def load_excel_file(file_path):
-    """Load data from Excel file (.xls or .xlsx)"""
+# Bump whenever parsing or processing changes, so snapshots of the old output are not reused
+LOADER_VERSION = 2
+
+DEFAULT_SNAPSHOT_DIR = SNAPSHOT_CACHE_DIR if SNAPSHOT_CACHE_ENABLED else None
+
+def snapshot_file(kind, file_path, snapshot_dir=SNAPSHOT_CACHE_DIR):
+    """Snapshot path for one kind of frame ('excel', 'landsoft') of a file, keyed by content and loader version"""
+    return Path(snapshot_dir) / f"{kind}-{file_digest(file_path)[:32]}-v{LOADER_VERSION}.feather"
+
+def read_snapshot(path):
+    """Memory-map a Feather snapshot into a DataFrame, or None if missing or unreadable"""
+    if not os.path.exists(path):
+        return None
+    try:
+        from pyarrow import feather
+        df = feather.read_table(str(path), memory_map=True).to_pandas()
+        os.utime(path)  # Recently used snapshots survive pruning
+        return df
+    except Exception as e:
+        print(f"⚠️ Could not read snapshot {path}: {e}")
+        return None
+
+def write_snapshot(df, path, max_files=SNAPSHOT_CACHE_MAX_FILES):
+    """
+    Write a DataFrame as an uncompressed Feather (Arrow IPC) file, which can be memory-mapped
+    
+    Frames Arrow cannot represent faithfully (custom index, mixed-type object
+    columns) are skipped. Returns True if the snapshot was written.
+    """
+    index = df.index
+    if not isinstance(index, pd.RangeIndex) or index.start != 0 or index.step != 1:
+        return False
+    try:
+        import pyarrow as pa
+        from pyarrow import feather
+    except ImportError:
+        return False
+    
+    path = Path(path)
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        feather.write_feather(table, str(tmp_path), compression='uncompressed')
+        os.replace(tmp_path, path)
+    except (pa.ArrowException, OSError, ValueError) as e:
+        print(f"⚠️ Could not write snapshot {path.name}: {e}")
+        return False
+    
+    # Keep only the most recently used snapshots
+    snapshots = sorted(path.parent.glob('*.feather'), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old_path in snapshots[max_files:]:
+        try:
+            old_path.unlink()
+        except OSError:
+            pass
+    return True
+
+def cached_frame(kind, file_path, build, snapshot_dir=DEFAULT_SNAPSHOT_DIR):
+    """
+    build() through a columnar snapshot of its result
+    
+    Args:
+        kind: Name of what build() produces, part of the snapshot key
+        file_path: Source file; its content hash is part of the snapshot key
+        build: Zero-argument function parsing/processing the file into a DataFrame
+        snapshot_dir: Snapshot directory (None = always build)
+    """
+    if snapshot_dir is None:
+        return build()
+    
+    path = snapshot_file(kind, file_path, snapshot_dir)
+    df = read_snapshot(path)
+    if df is not None:
+        print(f"⚡ Loaded {kind} snapshot of {os.path.basename(str(file_path))}: {len(df)} rows, {len(df.columns)} columns")
+        return df
+    
+    df = build()
+    write_snapshot(df, path)
+    return df
+
+def load_excel_file(file_path, snapshot_dir=DEFAULT_SNAPSHOT_DIR):
+    """Load data from Excel file (.xls or .xlsx), parsing it only once per file content"""
+    return cached_frame('excel', file_path, lambda: read_excel_file(file_path), snapshot_dir)
+
+def load_landsoft_file(file_path, snapshot_dir=DEFAULT_SNAPSHOT_DIR):
+    """Load and process a LandSoft Excel export, reusing the processed snapshot when the file is unchanged"""
+    def load():
+        with span('read_excel') as stage:
+            raw = load_excel_file(file_path, snapshot_dir)
+            stage.set(rows=len(raw))
+        with span('process_landsoft_data', rows=len(raw)):
+            return process_landsoft_data(raw, fill_missing_dates=False)
+
+    df = cached_frame('landsoft', file_path, load, snapshot_dir)
+    # Today's date for undated listings is applied on every load, never frozen into the snapshot
+    df['posted_date'] = fill_missing_posted_dates(df['posted_date'])
+    return df
+
+def read_excel_file(file_path):
+    """Parse an Excel file (.xls or .xlsx)"""
     try:
         # Try to read the Excel file
         df = pd.read_excel(file_path)
@@ -68,9 +174,13 @@ def load_excel_file(file_path):
     except Exception as e:
         raise Exception(f"Error reading Excel file {file_path}: {str(e)}")
 
-def process_landsoft_data(df):
+def process_landsoft_data(df, fill_missing_dates=True):
     """
     Process LandSoft Excel data to match expected format
+    
+    Args:
+        fill_missing_dates: Give listings without a registration date today's
+            posted_date (False leaves them missing, see fill_missing_posted_dates)
     """
     print("🔄 Processing LandSoft data...")
     
@@ -113,47 +223,37 @@ def process_landsoft_data(df):
             processed_df['id'] = 'SP_' + processed_df.index.astype(str)
     
     # Process address
-    processed_df['address'] = processed_df.apply(
-        lambda row: f"{row.get('house_number', '')} {row.get('street_name', '')}, {row.get('ward', '')}, {row.get('district', '')}".strip(),
-        axis=1
-    )
-    
-    # If address is empty or just commas, use a default
-    processed_df['address'] = processed_df['address'].apply(
-        lambda x: 'N/A' if not x or x.strip() in [',', ''] else x
-    )
+    processed_df['address'] = build_addresses(processed_df)
     
     # Process price
     if 'price_text' in processed_df.columns:
-        processed_df['price'] = processed_df['price_text'].apply(parse_price_text)
+        processed_df['price'] = parse_prices(processed_df['price_text'])
     elif 'price' not in processed_df.columns:
         processed_df['price'] = 0
     
     # Process property type based on transaction type and description
-    processed_df['type'] = processed_df.apply(determine_property_type, axis=1)
+    processed_df['type'] = determine_property_types(processed_df)
     
     # Extract bedrooms from description
-    processed_df['bedrooms'] = processed_df['description'].apply(extract_bedrooms)
+    processed_df['bedrooms'] = extract_bedrooms_series(processed_df['description'])
     
     # Process legal status (default to available)
     processed_df['legal_status'] = 'Sổ hồng'  # Default value
     
     # Process amenities from description
-    processed_df['amenities'] = processed_df['description'].apply(extract_amenities)
+    processed_df['amenities'] = extract_amenities_series(processed_df['description'])
     
     # Process status based on transaction type
     if 'transaction_type' in processed_df.columns:
-        processed_df['status'] = processed_df['transaction_type'].apply(
-            lambda x: 'available' if x == 'Cần bán' else 'for_rent' if x == 'Cho thuê' else 'available'
-        )
+        processed_df['status'] = pd.Series(
+            np.where(processed_df['transaction_type'].eq('Cho thuê').to_numpy(dtype=bool), 'for_rent', 'available'),
+            index=processed_df.index, dtype=object
+        ).infer_objects()
     else:
         processed_df['status'] = 'available'
     
     # Add posted_date
-    processed_df['posted_date'] = processed_df['registration_date'].apply(
-        lambda x: x.strftime('%Y-%m-%d') if pd.notna(x) and hasattr(x, 'strftime') else 
-                 (x if pd.notna(x) and isinstance(x, str) else datetime.now().strftime('%Y-%m-%d'))
-    )
+    processed_df['posted_date'] = format_posted_dates(processed_df['registration_date'], fill_missing_dates)
     
     print(f"✅ Processed {len(processed_df)} records")
     return processed_df
@@ -162,34 +262,47 @@ def parse_price_text(price_text):
     """
     Parse price text to numeric value
     Examples: "50 triệu" -> 50000000, "6 tỷ 900 triệu" -> 6900000000
-    """
-    if pd.isna(price_text) or price_text == 'Thương lượng':
-        return 0
-    
-    price_text = str(price_text).strip()
-    
-    # Handle "Thương lượng" or empty
-    if 'thương lượng' in price_text.lower() or price_text == '':
-        return 0
-    
-    total_price = 0
     
-    # Extract billions (tỷ)
-    billion_match = re.search(r'(\d+(?:\.\d+)?)\s*tỷ', price_text, re.IGNORECASE)
-    if billion_match:
-        total_price += float(billion_match.group(1)) * 1000000000
-    
-    # Extract millions (triệu)
-    million_match = re.search(r'(\d+(?:\.\d+)?)\s*triệu', price_text, re.IGNORECASE)
-    if million_match:
-        total_price += float(million_match.group(1)) * 1000000
-    
-    # Extract thousands (nghìn)
-    thousand_match = re.search(r'(\d+(?:\.\d+)?)\s*nghìn', price_text, re.IGNORECASE)
-    if thousand_match:
-        total_price += float(thousand_match.group(1)) * 1000
-    
-    return int(total_price) if total_price > 0 else 0
+    Single-value convenience wrapper; use parse_prices for whole columns.
+    """
+    return int(parse_prices(pd.Series([price_text], dtype=object)).iloc[0])
+
+# Property type keywords, checked in order (first match wins)
+PROPERTY_TYPE_KEYWORDS = [
+    ('Căn hộ', ['căn hộ', 'apartment', 'chung cư']),
+    ('Nhà phố', ['nhà phố', 'shophouse', 'nhà mặt tiền']),
+    ('Biệt thự', ['biệt thự', 'villa']),
+    ('Văn phòng', ['văn phòng', 'office']),
+    ('Đất nền', ['đất nền', 'đất thổ cư']),
+]
+
+# Bedroom patterns, checked in order (first pattern that matches wins)
+BEDROOM_PATTERNS = [
+    r'(\d+)\s*phòng\s*ngủ',
+    r'(\d+)\s*pn',
+    r'(\d+)\s*bedroom',
+    r'(\d+)\s*br'
+]
+
+# Common amenities to look for
+AMENITY_KEYWORDS = {
+    'hồ bơi': 'Hồ bơi',
+    'gym': 'Gym',
+    'thang máy': 'Thang máy',
+    'bãi xe': 'Bãi xe',
+    'an ninh': 'An ninh 24/7',
+    'sân chơi': 'Sân chơi trẻ em',
+    'vườn': 'Vườn',
+    'sân thượng': 'Sân thượng',
+    'ban công': 'Ban công',
+    'nhà bếp': 'Nhà bếp',
+    'phòng khách': 'Phòng khách',
+    'wc': 'WC riêng',
+    'điều hòa': 'Điều hòa',
+    'nóng lạnh': 'Nóng lạnh',
+    'internet': 'Internet',
+    'truyền hình': 'Truyền hình cáp'
+}
 
 def determine_property_type(row):
     """
@@ -199,22 +312,15 @@ def determine_property_type(row):
     transaction_type = str(row.get('transaction_type', '')).lower()
     
     # Check for specific keywords in description
-    if any(word in description for word in ['căn hộ', 'apartment', 'chung cư']):
-        return 'Căn hộ'
-    elif any(word in description for word in ['nhà phố', 'shophouse', 'nhà mặt tiền']):
-        return 'Nhà phố'
-    elif any(word in description for word in ['biệt thự', 'villa']):
-        return 'Biệt thự'
-    elif any(word in description for word in ['văn phòng', 'office']):
-        return 'Văn phòng'
-    elif any(word in description for word in ['đất nền', 'đất thổ cư']):
-        return 'Đất nền'
+    for property_type, keywords in PROPERTY_TYPE_KEYWORDS:
+        if any(word in description for word in keywords):
+            return property_type
+    
+    # Default based on transaction type
+    if 'cho thuê' in transaction_type:
+        return 'Căn hộ'  # Most common for rental
     else:
-        # Default based on transaction type
-        if 'cho thuê' in transaction_type:
-            return 'Căn hộ'  # Most common for rental
-        else:
-            return 'Nhà phố'  # Most common for sale
+        return 'Nhà phố'  # Most common for sale
 
 def extract_bedrooms(description):
     """
@@ -226,14 +332,7 @@ def extract_bedrooms(description):
     description = str(description).lower()
     
     # Look for bedroom patterns
-    patterns = [
-        r'(\d+)\s*phòng\s*ngủ',
-        r'(\d+)\s*pn',
-        r'(\d+)\s*bedroom',
-        r'(\d+)\s*br'
-    ]
-    
-    for pattern in patterns:
+    for pattern in BEDROOM_PATTERNS:
         match = re.search(pattern, description)
         if match:
             return int(match.group(1))
@@ -250,37 +349,149 @@ def extract_amenities(description):
     description = str(description).lower()
     amenities = []
     
-    # Common amenities to look for
-    amenity_keywords = {
-        'hồ bơi': 'Hồ bơi',
-        'gym': 'Gym',
-        'thang máy': 'Thang máy',
-        'bãi xe': 'Bãi xe',
-        'an ninh': 'An ninh 24/7',
-        'sân chơi': 'Sân chơi trẻ em',
-        'vườn': 'Vườn',
-        'sân thượng': 'Sân thượng',
-        'ban công': 'Ban công',
-        'nhà bếp': 'Nhà bếp',
-        'phòng khách': 'Phòng khách',
-        'wc': 'WC riêng',
-        'điều hòa': 'Điều hòa',
-        'nóng lạnh': 'Nóng lạnh',
-        'internet': 'Internet',
-        'truyền hình': 'Truyền hình cáp'
-    }
-    
-    for keyword, amenity in amenity_keywords.items():
+    for keyword, amenity in AMENITY_KEYWORDS.items():
         if keyword in description:
             amenities.append(amenity)
     
     return ', '.join(amenities) if amenities else 'Cơ bản'
 
-def load_google_sheet(sheet_url, credentials_path='credentials.json'):
-    """Load data from Google Sheet using service account credentials"""
-    # Set up authentication
-    scopes = ['https://www.googleapis.com/auth/spreadsheets']
+# ---------- Vectorized (column-wise) versions of the helpers above ----------
+
+# Arrow-backed strings run lower/contains/strip in C++ instead of a Python loop.
+# NaN as missing value matches pandas 3's default 'str' dtype, so its columns need no conversion.
+try:
+    import pyarrow  # noqa: F401
+    try:
+        TEXT_DTYPE = pd.StringDtype('pyarrow', na_value=np.nan)
+    except TypeError:
+        TEXT_DTYPE = pd.StringDtype('pyarrow')
+except ImportError:
+    TEXT_DTYPE = object
+
+# dtype pandas infers for a column of Python strings (object on pandas 2, str on pandas 3)
+STRING_RESULT_DTYPE = pd.Series(['']).dtype
+
+def to_text(values):
+    """Element-wise str() of a Series, matching how the row-wise f-strings render values (NaN -> 'nan')"""
+    if pd.api.types.is_string_dtype(values.dtype) and values.dtype != object:
+        return values.fillna('nan').astype(TEXT_DTYPE)
+    if values.dtype == object or pd.api.types.is_bool_dtype(values.dtype):
+        return values.astype(object).map(str).astype(TEXT_DTYPE)
+    
+    # Numbers, dates, categories: render each distinct value once (missing -> 'nan')
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    # float32 scalars print their shortest form (80.1), Python floats would not (80.0999984741211)
+    uniques = list(np.asarray(uniques, dtype=np.float32)) if values.dtype == np.float32 else uniques.tolist()
+    rendered = pd.array([str(value) for value in uniques] + ['nan'], dtype=TEXT_DTYPE)
+    return pd.Series(rendered.take(codes), index=values.index)
+
+def _column_text(df, column):
+    """Text of a column, or '' for every row if the column is missing (like row.get(column, ''))"""
+    if column in df.columns:
+        return to_text(df[column])
+    return pd.Series('', index=df.index, dtype=TEXT_DTYPE)
+
+def to_string_result(values):
+    """Give computed string columns the dtype pandas infers for apply() results"""
+    return values.astype(STRING_RESULT_DTYPE)
+
+def build_addresses(df):
+    """
+    Build 'house_number street_name, ward, district' addresses for all rows,
+    using 'N/A' when nothing but separators is left
+    """
+    addresses = (
+        _column_text(df, 'house_number') + ' ' + _column_text(df, 'street_name') + ', '
+        + _column_text(df, 'ward') + ', ' + _column_text(df, 'district')
+    ).str.strip()
+    return to_string_result(addresses.mask(addresses.isin(['', ',']), 'N/A'))
+
+def _contains(text, keyword):
+    return text.str.contains(keyword, regex=False).to_numpy(dtype=bool)
+
+def determine_property_types(df):
+    """Column-wise determine_property_type"""
+    description = _column_text(df, 'description').str.lower()
+    transaction_type = _column_text(df, 'transaction_type').str.lower()
+    
+    conditions = [
+        np.logical_or.reduce([_contains(description, keyword) for keyword in keywords])
+        for _, keywords in PROPERTY_TYPE_KEYWORDS
+    ]
+    choices = [property_type for property_type, _ in PROPERTY_TYPE_KEYWORDS]
+    default = np.where(_contains(transaction_type, 'cho thuê'), 'Căn hộ', 'Nhà phố')
+    return to_string_result(pd.Series(np.select(conditions, choices, default=default), index=df.index))
+
+def extract_bedrooms_series(descriptions):
+    """Column-wise extract_bedrooms"""
+    text = to_text(descriptions).str.lower()
+    
+    # Every pattern needs one of these substrings; only those rows go through the regexes
+    candidates = descriptions.notna().to_numpy() & np.logical_or.reduce(
+        [_contains(text, keyword) for keyword in ('phòng', 'pn', 'bedroom', 'br')]
+    )
+    candidate_text = text[candidates].astype(object)
+    
+    found = pd.Series(np.nan, index=candidate_text.index, dtype=object)
+    for pattern in BEDROOM_PATTERNS:
+        found = found.fillna(candidate_text.str.extract(pattern, expand=False))
     
+    bedrooms = np.zeros(len(descriptions), dtype='int64')
+    bedrooms[candidates] = found.fillna('0').map(int).to_numpy(dtype='int64')
+    return pd.Series(bedrooms, index=descriptions.index)
+
+def extract_amenities_series(descriptions):
+    """Column-wise extract_amenities"""
+    text = to_text(descriptions).str.lower()
+    
+    # Encode the amenities found in each row as a bitmask, then render each distinct mask once
+    labels = list(AMENITY_KEYWORDS.values())
+    masks = np.zeros(len(descriptions), dtype='int64')
+    for bit, keyword in enumerate(AMENITY_KEYWORDS):
+        masks |= _contains(text, keyword).astype('int64') << bit
+    
+    codes, unique_masks = pd.factorize(masks)
+    rendered = np.array([
+        ', '.join(label for bit, label in enumerate(labels) if mask >> bit & 1) or 'Cơ bản'
+        for mask in unique_masks
+    ], dtype=object)
+    amenities = pd.Series(rendered[codes], index=descriptions.index)
+    return to_string_result(amenities.mask(descriptions.isna(), ''))
+
+def format_posted_dates(values, fill_missing=True):
+    """
+    Render registration dates as 'YYYY-MM-DD'; strings are kept as-is and
+    missing dates fall back to today (or stay None without fill_missing)
+    """
+    today = datetime.now().strftime('%Y-%m-%d') if fill_missing else None
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        dates = values.dt.strftime('%Y-%m-%d').astype(object)
+        return (dates.fillna(today) if fill_missing else dates.where(dates.notna(), None)).infer_objects()
+    
+    result = pd.Series(today, index=values.index, dtype=object)
+    is_text = values.map(type).eq(str).to_numpy(dtype=bool)
+    result[is_text] = values[is_text]
+    
+    # Remaining values are rare in practice (mixed columns); handle them one by one
+    others = values.notna().to_numpy(dtype=bool) & ~is_text
+    if others.any():
+        result[others] = values[others].map(
+            lambda x: x.strftime('%Y-%m-%d') if pd.notna(x) and hasattr(x, 'strftime') else today
+        )
+    return result.infer_objects()
+
+def fill_missing_posted_dates(values):
+    """Missing posted dates fall back to today"""
+    if not values.isna().any():
+        return values
+    return values.astype(object).fillna(datetime.now().strftime('%Y-%m-%d')).infer_objects()
+
+GSHEET_SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+# Drive metadata gives the sheet's last modification time (used as its revision)
+GSHEET_REVISION_SCOPES = GSHEET_SCOPES + ['https://www.googleapis.com/auth/drive.metadata.readonly']
+
+def get_gspread_client(credentials_path='credentials.json', scopes=GSHEET_SCOPES):
+    """Authorize a gspread client from GOOGLE_CREDENTIALS_JSON or a credentials file"""
     # Check for environment variable first (for deployment)
     google_creds_json = os.getenv('GOOGLE_CREDENTIALS_JSON')
     
@@ -300,13 +511,44 @@ def load_google_sheet(sheet_url, credentials_path='credentials.json'):
             f"or provide credentials file at {credentials_path}"
         )
     
+    return gspread.authorize(creds)
+
+def get_sheet_revision(sheet_url, credentials_path='credentials.json'):
+    """
+    Last modification time of a Google Sheet, or None if it cannot be read
+    (e.g. the service account has no Drive metadata access)
+    """
+    try:
+        client = get_gspread_client(credentials_path, scopes=GSHEET_REVISION_SCOPES)
+        return client.open_by_url(sheet_url).get_lastUpdateTime()
+    except Exception as e:
+        print(f"⚠️ Could not read Google Sheet revision: {e}")
+        return None
+
+def load_google_sheet(sheet_url, credentials_path='credentials.json', client=None, delta=GSHEET_DELTA_ENABLED,
+                      snapshot_dir=GSHEET_SNAPSHOT_DIR):
+    """
+    Load data from Google Sheet using service account credentials
+    
+    Args:
+        sheet_url: Google Sheet URL
+        credentials_path: Path to Google Service Account credentials
+        client: Optional authorized gspread client (defaults to one from the credentials)
+        delta: Keep a local snapshot and download only changed rows (see utils.sheet_snapshot)
+        snapshot_dir: Directory of the local snapshots
+    """
     # Connect to Google Sheets
-    client = gspread.authorize(creds)
+    if client is None:
+        client = get_gspread_client(credentials_path, scopes=GSHEET_REVISION_SCOPES if delta else GSHEET_SCOPES)
     
     try:
         # Open the spreadsheet
         spreadsheet = client.open_by_url(sheet_url)
         
+        if delta:
+            header, rows = SheetDeltaLoader(spreadsheet, snapshot_path(sheet_url, snapshot_dir)).load()
+            return pd.DataFrame(rows, columns=header)
+        
         # Get the first worksheet
         worksheet = spreadsheet.get_worksheet(0)
         
@@ -380,17 +622,7 @@ def process_google_sheets_data(df):
     
     if 'price_text' in processed_df.columns:
         # Extract numeric price from price_text
-        import re
-        def extract_price(price_text):
-            if pd.isna(price_text):
-                return 0
-            # Extract numbers from price text
-            numbers = re.findall(r'[\d,]+', str(price_text))
-            if numbers:
-                # Remove commas and convert to int
-                return int(numbers[0].replace(',', ''))
-            return 0
-        processed_df['price'] = processed_df['price_text'].apply(extract_price)
+        processed_df['price'] = parse_prices(processed_df['price_text'])
     
     if 'owner' in processed_df.columns:
         processed_df['amenities'] = 'Cơ bản'  # Default amenities
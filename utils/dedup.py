@@ -0,0 +1,199 @@
+"""
+Near-duplicate listing detection: the same property posted several times
+(by different agents, with slightly edited descriptions) is folded into one
+canonical row before the texts are embedded
+
+Two rows are duplicates when they share the exact keys (normalized address,
+area, price, transaction type) and their normalized descriptions are similar
+(estimated Jaccard of word shingles >= DEDUP_THRESHOLD). Only rows whose key
+is shared by another row are compared at all, and within those, MinHash
+signatures bucketed by LSH bands (keyed by the exact key) give the candidate
+pairs, so the work grows with the number of colliding rows, not with the
+square of the table.
+"""
+
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from utils.config import DEDUP_BANDS, DEDUP_NUM_PERM, DEDUP_SHINGLE_SIZE, DEDUP_THRESHOLD
+from utils.text_utils import normalize_text
+
+# Số nguyên tố > 2^32 cho họ hàm băm (a * x + b) mod p của MinHash
+MINHASH_PRIME = np.uint64(4_294_967_311)
+
+
+def _normalized(series):
+    """Lowercase text with collapsed whitespace ('' for missing), column-wise"""
+    text = series.astype('string').fillna('').str.lower()
+    return text.str.replace(r'\s+', ' ', regex=True).str.strip().to_numpy(dtype=object)
+
+
+def exact_key_codes(df):
+    """Group code per row of (address, area, price, transaction type); equal keys get equal codes"""
+    keys = pd.DataFrame({
+        'address': _normalized(df['address']),
+        'area': pd.to_numeric(df['area'], errors='coerce').round(1).to_numpy(),
+        'price': pd.to_numeric(df['price'], errors='coerce').to_numpy(),
+        'transaction_type': (_normalized(df['transaction_type']) if 'transaction_type' in df.columns
+                             else np.full(len(df), '', dtype=object)),
+    })
+    return keys.groupby(list(keys.columns), sort=False, dropna=False).ngroup().to_numpy()
+
+
+def shingle_hashes(text, size=DEDUP_SHINGLE_SIZE):
+    """Distinct CRC32 hashes of the word `size`-grams of a folded text (the whole text if shorter)"""
+    words = normalize_text(text).split()
+    shingles = {' '.join(words[i:i + size]) for i in range(max(len(words) - size + 1, 1))}
+    return np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles), dtype=np.uint64)
+
+
+def minhash_signatures(texts, num_perm=DEDUP_NUM_PERM, seed=1):
+    """
+    MinHash signature matrix (len(texts), num_perm) over word shingles
+
+    All shingles are hashed once into one flat array, then every permutation
+    is a vectorized (a * x + b) mod p followed by a per-text minimum.
+    """
+    hashes = [shingle_hashes(text) for text in texts]
+    lengths = np.fromiter((len(h) for h in hashes), dtype=np.int64, count=len(hashes))
+    flat = np.concatenate(hashes) if hashes else np.zeros(0, dtype=np.uint64)
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(np.int64)
+
+    rng = np.random.default_rng(seed)
+    # a < 2^32 keeps a * x (x < 2^32) inside uint64
+    a = rng.integers(1, 2**32 - 1, num_perm, dtype=np.uint64)
+    b = rng.integers(0, 2**32 - 1, num_perm, dtype=np.uint64)
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint64)
+    for column in range(num_perm):
+        permuted = (flat * a[column] + b[column]) % MINHASH_PRIME
+        signatures[:, column] = np.minimum.reduceat(permuted, starts)
+    return signatures
+
+
+def connected_components(num_nodes, edges):
+    """Smallest node of each node's component, by min-label propagation with pointer jumping"""
+    labels = np.arange(num_nodes)
+    if len(edges) == 0:
+        return labels
+    left, right = edges[:, 0], edges[:, 1]
+    while True:
+        smaller = np.minimum(labels[left], labels[right])
+        previous = labels.copy()
+        np.minimum.at(labels, left, smaller)
+        np.minimum.at(labels, right, smaller)
+        labels = labels[labels]
+        if np.array_equal(labels, previous):
+            return labels
+
+
+def _lsh_edges(keys, signatures, bands, threshold):
+    """(member, bucket anchor) pairs from the LSH buckets whose signatures agree on >= threshold"""
+    rows_per_band = signatures.shape[1] // bands
+    positions = np.arange(len(keys))
+    edges = []
+    for band in range(bands):
+        columns = signatures[:, band * rows_per_band:(band + 1) * rows_per_band]
+        buckets = pd.DataFrame(columns).assign(key=keys).groupby(
+            ['key', *range(rows_per_band)], sort=False).ngroup().to_numpy()
+        # The first member of every bucket is its anchor; each member is checked against it only
+        anchors = pd.Series(positions).groupby(buckets).transform('first').to_numpy()
+        members = np.flatnonzero(anchors != positions)
+        if len(members):
+            agreement = (signatures[members] == signatures[anchors[members]]).mean(axis=1)
+            similar = members[agreement >= threshold]
+            edges.append(np.column_stack([similar, anchors[similar]]))
+    return np.concatenate(edges) if edges else np.zeros((0, 2), dtype=np.int64)
+
+
+def find_duplicate_clusters(df, threshold=DEDUP_THRESHOLD, num_perm=DEDUP_NUM_PERM, bands=DEDUP_BANDS):
+    """
+    Cluster label of every row: the position of its cluster's canonical row
+
+    The canonical row is the most recently updated one ('update_date'), or the
+    first one when there is no update date. Rows without a description are
+    never merged.
+
+    Args:
+        df: Processed listings (address, area, price, description)
+        threshold: Minimum estimated Jaccard similarity of the descriptions
+        num_perm: MinHash permutations
+        bands: LSH bands (num_perm must be a multiple)
+
+    Returns:
+        numpy int array aligned with df's rows
+    """
+    if num_perm % bands:
+        raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+    num_rows = len(df)
+    keys = exact_key_codes(df)
+    descriptions = _normalized(df['description'])
+    candidates = np.flatnonzero((np.bincount(keys, minlength=1)[keys] > 1) & (descriptions != ''))
+    if len(candidates) == 0:
+        return np.arange(num_rows)
+
+    # Identical (key, description) rows are merged without hashing; one representative each goes to LSH
+    exact = pd.DataFrame({'key': keys[candidates], 'description': descriptions[candidates]}).groupby(
+        ['key', 'description'], sort=False).ngroup().to_numpy()
+    local = np.arange(len(candidates))
+    representative = pd.Series(local).groupby(exact).transform('first').to_numpy()
+    unique = np.flatnonzero(representative == local)
+
+    signatures = minhash_signatures(descriptions[candidates[unique]].tolist(), num_perm)
+    lsh = _lsh_edges(keys[candidates[unique]], signatures, bands, threshold)
+    edges = np.concatenate([np.column_stack([local, representative]), unique[lsh]])
+    component = connected_components(len(candidates), edges)
+
+    # Canonical row per cluster: latest update date, then earliest position
+    if 'update_date' in df.columns:
+        updated = pd.to_datetime(df['update_date'].iloc[candidates], errors='coerce')
+        recency = -updated.to_numpy(dtype='datetime64[ns]').astype(np.int64, copy=True)
+        recency[updated.isna().to_numpy()] = np.iinfo(np.int64).max
+    else:
+        recency = np.zeros(len(candidates), dtype=np.int64)
+    order = np.lexsort((candidates, recency, component))
+    sorted_components = component[order]
+    first_in_cluster = np.r_[True, sorted_components[1:] != sorted_components[:-1]]
+    canonical_of_component = np.zeros(len(candidates), dtype=np.int64)
+    canonical_of_component[sorted_components[first_in_cluster]] = candidates[order[first_in_cluster]]
+
+    labels = np.arange(num_rows)
+    labels[candidates] = canonical_of_component[component]
+    return labels
+
+
+def cluster_stats(labels, seconds=None):
+    """Counts for the report: rows, clusters, duplicates folded, multi-row clusters, largest cluster"""
+    sizes = np.bincount(labels, minlength=len(labels))
+    sizes = sizes[sizes > 0]
+    stats = {
+        'rows': int(len(labels)),
+        'clusters': int(len(sizes)),
+        'duplicates': int(len(labels) - len(sizes)),
+        'duplicate_clusters': int((sizes > 1).sum()),
+        'largest_cluster': int(sizes.max()) if len(sizes) else 0,
+    }
+    if seconds is not None:
+        stats['seconds'] = seconds
+    return stats
+
+
+def deduplicate_listings(df, **kwargs):
+    """
+    Keep one canonical row per near-duplicate cluster
+
+    Args:
+        df: Processed listings
+        **kwargs: threshold, num_perm, bands (see find_duplicate_clusters)
+
+    Returns:
+        (deduplicated DataFrame with a 'duplicate_count' column, cluster_stats)
+    """
+    start = time.perf_counter()
+    labels = find_duplicate_clusters(df, **kwargs)
+    keep = labels == np.arange(len(df))
+    deduplicated = df[keep].reset_index(drop=True)
+    deduplicated['duplicate_count'] = (np.bincount(labels, minlength=len(df))[keep] - 1).astype(np.int32)
+    return deduplicated, cluster_stats(labels, time.perf_counter() - start)
@@ -0,0 +1,182 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from utils.config import EMBEDDING_CACHE_PATH, EMBEDDING_CACHE_MAX_ENTRIES
+from utils.embedding_executor import estimate_tokens
+from utils.metrics import span
+
+# SQLite giới hạn số tham số trong một câu lệnh, nên tra cứu theo từng lô
+_SQLITE_BATCH = 500
+
+
+def embedding_cache_key(model_name, text):
+    """Content-addressed key for one (embedding model, text) pair"""
+    return hashlib.sha256(f"{model_name}\x00{text}".encode('utf-8')).hexdigest()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Wrap an embeddings backend with a persistent on-disk cache
+
+    Vectors are stored in SQLite keyed by a hash of (model, text), so only
+    texts that were never embedded with this model go to the backend.
+    The least recently used entries are evicted once the cache grows past
+    max_entries.
+
+    Args:
+        embeddings: Underlying embeddings backend (e.g. OpenAIEmbeddings)
+        model_name: Embedding model name, part of the cache key
+        cache_path: SQLite file path, or ':memory:' for a process-local cache
+        max_entries: Maximum number of cached vectors (None = unbounded)
+    """
+
+    def __init__(self, embeddings, model_name, cache_path=EMBEDDING_CACHE_PATH,
+                 max_entries=EMBEDDING_CACHE_MAX_ENTRIES):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._pending = {}  # key -> Future of a vector another call is embedding
+        self._conn = self._connect(cache_path)
+
+    def _connect(self, cache_path):
+        """Open the cache database, falling back to memory on read-only filesystems"""
+        if str(cache_path) != ':memory:':
+            try:
+                Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(cache_path), check_same_thread=False)
+                self._init_schema(conn)
+                return conn
+            except (OSError, sqlite3.OperationalError) as e:
+                print(f"Warning: Could not open embedding cache at {cache_path}: {e}")
+        conn = sqlite3.connect(':memory:', check_same_thread=False)
+        self._init_schema(conn)
+        return conn
+
+    @staticmethod
+    def _init_schema(conn):
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "key TEXT PRIMARY KEY, vector BLOB NOT NULL, last_used REAL NOT NULL)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)")
+        conn.commit()
+
+    def _lookup(self, keys):
+        """Return {key: vector} for the keys already in the cache and mark them used"""
+        found = {}
+        now = time.time()
+        for start in range(0, len(keys), _SQLITE_BATCH):
+            batch = keys[start:start + _SQLITE_BATCH]
+            placeholders = ','.join('?' * len(batch))
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+            ).fetchall()
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+            if rows:
+                self._conn.execute(
+                    f"UPDATE embeddings SET last_used = ? WHERE key IN ({placeholders})", [now, *batch]
+                )
+        return found
+
+    def _store(self, items):
+        """Insert (key, vector) pairs and evict the oldest entries above the size bound"""
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, vector, last_used) VALUES (?, ?, ?)",
+            [(key, np.asarray(vector, dtype=np.float32).tobytes(), now) for key, vector in items]
+        )
+        if self.max_entries is not None:
+            overflow = self._count() - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE key IN "
+                    "(SELECT key FROM embeddings ORDER BY last_used ASC LIMIT ?)", (overflow,)
+                )
+
+    def _count(self):
+        return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def embed_documents(self, texts):
+        """
+        Embed texts, sending only cache misses to the underlying backend
+
+        Each missing text is embedded once, even if it appears several times or
+        another thread is already embedding it. The lock is not held during the
+        backend call, and every vector is returned at the cache's float32 precision.
+        """
+        texts = list(texts)
+        keys = [embedding_cache_key(self.model_name, text) for text in texts]
+
+        with self._lock:
+            vectors = self._lookup(list(dict.fromkeys(keys)))
+            self._conn.commit()
+
+            missing, waiting = {}, {}
+            for key, text in zip(keys, texts):
+                if key in vectors or key in missing or key in waiting:
+                    continue
+                if key in self._pending:
+                    waiting[key] = self._pending[key]
+                else:
+                    missing[key] = text
+            for key in missing:
+                self._pending[key] = Future()
+
+            self.misses += len(missing)
+            self.hits += len(texts) - len(missing)
+
+        if missing:
+            try:
+                # tokens: estimated from the UTF-8 size, as for the rate limit
+                with span('embedding', texts=len(missing),
+                          tokens=sum(estimate_tokens(text) for text in missing.values())):
+                    new_vectors = self.embeddings.embed_documents(list(missing.values()))
+                new_items = [(key, np.asarray(vector, dtype=np.float32)) for key, vector in zip(missing, new_vectors)]
+                with self._lock:
+                    self._store(new_items)
+                    self._conn.commit()
+            except BaseException as e:
+                with self._lock:
+                    for key in missing:
+                        self._pending.pop(key).set_exception(e)
+                raise
+            vectors.update((key, vector.tolist()) for key, vector in new_items)
+            with self._lock:
+                for key in missing:
+                    self._pending.pop(key).set_result(vectors[key])
+
+        for key, future in waiting.items():
+            vectors[key] = future.result()
+        return [vectors[key] for key in keys]
+
+    def embed_query(self, text):
+        """Queries change constantly, so they bypass the cache"""
+        return self.embeddings.embed_query(text)
+
+    def stats(self):
+        """Hit/miss counters for this instance and the current cache size"""
+        with self._lock:
+            entries = self._count()
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'entries': entries,
+            'max_entries': self.max_entries,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
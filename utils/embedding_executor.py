@@ -0,0 +1,190 @@
+"""
+Batched, concurrent embedding with a tokens-per-minute budget and retries
+
+EmbeddingExecutor wraps an embeddings backend (OpenAIEmbeddings) and splits
+embed_documents into batches that run on a thread pool. Each batch waits for
+its tokens in a shared token bucket, and rate-limit/transient errors are
+retried with exponential backoff (honouring Retry-After).
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.embeddings import Embeddings
+
+from utils.config import (
+    EMBEDDING_BATCH_SIZE, EMBEDDING_MAX_WORKERS, EMBEDDING_TPM_LIMIT,
+    EMBEDDING_MAX_RETRIES, EMBEDDING_BACKOFF_SECONDS,
+)
+
+# HTTP statuses worth retrying: rate limit, timeouts and server errors
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = {'RateLimitError', 'APIConnectionError', 'APITimeoutError', 'InternalServerError'}
+MAX_BACKOFF_SECONDS = 60.0
+
+
+def estimate_tokens(text):
+    """
+    Rough token count for budgeting (no tokenizer download needed)
+
+    Vietnamese text averages about 3 UTF-8 bytes per token with cl100k-style
+    tokenizers; erring high only makes the budget a little conservative.
+    """
+    return len(text.encode('utf-8')) // 3 + 1
+
+
+def is_retryable(error):
+    """Rate limits, timeouts, connection and server errors (by status code or OpenAI error type)"""
+    if getattr(error, 'status_code', None) in RETRYABLE_STATUS:
+        return True
+    return any(cls.__name__ in RETRYABLE_ERRORS for cls in type(error).__mro__)
+
+
+def retry_after(error):
+    """Seconds the server asked us to wait, if it said so"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Thread-safe tokens-per-minute budget
+
+    Starts full and refills continuously at tokens_per_minute / 60 per second.
+    A request larger than the whole bucket waits for a full bucket.
+    """
+
+    def __init__(self, tokens_per_minute, clock=time.monotonic, sleep=time.sleep):
+        self.capacity = float(tokens_per_minute)
+        self.rate = self.capacity / 60.0
+        self.available = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = self._clock()
+        self.available = min(self.capacity, self.available + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens):
+        """Block until `tokens` can be spent, then spend them; returns seconds waited"""
+        tokens = min(float(tokens), self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self.available >= tokens:
+                    self.available -= tokens
+                    return waited
+                wait = (tokens - self.available) / self.rate
+            self._sleep(wait)
+            waited += wait
+
+
+class EmbeddingExecutor(Embeddings):
+    """
+    Run embed_documents as concurrent, budgeted, retried batches
+
+    Args:
+        embeddings: Backend embeddings (give it max_retries=0, retries happen here)
+        batch_size: Texts per request
+        max_workers: Concurrent requests
+        tokens_per_minute: Token budget shared by all workers (None = unlimited)
+        max_retries: Retries per batch on retryable errors
+        backoff: First retry delay in seconds, doubled on every retry (with jitter)
+        token_counter: Function text -> estimated tokens
+        on_progress: Optional callback(done_texts, total_texts, elapsed_seconds)
+    """
+
+    def __init__(self, embeddings, batch_size=EMBEDDING_BATCH_SIZE, max_workers=EMBEDDING_MAX_WORKERS,
+                 tokens_per_minute=EMBEDDING_TPM_LIMIT, max_retries=EMBEDDING_MAX_RETRIES,
+                 backoff=EMBEDDING_BACKOFF_SECONDS, token_counter=estimate_tokens, on_progress=None,
+                 sleep=time.sleep):
+        self.embeddings = embeddings
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.token_counter = token_counter
+        self.on_progress = on_progress
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self.totals = {'texts': 0, 'tokens': 0, 'requests': 0, 'retries': 0, 'seconds': 0.0}
+
+    def _call(self, func, tokens):
+        """func() with budget and retries"""
+        for attempt in range(self.max_retries + 1):
+            if self.bucket is not None:
+                self.bucket.acquire(tokens)
+            try:
+                with self._lock:
+                    self.totals['requests'] += 1
+                return func()
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    raise
+                delay = retry_after(e)
+                if delay is None:
+                    delay = min(MAX_BACKOFF_SECONDS, self.backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+                with self._lock:
+                    self.totals['retries'] += 1
+                print(f"⏳ Embedding request failed ({type(e).__name__}), retrying in {delay:.1f}s")
+                self._sleep(delay)
+
+    def embed_documents(self, texts):
+        texts = list(texts)
+        if not texts:
+            return []
+        batches = [texts[start:start + self.batch_size] for start in range(0, len(texts), self.batch_size)]
+        start_time = time.perf_counter()
+        done = [0]
+        tokens_total = [0]
+        progress_lock = threading.Lock()
+        report_every = max(1, len(batches) // 10)
+
+        def run(batch_number, batch):
+            tokens = sum(self.token_counter(text) for text in batch)
+            vectors = self._call(lambda: self.embeddings.embed_documents(batch), tokens)
+            with progress_lock:
+                done[0] += len(batch)
+                tokens_total[0] += tokens
+                elapsed = time.perf_counter() - start_time
+                if self.on_progress is not None:
+                    self.on_progress(done[0], len(texts), elapsed)
+                elif len(batches) > 1 and (batch_number + 1) % report_every == 0:
+                    print(f"🧮 Embedded {done[0]:,}/{len(texts):,} texts ({done[0] / max(elapsed, 1e-9):,.0f} texts/s)")
+            return vectors
+
+        if len(batches) == 1 or self.max_workers <= 1:
+            results = [run(number, batch) for number, batch in enumerate(batches)]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(batches))) as pool:
+                results = list(pool.map(run, range(len(batches)), batches))
+
+        elapsed = time.perf_counter() - start_time
+        with self._lock:
+            self.totals['texts'] += len(texts)
+            self.totals['tokens'] += tokens_total[0]
+            self.totals['seconds'] += elapsed
+        if len(batches) > 1:
+            print(f"🧮 Embedded {len(texts):,} texts in {len(batches)} batches, {elapsed:.1f}s "
+                  f"({len(texts) / max(elapsed, 1e-9):,.0f} texts/s, ~{tokens_total[0] * 60 / max(elapsed, 1e-9):,.0f} tokens/min)")
+        return [vector for batch_vectors in results for vector in batch_vectors]
+
+    def embed_query(self, text):
+        return self._call(lambda: self.embeddings.embed_query(text), self.token_counter(text))
+
+    def stats(self):
+        with self._lock:
+            totals = dict(self.totals)
+        totals['texts_per_second'] = totals['texts'] / totals['seconds'] if totals['seconds'] else 0.0
+        return totals
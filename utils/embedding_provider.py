@@ -0,0 +1,43 @@
+"""
+Embedding backends selectable by EMBEDDING_PROVIDER
+
+'openai' sends texts to the OpenAI API through the batched, rate-limited
+EmbeddingExecutor; 'local' hashes character n-grams on the CPU (see
+utils/local_embeddings.py), for offline CI and development builds.
+"""
+
+from utils.config import EMBEDDING_PROVIDER, EMBEDDING_MODEL
+
+EMBEDDING_PROVIDERS = ('openai', 'local')
+
+
+def _check_provider(provider):
+    provider = provider or EMBEDDING_PROVIDER
+    if provider not in EMBEDDING_PROVIDERS:
+        raise ValueError(f"Invalid embedding provider: {provider} (expected one of {', '.join(EMBEDDING_PROVIDERS)})")
+    return provider
+
+
+def requires_api_key(provider=None):
+    """Whether building an index with this provider needs OPENAI_API_KEY"""
+    return _check_provider(provider) == 'openai'
+
+
+def embedding_model_name(provider=None):
+    """Name identifying the vectors, for cache keys, content hashes and collection names"""
+    if _check_provider(provider) == 'local':
+        from utils.local_embeddings import HashedNgramEmbeddings
+        return HashedNgramEmbeddings().model_name
+    return EMBEDDING_MODEL
+
+
+def make_embedding_backend(provider=None):
+    """Uncached embeddings of the configured provider"""
+    if _check_provider(provider) == 'local':
+        from utils.local_embeddings import HashedNgramEmbeddings
+        return HashedNgramEmbeddings()
+
+    from langchain_openai import OpenAIEmbeddings
+    from utils.embedding_executor import EmbeddingExecutor
+    # Retries happen in the executor, which also respects the tokens-per-minute budget
+    return EmbeddingExecutor(OpenAIEmbeddings(model=EMBEDDING_MODEL, max_retries=0))
@@ -0,0 +1,14 @@
+"""
+Content hashes shared by the loaders and the agent cache
+"""
+
+import hashlib
+
+
+def file_digest(file_path, block_size=1 << 20):
+    """sha256 of a file's contents (uploads land in new temp files, so the path alone is useless)"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
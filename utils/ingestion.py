@@ -0,0 +1,112 @@
+"""
+Chunked readers for large source files
+
+Each reader yields raw DataFrames of at most chunk_size rows whose index
+continues from the previous chunk (0, 1, ... over the whole file), so
+index-derived ids come out the same as for a single full read.
+"""
+
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+from utils.config import SAMPLE_DATA_PATH, PRODUCTION_DATA_PATH, EXCEL_DATA_PATH, INGEST_CHUNK_SIZE
+
+# Uploads are saved with a '.excel' suffix, so the format is read from the file header
+XLSX_MAGIC = b'PK\x03\x04'
+
+
+def iter_csv_chunks(file_path, chunk_size=INGEST_CHUNK_SIZE):
+    """CSV in chunks (pandas keeps the index running across chunks)"""
+    yield from pd.read_csv(file_path, chunksize=chunk_size)
+
+
+def _header_names(header):
+    return [f"Unnamed: {i}" if name is None else name for i, name in enumerate(header)]
+
+
+def _parse_rows(columns, rows, start):
+    """Cell values -> DataFrame with the type inference pd.read_excel applies (e.g. numeric strings)"""
+    df = TextParser([columns] + rows, header=0).read()
+    df.index = pd.RangeIndex(start, start + len(df))
+    return df
+
+
+def iter_xlsx_chunks(file_path, chunk_size=INGEST_CHUNK_SIZE):
+    """
+    First worksheet of an .xlsx file in chunks, streamed with openpyxl's read-only mode
+
+    Blank rows are kept only if a non-blank row follows them, as pd.read_excel does.
+    """
+    from openpyxl import load_workbook
+
+    # A file object, because openpyxl rejects paths without an .xlsx suffix
+    with open(file_path, 'rb') as f:
+        yield from _iter_workbook_chunks(load_workbook(f, read_only=True, data_only=True), chunk_size)
+
+
+def _iter_workbook_chunks(workbook, chunk_size):
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        # Trailing empty header cells are not columns
+        width = len(header)
+        while width and header[width - 1] is None:
+            width -= 1
+        columns = _header_names(header[:width])
+
+        start = 0
+        buffer = []
+        pending_blank = 0
+        for row in rows:
+            row = tuple(row[:width]) + (None,) * (width - len(row))
+            if all(value is None for value in row):
+                pending_blank += 1
+                continue
+            buffer.extend([(None,) * width] * pending_blank)
+            pending_blank = 0
+            buffer.append(row)
+            while len(buffer) >= chunk_size:
+                yield _parse_rows(columns, buffer[:chunk_size], start)
+                start += chunk_size
+                buffer = buffer[chunk_size:]
+        if buffer:
+            yield _parse_rows(columns, buffer, start)
+    finally:
+        workbook.close()
+
+
+def iter_excel_chunks(file_path, chunk_size=INGEST_CHUNK_SIZE):
+    """
+    Excel file in chunks
+
+    .xlsx is streamed; legacy .xls has no streaming reader (xlrd loads the
+    whole workbook), so it is read once and then split.
+    """
+    with open(file_path, 'rb') as f:
+        is_xlsx = f.read(4) == XLSX_MAGIC
+    if is_xlsx:
+        yield from iter_xlsx_chunks(file_path, chunk_size)
+        return
+    df = pd.read_excel(file_path)
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size]
+
+
+def iter_source_chunks(source_type, file_path=None, chunk_size=INGEST_CHUNK_SIZE):
+    """
+    Raw chunks of a file source
+
+    Args:
+        source_type: 'sample' | 'csv' | 'excel'
+        file_path: Optional custom file path for csv/excel
+        chunk_size: Rows per chunk
+    """
+    if source_type == 'sample':
+        return iter_csv_chunks(SAMPLE_DATA_PATH, chunk_size)
+    if source_type == 'csv':
+        return iter_csv_chunks(file_path or PRODUCTION_DATA_PATH, chunk_size)
+    if source_type == 'excel':
+        return iter_excel_chunks(file_path or EXCEL_DATA_PATH, chunk_size)
+    raise ValueError(f"Streaming ingestion is not supported for source type: {source_type}")
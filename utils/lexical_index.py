@@ -0,0 +1,277 @@
+"""
+In-memory BM25 inverted index over the listing texts
+
+Terms are lowercase and diacritic-free ("Võ Văn Tần" -> vo, van, tan), and
+letters and digits are split apart with leading zeros dropped, so "Q7",
+"quận 7" and "P.07" share the term "7". Postings are stored as flat NumPy
+arrays (CSR by term) with the BM25 weight of every posting precomputed, so a
+query is a handful of array slices plus a bincount.
+"""
+
+import re
+import time
+
+import numpy as np
+import pandas as pd
+from langchain_core.documents import Document
+
+from utils.text_utils import fold_diacritics
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+
+TERM_PATTERN = re.compile(r'[a-z]+|[0-9]+')
+
+# Số listing xử lý mỗi lần khi build (giới hạn bộ nhớ tạm)
+INDEX_CHUNK_SIZE = 100_000
+
+# Terms in more listings than this ("quan", "gia", ...) only contribute
+# candidates from their highest-weight postings (see LexicalIndex.search)
+IMPACT_TIER_SIZE = 1000
+
+# Terms in (almost) every listing, like the field labels of the listing text,
+# cannot change a ranking and are left out of queries
+MIN_TERM_IDF = 0.01
+
+# Full scan when the tiers cannot prove the top-k exact, up to this many postings
+MAX_EXACT_POSTINGS = 200_000
+
+
+def _terms(raw_token):
+    if raw_token.isascii():
+        # Listing codes, prices and most numbers: nothing to fold
+        if raw_token.isdigit():
+            return [raw_token.lstrip('0') or '0']
+        terms = TERM_PATTERN.findall(raw_token.lower())
+    else:
+        terms = TERM_PATTERN.findall(fold_diacritics(raw_token).lower())
+    return [term.lstrip('0') or '0' if term.isdigit() else term for term in terms]
+
+
+def tokenize(text):
+    """Index terms of a text, e.g. 'Căn hộ Q7, 2PN' -> ['can', 'ho', 'q', '7', '2', 'pn']"""
+    return [term for raw_token in str(text).split() for term in _terms(raw_token)]
+
+
+def _split_whitespace(texts):
+    """
+    Whitespace tokens of every text, dictionary-encoded
+
+    Returns:
+        (codes, raw_vocabulary, positions): the code of each token, the
+        distinct tokens, and the position of the text each token came from
+    """
+    if pa is not None:
+        parts = pc.ascii_split_whitespace(pa.array(texts, type=pa.string(), from_pandas=True))
+        encoded = pc.dictionary_encode(pc.list_flatten(parts))
+        return (
+            encoded.indices.to_numpy(zero_copy_only=False),
+            encoded.dictionary,
+            pc.list_parent_indices(parts).to_numpy(zero_copy_only=False),
+        )
+    tokens = texts.astype(object).reset_index(drop=True).str.split().explode().dropna()
+    codes, uniques = pd.factorize(tokens)
+    return codes, list(uniques), tokens.index.to_numpy()
+
+
+def _vocabulary_terms(raw_vocabulary):
+    """
+    Terms of every distinct whitespace token, same rules as tokenize()
+
+    Returns:
+        (counts, term_codes, terms): number of terms per token, the code of
+        each term in token order, and the distinct terms
+    """
+    if pa is None:
+        term_lists = [_terms(raw_token) for raw_token in raw_vocabulary]
+        counts = np.array([len(term_list) for term_list in term_lists], dtype=np.int64)
+        term_codes, term_strings = pd.factorize(pd.Series([term for terms in term_lists for term in terms],
+                                                          dtype=object))
+        return counts, term_codes, list(term_strings)
+
+    text = pc.replace_substring(pc.utf8_lower(raw_vocabulary), 'đ', 'd')
+    text = pc.replace_substring_regex(pc.utf8_normalize(text, 'NFD'), '[\u0300-\u036f]', '')
+    text = pc.replace_substring_regex(text, '([a-z])([0-9])', r'\1 \2')
+    text = pc.replace_substring_regex(text, '([0-9])([a-z])', r'\1 \2')
+    text = pc.replace_substring_regex(text, '[^a-z0-9]+', ' ')
+    text = pc.replace_substring_regex(text, '(^| )0+([0-9])', r'\1\2')
+    text = pc.utf8_trim_whitespace(text)
+    # Punctuation-only tokens have no terms (a null list, not [''])
+    term_lists = pc.ascii_split_whitespace(pc.if_else(pc.equal(text, ''), None, text))
+    counts = pc.list_value_length(term_lists).fill_null(0).to_numpy(zero_copy_only=False).astype(np.int64)
+    terms = pc.dictionary_encode(pc.list_flatten(term_lists))
+    return counts, terms.indices.to_numpy(zero_copy_only=False), terms.dictionary.to_pylist()
+
+
+def _top_k(doc_ids, scores, k):
+    """Best k (doc, score) pairs by score, ties broken by position"""
+    if len(scores) > k:
+        keep = np.argpartition(-scores, k - 1)[:k]
+        doc_ids, scores = doc_ids[keep], scores[keep]
+    order = np.lexsort((doc_ids, -scores))
+    return [(int(doc_ids[i]), float(scores[i])) for i in order]
+
+
+class LexicalIndex:
+    """
+    BM25 (Okapi) index over a list of texts
+
+    Args:
+        texts: Series or list of texts to index (the listing texts from load_and_process_data)
+        ids: Optional document ids, see utils.vector_sync.make_document_ids
+        metadatas: Optional metadata dicts returned with the documents
+        k1, b: BM25 parameters
+        chunk_size: Texts tokenized per batch while building
+        tier_size: Postings kept in the impact tier of a frequent term
+    """
+
+    def __init__(self, texts, ids=None, metadatas=None, k1=1.5, b=0.75,
+                 chunk_size=INDEX_CHUNK_SIZE, tier_size=IMPACT_TIER_SIZE):
+        start_time = time.perf_counter()
+        self.texts = pd.Series(texts).reset_index(drop=True)
+        self.ids = list(ids) if ids is not None else [str(position) for position in range(len(self.texts))]
+        self.metadatas = metadatas
+        self.num_docs = len(self.texts)
+        self.vocabulary = {}
+
+        chunks = []
+        doc_lengths = np.zeros(self.num_docs, dtype=np.int64)
+        for chunk_start in range(0, self.num_docs, chunk_size):
+            chunk = self.texts.iloc[chunk_start:chunk_start + chunk_size]
+            terms, docs, tfs, lengths = self._count_terms(chunk)
+            chunks.append((terms, (docs + chunk_start).astype(np.int32), tfs.astype(np.float32)))
+            doc_lengths[chunk_start:chunk_start + len(chunk)] = lengths
+
+        # CSR layout by term: every chunk is sorted by term, so its postings are
+        # scattered into the slots after the previous chunks' (no global sort)
+        self.doc_freq = np.zeros(len(self.vocabulary), dtype=np.int64)
+        for terms, _, _ in chunks:
+            self.doc_freq += np.bincount(terms, minlength=len(self.vocabulary))
+        self.offsets = np.concatenate([[0], np.cumsum(self.doc_freq)])
+        self.postings = np.zeros(self.offsets[-1], dtype=np.int32)
+        tfs = np.zeros(self.offsets[-1], dtype=np.float32)
+        next_slot = self.offsets[:-1].copy()
+        for terms, docs, chunk_tfs in chunks:
+            group_starts = np.flatnonzero(np.diff(terms, prepend=-1))
+            group_sizes = np.diff(group_starts, append=len(terms))
+            rank = np.arange(len(terms)) - np.repeat(group_starts, group_sizes)
+            slots = next_slot[terms] + rank
+            self.postings[slots] = docs
+            tfs[slots] = chunk_tfs
+            next_slot[terms[group_starts]] += group_sizes
+        del chunks
+
+        # Precomputed BM25 contribution of every posting
+        self.idf = np.log1p((self.num_docs - self.doc_freq + 0.5) / (self.doc_freq + 0.5)).astype(np.float32)
+        avg_length = doc_lengths.mean() if self.num_docs and doc_lengths.any() else 1.0
+        norm = (k1 * (1 - b + b * doc_lengths / avg_length)).astype(np.float32)
+        self.weights = np.repeat(self.idf, self.doc_freq) * tfs * (k1 + 1) / (tfs + norm[self.postings])
+
+        # Impact tiers: the highest-weight postings of each frequent term, and
+        # the largest weight any listing outside the tier can get from that term
+        self.tiers = {}
+        self.tier_floor = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for term_id in np.flatnonzero(self.doc_freq > tier_size):
+            docs, weights = self._postings(term_id)
+            top = np.sort(np.argpartition(-weights, tier_size - 1)[:tier_size])
+            self.tiers[term_id] = docs[top]
+            self.tier_floor[term_id] = weights[top].min()
+        self.build_seconds = time.perf_counter() - start_time
+
+    def _count_terms(self, texts):
+        """(term, doc, tf) triples sorted by term, plus the length of every text"""
+        codes, raw_vocabulary, positions = _split_whitespace(texts)
+
+        # Clean each distinct whitespace token once; one token can hold several terms ("Q7")
+        counts, term_codes, term_strings = _vocabulary_terms(raw_vocabulary)
+        term_ids = np.array([self.vocabulary.setdefault(term, len(self.vocabulary)) for term in term_strings],
+                            dtype=np.int64)
+        flat_terms = term_ids[term_codes]
+        starts = np.cumsum(counts) - counts
+
+        occurrence_counts = counts[codes]
+        total = int(occurrence_counts.sum())
+        offsets_within = np.arange(total) - np.repeat(np.cumsum(occurrence_counts) - occurrence_counts,
+                                                      occurrence_counts)
+        occurrence_terms = flat_terms[np.repeat(starts[codes], occurrence_counts) + offsets_within]
+        occurrence_docs = np.repeat(positions.astype(np.int64), occurrence_counts)
+
+        lengths = np.bincount(occurrence_docs, minlength=len(texts))
+        keys, tfs = np.unique(occurrence_terms * len(texts) + occurrence_docs, return_counts=True)
+        return (keys // len(texts)).astype(np.int32), keys % len(texts), tfs, lengths
+
+    def _postings(self, term_id):
+        start, end = self.offsets[term_id], self.offsets[term_id + 1]
+        return self.postings[start:end], self.weights[start:end]
+
+    def search(self, query, k=10):
+        """
+        Top-k texts for a query by BM25 score
+
+        Candidates are scored exactly. They are all listings with a rare query
+        term plus the impact tier of each frequent one; when a listing outside
+        the candidates could still reach the top k, the full postings are
+        scanned, unless that exceeds MAX_EXACT_POSTINGS (then the result is
+        the best of the candidates).
+
+        Returns:
+            list of (position, score), best first
+        """
+        term_ids = list(dict.fromkeys(
+            self.vocabulary[term] for term in tokenize(query)
+            if term in self.vocabulary and self.idf[self.vocabulary[term]] >= MIN_TERM_IDF
+        ))
+        if not term_ids or k <= 0:
+            return []
+
+        # Candidates: every listing with a rare term, plus the impact tier of each frequent term
+        frequent = [term_id for term_id in term_ids if term_id in self.tiers]
+        candidates = np.unique(np.concatenate([
+            self.tiers[term_id] if term_id in self.tiers else self._postings(term_id)[0]
+            for term_id in term_ids
+        ]))
+        scores = np.zeros(len(candidates))
+        for term_id in term_ids:
+            docs, weights = self._postings(term_id)
+            found = np.minimum(np.searchsorted(docs, candidates), len(docs) - 1)
+            hit = docs[found] == candidates
+            scores[hit] += weights[found[hit]]
+        top = _top_k(candidates, scores, k)
+
+        # A listing outside every tier scores at most the sum of the tier floors
+        bound = float(self.tier_floor[frequent].sum())
+        if len(top) == k and top[-1][1] >= bound or not frequent:
+            return top
+        if self.doc_freq[term_ids].sum() > MAX_EXACT_POSTINGS:
+            # Too many postings to scan within the latency budget: tiered result
+            return top
+
+        postings = [self._postings(term_id) for term_id in term_ids]
+        scores = np.bincount(np.concatenate([docs for docs, _ in postings]),
+                             weights=np.concatenate([weights for _, weights in postings]),
+                             minlength=self.num_docs)
+        matched = np.flatnonzero(scores)
+        return _top_k(matched, scores[matched], k)
+
+    def get_document(self, position):
+        """The indexed text at a position as a Document (metadata includes its id)"""
+        metadata = dict(self.metadatas[position]) if self.metadatas is not None else {}
+        metadata['id'] = self.ids[position]
+        return Document(page_content=self.texts.iloc[position], metadata=metadata)
+
+    @property
+    def nbytes(self):
+        """Memory held by the postings arrays"""
+        arrays = [self.postings, self.weights, self.offsets, self.doc_freq, self.idf, self.tier_floor]
+        return sum(array.nbytes for array in arrays) + sum(tier.nbytes for tier in self.tiers.values())
+
+    def stats(self):
+        return {
+            'documents': self.num_docs,
+            'terms': len(self.vocabulary),
+            'postings': len(self.postings),
+            'build_seconds': self.build_seconds,
+        }
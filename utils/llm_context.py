@@ -0,0 +1,121 @@
+"""
+Compact rendering of retrieved listings for the prompt's {context}, under a token budget
+
+Each listing becomes one " | "-separated line of its metadata fields (labels
+only where the value is not self-explanatory, prices in tỷ/triệu) and a
+description line. The fields always fit; the descriptions share what is left
+of the budget and are cut at a word boundary when they do not.
+"""
+
+from utils.config import CONTEXT_TOKEN_BUDGET
+from utils.embedding_executor import estimate_tokens
+from utils.text_builder import DESCRIPTION_LABEL
+
+MISSING_VALUES = {'', 'nan', 'None', 'N/A', '<NA>', 'NaT'}
+NO_LISTINGS = "Không có sản phẩm nào khớp với câu hỏi."
+ELLIPSIS = '…'
+
+
+def compact_price(value):
+    """'21,000,000,000 VND' -> '21 tỷ', '850,000,000 VND' -> '850 triệu'; other texts unchanged"""
+    digits = value.removesuffix(' VND').replace(',', '')
+    if not digits.isdigit():
+        return value
+    price = int(digits)
+    for unit, name in ((1_000_000_000, 'tỷ'), (1_000_000, 'triệu')):
+        if price >= unit:
+            return f"{price / unit:.3f}".rstrip('0').rstrip('.') + f" {name}"
+    return f"{price:,} VND"
+
+
+def format_listing_fields(metadata):
+    """The one-line summary of a listing's metadata (see build_listing_metadata)"""
+    value = {field: str(text) for field, text in metadata.items() if str(text) not in MISSING_VALUES}
+    parts = []
+    if 'listing_id' in value:
+        product = f" (Mã sản phẩm: {value['product_id']})" if 'product_id' in value else ''
+        parts.append(f"Mã SP: {value['listing_id']}{product}")
+    kind = ' '.join(value[field] for field in ('transaction_type', 'type') if field in value)
+    if kind:
+        parts.append(kind)
+    # The address usually ends with the ward and district already
+    places = [value[field] for field in ('district', 'ward') if field in value]
+    address = value.get('address')
+    if places and not (address and all(place in address for place in places)):
+        parts.append(', '.join(places))
+    if address:
+        parts.append(address)
+    if 'price_text' in value:
+        parts.append(f"Giá {compact_price(value['price_text'])}")
+    if 'area_text' in value:
+        parts.append(value['area_text'])
+    if value.get('bedrooms', '0') not in ('0', '0.0'):
+        parts.append(f"{value['bedrooms']} PN")
+    if 'direction' in value:
+        parts.append(f"Hướng {value['direction']}")
+    if 'legal_status' in value:
+        parts.append(value['legal_status'])
+    for field, prefix in (('amenities', 'Tiện ích'), ('owner', 'Chủ nhà'), ('agent_name', 'MG'), ('phone', 'ĐT')):
+        if field in value:
+            parts.append(f"{prefix}: {value[field]}")
+    return ' | '.join(parts)
+
+
+def truncate_to_tokens(text, max_tokens):
+    """text cut at a word boundary (with '…') so that estimate_tokens stays within max_tokens"""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    max_bytes = (max_tokens - 1) * 3 - len(ELLIPSIS.encode('utf-8'))
+    if max_bytes <= 0:
+        return ''
+    cut = text.encode('utf-8')[:max_bytes].decode('utf-8', errors='ignore')
+    if ' ' in cut:
+        cut = cut[:cut.rindex(' ')]
+    cut = cut.rstrip(' ,.;:-')
+    return cut + ELLIPSIS if cut else ''
+
+
+def share_budget(needs, budget):
+    """Token allowance per item: equal shares, with what short items leave over going to longer ones"""
+    allowances = [0] * len(needs)
+    remaining = max(budget, 0)
+    order = sorted(range(len(needs)), key=needs.__getitem__)
+    for position, index in enumerate(order):
+        allowances[index] = min(needs[index], remaining // (len(order) - position))
+        remaining -= allowances[index]
+    return allowances
+
+
+def format_context(documents, token_budget=CONTEXT_TOKEN_BUDGET):
+    """
+    Retrieved listings as prompt context within token_budget (estimate_tokens)
+
+    Args:
+        documents: Retrieved Documents in rank order; only their metadata
+            is rendered, not the embedded text
+        token_budget: Token limit of the whole context; the lowest ranked
+            listings are dropped if even their fields do not fit
+
+    Returns:
+        Numbered listings, one field line and one description line each
+    """
+    if not documents:
+        return NO_LISTINGS
+    headers = [f"[{rank}] {format_listing_fields(document.metadata)}".rstrip()
+               for rank, document in enumerate(documents, start=1)]
+    # The separators between listings and the description labels count too
+    header_tokens = [estimate_tokens(header + '\n\n' + DESCRIPTION_LABEL) for header in headers]
+    while len(headers) > 1 and sum(header_tokens) > token_budget:
+        headers.pop()
+        header_tokens.pop()
+
+    # Documents without listing metadata are shown by their text alone
+    descriptions = [' '.join(str(document.metadata.get('description', document.page_content)).split())
+                    for document in documents[:len(headers)]]
+    allowances = share_budget([estimate_tokens(description) for description in descriptions],
+                              token_budget - sum(header_tokens))
+    blocks = []
+    for header, description, allowance in zip(headers, descriptions, allowances):
+        description = truncate_to_tokens(description, allowance)
+        blocks.append(f"{header}\n{DESCRIPTION_LABEL}{description}" if description else header)
+    return '\n\n'.join(blocks)
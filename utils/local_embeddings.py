@@ -0,0 +1,97 @@
+"""
+CPU-only embeddings from hashed character n-grams
+
+Texts are normalized like the lexical index (lowercase, diacritic-free), padded
+with spaces and cut into character n-grams, which are hashed with a fixed
+64-bit mix into `dimensions` signed buckets (the "hashing trick"). Counts are
+log-scaled and every vector is L2-normalized, so cosine similarity measures
+shared word fragments: 'quận 7' and 'quan 7', 'căn hộ' and 'can ho' embed alike.
+Whole batches are hashed with NumPy, no model download or network needed.
+"""
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from utils.config import LOCAL_EMBEDDING_DIMENSIONS, LOCAL_EMBEDDING_NGRAM_RANGE, LOCAL_EMBEDDING_BATCH_SIZE
+from utils.text_utils import normalize_text
+
+_MULTIPLIER = np.uint64(0x100000001B3)
+_MIX_1 = np.uint64(0xFF51AFD7ED558CCD)
+_MIX_2 = np.uint64(0xC4CEB9FE1A85EC53)
+
+
+def _mix(hashes):
+    """64-bit finalizer (MurmurHash3 fmix64), spreads nearby n-grams over all buckets"""
+    hashes ^= hashes >> np.uint64(33)
+    hashes *= _MIX_1
+    hashes ^= hashes >> np.uint64(33)
+    hashes *= _MIX_2
+    hashes ^= hashes >> np.uint64(33)
+    return hashes
+
+
+class HashedNgramEmbeddings(Embeddings):
+    """
+    Deterministic local embeddings (same text -> same vector in every process)
+
+    Args:
+        dimensions: Vector size (hash buckets)
+        ngram_range: (min_n, max_n) character n-gram lengths
+        batch_size: Texts hashed per NumPy pass (bounds temporary memory)
+    """
+
+    def __init__(self, dimensions=LOCAL_EMBEDDING_DIMENSIONS, ngram_range=LOCAL_EMBEDDING_NGRAM_RANGE,
+                 batch_size=LOCAL_EMBEDDING_BATCH_SIZE):
+        self.dimensions = dimensions
+        self.ngram_range = ngram_range
+        self.batch_size = batch_size
+
+    @property
+    def model_name(self):
+        """Cache/content-hash key: changes whenever the vectors would"""
+        min_n, max_n = self.ngram_range
+        return f"local-hashed-char-{min_n}-{max_n}-{self.dimensions}"
+
+    def embed_array(self, texts):
+        """Embed texts as a float32 array of shape (len(texts), dimensions)"""
+        texts = list(texts)
+        vectors = np.empty((len(texts), self.dimensions), dtype=np.float32)
+        for start in range(0, len(texts), self.batch_size):
+            batch = texts[start:start + self.batch_size]
+            vectors[start:start + len(batch)] = self._embed_batch(batch)
+        return vectors
+
+    def _embed_batch(self, texts):
+        padded = [f" {normalize_text(text)} " for text in texts]
+        # One code point array for the whole batch; NUL separates texts
+        codes = np.frombuffer('\0'.join(padded).encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+        lengths = np.fromiter((len(text) + 1 for text in padded), dtype=np.int64, count=len(padded))
+        rows = np.repeat(np.arange(len(padded)), lengths)[:len(codes)]
+        separators = np.concatenate(([0], np.cumsum(codes == 0)))
+
+        cells, signs = [np.empty(0, dtype=np.int64)], [np.empty(0)]
+        min_n, max_n = self.ngram_range
+        for n in range(min_n, max_n + 1):
+            count = len(codes) - n + 1
+            if count <= 0:
+                continue
+            # N-grams spanning two texts contain a separator and are dropped
+            starts = np.flatnonzero(separators[n:n + count] == separators[:count])
+            hashes = np.full(len(starts), n, dtype=np.uint64)
+            for offset in range(n):
+                hashes = hashes * _MULTIPLIER + codes[starts + offset]
+            hashes = _mix(hashes)
+            cells.append(rows[starts] * self.dimensions + (hashes % np.uint64(self.dimensions)).astype(np.int64))
+            signs.append(np.where(hashes >> np.uint64(63), -1.0, 1.0))
+
+        counts = np.bincount(np.concatenate(cells), weights=np.concatenate(signs),
+                             minlength=len(padded) * self.dimensions).reshape(len(padded), self.dimensions)
+        vectors = np.sign(counts) * np.log1p(np.abs(counts))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+    def embed_documents(self, texts):
+        return self.embed_array(texts).tolist()
+
+    def embed_query(self, text):
+        return self.embed_array([text])[0].tolist()
@@ -0,0 +1,380 @@
+"""
+Span-based timing and counters for agent builds and queries
+
+A span times one stage and carries counters (rows, texts, tokens, ...).
+Spans opened inside another span become its children; when an outermost
+span ends, its trace is kept as the last one of its name, written as one
+JSON line to METRICS_LOG_PATH (when set) and added to the totals served at /metrics.
+
+    with span('build', source_type='excel'):
+        with span('load_data') as stage:
+            df = ...
+            stage.set(rows=len(df))
+
+Queries are traced from LangChain callbacks (MetricsCallbackHandler), since
+the chain runs retrieval in worker threads.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from utils.config import METRICS_HISTORY, METRICS_LOG_PATH, METRICS_PORT
+
+
+class Span:
+    """One timed stage with counters and child stages"""
+
+    def __init__(self, name, **attrs):
+        self.name = name
+        self.attrs = dict(attrs)
+        self.children = []
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.seconds = None
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+        return self
+
+    def add(self, **amounts):
+        """Increase counters (missing ones start at 0)"""
+        for key, amount in amounts.items():
+            self.attrs[key] = self.attrs.get(key, 0) + amount
+        return self
+
+    def child(self, name, **attrs):
+        child = Span(name, **attrs)
+        self.children.append(child)
+        return child
+
+    def elapsed(self):
+        return time.perf_counter() - self._start
+
+    def finish(self):
+        if self.seconds is None:
+            self.seconds = self.elapsed()
+        return self
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'started_at': datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(timespec='milliseconds'),
+            'seconds': self.seconds,
+            'attrs': self.attrs,
+            'children': [child.to_dict() for child in self.children],
+        }
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _walk(span, prefix=''):
+    """(path, span) for a span and all its descendants, depth first"""
+    path = f"{prefix}/{span.name}" if prefix else span.name
+    yield path, span
+    for child in span.children:
+        yield from _walk(child, path)
+
+
+def breakdown(trace):
+    """
+    Rows of a trace for display: one per stage path, in first-seen order
+
+    Repeated stages (e.g. one embedding span per batch) are merged: seconds
+    and numeric counters are summed and 'count' says how often it ran.
+
+    Returns:
+        List of {'stage', 'depth', 'seconds', 'count', **counters}
+    """
+    rows = {}
+    for path, span in _walk(trace):
+        row = rows.setdefault(path, {'stage': path.rsplit('/', 1)[-1], 'depth': path.count('/'),
+                                     'seconds': 0.0, 'count': 0})
+        row['seconds'] += span.seconds or 0.0
+        row['count'] += 1
+        for key, value in span.attrs.items():
+            if _is_number(value):
+                row[key] = row.get(key, 0) + value
+            else:
+                row[key] = value
+    return list(rows.values())
+
+
+class MetricsRegistry:
+    """Finished traces: the last few per name, running totals per stage and a JSON-lines log"""
+
+    def __init__(self, log_path=METRICS_LOG_PATH, history=METRICS_HISTORY):
+        self.log_path = str(log_path) if log_path else None
+        self._lock = threading.Lock()
+        self._history = history
+        self._traces = {}
+        self._totals = {}
+
+    def record(self, trace):
+        """Store a finished outermost span and write it to the log"""
+        trace.finish()
+        with self._lock:
+            self._traces.setdefault(trace.name, deque(maxlen=self._history)).append(trace)
+            for path, span in _walk(trace):
+                totals = self._totals.setdefault(path, {'count': 0, 'seconds': 0.0})
+                totals['count'] += 1
+                totals['seconds'] += span.seconds or 0.0
+                if 'error' in span.attrs:
+                    totals['errors'] = totals.get('errors', 0) + 1
+                for key, value in span.attrs.items():
+                    if _is_number(value):
+                        totals[key] = totals.get(key, 0) + value
+        self._log(trace)
+
+    def _log(self, trace):
+        if not self.log_path:
+            return
+        line = json.dumps({'event': 'trace', **trace.to_dict()}, ensure_ascii=False, default=str)
+        try:
+            os.makedirs(os.path.dirname(self.log_path) or '.', exist_ok=True)
+            with self._lock, open(self.log_path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+        except OSError as e:
+            # Read-only filesystem (deployment): keep the in-memory metrics only
+            print(f"⚠️ Metrics log disabled ({self.log_path}): {e}")
+            self.log_path = None
+
+    def last_trace(self, name):
+        """Most recent finished trace with this name, or None"""
+        with self._lock:
+            traces = self._traces.get(name)
+            return traces[-1] if traces else None
+
+    def traces(self, name):
+        with self._lock:
+            return list(self._traces.get(name, ()))
+
+    def totals(self):
+        """Per stage path: count, seconds and summed counters since start"""
+        with self._lock:
+            return {path: dict(totals) for path, totals in self._totals.items()}
+
+    def prometheus_text(self):
+        """Totals in the Prometheus text exposition format"""
+        totals = self.totals()
+        names = sorted({key for stage in totals.values() for key in stage})
+        lines = []
+        for key in names:
+            metric = f"real_estate_span_{key}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for path, stage in sorted(totals.items()):
+                if key in stage:
+                    lines.append(f'{metric}{{span="{path}"}} {stage[key]}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self._traces.clear()
+            self._totals.clear()
+
+
+METRICS = MetricsRegistry()
+_current_span = ContextVar('current_span', default=None)
+
+
+@contextmanager
+def span(name, registry=None, **attrs):
+    """
+    Time a block as a child of the enclosing span (or as a new trace)
+
+    Args:
+        name: Stage name
+        registry: Where an outermost span is recorded (default METRICS)
+        **attrs: Initial counters / labels
+    """
+    parent = _current_span.get()
+    current = parent.child(name, **attrs) if parent is not None else Span(name, **attrs)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.set(error=type(e).__name__)
+        raise
+    finally:
+        _current_span.reset(token)
+        current.finish()
+        if parent is None:
+            (registry or METRICS).record(current)
+
+
+def current_span():
+    """The innermost open span of this context, or None"""
+    return _current_span.get()
+
+
+def _usage_tokens(response):
+    """(input, output) token counts of an LLMResult, None where the provider gave none"""
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, 'message', None), 'usage_metadata', None)
+            if usage:
+                return usage.get('input_tokens'), usage.get('output_tokens')
+    usage = (response.llm_output or {}).get('token_usage') or {}
+    return usage.get('prompt_tokens'), usage.get('completion_tokens')
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """
+    Trace every chain run as a 'query' span with 'retrieval' and 'llm' children
+
+    Records retrieval time and documents, LLM time, time to first token and
+    token usage. Runs are matched by run id, so one handler serves concurrent
+    queries and the thread pool the chain runs its steps in.
+    """
+
+    run_inline = True
+
+    def __init__(self, registry=None, name='query'):
+        self.registry = registry
+        self.name = name
+        self._lock = threading.Lock()
+        self._roots = {}
+        self._spans = {}
+
+    def _root(self, run_id, parent_run_id):
+        """Trace of a run: a new one for a top-level run, else the parent's"""
+        with self._lock:
+            root = self._roots.get(parent_run_id) if parent_run_id is not None else None
+            if parent_run_id is None:
+                root = Span(self.name)
+            if root is not None:
+                self._roots[run_id] = root
+            return root
+
+    def _start(self, name, run_id, parent_run_id, **attrs):
+        root = self._root(run_id, parent_run_id)
+        if root is not None:
+            with self._lock:
+                self._spans[run_id] = root.child(name, **attrs)
+
+    def _end(self, run_id, **attrs):
+        with self._lock:
+            current = self._spans.pop(run_id, None)
+            self._roots.pop(run_id, None)
+        if current is not None:
+            current.set(**attrs).finish()
+        return current
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, **kwargs):
+        root = self._root(run_id, parent_run_id)
+        if parent_run_id is None and isinstance(inputs, str):
+            root.set(question_chars=len(inputs))
+
+    def _end_chain(self, run_id, parent_run_id, **attrs):
+        with self._lock:
+            root = self._roots.pop(run_id, None)
+        if parent_run_id is None and root is not None:
+            root.set(**attrs)
+            (self.registry or METRICS).record(root)
+
+    def on_chain_end(self, outputs, *, run_id, parent_run_id=None, **kwargs):
+        attrs = {'answer_chars': len(outputs)} if parent_run_id is None and isinstance(outputs, str) else {}
+        self._end_chain(run_id, parent_run_id, **attrs)
+
+    def on_chain_error(self, error, *, run_id, parent_run_id=None, **kwargs):
+        self._end_chain(run_id, parent_run_id, error=type(error).__name__)
+
+    def on_retriever_start(self, serialized, query, *, run_id, parent_run_id=None, **kwargs):
+        self._start('retrieval', run_id, parent_run_id)
+
+    def on_retriever_end(self, documents, *, run_id, **kwargs):
+        self._end(run_id, documents=len(documents))
+
+    def on_retriever_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=type(error).__name__)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, **kwargs):
+        prompt_chars = sum(len(str(message.content)) for batch in messages for message in batch)
+        self._start('llm', run_id, parent_run_id, prompt_chars=prompt_chars)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, **kwargs):
+        self._start('llm', run_id, parent_run_id, prompt_chars=sum(len(prompt) for prompt in prompts))
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        with self._lock:
+            current = self._spans.get(run_id)
+            if current is not None and 'ttft_seconds' not in current.attrs:
+                current.attrs['ttft_seconds'] = current.elapsed()
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        input_tokens, output_tokens = _usage_tokens(response)
+        attrs = {key: value for key, value in
+                 (('input_tokens', input_tokens), ('output_tokens', output_tokens)) if value is not None}
+        self._end(run_id, **attrs)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=type(error).__name__)
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    registry = METRICS
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            body = self.registry.prometheus_text().encode('utf-8')
+            content_type = 'text/plain; version=0.0.4; charset=utf-8'
+        elif self.path == '/metrics.json':
+            last = {name: self.registry.last_trace(name) for name in ('build', 'query')}
+            body = json.dumps({
+                'totals': self.registry.totals(),
+                'last': {name: trace.to_dict() for name, trace in last.items() if trace is not None},
+            }, ensure_ascii=False, default=str).encode('utf-8')
+            content_type = 'application/json; charset=utf-8'
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_failed = False
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=METRICS_PORT, host='127.0.0.1', registry=None):
+    """
+    Serve /metrics (Prometheus) and /metrics.json from a background thread
+
+    Safe to call on every Streamlit rerun: the server is started once per
+    process. Port 0 disables it; a port in use is reported, not raised.
+
+    Returns:
+        The running server, or None
+    """
+    global _server, _server_failed
+    if not port:
+        return None
+    with _server_lock:
+        if _server is None and not _server_failed:
+            handler = type('MetricsRequestHandler', (_MetricsRequestHandler,), {'registry': registry or METRICS})
+            try:
+                _server = ThreadingHTTPServer((host, port), handler)
+            except OSError as e:
+                print(f"⚠️ Metrics endpoint not started on {host}:{port}: {e}")
+                _server_failed = True
+                return None
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+            print(f"📈 Metrics endpoint: http://{host}:{_server.server_address[1]}/metrics")
+        return _server
@@ -0,0 +1,311 @@
+"""
+Brute-force vector store: one float32 matrix, one matmul per query
+
+For catalogues up to a few hundred thousand listings an exact search over a
+normalized float32 matrix (matmul + argpartition) is faster than SQLite +
+HNSW and never misses a neighbour. The store implements the part of the
+LangChain Chroma API the app uses (add_texts, get, delete, delete_collection,
+similarity_search with a `where` filter), so it plugs into ListingRetriever
+and sync_vector_store unchanged.
+
+A persisted collection is a directory with vectors.npy, memory-mapped on
+load, and documents.json, the sidecar with ids, texts and metadata in row
+order. Writes are buffered and saved by flush() (sync_vector_store calls it).
+"""
+
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from langchain_core.documents import Document
+
+VECTORS_FILE = 'vectors.npy'
+SIDECAR_FILE = 'documents.json'
+SIDECAR_VERSION = 1
+
+# Queries scored per matmul in similarity_search_batch (bounds the score matrix)
+QUERY_BATCH_SIZE = 256
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def _top_k(scores, k):
+    """Row-wise indices of the k highest scores, best first (-inf = excluded)"""
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+    candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, candidates, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+class _Collection:
+    """Rows of one collection: ids, texts, metadatas and the normalized vectors"""
+
+    def __init__(self):
+        self.ids, self.texts, self.metadatas = [], [], []
+        self.vectors = None
+        self.positions = {}
+        self.pending = []  # Vectors of appended rows not yet in self.vectors
+        self.dirty = False
+        self.lock = threading.RLock()
+        self.columns = {}
+
+    def consolidate(self):
+        if self.pending:
+            new = np.vstack(self.pending)
+            self.vectors = new if self.vectors is None else np.concatenate([self.vectors, new])
+            self.pending = []
+
+
+class NumpyVectorStore:
+    """
+    Exact cosine-similarity store over a (memory-mapped) float32 matrix
+
+    Args:
+        collection_name: Collection (sub-directory) name
+        embedding_function: LangChain Embeddings
+        persist_directory: Parent directory of persisted collections; None keeps
+            the collection in memory, shared by every store of that name in the process
+    """
+
+    _memory_collections = {}
+
+    def __init__(self, collection_name, embedding_function, persist_directory=None):
+        self.collection_name = collection_name
+        self.embeddings = embedding_function
+        self.directory = Path(persist_directory) / collection_name if persist_directory else None
+        if self.directory is None:
+            self._data = self._memory_collections.setdefault(collection_name, _Collection())
+        else:
+            self._data = self._load()
+
+    def _load(self):
+        data = _Collection()
+        sidecar = self.directory / SIDECAR_FILE
+        if not sidecar.exists():
+            return data
+        try:
+            with open(sidecar, encoding='utf-8') as f:
+                payload = json.load(f)
+            if payload.get('version') != SIDECAR_VERSION:
+                return data
+            # Copy-on-write: searches read the file's pages, updates stay in memory until flush()
+            vectors = np.load(self.directory / VECTORS_FILE, mmap_mode='c')
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load vector index at {self.directory}: {e}")
+            return data
+        if len(vectors) != len(payload['ids']):
+            print(f"Warning: Vector index at {self.directory} is inconsistent, starting empty")
+            return data
+        data.ids, data.texts, data.metadatas = payload['ids'], payload['texts'], payload['metadatas']
+        data.vectors = vectors if len(vectors) else None
+        data.positions = {doc_id: position for position, doc_id in enumerate(data.ids)}
+        return data
+
+    def __len__(self):
+        return len(self._data.ids)
+
+    # ---------- Writes ----------
+
+    def add_texts(self, texts, metadatas=None, ids=None, **kwargs):
+        """Embed and upsert texts; returns their ids"""
+        texts = list(texts)
+        metadatas = list(metadatas) if metadatas is not None else [{} for _ in texts]
+        ids = list(ids) if ids is not None else [str(len(self) + i) for i in range(len(texts))]
+        if not texts:
+            return ids
+        vectors = _normalize(self.embeddings.embed_documents(texts))
+
+        data = self._data
+        with data.lock:
+            data.consolidate()
+            if data.vectors is not None and vectors.shape[1] != data.vectors.shape[1]:
+                raise ValueError(f"Embedding dimension {vectors.shape[1]} does not match "
+                                 f"collection dimension {data.vectors.shape[1]}")
+            stored = len(data.vectors) if data.vectors is not None else 0
+            appended = []  # Row in `vectors` of each new document
+            for row, (doc_id, text, metadata) in enumerate(zip(ids, texts, metadatas)):
+                position = data.positions.get(doc_id)
+                if position is None:
+                    data.positions[doc_id] = len(data.ids)
+                    data.ids.append(doc_id)
+                    data.texts.append(text)
+                    data.metadatas.append(metadata)
+                    appended.append(row)
+                    continue
+                data.texts[position] = text
+                data.metadatas[position] = metadata
+                if position < stored:
+                    data.vectors[position] = vectors[row]
+                else:
+                    # Repeated id within this call: the last occurrence wins
+                    appended[position - stored] = row
+            if appended:
+                data.pending.append(vectors[appended])
+            data.columns = {}
+            data.dirty = True
+        return ids
+
+    def delete(self, ids=None, **kwargs):
+        """Remove documents by id"""
+        data = self._data
+        with data.lock:
+            data.consolidate()
+            drop = {data.positions[doc_id] for doc_id in ids or [] if doc_id in data.positions}
+            if not drop:
+                return
+            keep = np.setdiff1d(np.arange(len(data.ids)), np.fromiter(drop, dtype=np.int64))
+            data.vectors = data.vectors[keep] if len(keep) else None
+            data.ids = [data.ids[i] for i in keep]
+            data.texts = [data.texts[i] for i in keep]
+            data.metadatas = [data.metadatas[i] for i in keep]
+            data.positions = {doc_id: position for position, doc_id in enumerate(data.ids)}
+            data.columns = {}
+            data.dirty = True
+
+    def delete_collection(self):
+        """Drop every document, on disk too"""
+        with self._data.lock:
+            if self.directory is None:
+                self._memory_collections.pop(self.collection_name, None)
+            elif self.directory.exists():
+                shutil.rmtree(self.directory)
+            self._data = _Collection()
+
+    def flush(self):
+        """Write buffered changes to disk and re-map the matrix (no-op in memory)"""
+        data = self._data
+        with data.lock:
+            data.consolidate()
+            if self.directory is None or not data.dirty:
+                return
+            self.directory.mkdir(parents=True, exist_ok=True)
+            vectors = data.vectors if data.vectors is not None else np.empty((0, 0), dtype=np.float32)
+            # Write-then-rename, so a reader never maps a half-written file
+            tmp_vectors = self.directory / f"{VECTORS_FILE}.tmp"
+            with open(tmp_vectors, 'wb') as f:
+                np.save(f, np.ascontiguousarray(vectors))
+            tmp_sidecar = self.directory / f"{SIDECAR_FILE}.tmp"
+            with open(tmp_sidecar, 'w', encoding='utf-8') as f:
+                json.dump({'version': SIDECAR_VERSION, 'ids': data.ids, 'texts': data.texts,
+                           'metadatas': data.metadatas}, f, ensure_ascii=False)
+            os.replace(tmp_vectors, self.directory / VECTORS_FILE)
+            os.replace(tmp_sidecar, self.directory / SIDECAR_FILE)
+            data.vectors = np.load(self.directory / VECTORS_FILE, mmap_mode='c') if data.ids else None
+            data.dirty = False
+
+    # ---------- Reads ----------
+
+    def get(self, ids=None, include=('metadatas', 'documents'), **kwargs):
+        """Stored ids (and metadatas/documents) for the given ids, or all of them"""
+        data = self._data
+        with data.lock:
+            if ids is None:
+                positions = range(len(data.ids))
+            else:
+                positions = [data.positions[doc_id] for doc_id in ids if doc_id in data.positions]
+            result = {'ids': [data.ids[i] for i in positions]}
+            if 'metadatas' in include:
+                result['metadatas'] = [data.metadatas[i] for i in positions]
+            if 'documents' in include:
+                result['documents'] = [data.texts[i] for i in positions]
+        return result
+
+    def _column(self, field):
+        data = self._data
+        if field not in data.columns:
+            data.columns[field] = pd.Series([metadata.get(field) for metadata in data.metadatas], dtype=object)
+        return data.columns[field]
+
+    def _mask(self, where):
+        """Boolean row mask of a build_where_filter() filter (same semantics as matches_filter)"""
+        if '$and' in where:
+            mask = np.ones(len(self), dtype=bool)
+            for condition in where['$and']:
+                mask &= self._mask(condition)
+            return mask
+        mask = np.ones(len(self), dtype=bool)
+        for field, condition in where.items():
+            values = self._column(field)
+            if not isinstance(condition, dict):
+                condition = {'$eq': condition}
+            for operator, operand in condition.items():
+                if operator == '$eq':
+                    mask &= (values.notna() & (values == operand)).to_numpy(dtype=bool)
+                elif operator == '$in':
+                    mask &= values.isin(operand).to_numpy(dtype=bool)
+                elif operator in ('$gte', '$lte'):
+                    numbers = pd.to_numeric(values, errors='coerce').to_numpy(dtype=float)
+                    with np.errstate(invalid='ignore'):
+                        mask &= numbers >= operand if operator == '$gte' else numbers <= operand
+                else:
+                    raise ValueError(f"Unsupported filter operator: {operator}")
+        return mask
+
+    def _search(self, query_vectors, k, filter=None):
+        """
+        (Document, score) lists for each query vector
+
+        The rows are taken together under the lock and hits resolved against
+        that snapshot: delete() rebinds ids/texts/metadatas/vectors, so reading
+        them again after scoring could pair a hit with another listing.
+        """
+        data = self._data
+        with data.lock:
+            data.consolidate()
+            if data.vectors is None or not len(data.ids):
+                return [[] for _ in query_vectors]
+            ids, texts, metadatas, vectors = data.ids, data.texts, data.metadatas, data.vectors
+            mask = self._mask(filter) if filter else None
+        queries = _normalize(query_vectors)
+        results = []
+        for start in range(0, len(queries), QUERY_BATCH_SIZE):
+            scores = queries[start:start + QUERY_BATCH_SIZE] @ vectors.T
+            if mask is not None:
+                scores[:, ~mask] = -np.inf
+            top = _top_k(scores, k)
+            for row, positions in enumerate(top):
+                row_scores = scores[row, positions]
+                results.append([
+                    (Document(page_content=texts[p], metadata=metadatas[p], id=ids[p]), float(score))
+                    for p, score in zip(positions.tolist(), row_scores) if score != -np.inf
+                ])
+        return results
+
+    def similarity_search_by_vector_with_score(self, embedding, k=4, filter=None, **kwargs):
+        return self._search([embedding], k, filter)[0]
+
+    def similarity_search_with_score(self, query, k=4, filter=None, **kwargs):
+        """(Document, cosine similarity) pairs, most similar first"""
+        return self.similarity_search_by_vector_with_score(self.embeddings.embed_query(query), k, filter)
+
+    def similarity_search_by_vector(self, embedding, k=4, filter=None, **kwargs):
+        return [document for document, _ in self.similarity_search_by_vector_with_score(embedding, k, filter)]
+
+    def similarity_search(self, query, k=4, filter=None, **kwargs):
+        return [document for document, _ in self.similarity_search_with_score(query, k, filter)]
+
+    def similarity_search_batch(self, queries, k=4, filter=None):
+        """
+        similarity_search for many queries: one matmul per QUERY_BATCH_SIZE queries
+
+        Queries go through embed_query like single searches, so they never
+        enter the document embedding cache.
+
+        Returns:
+            List of Document lists, one per query
+        """
+        queries = list(queries)
+        if not queries:
+            return []
+        hits = self._search([self.embeddings.embed_query(query) for query in queries], k, filter)
+        return [[document for document, _ in query_hits] for query_hits in hits]
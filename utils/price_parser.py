@@ -0,0 +1,162 @@
+"""
+Vectorized parser for Vietnamese price texts ("6 tỷ 900 triệu", "15 triệu/tháng", ...)
+
+Used by both the LandSoft and the Google Sheets ingestion paths.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Đơn vị giá -> hệ số nhân (VND)
+PRICE_UNITS = {
+    'tỷ': 1_000_000_000, 'ty': 1_000_000_000,
+    'triệu': 1_000_000, 'trieu': 1_000_000, 'tr': 1_000_000,
+    'nghìn': 1_000, 'nghin': 1_000, 'ngàn': 1_000, 'ngan': 1_000, 'k': 1_000,
+}
+
+_UNIT_PATTERN = '|'.join(sorted(PRICE_UNITS, key=len, reverse=True))
+
+# "7 tỷ 850": số không đơn vị sau một đơn vị tính theo đơn vị nhỏ hơn kế tiếp
+NEXT_SMALLER_UNIT = {1_000_000_000: 1_000_000, 1_000_000: 1_000}
+
+# "12.5" không thể là giá VND: số trần nhỏ hơn ngưỡng này tính theo tỷ (tiền thuê theo triệu)
+BARE_AMOUNT_LIMIT = 1_000
+
+# A number with optional decimal/thousands separators, an optional "trăm" (x100)
+# and an optional unit that is not the start of a longer word ("tr" must not match "trăm")
+AMOUNT_PATTERN = (
+    rf'(?P<number>\d+(?:[.,]\d+)*)\s*(?P<hundreds>trăm)?\s*'
+    rf'(?:(?P<unit>{_UNIT_PATTERN})(?![^\W\d_]))?'
+)
+
+# "5 - 7 tỷ", "5 tỷ ~ 7 tỷ", "từ 5 đến 7 tỷ"
+RANGE_SEPARATOR_PATTERN = r'\s*(?:-|–|~|đến|tới)\s*'
+
+NEGOTIABLE_PATTERN = r'thương\s*lượng|thoả\s*thuận|thỏa\s*thuận|^tl$'
+MONTHLY_PATTERN = r'/\s*th(?:áng)?\b|mỗi\s*tháng'
+
+# "1.500.000" / "12,000" are thousands groups; "6.5" / "6,75" are decimals
+_THOUSANDS_GROUPED = r'\d{1,3}(?:[.,]\d{3})+'
+
+
+def _parse_amounts(text):
+    """
+    Parse every amount in each text
+
+    Returns:
+        (amount, unit_multiplier): amount in VND (NaN if no number), and the
+        multiplier of the first unit found (NaN if the text has no unit)
+    """
+    tokens = text.str.extractall(AMOUNT_PATTERN)
+    amount = pd.Series(np.nan, index=text.index)
+    first_unit = pd.Series(np.nan, index=text.index)
+    if tokens.empty:
+        return amount, first_unit
+
+    numbers = tokens['number']
+    grouped = numbers.str.fullmatch(_THOUSANDS_GROUPED)
+    numbers = numbers.where(~grouped, numbers.str.replace(r'[.,]', '', regex=True))
+    numbers = numbers.where(grouped, numbers.str.replace(',', '.', regex=False))
+    values = pd.to_numeric(numbers, errors='coerce') * np.where(tokens['hundreds'].notna(), 100, 1)
+
+    multiplier = tokens['unit'].map(PRICE_UNITS)
+    row = tokens.index.get_level_values(0)
+    # "7 tỷ 850" / "5 triệu 500": a bare number right after a unit counts in the next smaller one
+    previous = multiplier.groupby(row).shift(1)
+    multiplier = multiplier.fillna(previous.map(NEXT_SMALLER_UNIT))
+    has_unit = multiplier.notna()
+
+    # Rows with units: sum every "<number> <unit>" part ("6 tỷ 900 triệu")
+    with_unit = (values * multiplier)[has_unit].groupby(row[has_unit]).sum()
+    # Rows without any unit: the first number is a raw VND amount ("6900000000")
+    without_unit = values.groupby(row).first()
+
+    amount.loc[without_unit.index] = without_unit
+    amount.loc[with_unit.index] = with_unit
+    first_unit_found = multiplier[has_unit].groupby(row[has_unit]).first()
+    first_unit.loc[first_unit_found.index] = first_unit_found
+    return amount, first_unit
+
+
+def _empty_details(index):
+    return pd.DataFrame({
+        'price': pd.Series(dtype='int64'), 'price_max': pd.Series(dtype='int64'),
+        'is_monthly': pd.Series(dtype=bool), 'is_negotiable': pd.Series(dtype=bool),
+    }, index=index)
+
+
+def _parse_unique_price_details(text):
+    if text.empty:
+        return _empty_details(text.index)
+
+    lower_text = text.str.lower().str.strip()
+    is_negotiable = lower_text.str.contains(NEGOTIABLE_PATTERN, regex=True) | lower_text.eq('')
+    is_monthly = lower_text.str.contains(MONTHLY_PATTERN, regex=True)
+
+    parts = lower_text.str.split(RANGE_SEPARATOR_PATTERN, n=1, expand=True, regex=True)
+    low_text = parts[0]
+    high_text = parts[1] if 1 in parts.columns else pd.Series(np.nan, index=text.index, dtype=object)
+    has_range = high_text.notna() & high_text.str.contains(r'\d', regex=True).fillna(False).astype(bool)
+
+    low, low_unit = _parse_amounts(low_text)
+    high, high_unit = _parse_amounts(high_text.where(has_range, ''))
+
+    # "5 - 7 tỷ": the lower bound borrows the upper bound's unit
+    first_low_number = pd.to_numeric(
+        low_text.str.extract(r'(\d+(?:[.,]\d+)?)', expand=False).str.replace(',', '.', regex=False),
+        errors='coerce'
+    )
+    inherits_unit = has_range & low_unit.isna() & high_unit.notna()
+    low = low.where(~inherits_unit, first_low_number * high_unit)
+
+    # "12.5", "12,5 - 13": unitless amounts too small to be VND are tỷ (triệu for rents)
+    bare_unit = pd.Series(np.where(is_monthly.fillna(False), 1_000_000, 1_000_000_000), index=text.index)
+    low = low.where(~(low_unit.isna() & ~inherits_unit & (low < BARE_AMOUNT_LIMIT)), low * bare_unit)
+    high = high.where(~(high_unit.isna() & (high < BARE_AMOUNT_LIMIT)), high * bare_unit)
+
+    price = low.where(~is_negotiable, 0).fillna(0).round()
+    price_max = high.where(has_range & ~is_negotiable, price).fillna(price).round()
+    return pd.DataFrame({
+        'price': price.astype('int64'),
+        'price_max': price_max.astype('int64'),
+        'is_monthly': is_monthly.fillna(False).astype(bool),
+        'is_negotiable': is_negotiable.fillna(False).astype(bool),
+    })
+
+
+def parse_price_details(values):
+    """
+    Parse a Series of price texts
+
+    Handles tỷ/triệu/nghìn (and unaccented/short forms), decimals with a comma
+    or a dot, thousands separators, ranges ("5 - 7 tỷ" -> lower bound in
+    `price`, upper bound in `price_max`), rental prices ("15 triệu/tháng",
+    flagged in `is_monthly`) and "Thương lượng" (price 0, `is_negotiable`).
+    A bare number after a unit counts in the next smaller unit ("7 tỷ 850" is
+    7 tỷ 850 triệu). Other plain numbers without a unit are taken as VND,
+    except amounts below BARE_AMOUNT_LIMIT ("12.5"), which are tỷ, or triệu
+    for monthly rents.
+
+    Returns:
+        DataFrame with columns price, price_max, is_monthly, is_negotiable
+        aligned with `values`
+    """
+    if len(values) == 0:
+        return _empty_details(values.index)
+
+    # Price texts repeat a lot in real exports, so each distinct text is parsed once
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    unique_text = pd.Series(uniques, dtype=object).map(str).astype(str)
+    details = _parse_unique_price_details(unique_text)
+
+    missing = codes < 0
+    # Missing cells point at an extra "negotiable" row appended after the uniques
+    details.loc[len(details)] = {'price': 0, 'price_max': 0, 'is_monthly': False, 'is_negotiable': True}
+    result = details.iloc[np.where(missing, len(details) - 1, codes)]
+    result.index = values.index
+    return result
+
+
+def parse_prices(values):
+    """Parse a Series of price texts into an int64 Series of VND (0 = negotiable/unknown)"""
+    return parse_price_details(values)['price']
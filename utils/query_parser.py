@@ -0,0 +1,237 @@
+"""
+Query understanding: pull structured constraints (district, ward, price, area,
+bedrooms, transaction and property type) out of a free-text question and
+turn them into a vector store metadata filter
+"""
+
+import re
+
+from utils.config import DISTRICT_ALIASES
+from utils.data_loader import PROPERTY_TYPE_KEYWORDS
+from utils.price_parser import PRICE_UNITS
+from utils.text_utils import fold_diacritics, location_key, normalize_text
+
+# Khoảng dao động khi câu hỏi chỉ nêu một mức giá ("căn hộ 5 tỷ") hoặc diện tích ("80m2")
+PRICE_TOLERANCE = 0.2
+AREA_TOLERANCE = 0.2
+
+# All patterns below run on normalize_text() output (lowercase, no diacritics).
+# A number never starts inside a word, so the "2" of "m2" or "q2" is not one
+_NUMBER = r'(?<![\w.,])(\d+(?:[.,]\d+)?)'
+_UNIT = r'(ty|trieu|tr|nghin|ngan|k)\b'
+_MONEY = rf'{_NUMBER}\s*{_UNIT}'
+
+PRICE_RANGE_PATTERN = re.compile(rf'(?:tu\s*)?{_NUMBER}\s*(?:{_UNIT})?\s*(?:-|den|toi|~)\s*{_MONEY}')
+PRICE_MAX_PATTERN = re.compile(rf'(?:\bduoi|<=?|\btoi da|\bkhong qua|\bnho hon|\bre hon|\bit hon|\bmax)\s*{_MONEY}')
+PRICE_MIN_PATTERN = re.compile(rf'(?:\btren|>=?|\btu|\btoi thieu|\bit nhat|\blon hon|\bmin)\s*{_MONEY}')
+PRICE_PATTERN = re.compile(_MONEY)
+
+_AREA_UNIT = r'(?:m2|m²|met vuong)'
+_AREA = rf'{_NUMBER}\s*{_AREA_UNIT}'
+AREA_RANGE_PATTERN = re.compile(rf'{_NUMBER}\s*{_AREA_UNIT}?\s*(?:-|den|toi|~)\s*{_AREA}')
+AREA_MAX_PATTERN = re.compile(rf'(?:\bduoi|<=?|\btoi da|\bkhong qua|\bnho hon|\bmax)\s*{_AREA}')
+AREA_MIN_PATTERN = re.compile(rf'(?:\btren|>=?|\btu|\btoi thieu|\bit nhat|\blon hon|\brong hon|\bmin)\s*{_AREA}')
+AREA_PATTERN = re.compile(_AREA)
+
+BEDROOM_PATTERN = re.compile(r'(\d+)\s*(?:pn|phong ngu|bedrooms?|br)\b')
+DISTRICT_NUMBER_PATTERN = re.compile(r'\b(?:q|quan)\s*\.?\s*(\d{1,2})\b')
+WARD_NUMBER_PATTERN = re.compile(r'\b(?:p|phuong)\s*\.?\s*(\d{1,2})\b')
+
+RENT_PATTERN = re.compile(r'\bthue\b')
+# "bán"/"mua" checked before folding: folded "ban" is also "bạn", "bàn"
+SALE_PATTERN = re.compile(r'\b(?:bán|mua)\b')
+
+
+def _to_vnd(number, unit):
+    return float(number.replace(',', '.')) * PRICE_UNITS[unit]
+
+
+def _alias_pattern(alias):
+    """Whole words spelling the alias, with or without spaces ('binhthanh' matches "binh thanh")"""
+    return re.compile(r'\b' + r'\s*'.join(map(re.escape, alias)) + r'\b')
+
+
+# Tên quận viết tắt ('binhthanh'); 'q7'... đã do DISTRICT_NUMBER_PATTERN xử lý
+ALIAS_PATTERNS = {alias: _alias_pattern(alias) for alias in DISTRICT_ALIASES if not re.fullmatch(r'q\d+', alias)}
+# Alias chung chung ("trung tâm" còn là "trung tâm thương mại"): chỉ ưu tiên khi xếp hạng, không lọc cứng
+SOFT_DISTRICT_ALIASES = {'trungtam'}
+
+
+def _district_keys_from_aliases(query, aliases):
+    """District keys of the named aliases found as whole words in the folded query"""
+    keys = []
+    for alias in aliases:
+        if not ALIAS_PATTERNS[alias].search(query):
+            continue
+        districts = DISTRICT_ALIASES[alias]
+        for district in districts if isinstance(districts, list) else [districts]:
+            keys.append(location_key(district))
+    return keys
+
+
+def _extract_price_range(query):
+    """(price_min, price_max) in VND from the folded query (see _without_locations), None where not stated"""
+    match = PRICE_RANGE_PATTERN.search(query)
+    if match:
+        low_number, low_unit, high_number, high_unit = match.groups()
+        return _to_vnd(low_number, low_unit or high_unit), _to_vnd(high_number, high_unit)
+
+    price_min = price_max = None
+    match = PRICE_MAX_PATTERN.search(query)
+    if match:
+        price_max = _to_vnd(*match.groups())
+    match = PRICE_MIN_PATTERN.search(query)
+    if match:
+        price_min = _to_vnd(*match.groups())
+    if price_min is None and price_max is None:
+        match = PRICE_PATTERN.search(query)
+        if match:
+            price = _to_vnd(*match.groups())
+            price_min, price_max = price * (1 - PRICE_TOLERANCE), price * (1 + PRICE_TOLERANCE)
+    return price_min, price_max
+
+
+def _to_number(number):
+    return float(number.replace(',', '.'))
+
+
+def _without_locations(query):
+    """The folded query with district and ward numbers blanked, so "quận 2 - 5 tỷ" is not a 2-5 tỷ range"""
+    return WARD_NUMBER_PATTERN.sub(' ', DISTRICT_NUMBER_PATTERN.sub(' ', query))
+
+
+def _extract_area_range(query):
+    """(area_min, area_max) in m² from the folded query (see _without_locations), None where not stated"""
+    match = AREA_RANGE_PATTERN.search(query)
+    if match:
+        return _to_number(match.group(1)), _to_number(match.group(2))
+
+    area_min = area_max = None
+    match = AREA_MAX_PATTERN.search(query)
+    if match:
+        area_max = _to_number(match.group(1))
+    match = AREA_MIN_PATTERN.search(query)
+    if match:
+        area_min = _to_number(match.group(1))
+    if area_min is None and area_max is None:
+        match = AREA_PATTERN.search(query)
+        if match:
+            area = _to_number(match.group(1))
+            area_min, area_max = area * (1 - AREA_TOLERANCE), area * (1 + AREA_TOLERANCE)
+    return area_min, area_max
+
+
+def parse_query(question):
+    """
+    Extract search constraints from a question
+
+    Example:
+        parse_query("căn hộ 2pn Q7 dưới 5 tỷ") ->
+        {'districts': ['7'], 'preferred_districts': [], 'wards': [], 'price_min': None, 'price_max': 5e9,
+         'area_min': None, 'area_max': None, 'bedrooms': 2,
+         'transaction_type': None, 'property_type': 'Căn hộ'}
+
+    District and ward values are location keys (see utils.text_utils.location_key).
+    The area range and the preferred districts of vague aliases ("khu trung
+    tâm") only feed the re-ranker (utils.reranker), not the filter.
+    """
+    lower_query = str(question).lower()
+    query = normalize_text(question)
+
+    districts = [location_key(number) for number in DISTRICT_NUMBER_PATTERN.findall(query)]
+    districts += _district_keys_from_aliases(query, [alias for alias in ALIAS_PATTERNS
+                                                     if alias not in SOFT_DISTRICT_ALIASES])
+    preferred_districts = _district_keys_from_aliases(query, SOFT_DISTRICT_ALIASES)
+    wards = [location_key(number) for number in WARD_NUMBER_PATTERN.findall(query)]
+
+    numeric_query = _without_locations(query)
+    price_min, price_max = _extract_price_range(numeric_query)
+    area_min, area_max = _extract_area_range(numeric_query)
+
+    match = BEDROOM_PATTERN.search(query)
+    bedrooms = int(match.group(1)) if match else None
+
+    if RENT_PATTERN.search(query):
+        transaction_type = 'Cho thuê'
+    elif SALE_PATTERN.search(lower_query):
+        transaction_type = 'Cần bán'
+    else:
+        transaction_type = None
+
+    property_type = None
+    for type_name, keywords in PROPERTY_TYPE_KEYWORDS:
+        if any(fold_diacritics(keyword) in query for keyword in keywords):
+            property_type = type_name
+            break
+
+    return {
+        'districts': list(dict.fromkeys(districts)),
+        'preferred_districts': list(dict.fromkeys(preferred_districts)),
+        'wards': list(dict.fromkeys(wards)),
+        'price_min': price_min,
+        'price_max': price_max,
+        'area_min': area_min,
+        'area_max': area_max,
+        'bedrooms': bedrooms,
+        'transaction_type': transaction_type,
+        'property_type': property_type,
+    }
+
+
+def build_where_filter(constraints):
+    """
+    Turn parse_query() output into a Chroma `where` filter (None if no constraint)
+
+    Listings with an unknown bedroom count (0) are kept when bedrooms are
+    requested, and negotiable prices (0) pass a maximum-price constraint.
+    """
+    conditions = []
+    if constraints.get('districts'):
+        conditions.append({'district_key': {'$in': constraints['districts']}})
+    if constraints.get('wards'):
+        conditions.append({'ward_key': {'$in': constraints['wards']}})
+    if constraints.get('price_min') is not None:
+        conditions.append({'price': {'$gte': constraints['price_min']}})
+    if constraints.get('price_max') is not None:
+        conditions.append({'price': {'$lte': constraints['price_max']}})
+    if constraints.get('bedrooms') is not None:
+        conditions.append({'bedrooms': {'$in': [constraints['bedrooms'], 0]}})
+    if constraints.get('transaction_type'):
+        conditions.append({'transaction_type': constraints['transaction_type']})
+    if constraints.get('property_type'):
+        conditions.append({'type': constraints['property_type']})
+
+    if not conditions:
+        return None
+    if len(conditions) == 1:
+        return conditions[0]
+    return {'$and': conditions}
+
+
+_OPERATORS = {
+    '$eq': lambda value, operand: value == operand,
+    '$in': lambda value, operand: value in operand,
+    '$gte': lambda value, operand: value >= operand,
+    '$lte': lambda value, operand: value <= operand,
+}
+
+
+def matches_filter(metadata, where):
+    """
+    Evaluate a build_where_filter() filter against one metadata dict
+
+    Same semantics as the Chroma filter, for results that do not come from
+    Chroma (e.g. the lexical index).
+    """
+    if where is None:
+        return True
+    if '$and' in where:
+        return all(matches_filter(metadata, condition) for condition in where['$and'])
+    for field, condition in where.items():
+        value = metadata.get(field)
+        if not isinstance(condition, dict):
+            condition = {'$eq': condition}
+        for operator, operand in condition.items():
+            if value is None or not _OPERATORS[operator](value, operand):
+                return False
+    return True
@@ -0,0 +1,103 @@
+"""
+Retriever that narrows the vector search with constraints parsed from the question,
+merges it with keyword (BM25) search and re-ranks the candidates on those constraints
+"""
+
+from typing import Any
+
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from utils.config import (
+    HYBRID_FETCH_K, QUERY_FILTERS_ENABLED, RERANK_ENABLED, RERANK_FETCH_K, RRF_K, TOP_K_RESULTS,
+)
+from utils.query_parser import build_where_filter, matches_filter, parse_query
+from utils.reranker import rerank
+
+# Filtered keyword search looks this many times deeper before dropping non-matching listings
+LEXICAL_OVERFETCH = 5
+
+
+def _document_key(document):
+    return document.metadata.get('id') or document.page_content
+
+
+def reciprocal_rank_fusion(rankings, k=RRF_K):
+    """
+    Merge ranked Document lists: each document scores sum(1 / (k + rank))
+    over the lists it appears in; ties keep the order of the first list
+    """
+    scores, documents = {}, {}
+    for ranking in rankings:
+        for rank, document in enumerate(ranking, start=1):
+            key = _document_key(document)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+            documents.setdefault(key, document)
+    return [documents[key] for key in sorted(scores, key=scores.get, reverse=True)]
+
+
+class ListingRetriever(BaseRetriever):
+    """
+    Similarity search restricted by a metadata `where` filter
+
+    The filter comes from parse_query() (district, ward, price, bedrooms,
+    transaction and property type). With a lexical_index, the top fetch_k
+    listings of the vector search and of BM25 are merged by reciprocal-rank
+    fusion. When fewer than k listings match, the remaining slots are filled
+    from an unfiltered search so the LLM always gets k candidates.
+
+    With rerank on and a question that states constraints, rerank_fetch_k
+    candidates are retrieved and utils.reranker keeps the k that fit the
+    price, area, bedrooms, district and transaction type best.
+    """
+
+    vector_store: Any
+    lexical_index: Any = None
+    k: int = TOP_K_RESULTS
+    fetch_k: int = HYBRID_FETCH_K
+    use_filters: bool = QUERY_FILTERS_ENABLED
+    rerank: bool = RERANK_ENABLED
+    rerank_fetch_k: int = RERANK_FETCH_K
+
+    def _vector_search(self, query, k, where):
+        if where is None:
+            return self.vector_store.similarity_search(query, k=k)
+        return self.vector_store.similarity_search(query, k=k, filter=where)
+
+    def _lexical_search(self, query, k, where):
+        index = self.lexical_index
+        if where is None or index.metadatas is None:
+            positions = [position for position, _ in index.search(query, k=k)]
+        else:
+            hits = index.search(query, k=k * LEXICAL_OVERFETCH)
+            positions = [position for position, _ in hits if matches_filter(index.metadatas[position], where)][:k]
+        return [index.get_document(position) for position in positions]
+
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> list[Document]:
+        constraints = parse_query(query) if self.use_filters or self.rerank else {}
+        where = build_where_filter(constraints) if self.use_filters else None
+        # Over-fetch only when there is something to re-rank on
+        reranking = self.rerank and any(value not in (None, []) for value in constraints.values())
+        candidates = max(self.k, self.rerank_fetch_k) if reranking else self.k
+
+        if self.lexical_index is None:
+            documents = self._vector_search(query, candidates, where)
+        else:
+            fetch_k = max(candidates, self.fetch_k)
+            documents = reciprocal_rank_fusion([
+                self._vector_search(query, fetch_k, where),
+                self._lexical_search(query, fetch_k, where),
+            ])[:candidates]
+
+        if where is not None and len(documents) < self.k:
+            seen = {_document_key(document) for document in documents}
+            for document in self.vector_store.similarity_search(query, k=self.k + len(documents)):
+                if len(documents) >= self.k:
+                    break
+                if _document_key(document) not in seen:
+                    seen.add(_document_key(document))
+                    documents.append(document)
+        if reranking:
+            documents = rerank(documents, constraints, self.k)
+        return documents
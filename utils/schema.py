@@ -0,0 +1,126 @@
+"""
+Compact dtypes for the listings table agents keep in memory
+
+Every agent (and with it every Streamlit session using it) holds its
+processed DataFrame, so repeated labels become categoricals, counts small
+ints, measurements float32 and date strings datetime64. Conversions that
+would lose information (high-cardinality text, unparseable dates, fractional
+"integers") are skipped and the column keeps its dtype.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.config import CATEGORY_MAX_RATIO
+
+# Cột -> kiểu gọn; cột không có trong bảng thì bỏ qua
+LISTING_SCHEMA = {
+    'district': 'category',
+    'ward': 'category',
+    'type': 'category',
+    'direction': 'category',
+    'transaction_type': 'category',
+    'legal_status': 'category',
+    'status': 'category',
+    'amenities': 'category',
+    'street_type': 'category',
+    'street_name': 'category',
+    'agent_name': 'category',
+    'posted_by': 'category',
+    'poster_name': 'category',
+    'price_text': 'category',
+    'house_number': 'category',
+    'owner': 'category',
+    'phone': 'category',
+    'bedrooms': 'small_int',
+    'price': 'int64',  # Giá VND vượt quá int32
+    'area': 'float32',
+    'width': 'float32',
+    'length': 'float32',
+    'registration_date': 'datetime',
+    'update_date': 'datetime',
+    'posted_date': 'datetime',
+}
+
+
+def frame_memory(df):
+    """Bytes held by a DataFrame, including string contents"""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def _to_category(values):
+    non_null = values.notna().sum()
+    if isinstance(values.dtype, pd.CategoricalDtype) or non_null == 0:
+        return values
+    if values.nunique() > CATEGORY_MAX_RATIO * non_null:
+        return values
+    return values.astype('category')
+
+
+def _to_integer(values, downcast):
+    numbers = pd.to_numeric(values, errors='coerce')
+    if numbers.isna().any() or not (numbers == np.round(numbers)).all():
+        return values
+    if downcast:
+        return pd.to_numeric(numbers.astype('int64'), downcast='integer')
+    return numbers.astype('int64')
+
+
+def _to_float32(values):
+    numbers = pd.to_numeric(values, errors='coerce')
+    if numbers.notna().sum() != values.notna().sum():
+        return values
+    return numbers.astype('float32')
+
+
+def _to_datetime(values):
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return values
+    # Các ngày ở dạng chuỗi: 'YYYY-MM-DD' (posted_date) hoặc dd/mm/yyyy (Google Sheets);
+    # dayfirst chỉ áp dụng cho các giá trị không phải ISO, nếu không '2025-01-05' thành 1/5
+    dates = pd.to_datetime(values, errors='coerce', format='ISO8601')
+    rest = dates.isna() & values.notna()
+    if rest.any():
+        dates = dates.astype('datetime64[ns]')
+        dates[rest] = pd.to_datetime(values[rest], errors='coerce', format='mixed', dayfirst=True)
+    if dates.notna().sum() != values.notna().sum():
+        return values
+    return dates
+
+
+CONVERTERS = {
+    'category': _to_category,
+    'small_int': lambda values: _to_integer(values, downcast=True),
+    'int64': lambda values: _to_integer(values, downcast=False),
+    'float32': _to_float32,
+    'datetime': _to_datetime,
+}
+
+
+def compact_listings(df, schema=LISTING_SCHEMA, report=True):
+    """
+    Convert the columns named in `schema` to compact dtypes
+
+    Args:
+        df: Processed listings DataFrame (not modified)
+        schema: Column -> 'category' | 'small_int' | 'int64' | 'float32' | 'datetime'
+        report: Print memory before and after
+
+    Returns:
+        New DataFrame with the converted columns
+    """
+    before = frame_memory(df) if report else 0
+    compact = df.copy(deep=False)
+    for column, kind in schema.items():
+        if column in compact.columns:
+            compact[column] = CONVERTERS[kind](compact[column])
+
+    if report:
+        after = frame_memory(compact)
+        saved = 1 - after / before if before else 0.0
+        # The listing text is unique per row (and shared with the lexical index), so it stays as is
+        text = int(compact['text'].memory_usage(deep=True, index=False)) if 'text' in compact.columns else 0
+        text_saved = 1 - (after - text) / (before - text) if before > text else 0.0
+        print(f"🗜️ Listings table: {before / 1e6:.1f} MB → {after / 1e6:.1f} MB ({saved:.0%} smaller; "
+              f"{text_saved:.0%} without the {text / 1e6:.1f} MB of listing text)")
+    return compact
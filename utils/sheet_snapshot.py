@@ -0,0 +1,244 @@
+"""
+Local snapshot of a Google Sheet, refreshed by fetching only the rows that changed
+
+A load first compares the spreadsheet's last modification time with the
+snapshot's and returns the snapshot untouched if they match. Otherwise it
+reads the header plus the 'Ngày cập nhật' and 'Mã sản phẩm' columns (one
+API call), compares them row by row with the snapshot and re-downloads only
+the row ranges that differ, plus everything from the first inserted or
+deleted row onward. Edits that do not touch either column are picked up by
+the periodic full refresh.
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+from gspread.utils import numericise_all, rowcol_to_a1
+
+from utils.config import (
+    GSHEET_SNAPSHOT_DIR, GSHEET_UPDATE_COLUMN, GSHEET_KEY_COLUMN, GSHEET_FULL_REFRESH_SECONDS,
+)
+
+SNAPSHOT_VERSION = 1
+# Số vùng tối đa trong một lời gọi batch_get (giới hạn độ dài URL)
+MAX_RANGES_PER_CALL = 200
+
+
+def snapshot_path(sheet_url, snapshot_dir=GSHEET_SNAPSHOT_DIR):
+    return Path(snapshot_dir) / f"{hashlib.sha256(sheet_url.encode('utf-8')).hexdigest()[:16]}.json"
+
+
+def row_fingerprint(row):
+    """Hash of a row's raw cell values"""
+    return hashlib.sha1('\x1f'.join(row).encode('utf-8')).hexdigest()
+
+
+def _pad(row, width):
+    row = [str(value) for value in row[:width]]
+    return row + [''] * (width - len(row))
+
+
+def _column_letter(index):
+    return rowcol_to_a1(1, index + 1)[:-1]
+
+
+def _runs(positions):
+    """Group sorted row positions into (start, end) runs, end inclusive"""
+    runs = []
+    for position in positions:
+        if runs and runs[-1][1] == position - 1:
+            runs[-1][1] = position
+        else:
+            runs.append([position, position])
+    return [tuple(run) for run in runs]
+
+
+class SheetSnapshot:
+    """
+    Header and rows of one worksheet, with per-row probe values and fingerprints
+
+    Rows are stored numericised (as get_all_records returns them); probes are
+    the (key, update date) cells used to spot changed rows.
+    """
+
+    def __init__(self, header, rows, probes, fingerprints, revision=None, full_fetched_at=None):
+        self.header = header
+        self.rows = rows
+        self.probes = probes
+        self.fingerprints = fingerprints
+        self.revision = revision
+        self.full_fetched_at = full_fetched_at if full_fetched_at is not None else time.time()
+
+    @classmethod
+    def load(cls, path):
+        """Read a snapshot, or None if it is missing, unreadable or from another version"""
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != SNAPSHOT_VERSION:
+            return None
+        return cls(data['header'], data['rows'], data['probes'], data['fingerprints'],
+                   data.get('revision'), data.get('full_fetched_at'))
+
+    def save(self, path):
+        path = Path(path)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'version': SNAPSHOT_VERSION,
+                    'revision': self.revision,
+                    'full_fetched_at': self.full_fetched_at,
+                    'header': self.header,
+                    'rows': self.rows,
+                    'probes': self.probes,
+                    'fingerprints': self.fingerprints,
+                }, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not save Google Sheet snapshot to {path}: {e}")
+
+
+class SheetDeltaLoader:
+    """
+    Fetch a worksheet through a local snapshot
+
+    Args:
+        spreadsheet: gspread Spreadsheet (or anything with get_lastUpdateTime/get_worksheet)
+        path: Snapshot file, see snapshot_path
+        update_column: Header of the last-modified date column
+        key_column: Header of the product code column (optional in the sheet)
+        full_refresh_seconds: Re-download everything when the last full fetch is older
+    """
+
+    def __init__(self, spreadsheet, path, update_column=GSHEET_UPDATE_COLUMN, key_column=GSHEET_KEY_COLUMN,
+                 full_refresh_seconds=GSHEET_FULL_REFRESH_SECONDS):
+        self.spreadsheet = spreadsheet
+        self.path = path
+        self.update_column = update_column
+        self.key_column = key_column
+        self.full_refresh_seconds = full_refresh_seconds
+        self.stats = {}
+
+    def load(self):
+        """
+        Returns:
+            (header, rows) with numericised rows, like get_all_records
+        """
+        worksheet = self.spreadsheet.get_worksheet(0)
+        revision = self._revision()
+        snapshot = SheetSnapshot.load(self.path)
+
+        if snapshot is not None and revision is not None and snapshot.revision == revision:
+            self.stats = {'mode': 'unchanged', 'rows_fetched': 0, 'rows_changed': 0}
+            print(f"✅ Google Sheet unchanged since last load, using local snapshot ({len(snapshot.rows)} rows)")
+            return snapshot.header, snapshot.rows
+
+        if (snapshot is None or self.update_column not in snapshot.header
+                or time.time() - snapshot.full_fetched_at > self.full_refresh_seconds):
+            snapshot = self._full_fetch(worksheet, revision)
+        else:
+            snapshot = self._delta_fetch(worksheet, snapshot, revision)
+        snapshot.save(self.path)
+        return snapshot.header, snapshot.rows
+
+    def _revision(self):
+        try:
+            return self.spreadsheet.get_lastUpdateTime()
+        except Exception as e:
+            print(f"⚠️ Could not read Google Sheet revision, checking rows instead: {e}")
+            return None
+
+    def _probe_columns(self, header):
+        return [header.index(column) for column in (self.key_column, self.update_column) if column in header]
+
+    def _probe(self, row, columns):
+        return '\x1f'.join(row[column] for column in columns)
+
+    def _make_rows(self, raw_rows, width):
+        raw_rows = [_pad(row, width) for row in raw_rows]
+        return raw_rows, [numericise_all(row) for row in raw_rows]
+
+    def _full_fetch(self, worksheet, revision):
+        values = worksheet.get_values()
+        header = [str(value) for value in values[0]] if values else []
+        raw_rows, rows = self._make_rows(values[1:], len(header))
+        columns = self._probe_columns(header)
+        self.stats = {'mode': 'full', 'rows_fetched': len(rows), 'rows_changed': len(rows)}
+        print(f"📥 Google Sheet: downloaded all {len(rows)} rows")
+        return SheetSnapshot(header, rows, [self._probe(row, columns) for row in raw_rows],
+                             [row_fingerprint(row) for row in raw_rows], revision)
+
+    def _delta_fetch(self, worksheet, snapshot, revision):
+        header = snapshot.header
+        width = len(header)
+        columns = self._probe_columns(header)
+        letters = [_column_letter(column) for column in columns]
+
+        # Header + probe columns in one call
+        probe_values = worksheet.batch_get(['1:1'] + [f"{letter}2:{letter}" for letter in letters])
+        current_header = _pad(probe_values[0][0], width) if probe_values[0] else []
+        if current_header != header or (probe_values[0] and len(probe_values[0][0]) > width):
+            print("🔄 Google Sheet header changed")
+            return self._full_fetch(worksheet, revision)
+
+        probe_columns = [[row[0] if row else '' for row in values] for values in probe_values[1:]]
+        n_probed = max((len(values) for values in probe_columns), default=0)
+        probe_columns = [values + [''] * (n_probed - len(values)) for values in probe_columns]
+        probes = ['\x1f'.join(cells) for cells in zip(*probe_columns)] if probe_columns else []
+
+        common = min(n_probed, len(snapshot.probes))
+        changed = [i for i in range(common) if probes[i] != snapshot.probes[i]]
+        if self.key_column in header:
+            # A different product code means rows were inserted or deleted here: re-read from it on
+            shifted = [i for i in changed if probes[i].split('\x1f')[0] != snapshot.probes[i].split('\x1f')[0]]
+        else:
+            shifted = changed if n_probed != len(snapshot.probes) else []
+        # Always read past the end too, for appended rows (also those with blank probe cells)
+        tail_start = shifted[0] if shifted else common
+        changed = [i for i in changed if i < tail_start]
+
+        runs = _runs(changed)
+        last_letter = _column_letter(width - 1)
+        ranges = [f"A{start + 2}:{last_letter}{end + 2}" for start, end in runs]
+        ranges.append(f"A{tail_start + 2}:{last_letter}")
+        fetched = []
+        for i in range(0, len(ranges), MAX_RANGES_PER_CALL):
+            fetched.extend(worksheet.batch_get(ranges[i:i + MAX_RANGES_PER_CALL]))
+
+        rows = list(snapshot.rows[:tail_start])
+        fingerprints = list(snapshot.fingerprints[:tail_start])
+        raw_probes = list(snapshot.probes[:tail_start])
+        rows_fetched = rows_changed = 0
+        for (start, end), values in zip(runs, fetched):
+            raw_rows = list(values) + [[]] * (end - start + 1 - len(values))
+            raw_rows, new_rows = self._make_rows(raw_rows, width)
+            for offset, (raw_row, row) in enumerate(zip(raw_rows, new_rows)):
+                position = start + offset
+                fingerprint = row_fingerprint(raw_row)
+                rows_changed += fingerprint != fingerprints[position]
+                rows[position], fingerprints[position] = row, fingerprint
+                raw_probes[position] = self._probe(raw_row, columns)
+            rows_fetched += len(raw_rows)
+
+        raw_tail, tail_rows = self._make_rows(list(fetched[-1]), width)
+        old_tail = set(snapshot.fingerprints[tail_start:])
+        for raw_row, row in zip(raw_tail, tail_rows):
+            fingerprint = row_fingerprint(raw_row)
+            rows_changed += fingerprint not in old_tail
+            rows.append(row)
+            fingerprints.append(fingerprint)
+            raw_probes.append(self._probe(raw_row, columns))
+        rows_fetched += len(raw_tail)
+
+        self.stats = {'mode': 'delta', 'rows_fetched': rows_fetched, 'rows_changed': rows_changed,
+                      'ranges': len(ranges)}
+        print(f"🔄 Google Sheet delta: fetched {rows_fetched} of {len(rows)} rows in {len(ranges)} ranges "
+              f"({rows_changed} changed)")
+        return SheetSnapshot(header, rows, raw_probes, fingerprints, revision, snapshot.full_fetched_at)
@@ -0,0 +1,47 @@
+"""
+Token streaming from the agent chain with latency measurement
+"""
+
+import time
+
+
+def stream_answer(chain, question, on_update=None):
+    """
+    Stream the chain's answer as the LLM produces it
+
+    Args:
+        chain: Runnable returning text chunks from .stream() (see create_agent)
+        question: User question
+        on_update: Optional callback called with the answer so far after every chunk
+
+    Returns:
+        (answer, timings) where timings has ttft_seconds (time to first
+        token, None if nothing was produced), total_seconds and chunks
+    """
+    start = time.perf_counter()
+    first_token_at = None
+    answer = ""
+    chunks = 0
+    for chunk in chain.stream(question):
+        if not chunk:
+            continue
+        if first_token_at is None:
+            first_token_at = time.perf_counter()
+        answer += chunk
+        chunks += 1
+        if on_update is not None:
+            on_update(answer)
+
+    timings = {
+        'ttft_seconds': None if first_token_at is None else first_token_at - start,
+        'total_seconds': time.perf_counter() - start,
+        'chunks': chunks,
+    }
+    return answer, timings
+
+
+def format_timings(timings):
+    """'⏱️ Token đầu tiên: 0.82s · Tổng: 4.10s' for display under an answer"""
+    ttft = timings.get('ttft_seconds')
+    first = f"{ttft:.2f}s" if ttft is not None else "-"
+    return f"⏱️ Token đầu tiên: {first} · Tổng: {timings['total_seconds']:.2f}s"
@@ -0,0 +1,199 @@
+"""
+Column-wise builders for the listing text that gets embedded (and indexed for
+keyword search), and for the metadata stored next to it in the vector store
+
+The text is one "Nhãn: giá trị" line per field, description last. The metadata
+also carries the display fields, from which utils.llm_context renders the
+LLM's compact view of a listing; the two never parse each other.
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.data_loader import TEXT_DTYPE, determine_property_types, to_string_result, to_text
+from utils.text_utils import location_key, ward_key
+
+# Mỗi trường một dòng, không thụt lề; trường trống (chủ nhà, môi giới, ĐT) bỏ hẳn dòng
+LINE_SEPARATOR = '\n'
+DESCRIPTION_LABEL = 'Mô tả: '
+
+# Trường chỉ để hiển thị cho LLM (utils.llm_context), không dùng để lọc
+DISPLAY_FIELDS = (
+    'listing_id', 'product_id', 'address', 'price_text', 'area_text', 'direction', 'legal_status',
+    'amenities', 'owner', 'agent_name', 'phone', 'description',
+)
+
+# Google Sheets ghi nhu cầu (Cần bán/Cho thuê...) vào cột 'type' thay cho loại hình
+TRANSACTION_TYPES = ('Cần bán', 'Cần thuê', 'Cho thuê')
+
+
+def _constant(df, value):
+    return pd.Series(value, index=df.index, dtype=TEXT_DTYPE)
+
+
+def _format_prices(prices):
+    """'Thương lượng' for 0, otherwise '1,234 VND'; each distinct price is formatted once"""
+    codes, uniques = pd.factorize(prices, use_na_sentinel=True)
+    rendered = ["Thương lượng" if price == 0 else f"{price:,.0f} VND" for price in uniques.tolist()]
+    # Missing prices (code -1 picks the last entry) render like the row-wise f-string does
+    rendered.append(f"{np.nan:,.0f} VND")
+    return pd.Series(pd.array(rendered, dtype=TEXT_DTYPE).take(codes), index=prices.index)
+
+
+def _area_texts(df):
+    """'75.5m²', with ' (5m x 15m)' where both dimensions are known"""
+    area_info = to_text(df['area']) + 'm²'
+    if 'width' in df.columns and 'length' in df.columns:
+        has_dimensions = df['width'].notna() & df['length'].notna()
+        dimensions = ' (' + to_text(df['width']) + 'm x ' + to_text(df['length']) + 'm)'
+        area_info = area_info + dimensions.where(has_dimensions, '')
+    return area_info
+
+
+def _optional(df, column, prefix, suffix=''):
+    """prefix + value + suffix where the column is present and not null, '' elsewhere"""
+    if column not in df.columns:
+        return _constant(df, '')
+    values = df[column]
+    return (prefix + to_text(values) + suffix).where(values.notna(), '')
+
+
+def build_listing_texts(df):
+    """
+    Build the listing text for every row at once
+
+    Produces exactly the same strings as df.apply(create_detailed_text_embedding, axis=1)
+    without creating a Series per row.
+
+    Args:
+        df: Processed DataFrame with the required listing columns
+
+    Returns:
+        pandas.Series of texts aligned with df
+    """
+    # Show both Gallery ID and Product ID if available
+    id_display = 'Mã SP: ' + to_text(df['id']) + _optional(df, 'product_id', ' (Mã sản phẩm: ', ')')
+
+    if 'transaction_type' in df.columns:
+        transaction_type = to_text(df['transaction_type'])
+    else:
+        transaction_type = _constant(df, 'Cần bán')
+
+    lines = [
+        id_display,
+        'Loại giao dịch: ' + transaction_type,
+        'Loại hình: ' + to_text(df['type']),
+        'Vị trí: ' + to_text(df['district']) + ', ' + to_text(df['ward']),
+        'Địa chỉ: ' + to_text(df['address']),
+        'Giá: ' + _format_prices(df['price']),
+        'Diện tích: ' + _area_texts(df),
+        'Phòng ngủ: ' + to_text(df['bedrooms']),
+        'Hướng: ' + to_text(df['direction']),
+        'Pháp lý: ' + to_text(df['legal_status']),
+        'Tiện ích: ' + to_text(df['amenities']),
+        _optional(df, 'owner', 'Chủ nhà: '),
+        _optional(df, 'agent_name', 'Môi giới: '),
+        _optional(df, 'phone', 'ĐT: '),
+        DESCRIPTION_LABEL + to_text(df['description']),
+    ]
+
+    text = lines[0]
+    for line in lines[1:]:
+        text = text + (LINE_SEPARATOR + line).where(line != '', '')
+    return to_string_result(text.str.strip())
+
+
+def _metadata_text(df, column, default=''):
+    if column not in df.columns:
+        return [default] * len(df)
+    return df[column].astype(object).where(df[column].notna(), default).map(str).tolist()
+
+
+def _metadata_number(df, column, dtype):
+    if column not in df.columns:
+        return np.zeros(len(df), dtype=dtype).tolist()
+    values = pd.to_numeric(df[column], errors='coerce').fillna(0)
+    if values.dtype == np.float32:
+        # Via the shortest decimal form, so 80.1 stays 80.1 rather than 80.0999984741211
+        return values.to_numpy().astype(str).astype(dtype).tolist()
+    return values.to_numpy(dtype=dtype).tolist()
+
+
+def _metadata_types(df):
+    """
+    (type, transaction_type) metadata lists
+
+    Rows whose 'type' holds a transaction value (Google Sheets) take it as their
+    transaction_type and get the property type detected from the description,
+    so the type filters mean the same thing for every source.
+    """
+    types = pd.Series(_metadata_text(df, 'type'), index=df.index, dtype=object)
+    transaction_types = pd.Series(_metadata_text(df, 'transaction_type', default='Cần bán'), index=df.index, dtype=object)
+    misplaced = types.isin(TRANSACTION_TYPES)
+    if misplaced.any():
+        transaction_types = transaction_types.mask(misplaced, types)
+        types = types.mask(misplaced, determine_property_types(df).astype(object))
+    return types.tolist(), transaction_types.tolist()
+
+
+def _metadata_display(df, column, render=None):
+    """
+    The column as rendered in the listing text (or render(df)) where present
+    and not null, '' elsewhere
+    """
+    if column not in df.columns:
+        return [''] * len(df)
+    values = render(df) if render is not None else to_text(df[column])
+    return values.astype(object).where(df[column].notna(), '').tolist()
+
+
+def _metadata_keys(names, key_func):
+    """Apply key_func once per distinct name"""
+    codes, uniques = pd.factorize(pd.Series(names, dtype=object))
+    keys = np.array([key_func(name) for name in uniques] + [''], dtype=object)
+    return keys[codes].tolist()
+
+
+def build_listing_metadata(df):
+    """
+    Build the vector store metadata (filter and display fields) for every row
+
+    Chroma only accepts str/int/float/bool values, so missing texts become ''
+    and missing numbers become 0 (the same "unknown" value the loaders use).
+    district_key/ward_key hold the canonical location keys that
+    utils.query_parser filters on; the DISPLAY_FIELDS are what
+    utils.llm_context shows the LLM.
+
+    Args:
+        df: Processed DataFrame with the required listing columns
+
+    Returns:
+        list of metadata dicts aligned with df
+    """
+    districts = _metadata_text(df, 'district')
+    wards = _metadata_text(df, 'ward')
+    types, transaction_types = _metadata_types(df)
+    columns = {
+        'district': districts,
+        'ward': wards,
+        'district_key': _metadata_keys(districts, location_key),
+        'ward_key': _metadata_keys(wards, ward_key),
+        'type': types,
+        'transaction_type': transaction_types,
+        'price': _metadata_number(df, 'price', np.int64),
+        'area': _metadata_number(df, 'area', np.float64),
+        'bedrooms': _metadata_number(df, 'bedrooms', np.int64),
+        'listing_id': _metadata_display(df, 'id'),
+        'product_id': _metadata_display(df, 'product_id'),
+        'address': _metadata_display(df, 'address'),
+        'price_text': _metadata_display(df, 'price', lambda df: _format_prices(df['price'])),
+        'area_text': _metadata_display(df, 'area', _area_texts),
+        'direction': _metadata_display(df, 'direction'),
+        'legal_status': _metadata_display(df, 'legal_status'),
+        'amenities': _metadata_display(df, 'amenities'),
+        'owner': _metadata_display(df, 'owner'),
+        'agent_name': _metadata_display(df, 'agent_name'),
+        'phone': _metadata_display(df, 'phone'),
+        'description': _metadata_display(df, 'description'),
+    }
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
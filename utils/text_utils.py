@@ -0,0 +1,43 @@
+"""
+Vietnamese text normalization helpers shared by query parsing and search
+"""
+
+import re
+import unicodedata
+
+# đ/Đ are separate letters, not a base letter plus a combining mark
+_DIACRITIC_FREE = str.maketrans({'đ': 'd', 'Đ': 'D'})
+_COMBINING_MARKS = re.compile('[\u0300-\u036f]')
+
+
+def fold_diacritics(text):
+    """'Võ Văn Tần, Quận Đống Đa' -> 'Vo Van Tan, Quan Dong Da'"""
+    decomposed = unicodedata.normalize('NFD', str(text).translate(_DIACRITIC_FREE))
+    return _COMBINING_MARKS.sub('', decomposed)
+
+
+def normalize_text(text):
+    """Lowercase, diacritic-free text with collapsed whitespace"""
+    return ' '.join(fold_diacritics(text).lower().split())
+
+
+def location_key(name, prefixes=('quan', 'huyen', 'thanh pho', 'tp', 'q')):
+    """
+    Canonical key for a district/ward name so that 'Quận 7', 'Q7', 'q.07'
+    and 'quan 7' all become '7', and 'Quận Bình Thạnh' becomes 'binhthanh'
+    """
+    key = normalize_text(name)
+    for prefix in prefixes:
+        match = re.match(rf'{prefix}\b\.?\s*|{prefix}\.?(?=\d)', key)
+        if match:
+            key = key[match.end():]
+            break
+    key = re.sub(r'[^a-z0-9]', '', key)
+    if key.isdigit():
+        key = key.lstrip('0') or '0'
+    return key
+
+
+def ward_key(name):
+    """Canonical ward key: 'P.02', 'Phường 2' and 'p2' -> '2'"""
+    return location_key(name, prefixes=('phuong', 'xa', 'thi tran', 'p'))
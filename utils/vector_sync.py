@@ -0,0 +1,116 @@
+import hashlib
+import json
+
+# Chroma giới hạn số bản ghi trong một lần upsert
+SYNC_BATCH_SIZE = 1000
+
+
+class DocumentIdAllocator:
+    """
+    Deterministic, unique vector store ids from listing ids, across chunks
+
+    Repeated listing ids get a '#<n>' suffix in order of appearance, so the
+    same export always maps to the same ids however it is split into chunks.
+    Whole-number floats render as integers: a missing value in one chunk
+    turns that chunk's id column into floats.
+    """
+
+    def __init__(self):
+        self._seen = {}
+
+    def allocate(self, listing_ids):
+        doc_ids = []
+        for listing_id in listing_ids:
+            if isinstance(listing_id, float) and listing_id.is_integer():
+                listing_id = int(listing_id)
+            listing_id = str(listing_id)
+            count = self._seen.get(listing_id, 0)
+            self._seen[listing_id] = count + 1
+            doc_ids.append(listing_id if count == 0 else f"{listing_id}#{count + 1}")
+        return doc_ids
+
+
+def make_document_ids(df):
+    """Vector store ids for a whole DataFrame, see DocumentIdAllocator"""
+    return DocumentIdAllocator().allocate(df['id'].tolist())
+
+
+def content_hash(text, metadata=None, model_name=''):
+    """Hash of everything that ends up in the vector store for one listing"""
+    payload = json.dumps([model_name, text, metadata or {}], ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def sync_vector_store(vector_store, ids, texts, metadatas=None, model_name=''):
+    """
+    Bring a persisted collection in line with the current listings
+
+    Rows are matched by id and compared by content hash, so only new or
+    changed listings are embedded and only vanished listings are deleted.
+
+    Args:
+        vector_store: LangChain Chroma vector store (possibly already populated)
+        ids: Document ids, see make_document_ids
+        texts: Listing texts to embed
+        metadatas: Optional per-listing metadata dicts
+        model_name: Embedding model name (a model change re-embeds everything)
+
+    Returns:
+        dict with counts of added, updated, deleted and unchanged documents
+    """
+    return sync_vector_store_batches(vector_store, [(ids, texts, metadatas)], model_name)
+
+
+def sync_vector_store_batches(vector_store, batches, model_name=''):
+    """
+    sync_vector_store over an iterable of (ids, texts, metadatas) batches
+
+    Each batch is compared and upserted before the next one is read, so a
+    generator of chunks is never materialized; only the ids are kept, to
+    delete vanished listings at the end.
+    """
+    stats = {'added': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+    current_ids = set()
+
+    for ids, texts, metadatas in batches:
+        metadatas = metadatas or [{} for _ in texts]
+        current_ids.update(ids)
+        for start in range(0, len(ids), SYNC_BATCH_SIZE):
+            end = start + SYNC_BATCH_SIZE
+            _sync_batch(vector_store, ids[start:end], texts[start:end], metadatas[start:end], model_name, stats)
+
+    existing_ids = vector_store.get(include=[])['ids']
+    stale_ids = [doc_id for doc_id in existing_ids if doc_id not in current_ids]
+    stats['deleted'] = len(stale_ids)
+    for start in range(0, len(stale_ids), SYNC_BATCH_SIZE):
+        vector_store.delete(ids=stale_ids[start:start + SYNC_BATCH_SIZE])
+
+    # Stores that buffer writes (NumpyVectorStore) save them once, after the whole sync
+    flush = getattr(vector_store, 'flush', None)
+    if flush is not None:
+        flush()
+    return stats
+
+
+def _sync_batch(vector_store, ids, texts, metadatas, model_name, stats):
+    existing = vector_store.get(ids=list(ids), include=['metadatas'])
+    existing_hashes = {
+        doc_id: (meta or {}).get('content_hash')
+        for doc_id, meta in zip(existing['ids'], existing['metadatas'])
+    }
+
+    upsert_ids, upsert_texts, upsert_metas = [], [], []
+    for doc_id, text, metadata in zip(ids, texts, metadatas):
+        digest = content_hash(text, metadata, model_name)
+        old_digest = existing_hashes.get(doc_id)
+        if old_digest == digest:
+            stats['unchanged'] += 1
+            continue
+        stats['updated' if doc_id in existing_hashes else 'added'] += 1
+        upsert_ids.append(doc_id)
+        upsert_texts.append(text)
+        upsert_metas.append({**metadata, 'id': doc_id, 'content_hash': digest})
+
+    # add_texts upserts, so changed listings overwrite their previous vectors
+    if upsert_ids:
+        vector_store.add_texts(texts=upsert_texts, metadatas=upsert_metas, ids=upsert_ids)